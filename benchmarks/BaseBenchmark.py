@@ -0,0 +1,194 @@
+import os
+import sys
+import json
+import time
+import shutil
+import atexit
+import tempfile
+import statistics
+
+# querying root directory
+root = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+# Add kombi source code to python path for the benchmarks
+sourceFolder = os.path.join(root, "src")
+if not os.path.exists(sourceFolder):  # pragma: no cover
+    raise Exception("Can't resolve src location!")
+
+sys.path.insert(1, sourceFolder)
+
+class BaseBenchmark(object):
+    """
+    Base class for kombi benchmarks.
+
+    Each method prefixed by "bench" is executed multiple times (repeat) where
+    the timing about each execution is collected. The synthetic data used by the
+    benchmarks is generated on the local disk once (fixtures directory), it can
+    be reused across runs by defining KOMBI_BENCHMARK_FIXTURES_DIRECTORY (otherwise
+    a temporary directory is used, which is removed when the process exits).
+    """
+
+    repeat = 5
+    __rootPath = root
+    __fixturesDirectory = os.environ.get('KOMBI_BENCHMARK_FIXTURES_DIRECTORY', '')
+
+    def setUp(self):
+        """
+        For re-implementation: prepare the data used by the benchmarks of the class.
+        """
+
+    def tearDown(self):
+        """
+        For re-implementation: clean up after the benchmarks of the class.
+        """
+
+    @classmethod
+    def rootPath(cls):
+        """
+        Return kombi code root path.
+        """
+        return cls.__rootPath
+
+    @classmethod
+    def sourcePath(cls):
+        """
+        Return the location of kombi source code.
+        """
+        return sourceFolder
+
+    @classmethod
+    def fixturesDirectory(cls):
+        """
+        Return the directory used to store the synthetic data used by the benchmarks.
+        """
+        if not cls.__fixturesDirectory:
+            BaseBenchmark.__fixturesDirectory = tempfile.mkdtemp(prefix='kombiBenchmark')
+            atexit.register(shutil.rmtree, BaseBenchmark.__fixturesDirectory, ignore_errors=True)
+
+        return cls.__fixturesDirectory
+
+    @classmethod
+    def deepTreeDirectory(cls, depth=5, breadth=4, filesPerDirectory=4):
+        """
+        Return a directory containing a deep tree of directories and files.
+        """
+        treeDirectory = os.path.join(
+            cls.fixturesDirectory(),
+            'tree_{}_{}_{}'.format(depth, breadth, filesPerDirectory)
+        )
+        if os.path.exists(treeDirectory):
+            return treeDirectory
+
+        directories = [treeDirectory]
+        for level in range(depth):
+            childDirectories = []
+            for directory in directories:
+                for index in range(breadth):
+                    childDirectories.append(os.path.join(directory, 'dir{}_{}'.format(level, index)))
+            directories = childDirectories
+
+        for directory in directories:
+            os.makedirs(directory, exist_ok=True)
+
+            for index in range(filesPerDirectory):
+                open(os.path.join(directory, 'file{}.txt'.format(index)), 'w').close()
+
+        return treeDirectory
+
+    @classmethod
+    def sequenceDirectory(cls, totalFrames=10000):
+        """
+        Return a directory containing an exr named sequence (empty files).
+        """
+        sequenceDirectory = os.path.join(cls.fixturesDirectory(), 'sequence_{}'.format(totalFrames))
+        if os.path.exists(sequenceDirectory):
+            return sequenceDirectory
+
+        os.makedirs(sequenceDirectory)
+        for frame in range(1, totalFrames + 1):
+            open(os.path.join(sequenceDirectory, 'RND-TST-SHT_lighting_beauty_sr.{:04d}.exr'.format(frame)), 'w').close()
+
+        return sequenceDirectory
+
+    @classmethod
+    def nestedConfigFilePath(cls, depth=4, breadth=4):
+        """
+        Return the file path of a large configuration containing nested tasks.
+        """
+        configFilePath = os.path.join(cls.fixturesDirectory(), 'config_{}_{}.json'.format(depth, breadth))
+        if os.path.exists(configFilePath):
+            return configFilePath
+
+        def nestedTasks(level):
+            if level == depth:
+                return []
+
+            return [
+                {
+                    'run': 'modifyOutput',
+                    'target': '!kt (tmp)/level{}/{{name}}_{}.(pad {{frame}} 4).{{ext}}'.format(level, index),
+                    'options': {
+                        'assignVars': {
+                            'level{}'.format(level): '!kt (upper {name})_(pad {frame} 6)'
+                        }
+                    },
+                    'metadata': {
+                        'match.types': [
+                            'exr'
+                        ],
+                        'match.vars': {
+                            'imageType': [
+                                'sequence'
+                            ]
+                        }
+                    },
+                    'tasks': nestedTasks(level + 1)
+                } for index in range(breadth)
+            ]
+
+        with open(configFilePath, 'w') as f:
+            json.dump(
+                {
+                    'vars': {
+                        'benchmarkVar': 'benchmark'
+                    },
+                    'tasks': nestedTasks(0)
+                },
+                f,
+                indent=2
+            )
+
+        return configFilePath
+
+    @classmethod
+    def names(cls):
+        """
+        Return a list of the benchmark method names provided by the class.
+        """
+        return sorted(filter(lambda x: x.startswith('bench') and callable(getattr(cls, x)), dir(cls)))
+
+    def run(self, benchmarkNames=None):
+        """
+        Run the benchmarks returning a dictionary with the timings (in seconds) about each of them.
+        """
+        result = {}
+        self.setUp()
+        try:
+            for benchmarkName in benchmarkNames or self.names():
+                benchmarkMethod = getattr(self, benchmarkName)
+
+                timings = []
+                for _ in range(self.repeat):
+                    startTime = time.perf_counter()
+                    benchmarkMethod()
+                    timings.append(time.perf_counter() - startTime)
+
+                result['{}.{}'.format(self.__class__.__name__, benchmarkName)] = {
+                    'min': min(timings),
+                    'median': statistics.median(timings),
+                    'max': max(timings)
+                }
+        finally:
+            self.tearDown()
+
+        return result
@@ -0,0 +1,62 @@
+import os
+from .BaseBenchmark import BaseBenchmark
+from kombi.Element import Element
+from kombi.Element.Fs import FsElement
+
+class ElementBenchmark(BaseBenchmark):
+    """Benchmarks for the element creation, listing and serialization."""
+
+    __totalElements = 2000
+
+    def setUp(self):
+        """
+        Prepare the elements used by the benchmarks.
+        """
+        self.__sequenceDirectory = self.sequenceDirectory()
+        self.__treeDirectory = self.deepTreeDirectory()
+        self.__filePaths = [
+            os.path.join(self.__sequenceDirectory, fileName)
+            for fileName in sorted(os.listdir(self.__sequenceDirectory))[:self.__totalElements]
+        ]
+        self.__elements = list(map(FsElement.createFromPath, self.__filePaths))
+        self.__jsonContents = [element.toJson() for element in self.__elements]
+
+    def benchCreate(self):
+        """
+        Element.create for the files of a sequence.
+        """
+        for filePath in self.__filePaths:
+            FsElement.createFromPath(filePath)
+
+    def benchDirectoryComputeChildren(self):
+        """
+        DirectoryElement._computeChildren for a directory containing a 10k frames sequence.
+        """
+        FsElement.createFromPath(self.__sequenceDirectory)._computeChildren()
+
+    def benchGlob(self):
+        """
+        Element.glob over a deep directory tree.
+        """
+        FsElement.createFromPath(self.__treeDirectory).glob(useCache=False)
+
+    def benchClone(self):
+        """
+        Element.clone.
+        """
+        for element in self.__elements:
+            element.clone()
+
+    def benchToJson(self):
+        """
+        Element.toJson.
+        """
+        for element in self.__elements:
+            element.toJson()
+
+    def benchCreateFromJson(self):
+        """
+        Element.createFromJson.
+        """
+        for jsonContents in self.__jsonContents:
+            Element.createFromJson(jsonContents)
@@ -0,0 +1,75 @@
+import os
+from .BaseBenchmark import BaseBenchmark
+from kombi.Task import Task
+from kombi.TaskWrapper import TaskWrapper
+from kombi.Element.Matcher import Matcher
+from kombi.Element.Fs import FsElement
+from kombi.TaskHolder.Loader import JsonLoader, CompiledConfigCache
+
+class TaskHolderBenchmark(BaseBenchmark):
+    """Benchmarks for the configuration loading, matching and execution of task holders."""
+
+    __totalElements = 2000
+    __totalRunElements = 10
+
+    def setUp(self):
+        """
+        Prepare the configuration and elements used by the benchmarks.
+        """
+        self.__configFilePath = self.nestedConfigFilePath()
+        self.__previousConfigCacheDirectory = CompiledConfigCache.directory()
+        CompiledConfigCache.setDirectory('')
+
+        sequenceDirectory = self.sequenceDirectory()
+        self.__elements = [
+            FsElement.createFromPath(os.path.join(sequenceDirectory, fileName))
+            for fileName in sorted(os.listdir(sequenceDirectory))
+        ]
+        self.__matcher = Matcher(['exr'], {'imageType': ['sequence']})
+
+        loader = JsonLoader()
+        loader.loadFromFile(self.__configFilePath)
+        self.__taskHolder = loader.taskHolders()[0]
+
+        self.__task = Task.create('modifyOutput')
+        self.__task.setOption('assignVars', {'benchmark': '!kt (upper {name})'})
+        for element in self.__elements[:self.__totalElements]:
+            self.__task.add(element)
+
+    def tearDown(self):
+        """
+        Restore the config cache.
+        """
+        CompiledConfigCache.setDirectory(self.__previousConfigCacheDirectory)
+
+    def benchLoadConfig(self):
+        """
+        Loading a large nested configuration (without the config cache).
+        """
+        CompiledConfigCache.clear()
+        JsonLoader().loadFromFile(self.__configFilePath)
+
+    def benchMatcherMatch(self):
+        """
+        Matcher.match over the elements of a 10k frames sequence.
+        """
+        for element in self.__elements:
+            self.__matcher.match(element)
+
+    def benchQuery(self):
+        """
+        TaskHolder.query.
+        """
+        self.__taskHolder.query(self.__elements[:self.__totalElements])
+
+    def benchRun(self):
+        """
+        TaskHolder.run over nested task holders.
+        """
+        self.__taskHolder.run(self.__elements[:self.__totalRunElements])
+
+    def benchSubprocessRoundTrip(self):
+        """
+        SubprocessTaskWrapper round-trip (serialization, execution and deserialization).
+        """
+        TaskWrapper.create('python').run(self.__task)
@@ -0,0 +1,37 @@
+from .BaseBenchmark import BaseBenchmark
+from kombi.Template import Template
+from kombi.Element.VarExtractor import VarExtractor
+
+class TemplateBenchmark(BaseBenchmark):
+    """Benchmarks for the template resolution and variable extraction."""
+
+    __iterations = 2000
+
+    def setUp(self):
+        """
+        Prepare the templates used by the benchmarks.
+        """
+        self.__template = Template('!kt {prefix}/(pad {frame} 4)/(upper {name})_(pad ({frame} + 1000) 6).{ext}')
+        self.__templateVars = {
+            'prefix': '/tmp/benchmark',
+            'frame': 1001,
+            'name': 'plate',
+            'ext': 'exr'
+        }
+
+    def benchValue(self):
+        """
+        Template.value containing procedures and arithmetic operations.
+        """
+        for _ in range(self.__iterations):
+            self.__template.value(self.__templateVars)
+
+    def benchVarExtractor(self):
+        """
+        VarExtractor matching a file name.
+        """
+        for frame in range(self.__iterations):
+            VarExtractor(
+                'PRO_ABC_D-E-F_FOO_V0001.{:04d}.exr'.format(frame),
+                '{job:3}_{seq:3}_*_{plateName}_V{version:4i}.####.{ext}'
+            ).match()
@@ -0,0 +1,4 @@
+from .BaseBenchmark import BaseBenchmark
+from .ElementBenchmark import ElementBenchmark
+from .TemplateBenchmark import TemplateBenchmark
+from .TaskHolderBenchmark import TaskHolderBenchmark
@@ -0,0 +1,133 @@
+import os
+import sys
+import json
+import platform
+import argparse
+from fnmatch import fnmatch
+from . import BaseBenchmark
+
+# baseline numbers used to detect regressions (specific to the machine
+# where they have been recorded, see --save-baseline)
+defaultBaselineFilePath = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'baseline.json')
+defaultThreshold = float(os.environ.get('KOMBI_BENCHMARK_THRESHOLD', 0.25))
+
+def main():
+    """
+    Run the benchmarks comparing the results against the baseline.
+
+    Return 1 when any benchmark is slower than the baseline by more than the threshold.
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description='Runs the kombi benchmarks'
+    )
+
+    parser.add_argument(
+        'patterns',
+        nargs='*',
+        default=['*'],
+        help='glob patterns used to filter the benchmarks (ClassName.benchName)'
+    )
+
+    parser.add_argument(
+        '--baseline',
+        default=defaultBaselineFilePath,
+        help='json file containing the baseline numbers'
+    )
+
+    parser.add_argument(
+        '--save-baseline',
+        action='store_true',
+        help='write the results as the new baseline'
+    )
+
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=defaultThreshold,
+        help='relative slowdown (compared to the baseline median) reported as regression'
+    )
+
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=BaseBenchmark.repeat,
+        help='number of times each benchmark is executed'
+    )
+
+    args = parser.parse_args()
+
+    # making kombi available to the subprocesses launched by the task wrappers
+    os.environ['PYTHONPATH'] = os.pathsep.join(
+        filter(None, [BaseBenchmark.sourcePath(), os.environ.get('PYTHONPATH', '')])
+    )
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)['benchmarks']
+
+    results = {}
+    regressions = []
+    for benchmarkClass in BaseBenchmark.__subclasses__():
+        benchmarkNames = list(filter(
+            lambda x: any(fnmatch('{}.{}'.format(benchmarkClass.__name__, x), pattern) for pattern in args.patterns),
+            benchmarkClass.names()
+        ))
+        if not benchmarkNames:
+            continue
+
+        benchmark = benchmarkClass()
+        benchmark.repeat = args.repeat
+        for name, timings in benchmark.run(benchmarkNames).items():
+            results[name] = timings
+
+            status = ''
+            baselineMedian = baseline.get(name, {}).get('median')
+            if baselineMedian:
+                change = (timings['median'] - baselineMedian) / baselineMedian
+                status = '{:+.1f}%'.format(change * 100)
+                if change > args.threshold:
+                    status += ' REGRESSION'
+                    regressions.append(name)
+
+            sys.stdout.write(
+                '{:<55}{:>12.2f} ms{:>12} {}\n'.format(
+                    name,
+                    timings['median'] * 1000,
+                    '{:.2f} ms'.format(baselineMedian * 1000) if baselineMedian else '-',
+                    status
+                )
+            )
+            sys.stdout.flush()
+
+    if args.save_baseline:
+        baseline.update(results)
+        with open(args.baseline, 'w') as f:
+            json.dump(
+                {
+                    'machine': {
+                        'platform': platform.platform(),
+                        'processor': platform.processor() or platform.machine(),
+                        'python': platform.python_version(),
+                        'cpuCount': os.cpu_count()
+                    },
+                    'benchmarks': baseline
+                },
+                f,
+                indent=4,
+                sort_keys=True
+            )
+        sys.stdout.write('Baseline has been saved to: {}\n'.format(args.baseline))
+
+    if regressions:
+        sys.stderr.write(
+            'Regressions above {:.0f}% of the baseline: {}\n'.format(args.threshold * 100, ', '.join(regressions))
+        )
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
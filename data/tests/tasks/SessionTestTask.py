@@ -0,0 +1,28 @@
+import os
+import sys
+from kombi.Task import Task
+
+class SessionTestTask(Task):
+    """
+    Dummy task for testing subprocess sessions.
+    """
+
+    def _perform(self):
+        if self.option('fail'):
+            raise Exception('Session test task failure')
+
+        result = []
+        for index, element in enumerate(self.elements()):
+            sys.stdout.write("ALF_PROGRESS {}%\n".format(int((index + 1) * 100.0 / len(self.elements()))))
+            sys.stdout.flush()
+
+            element.setVar("sessionPid", os.getpid())
+            result.append(element.clone())
+
+        return result
+
+
+Task.register(
+    'sessionTestTask',
+    SessionTestTask
+)
@@ -0,0 +1,43 @@
+import os
+import threading
+
+class CacheFile(object):
+    """
+    Helpers shared by the caches that are stored in files.
+
+    Usage:
+        fileStat = CacheFile.stat(filePath)  # changes when the file gets modified
+        CacheFile.atomicWrite(cacheFilePath, contents)
+    """
+
+    @staticmethod
+    def stat(filePath):
+        """
+        Return a tuple used to detect when the file gets modified (None when the file does not exist).
+        """
+        try:
+            stat = os.stat(filePath)
+        except OSError:
+            return None
+
+        return (stat.st_mtime_ns, stat.st_size)
+
+    @staticmethod
+    def atomicWrite(filePath, contents):
+        """
+        Write the contents through a temporary file that is renamed to the file path.
+
+        Concurrent processes (and threads) may be writing the same file, the
+        readers never see a partially written file.
+        """
+        temporaryFilePath = '{}.{}_{}'.format(filePath, os.getpid(), threading.get_ident())
+        os.makedirs(os.path.dirname(filePath), exist_ok=True)
+        try:
+            with open(temporaryFilePath, 'w') as f:
+                f.write(contents)
+
+            os.replace(temporaryFilePath, filePath)
+        except OSError:
+            if os.path.exists(temporaryFilePath):
+                os.remove(temporaryFilePath)
+            raise
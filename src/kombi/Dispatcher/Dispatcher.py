@@ -4,6 +4,7 @@ import getpass
 from datetime import datetime
 from ..TaskHolder import TaskHolder
 from ..Task import Task
+from ..Tracer import Tracer
 from ..KombiError import KombiError
 
 class DispatcherError(KombiError):
@@ -138,19 +139,30 @@ class Dispatcher(object):
 
         assert isinstance(taskHolder, TaskHolder), "Invalid task holder type!"
 
-        clonedTaskHolder = taskHolder.clone()
+        with Tracer.span('dispatcher.dispatch', dispatcherType=self.type(), elements=len(elements)):
+            clonedTaskHolder = taskHolder.clone()
 
-        # setting the verbose output to the tasks in place
-        self.__setReporter(clonedTaskHolder)
+            # setting the verbose output to the tasks in place
+            self.__setReporter(clonedTaskHolder)
 
-        clonedTaskHolder.addElements(elements)
+            clonedTaskHolder.addElements(elements)
 
-        # in case the task does not have any elements means there is nothing
-        # to be executed, returning right away.
-        if len(clonedTaskHolder.task().elements()) == 0:
-            return []
+            # in case the task does not have any elements means there is nothing
+            # to be executed, returning right away.
+            if len(clonedTaskHolder.task().elements()) == 0:
+                return []
 
-        return self._perform(clonedTaskHolder)
+            # propagating the tracing to the processes launched by the dispatcher,
+            # the env option is restored once the dispatch is done
+            env = self.option('env')
+            if Tracer.isEnabled():
+                self.setOption('env', dict(env, **Tracer.env()))
+
+            try:
+                with Tracer.span('dispatcher.perform', dispatcherType=self.type()):
+                    return self._perform(clonedTaskHolder)
+            finally:
+                self.setOption('env', env)
 
     def toJson(self):
         """
@@ -2,6 +2,7 @@ import os
 import subprocess
 import getpass
 import tempfile
+from collections import OrderedDict
 from ..Dispatcher import DispatcherError
 from .RenderfarmDispatcher import RenderfarmDispatcher
 from .Job import Job, CollapsedJob, ExpandedJob
@@ -33,6 +34,8 @@ class DeadlineDispatcher(RenderfarmDispatcher):
             }
         )
         ```
+        - The jobs that don't depend on each other (for instance the chunks of a task) are
+        submitted at once through a single deadlinecommand call (SubmitMultipleJobs).
 
     Optional options: pool, secondaryPool, group and jobFailRetryAttempts
     """
@@ -108,18 +111,9 @@ class DeadlineDispatcher(RenderfarmDispatcher):
         as dependency of the collapsed job itself. Also, you may need to mark
         the collapsed job as pending status again.
         """
-        # getting the current job ids
-        currentJobIds = self.__executeDeadlineCommand(
-            "{} GetJobSetting {} JobDependencies".format(self.__deadlineCommandExecutable, jobId)
-        )
-
-        currentJobIds = currentJobIds.split(",") if len(currentJobIds) else []
-
-        # appending with the new dependency ids
-        currentJobIds += dependencyIds
-
-        # updating the job dependency ids
-        currentJobIds = self.__executeDeadlineCommand(
+        # updating the job dependency ids (the current dependencies of the
+        # collapsed job are already completed at this point, so they are replaced)
+        self.__executeDeadlineCommand(
             "{} SetJobSetting {} JobDependencies {}".format(
                 self.__deadlineCommandExecutable,
                 jobId,
@@ -143,7 +137,7 @@ class DeadlineDispatcher(RenderfarmDispatcher):
                     self.__deadlineCommandExecutable,
                     jobId
                 )
-            )
+            ).strip()
 
             for dependencyId in dependencyIds:
                 self.__executeDeadlineCommand(
@@ -160,6 +154,68 @@ class DeadlineDispatcher(RenderfarmDispatcher):
 
         Should return the job id created during the dispatching.
         """
+        return self._executeBatchOnTheFarm([renderfarmJob], [jobDataFilePath])[0]
+
+    def _executeBatchOnTheFarm(self, renderfarmJobs, jobDataFilePaths):
+        """
+        Dispatch a list of jobs that don't depend on each other to the farm.
+
+        All the jobs are submitted through a single deadlinecommand call
+        (SubmitMultipleJobs), where the job ids returned by deadline follow
+        the order of the submitted jobs.
+        """
+        if not renderfarmJobs:
+            return []
+
+        args = [
+            "-SubmitMultipleJobs"
+        ]
+        for renderfarmJob, jobDataFilePath in zip(renderfarmJobs, jobDataFilePaths):
+            jobInfo, pluginInfo = self.__jobInfo(renderfarmJob, jobDataFilePath)
+
+            args += [
+                "-job",
+                self.__serializeDeadlineInfo(jobInfo, renderfarmJob.jobDirectory(), "deadline_jobInfo_"),
+                self.__serializeDeadlineInfo(pluginInfo, renderfarmJob.jobDirectory(), "deadline_pluginInfo_")
+            ]
+
+        output = self.__executeDeadlineCommand(
+            ' '.join([
+                self.__deadlineCommandExecutable,
+                self.__serializeDeadlineArgs(args, renderfarmJobs[0].jobDirectory())
+            ]),
+        )
+
+        jobIdPrefix = "JobID="
+        jobIds = list(map(
+            lambda x: x.strip()[len(jobIdPrefix):],
+            filter(lambda x: x.strip().startswith(jobIdPrefix), output.split("\n"))
+        ))
+
+        # it should contain a job id for each of the submitted jobs
+        if len(jobIds) != len(renderfarmJobs):
+            raise DeadlineDispatcherCommandError(output)
+
+        return jobIds
+
+    @classmethod
+    def deadlineCommandExecutable(cls):
+        """
+        Return the deadlinecommand executable (KOMBI_DEADLINECOMMAND_EXECUTABLE).
+        """
+        return cls.__deadlineCommandExecutable
+
+    @classmethod
+    def setDeadlineCommandExecutable(cls, deadlineCommandExecutable):
+        """
+        Set the deadlinecommand executable.
+        """
+        cls.__deadlineCommandExecutable = deadlineCommandExecutable
+
+    def __jobInfo(self, renderfarmJob, jobDataFilePath):
+        """
+        Return a tuple containing the job info and the plugin info used to submit the job to deadline.
+        """
         assert isinstance(renderfarmJob, Job), \
             "Invalid RenderFarmJob type!"
 
@@ -179,26 +235,26 @@ class DeadlineDispatcher(RenderfarmDispatcher):
         if self.option('chunkifyOnTheFarm') and isinstance(renderfarmJob, ExpandedJob) and renderfarmJob.chunkSize():
             command += " --range-start <STARTFRAME> --range-end <ENDFRAME>"
 
-        args = self.__defaultJobArgs(
-            task,
-            command,
-            jobDataFilePath
-        )
+        jobInfo = self.__defaultJobInfo(task)
+        pluginInfo = OrderedDict([
+            (
+                "Executable",
+                self.option('env').get(
+                    'KOMBI_PYTHON_EXECUTABLE',
+                    'python'
+                )
+            ),
+            ("Arguments", command)
+        ])
 
         # collapsed job
         if isinstance(renderfarmJob, CollapsedJob):
             # adding the job name
-            args += [
-                "-name",
-                "Pending {}".format(task.type())
-            ]
+            jobInfo["Name"] = "Pending {}".format(task.type())
 
             # since pending jobs are intermediated jobs, we mark them to be deleted asap
             # they are completed
-            args += [
-                "-prop",
-                "OnJobComplete=Delete"
-            ]
+            jobInfo["OnJobComplete"] = "Delete"
 
         # expanded job type
         else:
@@ -209,12 +265,8 @@ class DeadlineDispatcher(RenderfarmDispatcher):
             taskLabel = task.type()
 
             if self.option('chunkifyOnTheFarm') and renderfarmJob.chunkSize():
-                args += [
-                    "-prop",
-                    "Frames=0-{}".format(renderfarmJob.totalInChunk() - 1),
-                    "-prop",
-                    "ChunkSize={}".format(renderfarmJob.chunkSize())
-                ]
+                jobInfo["Frames"] = "0-{}".format(renderfarmJob.totalInChunk() - 1)
+                jobInfo["ChunkSize"] = renderfarmJob.chunkSize()
             else:
                 taskLabel += ' ({}/{}): '.format(
                     str(currentChunk + 1).zfill(3),
@@ -226,10 +278,7 @@ class DeadlineDispatcher(RenderfarmDispatcher):
                 task.elements()[0].tag('label')
             )
 
-            args += [
-                "-name",
-                task.metadata('label') if task.hasMetadata('label') else taskLabel
-            ]
+            jobInfo["Name"] = task.metadata('label') if task.hasMetadata('label') else taskLabel
 
             # adding additional props
             hasOutputDirectory = False
@@ -237,100 +286,63 @@ class DeadlineDispatcher(RenderfarmDispatcher):
                 if keyProp.startswith('OutputDirectory'):
                     hasOutputDirectory = True
 
-                args += [
-                    "-prop",
-                    "{}={}".format(keyProp, valueProp)
-                ]
+                jobInfo[keyProp] = valueProp
 
             # output directories
             if not hasOutputDirectory:
                 outputDirectories = list(filter(lambda x: bool(x), set(map(lambda x: os.path.dirname(task.target(x)), task.elements()))))
                 for index, outputDirectory in enumerate(outputDirectories):
-                    args += [
-                        "-prop",
-                        "OutputDirectory{}={}".format(index, outputDirectory)
-                    ]
+                    jobInfo["OutputDirectory{}".format(index)] = outputDirectory
 
         if dependencyIds:
-            args += [
-                "-prop",
-                "JobDependencies=" + ",".join(dependencyIds)
-            ]
-
-        output = self.__executeDeadlineCommand(
-            ' '.join([
-                self.__deadlineCommandExecutable,
-                self.__serializeDeadlineArgs(args, renderfarmJob.jobDirectory())
-            ]),
-        )
+            jobInfo["JobDependencies"] = ",".join(dependencyIds)
 
-        jobIdPrefix = "JobID="
-        jobId = list(filter(lambda x: x.startswith(jobIdPrefix), output.split("\n")))
+        return jobInfo, pluginInfo
 
-        if jobId:
-            # it should contain just a single job id
-            return jobId[0][len(jobIdPrefix):]
-        else:
-            raise DeadlineDispatcherCommandError(output)
-
-    def __defaultJobArgs(self, task, command, jobDataFilePath):
+    def __defaultJobInfo(self, task):
         """
-        Return a list containing the default job args that later are passed to deadlinecommand.
+        Return a dictionary containing the default job info that later is passed to deadlinecommand.
         """
-        pythonExec = self.option('env').get(
-            'KOMBI_PYTHON_EXECUTABLE',
-            'python'
-        )
         kombiUser = self.option('env').get('KOMBI_USER', getpass.getuser())
 
-        args = [
-            "-SubmitCommandLineJob",
-            "-executable",
-            pythonExec,
-            "-arguments",
-            command,
-            "-priority",
-            '{}'.format(
-                self.option(
-                    'priority',
-                    task
-                )
-            ),
-            "-prop",
-            "OverrideJobFailureDetection=true",
-            "-prop",
-            "FailureDetectionJobErrors={}".format(self.option('jobFailRetryAttempts', task) + 1),
-            "-prop",
-            "IncludeEnvironment={}".format(str(self.option('includeEnvironment')).lower()),
-            "-prop",
-            "BatchName={}".format(self.option('label')),
-            "-prop",
-            "UserName={}".format(kombiUser)
-        ]
+        jobInfo = OrderedDict([
+            ("Plugin", "CommandLine"),
+            ("Frames", "0"),
+            ("Priority", self.option('priority', task)),
+            ("OverrideJobFailureDetection", "true"),
+            ("FailureDetectionJobErrors", self.option('jobFailRetryAttempts', task) + 1),
+            ("IncludeEnvironment", str(self.option('includeEnvironment')).lower()),
+            ("BatchName", self.option('label')),
+            ("UserName", kombiUser)
+        ])
 
         # adding optional props
         for optionName in ('group', 'pool', 'secondaryPool'):
             if self.option(optionName, task):
-                args += [
-                    "-prop",
-                    "{}={}".format(
-                        optionName.capitalize(),
-                        self.option(
-                            optionName,
-                            task
-                        )
-                    )
-                ]
+                jobInfo[optionName.capitalize()] = self.option(
+                    optionName,
+                    task
+                )
 
-        return args
+        return jobInfo
+
+    def __serializeDeadlineInfo(self, info, directory, prefix):
+        """
+        Return a file path about the serialized info (key=value per line).
+        """
+        return self.__serializeDeadlineArgs(
+            map(lambda x: '{}={}'.format(*x), info.items()),
+            directory,
+            prefix
+        )
 
-    def __serializeDeadlineArgs(self, args, directory):
+    def __serializeDeadlineArgs(self, args, directory, prefix="deadline_"):
         """
         Return a file path about the serialized args.
         """
         temporaryFile = tempfile.NamedTemporaryFile(
             mode='w',
-            prefix=os.path.join(directory, "deadline_"),
+            prefix=os.path.join(directory, prefix),
             suffix='.txt',
             delete=False
         )
@@ -6,12 +6,18 @@ from datetime import datetime
 from collections import OrderedDict
 from ..Dispatcher import Dispatcher
 from .Job import Job, ExpandedJob, CollapsedJob
+from .SplitPolicy import SplitPolicy
+from .SharedJobData import SharedJobData
 
 class RenderfarmDispatcher(Dispatcher):
     """
     Abstracted implementation for a renderfarm dispatcher.
 
-    Optional options: label, jobTempDir, splitSize, priority, chunkifyOnTheFarm and expandOnTheFarm
+    Optional options: label, jobTempDir, splitSize, priority, chunkifyOnTheFarm, expandOnTheFarm,
+    adaptiveSplit, chunkDuration (seconds) and maxJobs (see SplitPolicy)
+
+    The adaptive split is disabled by default (KOMBI_DISPATCHER_RENDERFARM_ADAPTIVESPLIT),
+    when enabled it only applies to the tasks that don't define dispatch.splitSize.
     """
 
     __defaultJobTempDir = os.environ.get('KOMBI_TEMP_REMOTE_DIR', '')
@@ -20,6 +26,9 @@ class RenderfarmDispatcher(Dispatcher):
     __defaultChunkifyOnTheFarm = False
     __defaultPriority = int(os.environ.get('KOMBI_DISPATCHER_RENDERFARM_PRIORITY', 50))
     __defaultSplitSize = int(os.environ.get('KOMBI_DISPATCHER_RENDERFARM_SPLITSIZE', 10))
+    __defaultAdaptiveSplit = os.environ.get('KOMBI_DISPATCHER_RENDERFARM_ADAPTIVESPLIT', '0') == '1'
+    __defaultChunkDuration = float(os.environ.get('KOMBI_DISPATCHER_RENDERFARM_CHUNKDURATION', 300))
+    __defaultMaxJobs = int(os.environ.get('KOMBI_DISPATCHER_RENDERFARM_MAXJOBS', 100))
 
     def __init__(self, *args, **kwargs):
         """
@@ -27,8 +36,6 @@ class RenderfarmDispatcher(Dispatcher):
         """
         super(RenderfarmDispatcher, self).__init__(*args, **kwargs)
 
-        assert len(self.__defaultJobTempDir), "KOMBI_TEMP_REMOTE_DIR env is not defined!"
-
         # setting default options
         self.setOption('label', self.__defaultLabel)
         self.setOption('jobTempDir', self.__defaultJobTempDir)
@@ -36,6 +43,9 @@ class RenderfarmDispatcher(Dispatcher):
         self.setOption('priority', self.__defaultPriority)
         self.setOption('expandOnTheFarm', self.__defaultExpandOnTheFarm)
         self.setOption('chunkifyOnTheFarm', self.__defaultChunkifyOnTheFarm)
+        self.setOption('adaptiveSplit', self.__defaultAdaptiveSplit)
+        self.setOption('chunkDuration', self.__defaultChunkDuration)
+        self.setOption('maxJobs', self.__defaultMaxJobs)
         self.setOption('dispatchedMessage', 'Execution submitted to the farm!')
 
     def extendDependencyIds(self, jobId, dependencyIds, task=None):
@@ -115,30 +125,43 @@ class RenderfarmDispatcher(Dispatcher):
         """
         raise NotImplementedError
 
-    def __generateJobData(self, renderfarmJob):
+    def _executeBatchOnTheFarm(self, renderfarmJobs, jobDataFilePaths):
+        """
+        Dispatch a list of jobs that don't depend on each other to the farm.
+
+        Return a list containing the job ids (in the same order of the input jobs). By
+        default each job is dispatched through _executeOnTheFarm, re-implement it when
+        the renderfarm manager can submit multiple jobs at once.
+        """
+        return list(map(self._executeOnTheFarm, renderfarmJobs, jobDataFilePaths))
+
+    def __generateJobData(self, renderfarmJob, sharedJobDataFilePath=None):
         """
         Generate a file used to execute the task holder on the farm.
+
+        When the shared job data is specified (expanded jobs) the job data
+        only carries the elements of the job.
         """
         assert isinstance(renderfarmJob, Job), \
             "Invalid Job type!"
 
-        # in case the option "expandOnTheFarm" is enabled we need to disable that
-        # otherwise, the job is going to keep re-spawning on the farm indefinitely.
-        renderFarmDispatcher = self
-        if renderFarmDispatcher.option('expandOnTheFarm'):
-            renderFarmDispatcher = renderFarmDispatcher.createFromJson(
-                renderFarmDispatcher.toJson()
-            )
-
-            renderFarmDispatcher.setOption(
-                'expandOnTheFarm',
-                False
-            )
-
-        data = {
-            'dispatcher': renderFarmDispatcher.toJson(),
-            'taskHolder': renderfarmJob.taskHolder().toJson()
-        }
+        if sharedJobDataFilePath:
+            task = renderfarmJob.taskHolder().task()
+            data = {
+                'sharedJobDataFilePath': sharedJobDataFilePath,
+                'elementData': list(map(
+                    lambda x: {
+                        'filePath': task.target(x),
+                        'serializedElement': x.toJson()
+                    },
+                    task.elements()
+                ))
+            }
+        else:
+            data = {
+                'dispatcher': self.__jobDispatcherJson(),
+                'taskHolder': renderfarmJob.taskHolder().toJson()
+            }
 
         # collapsed job
         if isinstance(renderfarmJob, CollapsedJob):
@@ -157,6 +180,11 @@ class RenderfarmDispatcher(Dispatcher):
             data['jobType'] = 'expanded'
             data['taskResultFilePath'] = renderfarmJob.taskResultFilePath()
 
+            # the expanded job records its timing used by the adaptive split
+            task = renderfarmJob.taskHolder().task()
+            if self.option('adaptiveSplit', task):
+                data['splitHistoryFilePath'] = self.__splitHistoryFilePath(renderfarmJob.taskHolder())
+
         jobDataFilePath = os.path.join(
             renderfarmJob.jobDirectory(),
             "jobData_{}.json".format(
@@ -168,8 +196,7 @@ class RenderfarmDispatcher(Dispatcher):
         with open(jobDataFilePath, 'w') as outputFile:
             json.dump(
                 data,
-                outputFile,
-                indent=4
+                outputFile
             )
 
         # we might need to open this file with a different
@@ -210,20 +237,49 @@ class RenderfarmDispatcher(Dispatcher):
             element.setTag('originalIndex', index)
             taskElements[element] = task.target(element)
 
+        # when the adaptive split is enabled the chunks are computed based on
+        # the timings recorded by the previous executions of the task holder (without
+        # history or when the task defines its own split size the static split size
+        # is used as it is)
+        splitCost = None
+        chunkDuration = 0
+        maxJobs = 0
+        if splitSize and self.option('adaptiveSplit', task) and not task.hasMetadata('dispatch.splitSize'):
+            splitCost = SplitPolicy.cost(self.__splitHistoryFilePath(clonedTaskHolder))
+            if splitCost is not None:
+                chunkDuration = self.option('chunkDuration', task)
+                maxJobs = self.option('maxJobs', task)
+
         # we can delegate the chunkfication to the render farm dispatcher
         # when chunkifyOnTheFarm is enabled. Otherwise, we chunkify
         # by splitting in sub jobs
         elements = list(taskElements.keys())
-        if self.option('chunkifyOnTheFarm') or splitSize == 0:
+        if splitSize == 0:
+            chunkfiedElements = [elements]
+        elif self.option('chunkifyOnTheFarm'):
             chunkfiedElements = [elements]
+            splitSize = SplitPolicy.chunkSize(elements, splitSize, splitCost, chunkDuration, maxJobs)
         else:
-            chunkfiedElements = self.__chunkify(elements, splitSize)
+            chunkfiedElements = SplitPolicy.chunkify(elements, splitSize, splitCost, chunkDuration, maxJobs)
+
+        # the data that is common to all the chunks is written only once
+        clonedTaskHolder.task().clear()
+        sharedJobDataFilePath = SharedJobData.write(
+            jobDirectory,
+            {
+                'dispatcher': self.__jobDispatcherJson(),
+                'taskHolder': clonedTaskHolder.toJson()
+            }
+        )
 
         # splitting in multiple tasks
+        jobDataFilePaths = []
         for index, chunkedElements in enumerate(chunkfiedElements):
 
-            # creating a renderfarm job
-            expandedJob = ExpandedJob(clonedTaskHolder, jobDirectory)
+            # creating a renderfarm job. Each job holds its own task holder, since
+            # the jobs are only sent to the farm after all of them have been created
+            chunkTaskHolder = clonedTaskHolder.clone(includeSubTaskHolders=False)
+            expandedJob = ExpandedJob(chunkTaskHolder, jobDirectory)
 
             # adding information about the chunks
             expandedJob.setChunkTotal(len(chunkfiedElements))
@@ -231,33 +287,36 @@ class RenderfarmDispatcher(Dispatcher):
             expandedJob.setTotalInChunk(len(chunkedElements))
             expandedJob.setChunkSize(splitSize)
 
-            task = clonedTaskHolder.task()
+            task = chunkTaskHolder.task()
 
             # adding elements to the task (since the task holder has been cloned
             # previously it's safe for us to change it)
-            task.clear()
             for chunkedElement in chunkedElements:
                 targetFilePath = taskElements[chunkedElement]
                 task.add(chunkedElement, targetFilePath)
 
-            jobDataFilePath = self.__generateJobData(
-                expandedJob
-            )
-
-            # sending to the farm
-            jobId = self._executeOnTheFarm(
-                expandedJob,
-                jobDataFilePath
+            jobDataFilePaths.append(
+                self.__generateJobData(
+                    expandedJob,
+                    sharedJobDataFilePath
+                )
             )
 
-            # setting the job id to the expanded job. This information may
-            # be used by sub tasks holders.
-            expandedJob.setJobId(jobId)
-
             result.append(
                 expandedJob
             )
 
+        # sending all the chunks to the farm at once (they don't depend on each other)
+        jobIds = self._executeBatchOnTheFarm(
+            result,
+            jobDataFilePaths
+        )
+
+        # setting the job id to the expanded jobs. This information may
+        # be used by sub tasks holders.
+        for expandedJob, jobId in zip(result, jobIds):
+            expandedJob.setJobId(jobId)
+
         return result
 
     def __dispatchSubTaskHolders(self, subTaskHolders, jobDirectory, renderfarmJobs):
@@ -267,6 +326,7 @@ class RenderfarmDispatcher(Dispatcher):
         The result is a list of collapsed job instances.
         """
         result = []
+        jobDataFilePaths = []
         awaitSubtaskHolders = []
 
         # processing first all sub task holders that can be executed in parallel
@@ -285,25 +345,29 @@ class RenderfarmDispatcher(Dispatcher):
                 collapsedJob.addExpandedJob(renderfarmJob)
                 collapsedJob.addDependencyId(renderfarmJob.jobId())
 
-            jobDataFilePath = self.__generateJobData(
-                collapsedJob
-            )
-
-            # sending to the farm
-            jobId = self._executeOnTheFarm(
-                collapsedJob,
-                jobDataFilePath
+            jobDataFilePaths.append(
+                self.__generateJobData(
+                    collapsedJob
+                )
             )
 
-            # setting the job id to the collapsed job
-            collapsedJob.setJobId(jobId)
+            result.append(collapsedJob)
 
-            self.__createJobIdFile(
-                jobDataFilePath,
-                jobId
+        # sending the parallel sub task holders to the farm at once
+        if result:
+            jobIds = self._executeBatchOnTheFarm(
+                result,
+                jobDataFilePaths
             )
 
-            result.append(collapsedJob)
+            # setting the job id to the collapsed jobs
+            for collapsedJob, jobDataFilePath, jobId in zip(result, jobDataFilePaths, jobIds):
+                collapsedJob.setJobId(jobId)
+
+                self.__createJobIdFile(
+                    jobDataFilePath,
+                    jobId
+                )
 
         # processing the awaiting sub-tasks holders. When a sub task holder is marked with
         # "await" means it is only going to be started after all the sub task holders are done,
@@ -355,13 +419,47 @@ class RenderfarmDispatcher(Dispatcher):
 
         return result
 
+    def __jobDispatcherJson(self):
+        """
+        Return the serialized dispatcher used to execute the jobs on the farm.
+        """
+        # in case the option "expandOnTheFarm" is enabled we need to disable that
+        # otherwise, the job is going to keep re-spawning on the farm indefinitely.
+        renderFarmDispatcher = self
+        if renderFarmDispatcher.option('expandOnTheFarm'):
+            renderFarmDispatcher = renderFarmDispatcher.createFromJson(
+                renderFarmDispatcher.toJson()
+            )
+
+            renderFarmDispatcher.setOption(
+                'expandOnTheFarm',
+                False
+            )
+
+        return renderFarmDispatcher.toJson()
+
+    def __splitHistoryFilePath(self, taskHolder):
+        """
+        Return the location of the file containing the timings about the task holder.
+
+        The timings are shared by the task holders of the same task type defined
+        by the same config.
+        """
+        return SplitPolicy.historyFilePath(
+            self.option('jobTempDir'),
+            taskHolder.task().type(),
+            taskHolder.var('contextConfig', '')
+        )
+
     def __createJobDirectory(self):
         """
         Create a temporary job directory used to store the job configuration.
         """
+        assert len(self.option('jobTempDir')), "KOMBI_TEMP_REMOTE_DIR env is not defined!"
+
         currentDate = datetime.now()
         baseRemoteTemporaryPath = os.path.join(
-            self.__defaultJobTempDir,
+            self.option('jobTempDir'),
             currentDate.strftime("%Y%m%d"),
             currentDate.strftime("%H"),
             os.environ.get("KOMBI_USER", getpass.getuser()),
@@ -400,27 +498,3 @@ class RenderfarmDispatcher(Dispatcher):
                 data,
                 jsonFile
             )
-
-    @classmethod
-    def __chunkify(cls, inputList, chunkSize):
-        """
-        Return an 2D array containing the input list divided by chunks.
-        """
-        result = []
-        if len(inputList) <= chunkSize:
-            result.append(inputList)
-            return result
-
-        # adding an extra chunk for the elements
-        # that don't fit completely in a full chunk
-        totalChunks = int(len(inputList) / chunkSize)
-        if len(inputList) % chunkSize:
-            totalChunks += 1
-
-        for chunk in range(totalChunks):
-            currentIndex = chunk * chunkSize
-            result.append(
-                inputList[currentIndex:currentIndex + chunkSize]
-            )
-
-        return result
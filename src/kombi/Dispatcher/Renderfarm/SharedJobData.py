@@ -0,0 +1,109 @@
+import os
+import json
+import hashlib
+import threading
+from ...CacheFile import CacheFile
+
+class SharedJobData(object):
+    """
+    Data shared by the expanded jobs of a dispatch (dispatcher, env and task holder).
+
+    The chunks of a task only differ by their elements. Therefore, the data that
+    is common to all of them is written once to the job directory (named by the
+    hash of its contents) and each job data only carries its elements. The shared
+    data is cached in memory and on the local disk of the worker, so the chunks
+    executed by the same worker read it from the shared temp directory only once.
+
+    The local cache location can be defined through KOMBI_JOB_DATA_CACHE_DIRECTORY
+    (an empty value disables it).
+    """
+
+    __cacheDirectory = os.environ.get(
+        'KOMBI_JOB_DATA_CACHE_DIRECTORY',
+        os.path.join(os.path.expanduser('~'), '.cache', 'kombi', 'jobData')
+    )
+    __memoryCache = {}
+    __lock = threading.Lock()
+
+    @classmethod
+    def write(cls, directory, contents):
+        """
+        Write the shared data to the directory returning its file path.
+
+        The file is only written when the same contents are not found there.
+        """
+        serializedContents = json.dumps(contents, sort_keys=True)
+        filePath = os.path.join(
+            directory,
+            'sharedJobData_{}.json'.format(
+                hashlib.sha256(serializedContents.encode('utf-8')).hexdigest()
+            )
+        )
+
+        if not os.path.exists(filePath):
+            CacheFile.atomicWrite(filePath, serializedContents)
+
+            # we might need to open this file with a different
+            # user (in case the task runs a different user)
+            os.chmod(filePath, 0o777)
+
+        return filePath
+
+    @classmethod
+    def load(cls, filePath):
+        """
+        Return the contents of the shared data.
+        """
+        fileName = os.path.basename(filePath)
+        with cls.__lock:
+            if fileName in cls.__memoryCache:
+                return cls.__memoryCache[fileName]
+
+        # since the file name is based on the hash of the contents the
+        # local copy never gets out of date
+        serializedContents = None
+        cacheFilePath = os.path.join(cls.__cacheDirectory, fileName) if cls.__cacheDirectory else ''
+        if cacheFilePath:
+            try:
+                with open(cacheFilePath) as f:
+                    serializedContents = f.read()
+            except OSError:
+                pass
+
+        if serializedContents is None:
+            with open(filePath) as f:
+                serializedContents = f.read()
+
+            if cacheFilePath:
+                try:
+                    CacheFile.atomicWrite(cacheFilePath, serializedContents)
+                except OSError:
+                    pass
+
+        contents = json.loads(serializedContents)
+        with cls.__lock:
+            cls.__memoryCache[fileName] = contents
+
+        return contents
+
+    @classmethod
+    def cacheDirectory(cls):
+        """
+        Return the directory used to cache the shared data on the local disk (empty string when disabled).
+        """
+        return cls.__cacheDirectory
+
+    @classmethod
+    def setCacheDirectory(cls, cacheDirectory):
+        """
+        Change the directory used to cache the shared data on the local disk (empty string disables it).
+        """
+        cls.__cacheDirectory = cacheDirectory
+
+    @classmethod
+    def clear(cls):
+        """
+        Clear the memory cache (the disk cache is kept).
+        """
+        with cls.__lock:
+            cls.__memoryCache.clear()
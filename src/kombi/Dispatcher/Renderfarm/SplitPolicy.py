@@ -0,0 +1,233 @@
+import os
+import json
+import math
+import hashlib
+from ...Element.Fs import FsElement
+
+class SplitPolicy(object):
+    """
+    Computes how the elements of a task are split in chunks on the farm.
+
+    The expanded jobs record the time spent to process their elements (per task
+    type and config) in a history file, which is used by the next dispatches to estimate the
+    cost of each element (weighted by the file size of the elements when it is
+    known). The elements are grouped in chunks that take about the target duration,
+    without going over the maximum number of jobs. When there is no history
+    about the task type the static split size is used instead.
+
+    The history files are compacted to the latest records once they go over
+    the maximum history file size.
+    """
+
+    __historySize = int(os.environ.get('KOMBI_DISPATCHER_RENDERFARM_SPLITHISTORY', 50))
+    __historyReadSize = 65536
+    __historyMaxFileSize = __historyReadSize * 4
+
+    @classmethod
+    def historyFilePath(cls, directory, taskType, configFilePath=''):
+        """
+        Return the location of the file containing the timings about the task type (defined by the config).
+        """
+        fileName = taskType
+        if configFilePath:
+            fileName = '{}_{}'.format(
+                taskType,
+                hashlib.sha256(str(configFilePath).encode('utf-8')).hexdigest()[:16]
+            )
+
+        return os.path.join(
+            directory,
+            'splitHistory',
+            '{}.jsonl'.format(fileName)
+        )
+
+    @classmethod
+    def record(cls, historyFilePath, totalElements, totalBytes, duration):
+        """
+        Append the timing about the execution of a chunk to the history file.
+
+        The history is an optimization, so failing to write it does not interrupt the job
+        (the same goes for the records that may get lost when concurrent jobs are
+        appending to the file while it's being compacted).
+        """
+        line = '{}\n'.format(
+            json.dumps({
+                'elements': totalElements,
+                'bytes': totalBytes,
+                'duration': duration
+            })
+        )
+
+        # the history is shared by the jobs of different users
+        originalUmask = os.umask(0)
+        try:
+            os.makedirs(os.path.dirname(historyFilePath), mode=0o777, exist_ok=True)
+            with open(historyFilePath, 'a') as f:
+                f.write(line)
+                historyFileSize = f.tell()
+
+            if historyFileSize > cls.__historyMaxFileSize:
+                cls.__compactHistory(historyFilePath)
+        except OSError:
+            pass
+        finally:
+            os.umask(originalUmask)
+
+    @classmethod
+    def cost(cls, historyFilePath):
+        """
+        Return a dictionary with the estimated cost in seconds (perElement and perByte) or None without history.
+
+        The perByte cost is None when the recorded chunks don't have any information about the bytes.
+        """
+        records = cls.__readHistory(historyFilePath)
+        totalElements = sum(map(lambda x: x['elements'], records))
+        if not totalElements:
+            return None
+
+        result = {
+            'perElement': sum(map(lambda x: x['duration'], records)) / totalElements,
+            'perByte': None
+        }
+
+        sizedRecords = list(filter(lambda x: x['bytes'], records))
+        if sizedRecords:
+            result['perByte'] = sum(map(lambda x: x['duration'], sizedRecords)) / sum(map(lambda x: x['bytes'], sizedRecords))
+
+        return result
+
+    @classmethod
+    def elementSize(cls, element):
+        """
+        Return the size in bytes of the element (None when it is not known).
+        """
+        if not isinstance(element, FsElement) or not FsElement.cachedPathQuery(element.path(), 'is_file'):
+            return None
+
+        try:
+            stat = FsElement.cachedPathQuery(element.path(), 'stat')
+        except OSError:
+            return None
+
+        return stat.st_size if stat.st_size else None
+
+    @classmethod
+    def chunkify(cls, elements, splitSize, cost=None, targetDuration=0, maxJobs=0):
+        """
+        Return a 2D list containing the elements divided in chunks.
+        """
+        if not elements:
+            return [elements]
+
+        if cost is None or targetDuration <= 0:
+            return cls.__chunkifyEvenly(
+                elements,
+                cls.chunkSize(elements, splitSize, maxJobs=maxJobs)
+            )
+
+        elementCosts = cls.__elementCosts(elements, cost)
+
+        # making sure the number of chunks does not go over the maximum number of jobs
+        totalCost = sum(elementCosts)
+        if maxJobs and totalCost / targetDuration > maxJobs:
+            targetDuration = totalCost / maxJobs
+
+        # a chunk is closed once it reaches the target duration, therefore
+        # the number of chunks is never greater than the maximum number of jobs
+        result = []
+        chunk = []
+        chunkCost = 0.0
+        for element, elementCost in zip(elements, elementCosts):
+            chunk.append(element)
+            chunkCost += elementCost
+
+            if chunkCost >= targetDuration:
+                result.append(chunk)
+                chunk = []
+                chunkCost = 0.0
+
+        if chunk:
+            result.append(chunk)
+
+        return result
+
+    @classmethod
+    def chunkSize(cls, elements, splitSize, cost=None, targetDuration=0, maxJobs=0):
+        """
+        Return a chunk size used to divide the elements evenly (used when the farm computes the chunks).
+        """
+        if cost is not None and targetDuration > 0 and elements:
+            averageCost = sum(cls.__elementCosts(elements, cost)) / len(elements)
+            if averageCost > 0:
+                splitSize = max(1, int(targetDuration / averageCost))
+
+        if maxJobs and splitSize and math.ceil(len(elements) / splitSize) > maxJobs:
+            splitSize = math.ceil(len(elements) / maxJobs)
+
+        return splitSize
+
+    @classmethod
+    def __elementCosts(cls, elements, cost):
+        """
+        Return a list containing the estimated cost of each element.
+        """
+        result = []
+        for element in elements:
+            elementSize = cls.elementSize(element) if cost['perByte'] is not None else None
+            if elementSize is None:
+                result.append(cost['perElement'])
+            else:
+                result.append(elementSize * cost['perByte'])
+
+        return result
+
+    @classmethod
+    def __readHistory(cls, historyFilePath):
+        """
+        Return a list with the latest records found in the history file.
+        """
+        try:
+            with open(historyFilePath, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                fileSize = f.tell()
+                f.seek(max(0, fileSize - cls.__historyReadSize))
+                contents = f.read().decode('utf-8', errors='replace')
+        except OSError:
+            return []
+
+        lines = contents.split('\n')
+
+        # the first line may have been cut by the seek
+        if fileSize > cls.__historyReadSize:
+            lines = lines[1:]
+
+        result = []
+        for line in filter(None, lines[-cls.__historySize - 1:]):
+            try:
+                result.append(json.loads(line))
+            except ValueError:
+                continue
+
+        return result[-cls.__historySize:]
+
+    @classmethod
+    def __compactHistory(cls, historyFilePath):
+        """
+        Rewrite the history file keeping only the latest records.
+        """
+        temporaryFilePath = '{}.{}'.format(historyFilePath, os.getpid())
+        with open(temporaryFilePath, 'w') as f:
+            for record in cls.__readHistory(historyFilePath):
+                f.write('{}\n'.format(json.dumps(record)))
+
+        os.replace(temporaryFilePath, historyFilePath)
+
+    @classmethod
+    def __chunkifyEvenly(cls, elements, chunkSize):
+        """
+        Return a 2D list containing the elements divided by chunks of the same size.
+        """
+        if not chunkSize or len(elements) <= chunkSize:
+            return [elements]
+
+        return [elements[index:index + chunkSize] for index in range(0, len(elements), chunkSize)]
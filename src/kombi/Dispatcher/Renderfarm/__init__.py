@@ -1,3 +1,5 @@
 from . import Job
+from .SplitPolicy import SplitPolicy
+from .SharedJobData import SharedJobData
 from .RenderfarmDispatcher import RenderfarmDispatcher
 from .DeadlineDispatcher import DeadlineDispatcher, DeadlineDispatcherCommandError
@@ -1,12 +1,19 @@
 import os
 import sys
 import json
+import time
 import argparse
 from glob import glob
-from collections import OrderedDict
+from itertools import islice
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from kombi.Element import Element
 from kombi.TaskHolder import TaskHolder
 from kombi.Dispatcher import Dispatcher
+from kombi.Dispatcher.Renderfarm import SplitPolicy, SharedJobData
+
+# number of input files (results of the expanded jobs) read in parallel by the collapsed jobs
+__loadThreads = max(1, int(os.environ.get('KOMBI_RENDERFARM_LOAD_THREADS', 8)))
 
 def __runCollapsed(data, taskHolder, dataJsonFile):
     """
@@ -68,26 +75,44 @@ def __runCollapsed(data, taskHolder, dataJsonFile):
         else:
             taskInputFilePaths = data['taskInputFilePaths']
 
-        # loading input elements
-        elements = []
-        for taskInputFilePath in taskInputFilePaths:
-            with open(taskInputFilePath) as jsonFile:
-                serializedElements = json.load(jsonFile)
-                elements += list(map(lambda x: Element.createFromJson(x), serializedElements))
-
         dispatcher = Dispatcher.createFromJson(data['dispatcher'])
 
         # in case of re-group tag we are going to split in multiple
         # dispatchers
         dispatchedIds = []
         if taskHolder.regroupTag():
-            elementGroups = Element.group(elements, taskHolder.regroupTag())
+            regroupTag = taskHolder.regroupTag()
             modifiedTaskHolder = taskHolder.clone()
 
             # since we don't want the task holder to split over again we
             # need to reset this information in the modified task holder
             modifiedTaskHolder.setRegroupTag('')
-            for elementGroup in elementGroups:
+
+            # the input elements are streamed. The elements without the re-group
+            # tag are dispatched as they are read, the other ones are kept
+            # serialized until all the inputs are read (a group can be spread
+            # among the input files). Therefore, only the elements of the group
+            # being dispatched are created at a time
+            groupedSerializedElements = OrderedDict()
+            for serializedElement in __streamSerializedElements(taskInputFilePaths):
+                tags = json.loads(serializedElement)['tags']
+                if regroupTag in tags:
+                    groupedSerializedElements.setdefault(tags[regroupTag], []).append(serializedElement)
+                    continue
+
+                dispatchedIds.extend(
+                    dispatcher.dispatch(
+                        modifiedTaskHolder.clone(),
+                        [Element.createFromJson(serializedElement)]
+                    )
+                )
+
+            for serializedElements in groupedSerializedElements.values():
+                elementGroup = Element.group(
+                    list(map(Element.createFromJson, serializedElements)),
+                    regroupTag
+                )[0]
+
                 dispatchedIds.extend(
                     dispatcher.dispatch(
                         modifiedTaskHolder.clone(),
@@ -99,7 +124,7 @@ def __runCollapsed(data, taskHolder, dataJsonFile):
             dispatchedIds.extend(
                 dispatcher.dispatch(
                     taskHolder,
-                    elements
+                    list(map(Element.createFromJson, __streamSerializedElements(taskInputFilePaths)))
                 )
             )
 
@@ -123,6 +148,32 @@ def __runCollapsed(data, taskHolder, dataJsonFile):
             os.remove(jobProcessedFilePath)
         raise err
 
+def __streamSerializedElements(taskInputFilePaths):
+    """
+    Yield the serialized elements found in the input files (in the order of the files).
+
+    The files are read in parallel by a bounded number of threads, so only
+    the files that are about to be consumed are kept in memory.
+    """
+    def loadFile(taskInputFilePath):
+        with open(taskInputFilePath) as jsonFile:
+            return json.load(jsonFile)
+
+    taskInputFilePaths = iter(taskInputFilePaths)
+    with ThreadPoolExecutor(max_workers=__loadThreads) as executor:
+        pendingLoads = deque(
+            executor.submit(loadFile, x) for x in islice(taskInputFilePaths, __loadThreads)
+        )
+
+        while pendingLoads:
+            serializedElements = pendingLoads.popleft().result()
+
+            # keeping the next file being loaded while the current one is consumed
+            for taskInputFilePath in islice(taskInputFilePaths, 1):
+                pendingLoads.append(executor.submit(loadFile, taskInputFilePath))
+
+            yield from serializedElements
+
 def __runExpanded(data, taskHolder, rangeStart, rangeEnd):
     """
     Execute an expanded job.
@@ -161,8 +212,23 @@ def __runExpanded(data, taskHolder, rangeStart, rangeEnd):
                 filePath
             )
 
+    # collecting the size of the elements (when known) used by the adaptive split
+    splitHistoryFilePath = data.get('splitHistoryFilePath')
+    if splitHistoryFilePath:
+        inputElements = taskHolder.task().elements()
+        totalBytes = sum(filter(None, map(SplitPolicy.elementSize, inputElements)))
+        startTime = time.time()
+
     outputElements = taskHolder.run()
 
+    if splitHistoryFilePath:
+        SplitPolicy.record(
+            splitHistoryFilePath,
+            len(inputElements),
+            totalBytes,
+            time.time() - startTime
+        )
+
     # writing resulted elements
     with open(taskResultFilePath, 'w') as jsonFile:
         data = list(map(lambda x: x.toJson(), outputElements))
@@ -180,8 +246,23 @@ def __run(dataJsonFile, rangeStart=None, rangeEnd=None):
     with open(dataJsonFile) as jsonFile:
         data = json.load(jsonFile)
 
+    # the expanded jobs carry only their elements, the data that is common
+    # to all the chunks is loaded from the shared job data
+    if 'sharedJobDataFilePath' in data:
+        sharedJobData = SharedJobData.load(data['sharedJobDataFilePath'])
+        data['dispatcher'] = sharedJobData['dispatcher']
+
+        taskHolder = TaskHolder.createFromJson(sharedJobData['taskHolder'])
+        task = taskHolder.task()
+        for elementDataItem in data['elementData']:
+            task.add(
+                Element.createFromJson(elementDataItem['serializedElement']),
+                elementDataItem['filePath']
+            )
+
     # loading task holder
-    taskHolder = TaskHolder.createFromJson(data['taskHolder'])
+    else:
+        taskHolder = TaskHolder.createFromJson(data['taskHolder'])
 
     if data['jobType'] == "collapsed":
         __runCollapsed(
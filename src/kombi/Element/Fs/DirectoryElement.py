@@ -2,7 +2,8 @@ import os
 import re
 import pathlib
 from .FsElement import FsElement
-from ...Template import Template
+from .SequenceIndex import SequenceIndex
+from ...Template import VersionResolver
 from .. import Element
 
 class DirectoryElement(FsElement):
@@ -88,21 +89,33 @@ class DirectoryElement(FsElement):
 
         # Using os.scandir for performance improvements, as it provides both the entry name
         # and type (file or directory) in a single call
+        childPaths = []
+        fileNames = []
         for childEntry in os.scandir(currentPath):
             childPath = pathlib.Path(os.path.join(currentPath, childEntry.name))
+            isFile = childEntry.is_file()
             self.setCachedPathQuery(childPath, 'exists', True)
-            self.setCachedPathQuery(childPath, 'is_file', childEntry.is_file())
+            self.setCachedPathQuery(childPath, 'is_file', isFile)
             self.setCachedPathQuery(childPath, 'is_dir', childEntry.is_dir())
 
+            childPaths.append(childPath)
+            if isFile:
+                fileNames.append(childEntry.name)
+
+        # the same listing is used to build the sequence index of the directory, so
+        # querying the sequences does not require to list the directory again
+        SequenceIndex.set(currentPath, fileNames)
+
+        for childPath in childPaths:
             childElement = Element.create(childPath, self)
             result.append(childElement)
 
         def __sortElement(x):
             name = x.var('name').lower() if 'group' not in x.tagNames() else x.tag('group').lower()
             # in case of a version folder v#### we want to sort the recent versions on top
-            if not x.isLeaf() and int(Template.runProcedure('isver', name)):
-                version = int(Template.runProcedure('vernumber', name))
-                name = Template.runProcedure('verprefix', name) + str(9999999999 - version).zfill(10) + Template.runProcedure('versuffix', name)
+            versionParts = None if x.isLeaf() else VersionResolver.split(name)
+            if versionParts:
+                name = versionParts[0] + str(9999999999 - int(versionParts[1])).zfill(10) + versionParts[2]
 
             return (int(x.isLeaf()), name)
 
@@ -1,6 +1,7 @@
 import os
 import time
 import sys
+import threading
 from pathlib import Path
 from .. import Element
 
@@ -11,6 +12,7 @@ class FsElement(Element):
     __invalidPath = None
     __pathCache = {}
     __pathLifespan = {}
+    __pathCacheLock = threading.Lock()
 
     # this cache speeds up data retrieval over the network by storing previously fetched results.
     # If you want to disable this cache, assign 0 to the environment variable KOMBI_FSELEMENT_CACHE_LIFESPAN
@@ -94,39 +96,53 @@ class FsElement(Element):
         """
         Retrieve or compute and cache the value of an attribute for the given path.
         """
+        return FsElement.cachedPathCompute(
+            path,
+            attr,
+            lambda: FsElement.__queryPathAttribute(path, attr, *args, **kwargs)
+        )
+
+    @staticmethod
+    def cachedPathCompute(path, name, computeFunction):
+        """
+        Retrieve or compute (through the compute function) and cache a value for the given path.
+
+        Used to cache arbitrary data about a path (for instance, the sequence
+        index of a directory) sharing the same lifespan of the path cache.
+
+        The cache can be used from multiple threads. The compute function runs
+        outside of the lock, when the value gets computed concurrently by different
+        threads the first value added to the cache is the one returned by all of them.
+        """
         # in case the cache is disabled. Compute and return the value right away
         if FsElement.__pathCacheTotalLifespan == 0:
-            return FsElement.__queryPathAttribute(path, attr, *args, **kwargs)
+            return computeFunction()
 
         pathId = hash(path)
-        currentTime = time.time()
-        expiredPathIds = set()
-        # computing expired cache entries
-        for cachePathId, lifespan in FsElement.__pathLifespan.items():
-            if lifespan + FsElement.__pathCacheTotalLifespan < currentTime:
-                expiredPathIds.add(cachePathId)
-            # when we get a lifespan that is still alive we can stop the lookup
-            # right here. Since, the entries are added in order.
-            else:
-                break
-
-        # purging expired cache entries
-        for expiredPathId in expiredPathIds:
-            del FsElement.__pathLifespan[expiredPathId]
-            del FsElement.__pathCache[expiredPathId]
-
-        # creating entry for path in the cache
-        if pathId not in FsElement.__pathCache:
-            FsElement.__pathCache[pathId] = {}
-            FsElement.__pathLifespan[pathId] = currentTime
-
-        # computing attribute
-        if attr not in FsElement.__pathCache[pathId]:
-            value = FsElement.__queryPathAttribute(path, attr, *args, **kwargs)
-            FsElement.setCachedPathQuery(pathId, attr, value)
-
-        # returning from the cache
-        return FsElement.__pathCache[pathId][attr]
+        with FsElement.__pathCacheLock:
+            currentTime = time.time()
+            expiredPathIds = []
+            # computing expired cache entries
+            for cachePathId, lifespan in FsElement.__pathLifespan.items():
+                if lifespan + FsElement.__pathCacheTotalLifespan < currentTime:
+                    expiredPathIds.append(cachePathId)
+                # when we get a lifespan that is still alive we can stop the lookup
+                # right here. Since, the entries are added in order.
+                else:
+                    break
+
+            # purging expired cache entries
+            for expiredPathId in expiredPathIds:
+                FsElement.__pathLifespan.pop(expiredPathId, None)
+                FsElement.__pathCache.pop(expiredPathId, None)
+
+            # returning from the cache
+            pathCache = FsElement.__pathCache.get(pathId)
+            if pathCache is not None and name in pathCache:
+                return pathCache[name]
+
+        # computing value
+        return FsElement.__setCachedPathValue(pathId, name, computeFunction(), override=False)
 
     @staticmethod
     def setCachedPathQuery(pathOrPathId, attr, value):
@@ -134,18 +150,16 @@ class FsElement(Element):
         Set a computed value for a specified attribute in the cache.
         """
         pathId = pathOrPathId if isinstance(pathOrPathId, int) else hash(pathOrPathId)
-        if pathId not in FsElement.__pathCache:
-            FsElement.__pathCache[pathId] = {}
-            FsElement.__pathLifespan[pathId] = time.time()
-        FsElement.__pathCache[pathId][attr] = value
+        FsElement.__setCachedPathValue(pathId, attr, value)
 
     @staticmethod
     def clearCache():
         """
         Clear the cached path query.
         """
-        FsElement.__pathCache = {}
-        FsElement.__pathLifespan = {}
+        with FsElement.__pathCacheLock:
+            FsElement.__pathCache = {}
+            FsElement.__pathLifespan = {}
 
     @classmethod
     def isBinary(cls, filePath, readBytes=512, threshold=0.3):
@@ -175,6 +189,21 @@ class FsElement(Element):
         # if percentage of binary characters above threshold, binary file
         return (float(binaryLength) / dataLength) >= threshold
 
+    @staticmethod
+    def __setCachedPathValue(pathId, name, value, override=True):
+        """
+        Add the value to the cache returning the cached value (kept when override is disabled).
+        """
+        with FsElement.__pathCacheLock:
+            if pathId not in FsElement.__pathCache:
+                FsElement.__pathCache[pathId] = {}
+                FsElement.__pathLifespan[pathId] = time.time()
+
+            if override or name not in FsElement.__pathCache[pathId]:
+                FsElement.__pathCache[pathId][name] = value
+
+            return FsElement.__pathCache[pathId][name]
+
     @staticmethod
     def __queryPathAttribute(path, attr, *args, **kwargs):
         """
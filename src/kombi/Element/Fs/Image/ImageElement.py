@@ -1,8 +1,5 @@
-import re
-import pathlib
-from glob import glob
-from ...Element import Element
 from ..FileElement import FileElement
+from ..SequenceIndex import SequenceIndex
 
 class ImageElement(FileElement):
     """
@@ -24,56 +21,42 @@ class ImageElement(FileElement):
         # setting icon
         self.setTag('icon', 'icons/elements/image.png')
 
+        self.__isSequence = False
         self.__computeImageSequence()
 
     def isSequence(self):
         """
         Return if path holder is holding a file that is part of a image sequence.
         """
-        # first test is to test against the conventional image seq abc.0001.ext
-        isImageSeq = self.__isStandardSequence()
-
-        # second test is to check against the non-conventional image seq abc_0001.ext
-        if not isImageSeq:
-            isImageSeq = self.__isAmbiguousSequence()
-
-        return isImageSeq
+        return self.__isSequence
 
     def sequenceElements(self):
         """
         Returns all elements that are part of a sequence, sorted by frame number.
+
+        The frames are queried from the sequence index of the directory, which
+        is computed once per directory (see SequenceIndex).
         """
         if not self.isSequence():
             return [self]
 
-        groupFullPath = self.path().parent.joinpath(
-            re.sub(r"#+", "*", self.tag('group'))
-        ).as_posix()
-
-        return sorted(
-            map(lambda x: Element.create(pathlib.Path(x)), glob(groupFullPath)),
-            key=lambda x: x.var('frame', 0)
+        parentPath = self.path().parent
+        return list(
+            map(
+                lambda x: FileElement.createFromPath(parentPath.joinpath(x).as_posix()),
+                SequenceIndex.get(parentPath).fileNames(self.tag('group'))
+            )
         )
 
     def __computeImageSequence(self):
         """
         Compute the image sequence tags and vars.
         """
-        nameParts = self.path().name.split(".")
-        frame = None
-        name = None
-        frameSep = None
-        if self.__isStandardSequence():
-            frame = nameParts[-2]
-            name = '.'.join(nameParts[:-2])
-            frameSep = "."
-        elif self.__isAmbiguousSequence():
-            nameParts = nameParts[0].split("_")
-            frame = nameParts[-1]
-            name = '_'.join(nameParts[:-1])
-            frameSep = "_"
+        parsedName = SequenceIndex.parseName(self.path().name)
 
-        if frame is not None:
+        if parsedName is not None:
+            name, frameSep, frame, _ = parsedName
+            self.__isSequence = True
             self.setVar('imageType', 'sequence')
             self.setVar('name', name)
             self.setVar('frame', int(frame))
@@ -105,28 +88,3 @@ class ImageElement(FileElement):
             )
         else:
             self.setTag('image', self.path().name)
-
-    def __isStandardSequence(self):
-        """
-        Return a boolean telling if the element contains a standard image sequence.
-
-        The element must follow the standard seq convention: abc.0001.ext
-        """
-        nameParts = self.path().name.split(".")
-        isImageSeq = (len(nameParts) >= 3 and self.path().name.split(".")[-2].isdigit())
-
-        return isImageSeq
-
-    def __isAmbiguousSequence(self):
-        """
-        Return a boolean telling if the element contains an ambiguous image sequence.
-
-        This element must follow the ambiguous seq convention: abc_0001.ext
-        """
-        nameParts = self.path().name.split(".")
-        parts = nameParts[0].split("_")
-        isImageSeq = False
-        if len(parts) > 1:
-            isImageSeq = (parts[-1].isdigit() and len(parts[-1]) >= 4)
-
-        return isImageSeq
@@ -0,0 +1,374 @@
+import os
+import re
+import json
+import hashlib
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from ...ImageReader import ImageReader, ImageReaderError
+from ...CacheFile import CacheFile
+
+# check of openimageio is available
+hasOpenImageIO = False
+try:
+    import OpenImageIO # noqa: w0611
+    hasOpenImageIO = True
+except ImportError:
+    pass
+
+class MediaProbe(object):
+    """
+    Batched header-only probes about the resolution of images and videos.
+
+    The images are probed through the OpenImageIO image cache (only the header
+    is read) on a thread pool, or through a single "oiiotool --info" call per batch
+    of files when the OpenImageIO python module is not available. The videos are
+    probed by running ffprobe concurrently (KOMBI_MEDIA_PROBE_THREADS).
+
+    The results are cached in memory and on disk (KOMBI_MEDIA_PROBE_CACHE_DIRECTORY,
+    an empty value disables it), where they are invalidated when the modification
+    time or the size of the file changes.
+
+    Usage:
+        MediaProbe.prefetchImages(filePaths)  # probes the files in batch
+        MediaProbe.imageInfo(filePaths[0])  # {'width': 1920, 'height': 1080}
+    """
+
+    __oiiotoolExecutable = os.environ.get('KOMBI_OIIOTOOL_EXECUTABLE', 'oiiotool')
+    __ffprobeExecutable = os.environ.get('KOMBI_FFPROBE_EXECUTABLE', 'ffprobe')
+    __threads = max(1, int(os.environ.get('KOMBI_MEDIA_PROBE_THREADS', 8)))
+    __oiiotoolBatchSize = 200
+    __cacheDirectory = os.environ.get(
+        'KOMBI_MEDIA_PROBE_CACHE_DIRECTORY',
+        os.path.join(os.path.expanduser('~'), '.cache', 'kombi', 'mediaProbe')
+    )
+    __memoryCache = {}
+    __executor = None
+    __lock = threading.Lock()
+
+    @classmethod
+    def imageInfo(cls, filePath):
+        """
+        Return a dictionary with the width and height of the image (None when it can't be probed).
+        """
+        return cls.prefetchImages([filePath])[str(filePath)]
+
+    @classmethod
+    def videoInfo(cls, filePath):
+        """
+        Return a dictionary with the width and height of the video (None when it can't be probed).
+        """
+        return cls.prefetchVideos([filePath])[str(filePath)]
+
+    @classmethod
+    def prefetchImages(cls, filePaths):
+        """
+        Probe the images in batch returning a dictionary with the info about each file path.
+        """
+        return cls.__probe(
+            'image',
+            filePaths,
+            cls.__probeImagesOiio if hasOpenImageIO else cls.__probeImagesOiiotool
+        )
+
+    @classmethod
+    def prefetchVideos(cls, filePaths):
+        """
+        Probe the videos in batch returning a dictionary with the info about each file path.
+        """
+        if not cls.__ffprobeExecutable:
+            return dict.fromkeys(map(str, filePaths))
+
+        return cls.__probe(
+            'video',
+            filePaths,
+            cls.__probeVideosFfprobe
+        )
+
+    @classmethod
+    def ffprobeExecutable(cls):
+        """
+        Return the ffprobe executable used to probe the videos (empty string when disabled).
+        """
+        return cls.__ffprobeExecutable
+
+    @classmethod
+    def setFfprobeExecutable(cls, ffprobeExecutable):
+        """
+        Change the ffprobe executable used to probe the videos.
+        """
+        cls.__ffprobeExecutable = ffprobeExecutable
+
+    @classmethod
+    def oiiotoolExecutable(cls):
+        """
+        Return the oiiotool executable used to probe the images when OpenImageIO python module is not available.
+        """
+        return cls.__oiiotoolExecutable
+
+    @classmethod
+    def setOiiotoolExecutable(cls, oiiotoolExecutable):
+        """
+        Change the oiiotool executable used to probe the images.
+        """
+        cls.__oiiotoolExecutable = oiiotoolExecutable
+
+    @classmethod
+    def cacheDirectory(cls):
+        """
+        Return the directory used to cache the probes on disk (empty string when disabled).
+        """
+        return cls.__cacheDirectory
+
+    @classmethod
+    def setCacheDirectory(cls, cacheDirectory):
+        """
+        Change the directory used to cache the probes on disk (empty string disables it).
+        """
+        cls.__cacheDirectory = cacheDirectory
+
+    @classmethod
+    def clear(cls):
+        """
+        Clear the memory cache (the disk cache is kept).
+        """
+        with cls.__lock:
+            cls.__memoryCache.clear()
+
+    @classmethod
+    def __probe(cls, kind, filePaths, probeCallable):
+        """
+        Return a dictionary with the info about the file paths probing only the ones that are not cached.
+        """
+        # the result follows the order of the file paths
+        filePaths = list(map(str, filePaths))
+        result = dict.fromkeys(filePaths)
+        missingFileStats = {}
+        for filePath in filePaths:
+            fileStat = CacheFile.stat(filePath)
+            if fileStat is None:
+                continue
+
+            memoryKey = (kind, filePath, fileStat)
+            with cls.__lock:
+                if memoryKey in cls.__memoryCache:
+                    result[filePath] = cls.__memoryCache[memoryKey]
+                    continue
+
+            info = cls.__readDiskCache(kind, filePath, fileStat)
+            if info is None:
+                missingFileStats[filePath] = fileStat
+            else:
+                result[filePath] = info
+                with cls.__lock:
+                    cls.__memoryCache[memoryKey] = info
+
+        if not missingFileStats:
+            return result
+
+        for filePath, info in probeCallable(list(missingFileStats.keys())).items():
+            result[filePath] = info
+
+            # failures are not cached, they are probed again next time
+            if info is None:
+                continue
+
+            with cls.__lock:
+                cls.__memoryCache[(kind, filePath, missingFileStats[filePath])] = info
+            cls.__writeDiskCache(kind, filePath, missingFileStats[filePath], info)
+
+        return result
+
+    @classmethod
+    def __probeImagesOiio(cls, filePaths):
+        """
+        Probe the images by reading their headers through the image cache.
+        """
+        def probeImage(filePath):
+            try:
+                spec = ImageReader.spec(filePath)
+            except ImageReaderError:
+                return None
+
+            return {
+                'width': spec.full_width,
+                'height': spec.full_height
+            }
+
+        return dict(zip(filePaths, cls.__map(probeImage, filePaths)))
+
+    @classmethod
+    def __probeImagesOiiotool(cls, filePaths):
+        """
+        Probe the images running oiiotool once per batch of files.
+        """
+        batches = [
+            filePaths[index:index + cls.__oiiotoolBatchSize] for index in range(0, len(filePaths), cls.__oiiotoolBatchSize)
+        ]
+
+        result = dict.fromkeys(filePaths)
+        for batchResult in cls.__map(cls.__runOiiotool, batches):
+            result.update(batchResult)
+
+        return result
+
+    @classmethod
+    def __runOiiotool(cls, filePaths):
+        """
+        Return a dictionary with the info about the images parsed from the output of oiiotool.
+        """
+        try:
+            process = subprocess.run(
+                [cls.__oiiotoolExecutable, '--info', '-v'] + filePaths,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                env=os.environ
+            )
+        except OSError:
+            return {}
+
+        # the information about each file starts by a line containing
+        # its file path ("Reading <file path>" or "<file path> : <width> x <height>...")
+        fileInfoLines = {}
+        infoLines = None
+        for line in process.stdout.decode('utf-8', errors='ignore').splitlines():
+            for filePath in filePaths:
+                if line.startswith('Reading {}'.format(filePath)) or line.startswith('{} :'.format(filePath)):
+                    infoLines = fileInfoLines.setdefault(filePath, [])
+                    break
+
+            if infoLines is not None and not line.startswith('Reading '):
+                infoLines.append(line)
+
+        result = {}
+        for filePath, infoLines in fileInfoLines.items():
+            if not infoLines:
+                continue
+
+            width = None
+            height = None
+
+            # by default we use the resolution provided in the first line of
+            # information of the file
+            match = re.search(':[ ]*([0-9]+)[ ]*x[ ]*([0-9]+)', infoLines[0])
+            if match:
+                width = match.group(1)
+                height = match.group(2)
+
+            # however, in case there is the display size defined we use that instead
+            for infoLine in infoLines[1:]:
+                match = re.search('full/display size:[ ]*([0-9]+)[ ]*x[ ]*([0-9]+)', infoLine)
+                if match:
+                    width = match.group(1)
+                    height = match.group(2)
+                    break
+
+            if width is not None and height is not None:
+                result[filePath] = {
+                    'width': int(width),
+                    'height': int(height)
+                }
+
+        return result
+
+    @classmethod
+    def __probeVideosFfprobe(cls, filePaths):
+        """
+        Probe the videos running ffprobe concurrently.
+        """
+        def probeVideo(filePath):
+            try:
+                process = subprocess.run(
+                    [
+                        cls.__ffprobeExecutable,
+                        '-v',
+                        'quiet',
+                        '-print_format',
+                        'json',
+                        '-show_entries',
+                        'stream=height,width',
+                        filePath
+                    ],
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    env=os.environ
+                )
+                output = json.loads(process.stdout.decode('utf-8'))
+            except (OSError, ValueError):
+                return None
+
+            # the first stream containing a resolution (audio streams don't have it)
+            for stream in output.get('streams', []):
+                if 'width' in stream and 'height' in stream:
+                    return {
+                        'width': stream['width'],
+                        'height': stream['height']
+                    }
+
+            return None
+
+        return dict(zip(filePaths, cls.__map(probeVideo, filePaths)))
+
+    @classmethod
+    def __map(cls, function, items):
+        """
+        Return a list with the result of the function for each item (computed on the thread pool).
+        """
+        if len(items) == 1:
+            return [function(items[0])]
+
+        with cls.__lock:
+            if MediaProbe.__executor is None:
+                MediaProbe.__executor = ThreadPoolExecutor(max_workers=cls.__threads)
+
+        return list(cls.__executor.map(function, items))
+
+    @classmethod
+    def __cacheFilePath(cls, kind, filePath):
+        """
+        Return the location of the disk cache about the file path.
+        """
+        return os.path.join(
+            cls.__cacheDirectory,
+            kind,
+            '{}.json'.format(hashlib.sha256(filePath.encode('utf-8')).hexdigest())
+        )
+
+    @classmethod
+    def __readDiskCache(cls, kind, filePath, fileStat):
+        """
+        Return the info cached on disk (None when it's not cached or it is out of date).
+        """
+        if not cls.__cacheDirectory:
+            return None
+
+        try:
+            with open(cls.__cacheFilePath(kind, filePath)) as f:
+                contents = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if contents.get('filePath') != filePath or contents.get('stat') != list(fileStat):
+            return None
+
+        return contents.get('info')
+
+    @classmethod
+    def __writeDiskCache(cls, kind, filePath, fileStat, info):
+        """
+        Write the info to the disk cache (failing to write it is ignored).
+        """
+        if not cls.__cacheDirectory:
+            return
+
+        try:
+            CacheFile.atomicWrite(
+                cls.__cacheFilePath(kind, filePath),
+                json.dumps({
+                    'filePath': filePath,
+                    'stat': list(fileStat),
+                    'info': info
+                })
+            )
+        except OSError:
+            pass
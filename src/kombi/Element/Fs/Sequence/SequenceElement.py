@@ -0,0 +1,290 @@
+import os
+import re
+import pathlib
+from ...Element import Element, ElementError
+from ..FsElement import FsElement
+from ..FileElement import FileElement
+from ..SequenceIndex import SequenceIndex
+
+class SequenceElementInvalidPatternError(ElementError):
+    """Sequence element invalid pattern error."""
+
+class SequenceElement(FsElement):
+    """
+    Collapsed file sequence element.
+
+    Represents an entire frame range (pattern, padding and a frame set that
+    may contain holes) through a single element rather than an element per
+    frame. The frame elements are only created when they are queried (children).
+
+    The sequence is described by a pattern where the frame is represented
+    by "#" (one for each digit of padding), for instance: /tmp/plate.####.exr
+    """
+
+    # name, frame separator, padding and extension: name.####.ext or name_####.ext
+    __patternRegex = re.compile(r'^(?P<name>.*?)(?P<frameSep>[._])(?P<padding>#+)\.(?P<ext>[^.]+)$')
+
+    # lazy variables queried from the first frame of the sequence
+    __frameLazyVars = ('width', 'height')
+
+    def __init__(self, data, parentElement=None):
+        """
+        Create a sequence element.
+
+        The data can be either the sequence pattern (string or Path) where the frames
+        are computed from the directory contents or a dictionary containing the
+        "filePath" (pattern) and the "frames" (see SequenceElement.compactFrames).
+        """
+        frames = None
+        if isinstance(data, dict):
+            frames = self.expandFrames(data['frames'])
+            data = data['filePath']
+
+        path = pathlib.Path(data)
+        patternMatch = self.__patternRegex.match(path.name)
+        if not patternMatch:
+            raise SequenceElementInvalidPatternError(
+                'Invalid sequence pattern "{}" (expected: name.####.ext)'.format(path)
+            )
+
+        super(SequenceElement, self).__init__(path, parentElement)
+
+        if frames is None:
+            frames = self.__computeFrames(path)
+
+        self.__frames = sorted(set(frames))
+        padding = len(patternMatch.group('padding'))
+
+        self.setVar('category', 'sequence')
+        self.setVar('imageType', 'sequence')
+        self.setVar('name', patternMatch.group('name'))
+        self.setVar('padding', padding)
+        self.setVar('sourceDirectory', str(path.parent))
+
+        # the frame variable points to the first frame, so tasks that only need
+        # the start of the sequence (ffmpeg for instance) don't need to expand it
+        if self.__frames:
+            self.setVar('frame', self.__frames[0])
+            self.setVar('firstFrame', self.__frames[0])
+            self.setVar('lastFrame', self.__frames[-1])
+        self.setVar('totalFrames', len(self.__frames))
+
+        # same group notation used by the image sequence elements
+        self.setTag('group', path.name)
+        self.setTag(
+            'groupSprintf',
+            '{0}{1}{2}.{3}'.format(
+                patternMatch.group('name'),
+                patternMatch.group('frameSep'),
+                '%0{}d'.format(padding),
+                patternMatch.group('ext')
+            )
+        )
+
+        # using the frame in the middle of the sequence for previews
+        if self.__frames:
+            self.setTag(
+                'previewFilePath',
+                self.framePath(self.__frames[int(len(self.__frames) / 2)])
+            )
+
+        # setting icon
+        self.setTag('icon', 'icons/elements/children.png')
+
+    def isLeaf(self):
+        """
+        Return a boolean telling if the element is leaf.
+        """
+        return False
+
+    def var(self, name, *args, **kwargs):
+        """
+        Return var value using lazy loading implementation for the variables provided by the frames (width and height).
+        """
+        if name in self.__frameLazyVars and name not in self.varNames() and self.__frames:
+            value = self.frameElement(self.__frames[0]).var(name, None)
+            if value is not None:
+                self.setVar(name, value)
+
+        return super(SequenceElement, self).var(name, *args, **kwargs)
+
+    def frames(self):
+        """
+        Return a sorted list containing the frame numbers that are part of the sequence.
+        """
+        return list(self.__frames)
+
+    def missingFrames(self):
+        """
+        Return a list of frame numbers missing (holes) between the first and last frames.
+        """
+        if not self.__frames:
+            return []
+
+        frames = set(self.__frames)
+        return [frame for frame in range(self.__frames[0], self.__frames[-1] + 1) if frame not in frames]
+
+    def framePath(self, frame):
+        """
+        Return the file path for the input frame number.
+        """
+        return self.resolvePattern(self.var('filePath'), frame)
+
+    def frameElement(self, frame):
+        """
+        Return the element about an individual frame of the sequence.
+
+        The context variables of the sequence are carried to the frame element.
+        """
+        result = FileElement.createFromPath(self.framePath(frame))
+        for ctxVarName in self.contextVarNames():
+            result.setVar(ctxVarName, self.var(ctxVarName), True)
+
+        return result
+
+    def serializeInitializationData(self):
+        """
+        Define the data passed during the initialization of the element.
+        """
+        return {
+            'filePath': self.var('filePath'),
+            'frames': self.compactFrames(self.__frames)
+        }
+
+    @classmethod
+    def test(cls, path, parentElement=None):
+        """
+        Test if the path is a sequence pattern (name.####.ext) that contains frames.
+        """
+        if not isinstance(path, pathlib.Path) or '#' not in path.name:
+            return False
+
+        patternMatch = cls.__patternRegex.match(path.name)
+        if not patternMatch or not cls.cachedPathQuery(path.parent, 'is_dir'):
+            return False
+
+        return bool(cls.__computeFrames(path))
+
+    @classmethod
+    def createFromElements(cls, elements):
+        """
+        Return a list of sequence elements created by collapsing the input frame elements.
+
+        The frame elements are grouped by the "group" tag (per directory). Elements
+        that are not part of a sequence are not included in the result.
+        """
+        sequences = {}
+        for element in elements:
+            if 'group' not in element.tagNames() or 'frame' not in element.varNames():
+                continue
+
+            # sequence elements are already collapsed
+            if isinstance(element, SequenceElement):
+                pattern = element.var('filePath')
+                frames = element.frames()
+            else:
+                pattern = os.path.join(os.path.dirname(element.var('filePath')), element.tag('group'))
+                frames = [element.var('frame')]
+
+            if pattern not in sequences:
+                sequences[pattern] = []
+            sequences[pattern] += frames
+
+        return [cls.createFromFrames(pattern, sequences[pattern]) for pattern in sorted(sequences.keys())]
+
+    @classmethod
+    def createFromFrames(cls, pattern, frames):
+        """
+        Create a sequence element based on the pattern and frame numbers (bypassing the file system).
+        """
+        result = cls(
+            {
+                'filePath': str(pattern),
+                'frames': cls.compactFrames(frames)
+            }
+        )
+        result.setVar('type', 'sequence')
+
+        return result
+
+    @classmethod
+    def expandElements(cls, elements):
+        """
+        Return a list of elements where the sequence elements are replaced by their frame elements.
+        """
+        result = []
+        for element in elements:
+            if isinstance(element, SequenceElement):
+                result += element.children()
+            else:
+                result.append(element)
+
+        return result
+
+    @classmethod
+    def resolvePattern(cls, pattern, frame):
+        """
+        Return the input pattern where the padding ("#") is replaced by the frame number.
+        """
+        return re.sub(
+            r'#+',
+            lambda x: str(frame).zfill(len(x.group(0))),
+            pattern
+        )
+
+    @staticmethod
+    def compactFrames(frames):
+        """
+        Return a string representation about the frames where the consecutive frames are represented as ranges.
+
+        For instance: [1, 2, 3, 4, 6, 7, 8] results "1-4,6-8"
+        """
+        ranges = []
+        for frame in sorted(set(map(int, frames))):
+            if ranges and frame == ranges[-1][1] + 1:
+                ranges[-1][1] = frame
+            else:
+                ranges.append([frame, frame])
+
+        return ','.join(
+            map(lambda x: str(x[0]) if x[0] == x[1] else '{}-{}'.format(*x), ranges)
+        )
+
+    @staticmethod
+    def expandFrames(compactFrames):
+        """
+        Return a list of frame numbers from a compact frames string (see SequenceElement.compactFrames).
+        """
+        result = []
+        for frameRange in filter(None, compactFrames.split(',')):
+            rangeMatch = re.match(r'^([0-9]+)(?:-([0-9]+))?$', frameRange.strip())
+            if not rangeMatch:
+                raise SequenceElementInvalidPatternError(
+                    'Invalid frame range "{}"'.format(frameRange)
+                )
+
+            start = int(rangeMatch.group(1))
+            end = int(rangeMatch.group(2)) if rangeMatch.group(2) is not None else start
+            result += list(range(start, end + 1))
+
+        return result
+
+    def _computeChildren(self):
+        """
+        Return the frame elements.
+        """
+        return list(map(self.frameElement, self.__frames))
+
+    @classmethod
+    def __computeFrames(cls, path):
+        """
+        Return a list of frames found in the directory for the sequence pattern.
+        """
+        return SequenceIndex.get(path.parent).frames(path.name)
+
+
+# registration
+Element.register(
+    'sequence',
+    SequenceElement
+)
@@ -0,0 +1 @@
+from .SequenceElement import SequenceElement, SequenceElementInvalidPatternError
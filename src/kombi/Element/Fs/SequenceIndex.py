@@ -0,0 +1,123 @@
+import os
+import re
+import pathlib
+from .FsElement import FsElement
+
+class SequenceIndex(object):
+    """
+    Index about the file sequences found in a directory.
+
+    The index is built from a single directory listing, grouping the files by
+    the sequence pattern (same notation used by the "group" tag: name.####.ext)
+    with the frames that are part of each sequence. The padding is not taken into
+    account when querying the frames of a sequence, since the sequence can be
+    unpadded (a.8.exr, a.9.exr, a.10.exr). Use SequenceIndex.get to
+    query the index of a directory, it is cached for the same lifespan used
+    by the path cache (KOMBI_FSELEMENT_CACHE_LIFESPAN).
+    """
+
+    def __init__(self, fileNames):
+        """
+        Create a sequence index object from a list of file names.
+        """
+        self.__sequences = {}
+        self.__groups = set()
+
+        for fileName in fileNames:
+            parsedName = self.parseName(fileName)
+            if parsedName is None:
+                continue
+
+            name, frameSep, frame, ext = parsedName
+            group = '{0}{1}{2}.{3}'.format(name, frameSep, '#' * len(frame), ext)
+            self.__groups.add(group)
+
+            sequenceKey = self.__sequenceKey(group)
+            if sequenceKey not in self.__sequences:
+                self.__sequences[sequenceKey] = []
+            self.__sequences[sequenceKey].append((int(frame), fileName))
+
+    def groups(self):
+        """
+        Return a sorted list with the sequence patterns (group) found in the index.
+        """
+        return sorted(self.__groups)
+
+    def frames(self, group):
+        """
+        Return a sorted list of frames for the input sequence pattern (group) regardless of the padding.
+        """
+        return sorted(set(frame for frame, _ in self.__sequences.get(self.__sequenceKey(group), [])))
+
+    def fileNames(self, group):
+        """
+        Return a list of file names for the input sequence pattern (group) sorted by frame regardless of the padding.
+        """
+        return [fileName for _, fileName in sorted(self.__sequences.get(self.__sequenceKey(group), []))]
+
+    @classmethod
+    def get(cls, directory):
+        """
+        Return the (cached) sequence index for the input directory.
+        """
+        directoryPath = pathlib.Path(directory)
+
+        return FsElement.cachedPathCompute(
+            directoryPath,
+            'sequenceIndex',
+            lambda: cls.fromDirectory(directoryPath)
+        )
+
+    @classmethod
+    def set(cls, directory, fileNames):
+        """
+        Cache the sequence index for the directory based on a directory listing performed by the caller.
+        """
+        sequenceIndex = cls(fileNames)
+        FsElement.setCachedPathQuery(pathlib.Path(directory), 'sequenceIndex', sequenceIndex)
+
+        return sequenceIndex
+
+    @classmethod
+    def fromDirectory(cls, directory):
+        """
+        Return a new (not cached) sequence index by listing the directory.
+        """
+        fileNames = []
+        try:
+            for childEntry in os.scandir(str(directory)):
+                if childEntry.is_file():
+                    fileNames.append(childEntry.name)
+        except OSError:
+            pass
+
+        return cls(fileNames)
+
+    @staticmethod
+    def parseName(fileName):
+        """
+        Return a tuple (name, frame separator, frame, ext) for a file name that is part of a sequence or None otherwise.
+
+        Supports the conventional image sequence abc.0001.ext and the
+        non-conventional one abc_0001.ext (at least 4 digits of padding).
+        """
+        nameParts = fileName.split(".")
+        ext = pathlib.PurePath(fileName).suffix[1:]
+
+        # first test is to test against the conventional image seq abc.0001.ext
+        if len(nameParts) >= 3 and nameParts[-2].isdigit():
+            return ('.'.join(nameParts[:-2]), '.', nameParts[-2], ext)
+
+        # second test is to check against the non-conventional image seq abc_0001.ext
+        parts = nameParts[0].split("_")
+        if len(parts) > 1 and parts[-1].isdigit() and len(parts[-1]) >= 4:
+            return ('_'.join(parts[:-1]), '_', parts[-1], ext)
+
+        return None
+
+    @staticmethod
+    def __sequenceKey(group):
+        """
+        Return the key used to index a sequence pattern ignoring its padding.
+        """
+        return re.sub(r"#+", "#", group)
@@ -1,6 +1,8 @@
 from .FsElement import FsElement
 from .FileElement import FileElement
 from .DirectoryElement import DirectoryElement
+from .SequenceIndex import SequenceIndex
+from .MediaProbe import MediaProbe
 
 from . import Image
 from . import Lut
@@ -11,3 +13,4 @@ from . import Render
 from . import Texture
 from . import Scene
 from . import Exchange3dData
+from . import Sequence
@@ -0,0 +1,156 @@
+import os
+import threading
+from collections import OrderedDict
+from .KombiError import KombiError
+from .CacheFile import CacheFile
+
+class ImageReaderError(KombiError):
+    """Image reader error."""
+
+class ImageReader(object):
+    """
+    Shared access to the images read through OpenImageIO.
+
+    The images are read through the OpenImageIO shared ImageCache, configured
+    with a memory budget (KOMBI_IMAGE_CACHE_MEMORY_MB) and a maximum number of
+    open files (KOMBI_IMAGE_CACHE_OPEN_FILES). Therefore, the files opened by
+    different tasks and elements (for instance the width and height of an element
+    and later the pixels used by a task) are shared. A cached image is invalidated
+    when its file gets modified.
+
+    Usage:
+        spec = ImageReader.spec(filePath)  # header only (no pixels are read)
+        imageBuf = ImageReader.imageBuf(filePath)
+        watermarkBuf = ImageReader.overlayImageBuf(filePath)  # reused across frames
+    """
+
+    __maxMemory = float(os.environ.get('KOMBI_IMAGE_CACHE_MEMORY_MB', 1024))
+    __maxOpenFiles = int(os.environ.get('KOMBI_IMAGE_CACHE_OPEN_FILES', 100))
+    __maxOverlays = int(os.environ.get('KOMBI_IMAGE_CACHE_OVERLAYS', 16))
+    __imageCache = None
+    __fileStats = {}
+    __overlays = OrderedDict()
+    __lock = threading.Lock()
+
+    @classmethod
+    def imageCache(cls):
+        """
+        Return the configured OpenImageIO shared image cache.
+        """
+        import OpenImageIO as oiio
+
+        with cls.__lock:
+            if cls.__imageCache is None:
+                imageCache = oiio.ImageCache(True)
+                imageCache.attribute('max_memory_MB', float(cls.__maxMemory))
+                imageCache.attribute('max_open_files', int(cls.__maxOpenFiles))
+                ImageReader.__imageCache = imageCache
+
+            return cls.__imageCache
+
+    @classmethod
+    def spec(cls, filePath):
+        """
+        Return the image spec of the file by reading only its header (metadata fast path).
+        """
+        filePath = str(filePath)
+        imageCache = cls.__validate(filePath)
+
+        # an invalid image results in an empty spec
+        spec = imageCache.get_imagespec(filePath)
+        if not spec.nchannels:
+            raise ImageReaderError(
+                "Can't read information from file:\n{}\n{}".format(
+                    filePath,
+                    imageCache.geterror()
+                )
+            )
+
+        return spec
+
+    @classmethod
+    def imageBuf(cls, filePath):
+        """
+        Return an image buf about the file (the pixels are read on demand through the image cache).
+        """
+        import OpenImageIO as oiio
+
+        filePath = str(filePath)
+        cls.__validate(filePath)
+
+        return oiio.ImageBuf(filePath)
+
+    @classmethod
+    def overlayImageBuf(cls, filePath):
+        """
+        Return an image buf that is loaded once and reused (for instance header, footer and watermark images).
+
+        The returned image buf is shared, it should not be modified.
+        """
+        import OpenImageIO as oiio
+
+        filePath = str(filePath)
+        overlayKey = (filePath, CacheFile.stat(filePath))
+        with cls.__lock:
+            if overlayKey in cls.__overlays:
+                cls.__overlays.move_to_end(overlayKey)
+                return cls.__overlays[overlayKey]
+
+        imageBuf = oiio.ImageBuf(filePath)
+        if not imageBuf.read(force=True):
+            raise ImageReaderError(
+                "Can't read the image:\n{}\n{}".format(
+                    filePath,
+                    imageBuf.geterror()
+                )
+            )
+
+        with cls.__lock:
+            cls.__overlays[overlayKey] = imageBuf
+            while len(cls.__overlays) > cls.__maxOverlays:
+                cls.__overlays.popitem(last=False)
+
+        return imageBuf
+
+    @classmethod
+    def invalidate(cls, filePath):
+        """
+        Discard the cached information about the file.
+        """
+        filePath = str(filePath)
+        imageCache = cls.imageCache()
+        with cls.__lock:
+            cls.__fileStats.pop(filePath, None)
+            for overlayKey in list(cls.__overlays.keys()):
+                if overlayKey[0] == filePath:
+                    del cls.__overlays[overlayKey]
+
+        imageCache.invalidate(filePath, True)
+
+    @classmethod
+    def clear(cls):
+        """
+        Discard all the cached images.
+        """
+        imageCache = cls.imageCache()
+        with cls.__lock:
+            cls.__fileStats.clear()
+            cls.__overlays.clear()
+
+        imageCache.invalidate_all(True)
+
+    @classmethod
+    def __validate(cls, filePath):
+        """
+        Invalidate the cached image when the file has been modified returning the image cache.
+        """
+        imageCache = cls.imageCache()
+        fileStat = CacheFile.stat(filePath)
+        with cls.__lock:
+            previousFileStat = cls.__fileStats.get(filePath)
+            cls.__fileStats[filePath] = fileStat
+
+        if previousFileStat is not None and previousFileStat != fileStat:
+            imageCache.invalidate(filePath, True)
+
+        return imageCache
@@ -1,8 +1,9 @@
 import os
+import itertools
 from collections import OrderedDict
-from zipfile import ZipFile, ZIP_DEFLATED, ZIP_STORED
-from tarfile import TarFile
 from ..Task import Task, TaskError
+from ...Tracer import Tracer
+from .Packer import Packer
 from ...Element.Fs.FsElement import FsElement
 from ...Element.Fs.DirectoryElement import DirectoryElement
 
@@ -11,9 +12,11 @@ class PackTaskUnsupportedTypeError(TaskError):
 
 class PackTask(Task):
     """
-    Task used for creating archives in tar, zip (or gz) and tar.gz (or tgz).
+    Task used for creating archives in tar, zip (or gz), tar.gz (or tgz) and tar.zst (or tzst).
 
-    You can use this task to archive entire directories or/and specific files.
+    You can use this task to archive entire directories or/and specific files. The
+    directories are walked while the archive is written and the data is compressed
+    in parallel (see Packer), tar.zst requires the zstandard python module.
 
     Optionality: In case you want to define a custom path for each file inside
     of the archive you can do that by defining the new name inside of "[]" after
@@ -40,82 +43,82 @@ class PackTask(Task):
         """
         archive = OrderedDict()
         for taskElement in self.elements():
-
-            allElements = []
-            # in case of directory element we glob for the contents
-            if isinstance(taskElement, DirectoryElement):
-                allElements += taskElement.glob()
-            else:
-                allElements.append(taskElement)
-
             filePath = self.target(taskElement)
 
-            # resolving the internal path for the elements
-            for element in allElements:
-                internalArchivePath = None
-
-                # elements based on directory elements the internal path is relative to source directory element
-                if isinstance(taskElement, DirectoryElement):
-                    internalArchivePath = element.var('fullPath')[len(taskElement.var('fullPath')) - len(taskElement.var('baseName')):]
+            # directories are walked lazily while the archive gets written, where
+            # the internal path is relative to the parent of the directory
+            if isinstance(taskElement, DirectoryElement):
+                archiveItems = self.__walkDirectory(taskElement.var('fullPath'))
 
-                # elements containing a custom internal path that can be declared as part of the target path,
-                # for instance: test.zip[a/b/c/file.ext]
-                elif filePath.endswith(']') and filePath.count('[') == 1:
-                    filePath, internalArchivePath = filePath[:-1].split('[')
-                    internalArchivePath = internalArchivePath.replace('|', '/')
+            # elements containing a custom internal path that can be declared as part of the target path,
+            # for instance: test.zip[a/b/c/file.ext]
+            elif filePath.endswith(']') and filePath.count('[') == 1:
+                filePath, internalArchivePath = filePath[:-1].split('[')
+                archiveItems = [(taskElement.var('fullPath'), internalArchivePath.replace('|', '/'))]
 
-                # otherwise the internal path is the base name of the element
-                else:
-                    internalArchivePath = element.var('baseName')
+            # otherwise the internal path is the base name of the element
+            else:
+                archiveItems = [(taskElement.var('fullPath'), taskElement.var('baseName'))]
 
-                if filePath not in archive:
-                    archive[filePath] = []
-                archive[filePath].append(
-                    {
-                        'element': element,
-                        'internalPath': internalArchivePath
-                    }
-                )
+            if filePath not in archive:
+                archive[filePath] = []
+            archive[filePath].append(archiveItems)
 
         # creating archives
         for archiveFilePath, archiveItems in archive.items():
             archiveName = os.path.basename(archiveFilePath).lower()
+            archiveItems = itertools.chain.from_iterable(archiveItems)
 
-            # tar archive
-            if archiveName.endswith('.tar') or archiveName.endswith('.tar.gz') or archiveName.endswith('.tgz'):
-                compressTar = archiveName.endswith('.tgz') or archiveName.endswith('.tar.gz')
-                self.__archiveTar(archiveFilePath, archiveItems, compressTar)
+            with Tracer.span('pack.archive', archiveFilePath=archiveFilePath) as span:
+                # tar archive
+                if archiveName.endswith(('.tar', '.tar.gz', '.tgz', '.tar.zst', '.tzst')):
+                    stats = self.__archiveTar(archiveFilePath, archiveName, archiveItems)
 
-            # zip archive
-            elif archiveName.endswith('.zip') or archiveName.endswith('.gz'):
-                self.__archiveZip(archiveFilePath, archiveItems)
-            else:
-                raise PackTaskUnsupportedTypeError(
-                    'Unsupported archive type: {}'.format(archiveName)
-                )
+                # zip archive
+                elif archiveName.endswith('.zip') or archiveName.endswith('.gz'):
+                    stats = Packer.writeZip(archiveFilePath, archiveItems, bool(self.option('compress')))
+                else:
+                    raise PackTaskUnsupportedTypeError(
+                        'Unsupported archive type: {}'.format(archiveName)
+                    )
+
+                for statName in ('bytesRead', 'bytesWritten', 'bytesPerSecond'):
+                    span.setAttribute(statName, stats[statName])
+
+            self._reportMetrics(bytesRead=stats['bytesRead'], bytesWritten=stats['bytesWritten'])
 
         return list(map(FsElement.createFromPath, archive.keys()))
 
-    def __archiveTar(self, archiveFilePath, archiveItems, compressTar):
+    def __archiveTar(self, archiveFilePath, archiveName, archiveItems):
         """
-        Create a tar archive.
+        Create a tar archive returning the stats about it.
         """
-        compress = compressTar if self.option('compress') is None else self.option('compress')
-        archiveMode = 'w:gz' if compress else 'w'
-
-        with TarFile.open(archiveFilePath, archiveMode) as archiveFile:
-            for archiveItem in archiveItems:
-                archiveFile.add(archiveItem['element'].var('fullPath'), archiveItem['internalPath'])
-
-    def __archiveZip(self, archiveFilePath, archiveItems):
+        compression = ''
+        if archiveName.endswith(('.tar.zst', '.tzst')):
+            compression = 'zst'
+        elif archiveName.endswith(('.tar.gz', '.tgz')):
+            compression = 'gz'
+
+        # the compress option overrides the compression driven by the archive type
+        if self.option('compress') is not None:
+            if not self.option('compress'):
+                compression = ''
+            elif not compression:
+                compression = 'gz'
+
+        return Packer.writeTar(archiveFilePath, archiveItems, compression)
+
+    @staticmethod
+    def __walkDirectory(directoryPath):
         """
-        Create a zip archive.
+        Yield the (source path, internal path) of the directory contents in a sorted order.
         """
-        archiveMode = ZIP_DEFLATED if self.option('compress') else ZIP_STORED
-
-        with ZipFile(archiveFilePath, 'w', compression=archiveMode, allowZip64=True) as archiveFile:
-            for archiveItem in archiveItems:
-                archiveFile.write(archiveItem['element'].var('fullPath'), archiveItem['internalPath'])
+        rootPath = os.path.dirname(os.path.normpath(directoryPath))
+        for currentDirectory, directoryNames, fileNames in os.walk(directoryPath):
+            directoryNames.sort()
+            for name in directoryNames + sorted(fileNames):
+                sourcePath = os.path.join(currentDirectory, name)
+                yield sourcePath, os.path.relpath(sourcePath, rootPath).replace(os.sep, '/')
 
 
 # registering task
@@ -0,0 +1,351 @@
+import os
+import gzip
+import time
+import zlib
+import shutil
+import tempfile
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from zipfile import ZipFile, ZipInfo, ZIP_DEFLATED, ZIP_STORED, ZIP64_LIMIT
+from tarfile import TarFile
+from ..Task import TaskError
+
+class PackerError(TaskError):
+    """Packer error."""
+
+class PackerMissingDependencyError(PackerError):
+    """Packer missing dependency error."""
+
+class BlockCompressedWriter(object):
+    """
+    File object that compresses the data written to it by blocks in parallel.
+
+    Each block is compressed independently (as a gzip member or a zstd frame),
+    the compressed blocks are written in order to the target file object. Both
+    formats define a stream of concatenated members/frames as a valid file.
+    """
+
+    def __init__(self, fileObject, compressBlock, executor, blockSize, maxPendingBlocks):
+        """
+        Create a block compressed writer.
+        """
+        self.__fileObject = fileObject
+        self.__compressBlock = compressBlock
+        self.__executor = executor
+        self.__blockSize = blockSize
+        self.__maxPendingBlocks = maxPendingBlocks
+        self.__buffer = bytearray()
+        self.__pendingBlocks = deque()
+        self.__position = 0
+
+    def write(self, data):
+        """
+        Write the data (compressed once a block is filled).
+        """
+        self.__buffer += data
+        self.__position += len(data)
+
+        while len(self.__buffer) >= self.__blockSize:
+            self.__submit(bytes(self.__buffer[:self.__blockSize]))
+            del self.__buffer[:self.__blockSize]
+
+        return len(data)
+
+    def tell(self):
+        """
+        Return the position of the uncompressed data.
+        """
+        return self.__position
+
+    def close(self):
+        """
+        Compress the remaining data waiting all the blocks to be written.
+        """
+        if self.__buffer:
+            self.__submit(bytes(self.__buffer))
+            self.__buffer.clear()
+
+        while self.__pendingBlocks:
+            self.__writeNextBlock()
+
+    def __submit(self, block):
+        """
+        Submit the block to be compressed (bounded by the maximum pending blocks).
+        """
+        self.__pendingBlocks.append(self.__executor.submit(self.__compressBlock, block))
+        while len(self.__pendingBlocks) > self.__maxPendingBlocks:
+            self.__writeNextBlock()
+
+    def __writeNextBlock(self):
+        """
+        Write the next compressed block to the file object.
+        """
+        self.__fileObject.write(self.__pendingBlocks.popleft().result())
+
+
+class DeflatedZipFile(ZipFile):
+    """
+    Zip file that supports writing members that have been deflated in advance.
+
+    ZipFile does not provide a public interface to write data that is already
+    compressed, therefore the access to its internals is kept in this class.
+    """
+
+    def writeDeflated(self, zipInfo, deflatedFileObject, crc, fileSize, bufferSize=1024 * 1024):
+        """
+        Write a member from a file object containing the raw deflated data (no zlib header).
+        """
+        deflatedFileObject.seek(0, os.SEEK_END)
+        zipInfo.compress_type = ZIP_DEFLATED
+        zipInfo.CRC = crc
+        zipInfo.file_size = fileSize
+        zipInfo.compress_size = deflatedFileObject.tell()
+        deflatedFileObject.seek(0)
+
+        with self._lock:
+            if self._writing:
+                raise ValueError(
+                    "Can't write to the zip file while there is an open writing handle"
+                )
+            self._writecheck(zipInfo)
+            self._didModify = True
+
+            if self._seekable:
+                self.fp.seek(self.start_dir)
+            zipInfo.header_offset = self.fp.tell()
+
+            zip64 = zipInfo.file_size > ZIP64_LIMIT or zipInfo.compress_size > ZIP64_LIMIT
+            self.fp.write(zipInfo.FileHeader(zip64))
+            shutil.copyfileobj(deflatedFileObject, self.fp, bufferSize)
+
+            self.filelist.append(zipInfo)
+            self.NameToInfo[zipInfo.filename] = zipInfo
+            self.start_dir = self.fp.tell()
+
+
+class Packer(object):
+    """
+    Creates archives compressing the data in parallel (KOMBI_PACK_THREADS).
+
+    Tar archives are compressed by blocks (KOMBI_PACK_BLOCK_SIZE) in parallel
+    (pigz style) either through gzip or zstd (requires the zstandard module).
+    The members of zip archives are deflated in parallel, where the compressed
+    data is spooled to memory (or to a temporary file for large files) until it's
+    written to the archive in order. The members waiting to be written are bounded
+    by their total size (KOMBI_PACK_MAX_PENDING_MB).
+
+    The items are consumed as they are written, so they can be provided by a
+    generator (for instance walking a directory).
+    """
+
+    __threads = max(1, int(os.environ.get('KOMBI_PACK_THREADS', multiprocessing.cpu_count())))
+    __blockSize = int(os.environ.get('KOMBI_PACK_BLOCK_SIZE', 1024 * 1024))
+    __spoolSize = 64 * 1024 * 1024
+    __maxPendingBytes = int(float(os.environ.get('KOMBI_PACK_MAX_PENDING_MB', 256)) * 1024 * 1024)
+    __gzipLevel = 6
+    __zstdLevel = 3
+    __deflateLevel = 6
+    __executor = None
+    __lock = threading.Lock()
+
+    @classmethod
+    def writeTar(cls, archiveFilePath, items, compression=''):
+        """
+        Create a tar archive from the items (sourcePath, internalPath) returning the stats about it.
+
+        The compression can be either: '' (no compression), 'gz' or 'zst'.
+        """
+        compressBlock = None
+        if compression == 'gz':
+            compressBlock = cls.__gzipBlock
+        elif compression == 'zst':
+            compressBlock = cls.__zstdBlock(cls.__zstdLevel)
+        elif compression:
+            raise PackerError(
+                'Unsupported compression: {}'.format(compression)
+            )
+
+        startTime = time.perf_counter()
+        bytesRead = 0
+        with open(archiveFilePath, 'wb') as archiveFileObject:
+            targetFileObject = archiveFileObject
+            if compressBlock:
+                targetFileObject = BlockCompressedWriter(
+                    archiveFileObject,
+                    compressBlock,
+                    cls.__sharedExecutor(),
+                    cls.__blockSize,
+                    cls.__threads * 2
+                )
+
+            with TarFile.open(fileobj=targetFileObject, mode='w') as archiveFile:
+                for sourcePath, internalPath in items:
+                    archiveFile.add(sourcePath, internalPath, recursive=False)
+                    if os.path.isfile(sourcePath):
+                        bytesRead += os.path.getsize(sourcePath)
+
+            if compressBlock:
+                targetFileObject.close()
+
+        return cls.__stats(archiveFilePath, bytesRead, startTime)
+
+    @classmethod
+    def writeZip(cls, archiveFilePath, items, compress=True):
+        """
+        Create a zip archive from the items (sourcePath, internalPath) returning the stats about it.
+        """
+        startTime = time.perf_counter()
+        bytesRead = 0
+        with DeflatedZipFile(archiveFilePath, 'w', compression=ZIP_DEFLATED if compress else ZIP_STORED, allowZip64=True) as archiveFile:
+            # without compression there is nothing to be done in parallel
+            if not compress:
+                for sourcePath, internalPath in items:
+                    archiveFile.write(sourcePath, internalPath)
+                    if os.path.isfile(sourcePath):
+                        bytesRead += os.path.getsize(sourcePath)
+
+                return cls.__stats(archiveFilePath, bytesRead, startTime)
+
+            # the deflated data of a member can take up to the spool size in memory
+            # (the rest goes to a temporary file), the pending members are written
+            # once their total size goes over the maximum pending bytes
+            pendingMembers = deque()
+            pendingBytes = 0
+            for sourcePath, internalPath in items:
+                zipInfo = ZipInfo.from_file(sourcePath, internalPath)
+                memberBytes = 0 if zipInfo.is_dir() else min(zipInfo.file_size, cls.__spoolSize)
+                pendingMembers.append((
+                    sourcePath,
+                    zipInfo,
+                    None if zipInfo.is_dir() else cls.__sharedExecutor().submit(cls.__deflateMember, sourcePath),
+                    memberBytes
+                ))
+                pendingBytes += memberBytes
+
+                while len(pendingMembers) > 1 and (len(pendingMembers) > cls.__threads * 2 or pendingBytes > cls.__maxPendingBytes):
+                    member = pendingMembers.popleft()
+                    bytesRead += cls.__writeZipMember(archiveFile, *member[:3])
+                    pendingBytes -= member[3]
+
+            while pendingMembers:
+                bytesRead += cls.__writeZipMember(archiveFile, *pendingMembers.popleft()[:3])
+
+        return cls.__stats(archiveFilePath, bytesRead, startTime)
+
+    @classmethod
+    def blockSize(cls):
+        """
+        Return the size in bytes of the blocks compressed in parallel.
+        """
+        return cls.__blockSize
+
+    @classmethod
+    def setBlockSize(cls, blockSize):
+        """
+        Change the size in bytes of the blocks compressed in parallel.
+        """
+        cls.__blockSize = max(1, int(blockSize))
+
+    @classmethod
+    def maxPendingBytes(cls):
+        """
+        Return the maximum size in bytes of the zip members waiting to be written.
+        """
+        return cls.__maxPendingBytes
+
+    @classmethod
+    def setMaxPendingBytes(cls, maxPendingBytes):
+        """
+        Change the maximum size in bytes of the zip members waiting to be written.
+        """
+        cls.__maxPendingBytes = max(1, int(maxPendingBytes))
+
+    @classmethod
+    def __writeZipMember(cls, archiveFile, sourcePath, zipInfo, deflateFuture):
+        """
+        Write the deflated member to the zip archive returning the size of the source file.
+        """
+        if deflateFuture is None:
+            archiveFile.write(sourcePath, zipInfo.filename)
+            return 0
+
+        deflatedData, crc, fileSize = deflateFuture.result()
+        with deflatedData:
+            archiveFile.writeDeflated(zipInfo, deflatedData, crc, fileSize, cls.__blockSize)
+
+        return fileSize
+
+    @classmethod
+    def __deflateMember(cls, sourcePath):
+        """
+        Return a tuple containing the deflated data (spooled file), crc and size of the source file.
+        """
+        compressor = zlib.compressobj(cls.__deflateLevel, zlib.DEFLATED, -15)
+        deflatedData = tempfile.SpooledTemporaryFile(max_size=cls.__spoolSize)
+        crc = 0
+        fileSize = 0
+        with open(sourcePath, 'rb') as sourceFile:
+            for chunk in iter(lambda: sourceFile.read(cls.__blockSize), b''):
+                crc = zlib.crc32(chunk, crc)
+                fileSize += len(chunk)
+                deflatedData.write(compressor.compress(chunk))
+
+        deflatedData.write(compressor.flush())
+
+        return deflatedData, crc, fileSize
+
+    @classmethod
+    def __gzipBlock(cls, block):
+        """
+        Return the block compressed as a gzip member.
+        """
+        return gzip.compress(block, cls.__gzipLevel, mtime=0)
+
+    @classmethod
+    def __zstdBlock(cls, level):
+        """
+        Return a callable that compresses a block as a zstd frame.
+        """
+        try:
+            import zstandard
+        except ImportError:
+            raise PackerMissingDependencyError(
+                'zstd compression requires the "zstandard" python module'
+            )
+
+        localData = threading.local()
+
+        def compressBlock(block):
+            # the compressors are not thread safe
+            if not hasattr(localData, 'compressor'):
+                localData.compressor = zstandard.ZstdCompressor(level=level)
+
+            return localData.compressor.compress(block)
+
+        return compressBlock
+
+    @classmethod
+    def __stats(cls, archiveFilePath, bytesRead, startTime):
+        """
+        Return a dictionary containing the stats about the archive.
+        """
+        seconds = time.perf_counter() - startTime
+        return {
+            'bytesRead': bytesRead,
+            'bytesWritten': os.path.getsize(archiveFilePath),
+            'seconds': seconds,
+            'bytesPerSecond': bytesRead / seconds if seconds > 0 else 0.0
+        }
+
+    @classmethod
+    def __sharedExecutor(cls):
+        """
+        Return the thread pool used to compress the data.
+        """
+        with cls.__lock:
+            if Packer.__executor is None:
+                Packer.__executor = ThreadPoolExecutor(max_workers=cls.__threads)
+
+            return Packer.__executor
@@ -1 +1,2 @@
+from .Packer import Packer, PackerError, PackerMissingDependencyError, DeflatedZipFile
 from .PackTask import PackTask, PackTaskUnsupportedTypeError
@@ -1,4 +1,5 @@
 import os
+import time
 import uuid
 import shutil
 from ...Element.Fs.FsElement import FsElement
@@ -26,6 +27,7 @@ class ByteCopyTask(Task):
         elements = self.elements()
 
         for element in elements:
+            startTime = time.perf_counter()
             sourceFilePath = element.var('filePath')
             targetFilePath = self.target(element)
 
@@ -67,6 +69,13 @@ class ByteCopyTask(Task):
                 FsElement.createFromPath(targetFilePath)
             )
 
+            fileSize = os.path.getsize(targetFilePath)
+            self._reportMetrics(
+                bytesRead=fileSize,
+                bytesWritten=fileSize,
+                elementLatency=time.perf_counter() - startTime
+            )
+
         return result
 
 
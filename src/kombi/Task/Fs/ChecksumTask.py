@@ -31,8 +31,11 @@ class ChecksumTask(Task):
             # TODO: change md5 for xxHash
             with open(sourceFilePath, 'rb') as sourceFile:
                 sourceFileHash = hashlib.md5(sourceFile.read()).hexdigest()
+                bytesRead = sourceFile.tell()
             with open(targetFilePath, 'rb') as targetFile:
                 targetFileHash = hashlib.md5(targetFile.read()).hexdigest()
+                bytesRead += targetFile.tell()
+            self._reportMetrics(bytesRead=bytesRead)
 
             if sourceFileHash != targetFileHash:
                 raise ChecksumTaskMatchError(
@@ -2,6 +2,7 @@ import os
 import shutil
 from ..Task import Task, TaskError
 from ...Element.Fs import FsElement
+from ...Element.Fs.Sequence import SequenceElement
 
 class CopyTaskTargetDirectoryError(TaskError):
     """Copy Target Directory Error."""
@@ -9,6 +10,10 @@ class CopyTaskTargetDirectoryError(TaskError):
 class CopyTask(Task):
     """
     Copies a file to the filePath.
+
+    Collapsed sequence elements (SequenceElement) are copied frame by frame. In
+    this case the filePath can be either a sequence pattern (/target/plate.####.exr)
+    or a directory where the frames are copied keeping their original names.
     """
 
     def __init__(self, *args, **kwargs):
@@ -44,21 +49,28 @@ class CopyTask(Task):
             return
 
         # Check if the target path already exists, if it is file remove it else raise an exception
-        if os.path.isfile(targetFilePath):
+        # (sequences are checked per frame)
+        isSequence = isinstance(element, SequenceElement)
+        if not isSequence and os.path.isfile(targetFilePath):
             os.remove(targetFilePath)
-        elif os.path.isdir(targetFilePath):
+        elif not isSequence and os.path.isdir(targetFilePath):
             raise CopyTaskTargetDirectoryError(
                 'Target directory already exists {}'.format(targetFilePath)
             )
 
         # doing the copy
-        if os.path.isdir(sourceFilePath):
-            shutil.copytree(sourceFilePath, targetFilePath)
+        if isSequence:
+            newElement = self.__copySequence(element, targetFilePath)
         else:
-            shutil.copy2(sourceFilePath, targetFilePath)
+            if os.path.isdir(sourceFilePath):
+                shutil.copytree(sourceFilePath, targetFilePath)
+            else:
+                shutil.copy2(sourceFilePath, targetFilePath)
+                fileSize = os.path.getsize(targetFilePath)
+                self._reportMetrics(bytesRead=fileSize, bytesWritten=fileSize)
 
-        # creating result element
-        newElement = FsElement.createFromPath(targetFilePath)
+            # creating result element
+            newElement = FsElement.createFromPath(targetFilePath)
 
         # copying vars
         for sourceVarName, targetVarName in self.option('copyVar').items():
@@ -74,6 +86,28 @@ class CopyTask(Task):
 
         return newElement
 
+    def __copySequence(self, sequenceElement, targetFilePath):
+        """
+        Copy the frames of a sequence element returning the target sequence element.
+        """
+        targetPattern = targetFilePath
+        if '#' not in os.path.basename(targetFilePath):
+            targetPattern = os.path.join(targetFilePath, sequenceElement.var('baseName'))
+
+        try:
+            os.makedirs(os.path.dirname(targetPattern))
+        except OSError:
+            pass
+
+        for frame in sequenceElement.frames():
+            targetFramePath = SequenceElement.resolvePattern(targetPattern, frame)
+            if os.path.isfile(targetFramePath):
+                os.remove(targetFramePath)
+
+            shutil.copy2(sequenceElement.framePath(frame), targetFramePath)
+
+        return SequenceElement.createFromFrames(targetPattern, sequenceElement.frames())
+
 
 # registering task
 Task.register(
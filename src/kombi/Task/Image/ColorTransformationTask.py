@@ -1,5 +1,4 @@
 import os
-from array import array
 from .UpdateImageMetadataTask import UpdateImageMetadataTask
 from .OcioTask import OcioTask
 from ..Task import Task
@@ -8,6 +7,9 @@ class ColorTransformationTask(OcioTask):
     """
     Applies a color transformation to an image using open color io and open image io.
 
+    The pixels are read as a float32 numpy buffer and transformed in place by
+    the cached OCIO processor (see OcioTask).
+
     Required Options: "sourceColorSpace" and "targetColorSpace".
     """
 
@@ -17,9 +19,6 @@ class ColorTransformationTask(OcioTask):
         """
         import OpenImageIO as oiio
 
-        # open color io configuration
-        config = self.ocioConfig()
-
         sourceColorSpace = self.option('sourceColorSpace')
         targetColorSpace = self.option('targetColorSpace')
         metadata = {
@@ -27,6 +26,12 @@ class ColorTransformationTask(OcioTask):
             'targetColorSpace': targetColorSpace
         }
 
+        # the processor is cached, so it is built only once for the whole sequence
+        processor = self.ocioProcessor(
+            sourceColorSpace,
+            targetColorSpace
+        )
+
         for element in self.elements():
 
             sourceImage = oiio.ImageInput.open(
@@ -35,13 +40,14 @@ class ColorTransformationTask(OcioTask):
             spec = sourceImage.spec()
             spec.set_format(oiio.FLOAT)
 
-            pixels = sourceImage.read_image()
+            # float32 numpy array (height, width, channels) transformed in place
+            pixels = sourceImage.read_image(oiio.FLOAT)
             sourceImage.close()
 
-            transformedPixels = config.getProcessor(
-                sourceColorSpace,
-                targetColorSpace
-            ).applyRGB(pixels)
+            self.applyOcioProcessor(
+                processor,
+                pixels
+            )
 
             targetFilePath = self.target(element)
 
@@ -62,20 +68,27 @@ class ColorTransformationTask(OcioTask):
                 metadata
             )
 
-            success = targetImage.open(
+            targetImageOpenArgs = [
                 targetFilePath,
-                spec,
-                oiio.Create
+                spec
+            ]
+            if hasattr(oiio, 'ImageOutputOpenMode'):
+                targetImageOpenArgs.append(oiio.ImageOutputOpenMode.Create)
+
+            success = targetImage.open(
+                *targetImageOpenArgs
             )
 
             # saving target image
             if success:
-                writePixels = array('d')
-                writePixels.fromlist(transformedPixels)
-                targetImage.write_image(writePixels)
+                targetImage.write_image(pixels)
+                targetImage.close()
             else:
                 raise Exception(oiio.geterror())
 
+            # releasing the frame before reading the next one
+            del pixels
+
         # default result based on the target filePath
         return super(ColorTransformationTask, self)._perform()
 
@@ -3,6 +3,7 @@ import multiprocessing
 
 from ..Task import Task, TaskError
 from ...Element.Fs import FsElement
+from ...ImageReader import ImageReader
 
 class ConvertImageTaskError(TaskError):
     """Convert image task error."""
@@ -50,8 +51,8 @@ class ConvertImageTask(Task):
 
         targetFilePath = self.target(element)
 
-        # opening the source image
-        inputImageBuf = oiio.ImageBuf(element.var('filePath'))
+        # opening the source image (through the shared image cache)
+        inputImageBuf = ImageReader.imageBuf(element.var('filePath'))
 
         # output image buf
         outImageBuf = inputImageBuf
@@ -1,5 +1,4 @@
 import os
-from array import array
 from .UpdateImageMetadataTask import UpdateImageMetadataTask
 from .OcioTask import OcioTask
 from ..Task import Task
@@ -16,7 +15,6 @@ class FileColorTransformationTask(OcioTask):
         Perform the task.
         """
         import OpenImageIO as oiio
-        import PyOpenColorIO as ocio
 
         sourceColorSpace = self.option('sourceColorSpace')
         targetColorSpace = self.option('targetColorSpace')
@@ -25,28 +23,15 @@ class FileColorTransformationTask(OcioTask):
             'targetColorSpace': targetColorSpace
         }
 
-        # open color io configuration
-        config = self.ocioConfig()
-
         for element in self.elements():
             # resolving the lut path
             lut = self.option('lut', element=element)
 
-            # adding color space transform
-            groupTransform = ocio.GroupTransform()
-            groupTransform.push_back(
-                ocio.ColorSpaceTransform(
-                    src=sourceColorSpace,
-                    dst=targetColorSpace
-                )
-            )
-
-            # adding lut transform
-            groupTransform.push_back(
-                ocio.FileTransform(
-                    lut,
-                    interpolation=ocio.Constants.INTERP_LINEAR
-                )
+            # color space transform followed by the lut transform (cached per lut)
+            processor = self.ocioProcessor(
+                sourceColorSpace,
+                targetColorSpace,
+                lut
             )
 
             # source image
@@ -56,12 +41,14 @@ class FileColorTransformationTask(OcioTask):
 
             metadata['lutFile'] = lut
 
-            pixels = sourceImage.read_image()
+            # float32 numpy array (height, width, channels) transformed in place
+            pixels = sourceImage.read_image(oiio.FLOAT)
             sourceImage.close()
 
-            transformedPixels = config.getProcessor(
-                groupTransform
-            ).applyRGB(pixels)
+            self.applyOcioProcessor(
+                processor,
+                pixels
+            )
 
             targetFilePath = self.target(element)
 
@@ -80,20 +67,27 @@ class FileColorTransformationTask(OcioTask):
                 metadata
             )
 
-            success = targetImage.open(
+            targetImageOpenArgs = [
                 targetFilePath,
-                spec,
-                oiio.Create
+                spec
+            ]
+            if hasattr(oiio, 'ImageOutputOpenMode'):
+                targetImageOpenArgs.append(oiio.ImageOutputOpenMode.Create)
+
+            success = targetImage.open(
+                *targetImageOpenArgs
             )
 
             # saving target image
             if success:
-                writePixels = array('d')
-                writePixels.fromlist(transformedPixels)
-                targetImage.write_image(writePixels)
+                targetImage.write_image(pixels)
+                targetImage.close()
             else:
                 raise Exception(oiio.geterror())
 
+            # releasing the frame before reading the next one
+            del pixels
+
         # default result based on the target filePath
         return super(FileColorTransformationTask, self)._perform()
 
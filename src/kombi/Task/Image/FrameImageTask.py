@@ -1,6 +1,7 @@
 import os
 from ..Task import Task
 from ...Element.Fs import FsElement
+from ...ImageReader import ImageReader
 
 class FrameImageTask(Task):
     """
@@ -52,25 +53,53 @@ class FrameImageTask(Task):
         """
         Process an individual element.
         """
-        import OpenImageIO as oiio
-
         targetFilePath = self.target(element)
 
-        # opening source image
-        inputImageBuf = self.__toImageBuf(element.var('filePath'))
+        headerFilePath = self.option('headerFilePath') if int(self.option('enableHeader')) else None
+        footerFilePath = self.option('footerFilePath') if int(self.option('enableFooter')) else None
+        watermarkFilePath = self.option('watermarkFilePath') if int(self.option('enableWatermark')) else None
+
+        outputImageBuf = self.frameImageBuf(
+            ImageReader.imageBuf(element.var('filePath')),
+            ImageReader.overlayImageBuf(headerFilePath) if headerFilePath else None,
+            ImageReader.overlayImageBuf(footerFilePath) if footerFilePath else None,
+            ImageReader.overlayImageBuf(watermarkFilePath) if watermarkFilePath else None,
+            self.option('bgColor'),
+            self.option('burnin') if int(self.option('enableBurnin')) else None,
+            int(self.option('diagonalLayout'))
+        )
+
+        # making parent directories if necessary
+        try:
+            os.makedirs(os.path.dirname(targetFilePath))
+        except (IOError, OSError):
+            pass
+
+        # writing file
+        outputImageBuf.write(
+            targetFilePath
+        )
+
+        return FsElement.createFromPath(targetFilePath)
+
+    @classmethod
+    def frameImageBuf(cls, inputImageBuf, headerImageBuf=None, footerImageBuf=None, watermarkImageBuf=None, bgColor='000000FF', burnin=None, diagonalLayout=True):
+        """
+        Return a new image buf that combines the header, input image buf and footer.
+
+        Also used by the image pipeline task to frame the images in memory.
+        """
+        import OpenImageIO as oiio
+
         width = inputImageBuf.spec().width
 
-        headerImageBuf = self.option('headerFilePath') if int(self.option('enableHeader')) else None
         headerHeight = 0
         if headerImageBuf:
-            headerImageBuf = self.__toImageBuf(headerImageBuf)
             headerHeight = headerImageBuf.spec().height
             width = max(width, headerImageBuf.spec().width)
 
         footerHeight = 0
-        footerImageBuf = self.option('footerFilePath') if int(self.option('enableFooter')) else None
         if footerImageBuf:
-            footerImageBuf = self.__toImageBuf(footerImageBuf)
             footerHeight = footerImageBuf.spec().height
             width = max(width, footerImageBuf.spec().width)
 
@@ -87,17 +116,14 @@ class FrameImageTask(Task):
             outputSpec
         )
 
-        # background color
-        bgColor = self.__fromHexColor(self.option('bgColor'))
-
         # filling background color
-        oiio.ImageBufAlgo.fill(outputImageBuf, bgColor)
+        oiio.ImageBufAlgo.fill(outputImageBuf, cls.__fromHexColor(bgColor))
 
         # header
         if headerImageBuf:
             oiio.ImageBufAlgo.paste(
                 outputImageBuf,
-                0 if int(self.option('diagonalLayout')) else int((width - headerImageBuf.spec().width) / 2),
+                0 if diagonalLayout else int((width - headerImageBuf.spec().width) / 2),
                 0,
                 0,
                 0,
@@ -105,9 +131,8 @@ class FrameImageTask(Task):
             )
 
         # watermark
-        watermarkImage = self.option('watermarkFilePath') if int(self.option('enableWatermark')) else None
-        if watermarkImage:
-            inputImageBuf = self.__watermark(inputImageBuf, self.__toImageBuf(watermarkImage))
+        if watermarkImageBuf:
+            inputImageBuf = cls.__watermark(inputImageBuf, watermarkImageBuf)
 
         # content
         oiio.ImageBufAlgo.paste(
@@ -123,7 +148,7 @@ class FrameImageTask(Task):
         if footerImageBuf:
             oiio.ImageBufAlgo.paste(
                 outputImageBuf,
-                width - footerImageBuf.spec().width if int(self.option('diagonalLayout')) else int((width - footerImageBuf.spec().width) / 2),
+                width - footerImageBuf.spec().width if diagonalLayout else int((width - footerImageBuf.spec().width) / 2),
                 headerHeight + inputImageBuf.spec().height,
                 0,
                 0,
@@ -131,8 +156,7 @@ class FrameImageTask(Task):
             )
 
         # burn-in text
-        burnin = self.option('burnin')
-        if int(self.option('enableBurnin')) and burnin['text']:
+        if burnin and burnin['text']:
             oiio.ImageBufAlgo.render_text(
                 outputImageBuf,
                 int(burnin['x']),
@@ -140,21 +164,10 @@ class FrameImageTask(Task):
                 burnin['text'],
                 int(burnin['size']),
                 burnin['font'],
-                self.__fromHexColor(burnin['color'])
+                cls.__fromHexColor(burnin['color'])
             )
 
-        # making parent directories if necessary
-        try:
-            os.makedirs(os.path.dirname(targetFilePath))
-        except (IOError, OSError):
-            pass
-
-        # writing file
-        outputImageBuf.write(
-            targetFilePath
-        )
-
-        return FsElement.createFromPath(targetFilePath)
+        return outputImageBuf
 
     @classmethod
     def __watermark(cls, targetImageBuf, watermarkImageBuf):
@@ -196,15 +209,6 @@ class FrameImageTask(Task):
         """
         return tuple(int(hexColor[i:i + 2], 16) / 255.0 for i in (0, 2, 4, 6))
 
-    @classmethod
-    def __toImageBuf(cls, filePath):
-        """
-        Load the input image in open image io.
-        """
-        import OpenImageIO as oiio
-
-        return oiio.ImageBuf(filePath)
-
 
 # registering task
 Task.register(
@@ -0,0 +1,360 @@
+import os
+import time
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from ..Task import Task, TaskError
+from .FrameImageTask import FrameImageTask
+from .UpdateImageMetadataTask import UpdateImageMetadataTask
+from ...Element.Fs import FsElement
+from ...ImageReader import ImageReader
+from ...Template import Template
+
+class ImagePipelineTaskError(TaskError):
+    """Image pipeline task error."""
+
+class ImagePipelineTaskInvalidOperationError(ImagePipelineTaskError):
+    """Image pipeline task invalid operation error."""
+
+class ImagePipelineTask(Task):
+    """
+    Decodes each image once and writes multiple outputs from it.
+
+    Replaces chains of image tasks (for instance convertImage, imageThumbnail,
+    frameImage and updateImageMetadata) that read and write the image again at
+    each step. The operations are applied to the image in memory, first the
+    ones shared by all outputs ("operations" option) followed by the operations
+    of each output. The frames are processed in parallel (KOMBI_IMAGE_PIPELINE_THREADS).
+
+    Operations (each operation is a dictionary with the name under "run"):
+        - resize: "width", "height" and "keepAspectRatio"
+        - channels: "channels" (aka ["R", "G", "B", "A"]) and "fallbackToFirstChannel"
+        - colorConvert: "sourceColorspace", "targetColorspace" and "colorConfig"
+        - frame: "headerFilePath", "footerFilePath", "watermarkFilePath", "bgColor",
+          "burnin" and "diagonalLayout" (see FrameImageTask)
+        - metadata: "data" (see UpdateImageMetadataTask)
+
+    Outputs (each output is a dictionary):
+        - "target": file path of the output (supports templates)
+        - "operations": list of operations applied only to this output
+        - "dataFormat": optional data format used to write the output (aka "uint8", "half")
+
+    The target of the task (when defined) is written after the shared operations.
+
+    Example:
+        {
+            "run": "imagePipeline",
+            "options": {
+                "operations": [
+                    {"run": "colorConvert", "sourceColorspace": "linear", "targetColorspace": "sRGB"}
+                ],
+                "outputs": [
+                    {
+                        "target": "!kt {dir}/proxy/{name}.(pad {frame} 4).jpg",
+                        "operations": [{"run": "resize", "width": 1024, "height": 1024, "keepAspectRatio": true}],
+                        "dataFormat": "uint8"
+                    },
+                    {
+                        "target": "!kt {dir}/thumbnail/{name}.(pad {frame} 4).png",
+                        "operations": [{"run": "resize", "width": 320, "height": 240, "keepAspectRatio": true}]
+                    }
+                ]
+            }
+        }
+    """
+
+    __threads = max(1, int(os.environ.get('KOMBI_IMAGE_PIPELINE_THREADS', multiprocessing.cpu_count())))
+    __operations = {}
+
+    def __init__(self, *args, **kwargs):
+        """
+        Create an image pipeline task.
+        """
+        super(ImagePipelineTask, self).__init__(*args, **kwargs)
+
+        self.setOption('operations', [])
+        self.setOption('outputs', [])
+        self.setMetadata('dispatch.split', True)
+
+    @classmethod
+    def registerOperation(cls, name, operationCallable):
+        """
+        Register an operation that can be used by the pipeline.
+
+        The callable receives the image buf, a dictionary with the operation options
+        (templates already resolved) and the number of threads that can be used by it. It
+        should return a new image buf (the input image buf must not be modified).
+        """
+        assert callable(operationCallable), \
+            "Invalid operation callable!"
+
+        cls.__operations[name] = operationCallable
+
+    @classmethod
+    def operationNames(cls):
+        """
+        Return a list of the registered operation names.
+        """
+        return list(sorted(cls.__operations.keys()))
+
+    def _perform(self):
+        """
+        Perform the task processing the frames in parallel.
+        """
+        elements = self.elements()
+        threads = min(self.__threads, len(elements)) or 1
+
+        # the image algorithms are multithreaded as well, splitting the cores between the frames
+        algorithmThreads = max(1, multiprocessing.cpu_count() // threads)
+
+        if threads == 1:
+            elementsResult = [self.__processImage(element, algorithmThreads) for element in elements]
+        else:
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                elementsResult = list(executor.map(lambda x: self.__processImage(x, algorithmThreads), elements))
+
+        # the metrics are reported from the calling thread, since the task
+        # reporter is not shared across the worker threads
+        result = []
+        alreadyAdded = set()
+        for createdElements, metrics in elementsResult:
+            self._reportMetrics(**metrics)
+            for createdElement in createdElements:
+                if createdElement.var('filePath') not in alreadyAdded:
+                    alreadyAdded.add(createdElement.var('filePath'))
+                    result.append(createdElement)
+
+        return result
+
+    def __processImage(self, element, algorithmThreads):
+        """
+        Decode the image of the element once and write all the outputs.
+
+        Return a tuple containing the created elements and the metrics about the processing.
+        """
+        startTime = time.perf_counter()
+
+        # decoding the whole image to memory, so the outputs don't go through the image cache again
+        inputImageBuf = ImageReader.imageBuf(element.var('filePath'))
+        if not inputImageBuf.read(force=True):
+            raise ImagePipelineTaskError(
+                "Can't read the image:\n{}\n{}".format(
+                    element.var('filePath'),
+                    inputImageBuf.geterror()
+                )
+            )
+
+        imageBuf = self.__applyOperations(
+            inputImageBuf,
+            self.option('operations', element),
+            element,
+            algorithmThreads
+        )
+
+        result = []
+        if self.target(element):
+            result.append(self.__write(imageBuf, self.target(element), ''))
+
+        # each output is written as soon as it's computed, so only one of them is kept in memory
+        for output in self.option('outputs', element):
+            if 'target' not in output:
+                raise ImagePipelineTaskError(
+                    'Output is missing the target: {}'.format(output)
+                )
+
+            result.append(
+                self.__write(
+                    self.__applyOperations(imageBuf, output.get('operations', []), element, algorithmThreads),
+                    self.__resolveValue(output['target'], element),
+                    output.get('dataFormat', '')
+                )
+            )
+
+        metrics = {
+            'bytesRead': os.path.getsize(element.var('filePath')),
+            'bytesWritten': sum(map(lambda x: os.path.getsize(x.var('filePath')), result)),
+            'elementLatency': time.perf_counter() - startTime
+        }
+
+        return result, metrics
+
+    def __applyOperations(self, imageBuf, operations, element, algorithmThreads):
+        """
+        Return the image buf resulted by applying the operations in order.
+        """
+        for operation in operations:
+            operation = self.__resolveValue(dict(operation), element)
+            operationName = operation.pop('run', None)
+            if operationName not in self.__operations:
+                raise ImagePipelineTaskInvalidOperationError(
+                    'Invalid operation "{}", available operations: {}'.format(
+                        operationName,
+                        ', '.join(self.operationNames())
+                    )
+                )
+
+            imageBuf = self.__operations[operationName](imageBuf, operation, algorithmThreads)
+
+        return imageBuf
+
+    @classmethod
+    def __resolveValue(cls, value, element):
+        """
+        Return the value where the templates found in it (including nested data) are resolved.
+        """
+        if isinstance(value, dict):
+            return {key: cls.__resolveValue(itemValue, element) for key, itemValue in value.items()}
+        elif isinstance(value, (list, tuple)):
+            return [cls.__resolveValue(itemValue, element) for itemValue in value]
+        elif isinstance(value, str) and Template.hasTemplatePrefix(value):
+            return Template(value).valueFromElement(element)
+
+        return value
+
+    @classmethod
+    def __write(cls, imageBuf, targetFilePath, dataFormat):
+        """
+        Write the image buf to the target file path returning the created element.
+        """
+        import OpenImageIO as oiio
+
+        # trying to create the directory automatically in case it does not exist
+        os.makedirs(os.path.dirname(targetFilePath), exist_ok=True)
+
+        if not imageBuf.write(targetFilePath, oiio.TypeDesc(dataFormat) if dataFormat else oiio.UNKNOWN):
+            raise ImagePipelineTaskError(
+                imageBuf.geterror()
+            )
+
+        return FsElement.createFromPath(targetFilePath)
+
+    @staticmethod
+    def _resizeOperation(imageBuf, options, threads):
+        """
+        Resize the image (the aspect ratio is kept when keepAspectRatio is enabled).
+        """
+        import OpenImageIO as oiio
+
+        spec = imageBuf.spec()
+        width = int(options.get('width', spec.width))
+        height = int(options.get('height', spec.height))
+
+        if int(options.get('keepAspectRatio', False)):
+            # smaller ratio will ensure that the image fits in the target resolution
+            ratio = min(width / float(spec.width), height / float(spec.height))
+            width = max(1, int(spec.width * ratio))
+            height = max(1, int(spec.height * ratio))
+
+        if width == spec.width and height == spec.height:
+            return imageBuf
+
+        outputImageBuf = oiio.ImageBuf(
+            oiio.ImageSpec(
+                width,
+                height,
+                spec.nchannels,
+                spec.format
+            )
+        )
+
+        oiio.ImageBufAlgo.resize(
+            outputImageBuf,
+            imageBuf,
+            roi=outputImageBuf.roi,
+            nthreads=threads
+        )
+
+        return outputImageBuf
+
+    @staticmethod
+    def _channelsOperation(imageBuf, options, threads):
+        """
+        Keep only the requested channels of the image.
+        """
+        import OpenImageIO as oiio
+
+        requestedChannels = list(map(lambda x: str(x).upper(), options.get('channels', ('R', 'G', 'B', 'A'))))
+        useChannels = list(filter(lambda x: x.upper() in requestedChannels, imageBuf.spec().channelnames))
+
+        if not useChannels and options.get('fallbackToFirstChannel', True):
+            useChannels.append(imageBuf.spec().channelnames[0])
+
+        outputImageBuf = oiio.ImageBuf()
+        oiio.ImageBufAlgo.channels(
+            outputImageBuf,
+            imageBuf,
+            tuple(useChannels),
+            nthreads=threads
+        )
+
+        return outputImageBuf
+
+    @staticmethod
+    def _colorConvertOperation(imageBuf, options, threads):
+        """
+        Convert the colorspace of the image.
+        """
+        import OpenImageIO as oiio
+
+        outputImageBuf = oiio.ImageBuf()
+        if not oiio.ImageBufAlgo.colorconvert(
+                outputImageBuf,
+                imageBuf,
+                options.get('sourceColorspace', ''),
+                options['targetColorspace'],
+                colorconfig=options.get('colorConfig', ''),
+                nthreads=threads):
+            raise ImagePipelineTaskError(
+                outputImageBuf.geterror()
+            )
+
+        return outputImageBuf
+
+    @staticmethod
+    def _frameOperation(imageBuf, options, threads):
+        """
+        Frame the image with header, footer, watermark and burn-in.
+        """
+        overlayImageBufs = {}
+        for optionName in ('headerFilePath', 'footerFilePath', 'watermarkFilePath'):
+            overlayImageBufs[optionName] = ImageReader.overlayImageBuf(options[optionName]) if options.get(optionName) else None
+
+        return FrameImageTask.frameImageBuf(
+            imageBuf,
+            overlayImageBufs['headerFilePath'],
+            overlayImageBufs['footerFilePath'],
+            overlayImageBufs['watermarkFilePath'],
+            options.get('bgColor', '000000FF'),
+            options.get('burnin'),
+            int(options.get('diagonalLayout', True))
+        )
+
+    @staticmethod
+    def _metadataOperation(imageBuf, options, threads):
+        """
+        Add metadata to the image.
+        """
+        import OpenImageIO as oiio
+
+        outputImageBuf = oiio.ImageBuf()
+        outputImageBuf.copy(imageBuf)
+        UpdateImageMetadataTask.updateMetadata(
+            outputImageBuf.specmod(),
+            None,
+            options.get('data', {})
+        )
+
+        return outputImageBuf
+
+
+# registering operations
+ImagePipelineTask.registerOperation('resize', ImagePipelineTask._resizeOperation)
+ImagePipelineTask.registerOperation('channels', ImagePipelineTask._channelsOperation)
+ImagePipelineTask.registerOperation('colorConvert', ImagePipelineTask._colorConvertOperation)
+ImagePipelineTask.registerOperation('frame', ImagePipelineTask._frameOperation)
+ImagePipelineTask.registerOperation('metadata', ImagePipelineTask._metadataOperation)
+
+# registering task
+Task.register(
+    'imagePipeline',
+    ImagePipelineTask
+)
@@ -1,5 +1,6 @@
 from fnmatch import fnmatch
 from ..Task import Task, TaskError
+from ...ImageReader import ImageReader
 
 class LoadImageMetadataTaskError(TaskError):
     """Generic load image metadata task error."""
@@ -35,13 +36,11 @@ class LoadImageMetadataTask(Task):
         """
         Perform the task.
         """
-        import OpenImageIO as oiio
-
         result = []
         for element in self.elements():
             newElement = element.clone()
 
-            inputSpec = oiio.ImageInput.open(element.var('fullPath')).spec()
+            inputSpec = ImageReader.spec(element.var('fullPath'))
             for metadataName in filter(lambda x: x.startswith('_'), self.optionNames()):
                 found = self.option('skipIfVarAlreadyDefined') and metadataName in element.varNames()
 
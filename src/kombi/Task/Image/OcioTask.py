@@ -1,17 +1,34 @@
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from ..Task import Task, TaskError
 
 class OcioTaskConfigurationError(TaskError):
     """Invalid OCIO configuration error."""
 
+class OcioTaskChannelsError(TaskError):
+    """Invalid number of channels error."""
+
 class OcioTask(Task):
     """
     Base class used by all OCIO image tasks.
 
+    The OCIO configs and CPU processors are cached per process (a processor is
+    built once per config, source, target and lut), so they are not rebuilt
+    for each frame of a sequence. The pixels are transformed in place by
+    scanline strips processed in parallel (KOMBI_OCIO_THREADS and
+    KOMBI_OCIO_STRIP_HEIGHT).
+
     Optional Options: "ocioConfig"
     """
 
     __ocioConfigDefault = ''
+    __threads = max(1, int(os.environ.get('KOMBI_OCIO_THREADS', os.cpu_count() or 1)))
+    __stripHeight = max(1, int(os.environ.get('KOMBI_OCIO_STRIP_HEIGHT', 64)))
+    __configCache = {}
+    __processorCache = {}
+    __executor = None
+    __lock = threading.Lock()
 
     def __init__(self, *args, **kwargs):
         """
@@ -26,11 +43,42 @@ class OcioTask(Task):
         """
         Return an OCIO config instance.
         """
+        return self.ocioConfigFromFile(self.option('ocioConfig'))
+
+    def ocioProcessor(self, sourceColorSpace, targetColorSpace, lut=''):
+        """
+        Return a cached OCIO CPU processor used to transform the color space (and apply the lut when specified).
+        """
+        return self.ocioProcessorFromFile(
+            self.option('ocioConfig'),
+            sourceColorSpace,
+            targetColorSpace,
+            lut
+        )
+
+    @classmethod
+    def ocioConfigFromFile(cls, configFilePath=''):
+        """
+        Return a cached OCIO config instance for the config file path (empty to use $OCIO).
+        """
         import PyOpenColorIO as ocio
 
         # open color io configuration
-        if self.option('ocioConfig'):
-            config = ocio.Config.CreateFromFile(self.option('ocioConfig'))
+        if configFilePath:
+
+            # the config is loaded again in case the file gets modified
+            try:
+                configKey = (configFilePath, os.stat(configFilePath).st_mtime_ns)
+            except OSError:
+                configKey = (configFilePath, None)
+
+            with cls.__lock:
+                config = cls.__configCache.get(configKey)
+
+            if config is None:
+                config = ocio.Config.CreateFromFile(configFilePath)
+                with cls.__lock:
+                    cls.__configCache[configKey] = config
 
         # otherwise loading configuration from $OCIO environment variable
         elif 'OCIO' in os.environ:
@@ -41,3 +89,87 @@ class OcioTask(Task):
             )
 
         return config
+
+    @classmethod
+    def ocioProcessorFromFile(cls, configFilePath, sourceColorSpace, targetColorSpace, lut=''):
+        """
+        Return a cached OCIO CPU processor for the config file path (empty to use $OCIO).
+        """
+        import PyOpenColorIO as ocio
+
+        config = cls.ocioConfigFromFile(configFilePath)
+        processorKey = (config.getCacheID(), sourceColorSpace, targetColorSpace, lut)
+        with cls.__lock:
+            processor = cls.__processorCache.get(processorKey)
+
+        if processor is None:
+            transform = ocio.ColorSpaceTransform(
+                src=sourceColorSpace,
+                dst=targetColorSpace
+            )
+
+            # adding lut transform
+            if lut:
+                transform = ocio.GroupTransform([
+                    transform,
+                    ocio.FileTransform(
+                        lut,
+                        interpolation=ocio.INTERP_LINEAR
+                    )
+                ])
+
+            processor = config.getProcessor(transform).getDefaultCPUProcessor()
+            with cls.__lock:
+                cls.__processorCache[processorKey] = processor
+
+        return processor
+
+    @classmethod
+    def applyOcioProcessor(cls, processor, pixels):
+        """
+        Apply the CPU processor in place to the pixels (float32 numpy array: height, width, channels).
+
+        Images containing more than 4 channels only get the first 3 channels (RGB) transformed.
+        """
+        import numpy
+
+        if pixels.ndim != 3 or pixels.shape[2] < 3:
+            raise OcioTaskChannelsError(
+                'Color transformation requires at least 3 channels (RGB)'
+            )
+
+        assert pixels.dtype == numpy.float32 and pixels.flags['C_CONTIGUOUS'], \
+            "Pixels must be a contiguous float32 array!"
+
+        channels = pixels.shape[2]
+
+        def applyStrip(startRow):
+            strip = pixels[startRow:startRow + cls.__stripHeight]
+            if channels == 3:
+                processor.applyRGB(strip)
+            elif channels == 4:
+                processor.applyRGBA(strip)
+            else:
+                rgbStrip = numpy.ascontiguousarray(strip[..., :3])
+                processor.applyRGB(rgbStrip)
+                strip[..., :3] = rgbStrip
+
+        rows = range(0, pixels.shape[0], cls.__stripHeight)
+        if cls.__threads == 1 or len(rows) == 1:
+            for startRow in rows:
+                applyStrip(startRow)
+            return
+
+        # consuming the results to propagate the exceptions
+        list(cls.__sharedExecutor().map(applyStrip, rows))
+
+    @classmethod
+    def __sharedExecutor(cls):
+        """
+        Return the thread pool used to process the strips.
+        """
+        with cls.__lock:
+            if OcioTask.__executor is None:
+                OcioTask.__executor = ThreadPoolExecutor(max_workers=cls.__threads)
+
+            return OcioTask.__executor
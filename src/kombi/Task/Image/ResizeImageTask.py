@@ -1,6 +1,7 @@
 import os
 import multiprocessing
 from ..Task import Task
+from ...ImageReader import ImageReader
 
 class ResizeImageTask(Task):
     """
@@ -48,7 +49,7 @@ class ResizeImageTask(Task):
         os.makedirs(os.path.dirname(targetFilePath), exist_ok=True)
 
         # opening the source image to generate a resized image
-        inputImageBuf = oiio.ImageBuf(element.var('filePath'))
+        inputImageBuf = ImageReader.imageBuf(element.var('filePath'))
         inputSpec = inputImageBuf.spec()
 
         # output spec
@@ -1,10 +1,11 @@
 from .UpdateImageMetadataTask import UpdateImageMetadataTask
 from .ConvertImageTask import ConvertImageTask
-from .OcioTask import OcioTask, OcioTaskConfigurationError
+from .OcioTask import OcioTask, OcioTaskConfigurationError, OcioTaskChannelsError
 from .ResizeImageTask import ResizeImageTask
 from .ImageThumbnailTask import ImageThumbnailTask
 from .ColorTransformationTask import ColorTransformationTask
 from .ConvertTextureTask import ConvertTextureTask
 from .FileColorTransformationTask import FileColorTransformationTask
 from .LoadImageMetadataTask import LoadImageMetadataTask, LoadImageMetadataTaskError, LoadImageMetadataTaskNotFoundError
-from .FrameImageTask import FrameImageTask
\ No newline at end of file
+from .FrameImageTask import FrameImageTask
+from .ImagePipelineTask import ImagePipelineTask, ImagePipelineTaskError, ImagePipelineTaskInvalidOperationError
\ No newline at end of file
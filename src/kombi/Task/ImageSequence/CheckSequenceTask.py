@@ -1,7 +1,10 @@
 import os
 from fnmatch import fnmatch
+from concurrent.futures import ThreadPoolExecutor
 from ...Task import Task, TaskError
 from ...Element import Element
+from ...Element.Fs.Sequence import SequenceElement
+from ...ImageReader import ImageReader, ImageReaderError
 
 class CheckSequenceTaskError(TaskError):
     """Base check sequence task exception."""
@@ -24,6 +27,12 @@ class CheckSequenceTaskRequiredMetadataError(CheckSequenceTaskError):
 class CheckSequenceTask(Task):
     """
     Implements a task that verifies for common issues in image sequence elements.
+
+    Collapsed sequence elements (SequenceElement) are expanded to their frames
+    during the verification. The file sizes are queried by listing each directory
+    once and the required metadata is checked in parallel (KOMBI_CHECK_SEQUENCE_THREADS).
+    All the problems found are reported at once (when they are about different
+    checks CheckSequenceTaskError is raised).
     """
 
     __missingFrame = True
@@ -31,6 +40,7 @@ class CheckSequenceTask(Task):
     __requiredMetadata = []
     __totalFrames = -1
     __minimumFrames = 1
+    __threads = max(1, int(os.environ.get('KOMBI_CHECK_SEQUENCE_THREADS', 8)))
 
     def __init__(self, *args, **kwargs):
         """
@@ -61,15 +71,13 @@ class CheckSequenceTask(Task):
         """
         Implement the execution of the task.
         """
-        import OpenImageIO as oiio
-
-        for elementGroup in Element.group(self.elements()):
+        problems = []
+        metadataElements = []
+        directoryFileSizes = {}
+        for elementGroup in Element.group(SequenceElement.expandElements(self.elements())):
             # sorting elements by frame
             elementGroup.sort(key=lambda x: x.var('frame'))
 
-            previousFrame = None
-            previousElement = None
-
             # total frames check
             sequenceFullPath = os.path.join(
                 os.path.dirname(elementGroup[0].var('fullPath')),
@@ -78,73 +86,124 @@ class CheckSequenceTask(Task):
 
             # sequence total frames check
             if self.option("totalFrames") != -1 and len(elementGroup) != self.option("totalFrames"):
-                raise CheckSequenceTaskTotalFramesError(
+                problems.append((
+                    CheckSequenceTaskTotalFramesError,
                     "Sequence does not match the total number of frames. It requires '{}' and contains '{}':\n    {}".format(
                         self.option("totalFrames"),
                         len(elementGroup),
                         sequenceFullPath
                     )
-                )
+                ))
 
             # sequence minimum frames check
             if len(elementGroup) < self.option("minimumFrames"):
-                raise CheckSequenceTaskMinimumFileSizeError(
+                problems.append((
+                    CheckSequenceTaskMinimumFramesError,
                     "Sequence does not match the minimum number of frames. It requires as miminum '{}' and contains '{}':\n    {}".format(
                         self.option("minimumFrames"),
                         len(elementGroup),
                         sequenceFullPath
                     )
-                )
-
-            for index, element in enumerate(elementGroup):
-                # missing frame check
-                if self.option("missingFrame"):
-                    if previousFrame is None or element.var("frame") - previousFrame == 1:
-                        previousFrame = element.var("frame")
-                        previousElement = element
-                    else:
-                        raise CheckSequenceTaskMissingFrameError(
+                ))
+
+            # missing frame check (holes between consecutive frames of the sorted frames)
+            if self.option("missingFrame"):
+                frames = [element.var("frame") for element in elementGroup]
+                for index in range(1, len(frames)):
+                    if frames[index] - frames[index - 1] > 1:
+                        problems.append((
+                            CheckSequenceTaskMissingFrameError,
                             "Found missing frame(s) between:\n    {}\n    ???\n    {}".format(
-                                previousElement.var('fullPath'),
-                                element.var('fullPath')
+                                elementGroup[index - 1].var('fullPath'),
+                                elementGroup[index].var('fullPath')
                             )
-                        )
-
-                # minimum file size check
-                if self.option("minimumFileSize") != -1 and element.path().stat().st_size < self.option("minimumFileSize"):
-                    raise CheckSequenceTaskMinimumFileSizeError(
-                        "Frame file size does not match the minimum required size (perhaps corruped):\n    {}".format(
-                            element.var('fullPath')
-                        )
-                    )
-
-                # minimum file size check
-                if self.option("minimumFileSize") != -1 and element.path().stat().st_size < self.option("minimumFileSize"):
-                    raise CheckSequenceTaskMinimumFileSizeError(
-                        "Frame file size does not match the minimum required size (perhaps corruped):\n    {}".format(
-                            element.var('fullPath')
-                        )
-                    )
-
-                # required metadata check
-                for requiredMetadata in self.option("requiredMetadata"):
-                    inputSpec = oiio.ImageInput.open(element.var("fullPath")).spec()
-
-                    found = False
-                    for attribute in inputSpec.extra_attribs:
-                        if fnmatch(attribute.name, requiredMetadata):
-                            found = True
-                            break
-                    if not found:
-                        raise CheckSequenceTaskRequiredMetadataError(
-                            "Could not find the required metadata name '{}' in the frame:\n    {}".format(
-                                attribute,
+                        ))
+
+            # minimum file size check (the directory is listed once)
+            if self.option("minimumFileSize") != -1:
+                for element in elementGroup:
+                    directory, fileName = os.path.split(element.var('fullPath'))
+                    if directory not in directoryFileSizes:
+                        directoryFileSizes[directory] = self.__fileSizes(directory)
+
+                    if directoryFileSizes[directory].get(fileName, 0) < self.option("minimumFileSize"):
+                        problems.append((
+                            CheckSequenceTaskMinimumFileSizeError,
+                            "Frame file size does not match the minimum required size (perhaps corruped):\n    {}".format(
                                 element.var('fullPath')
                             )
-                        )
+                        ))
+
+            if self.option("requiredMetadata"):
+                metadataElements += elementGroup
+
+        # required metadata check (the frames are opened once in parallel)
+        if metadataElements:
+            requiredMetadata = list(self.option("requiredMetadata"))
+            with ThreadPoolExecutor(max_workers=self.__threads) as executor:
+                for metadataProblems in executor.map(lambda x: self.__checkMetadata(x, requiredMetadata), metadataElements):
+                    problems += metadataProblems
+
+        # reporting all the problems at once
+        if problems:
+            problemTypes = set(map(lambda x: x[0], problems))
+            raise (problemTypes.pop() if len(problemTypes) == 1 else CheckSequenceTaskError)(
+                "Found {} problem(s):\n{}".format(
+                    len(problems),
+                    '\n'.join(map(lambda x: x[1], problems))
+                )
+            )
 
         return self.elements()
 
+    @classmethod
+    def __fileSizes(cls, directory):
+        """
+        Return a dictionary containing the size of the files found in the directory.
+        """
+        result = {}
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        result[entry.name] = entry.stat().st_size
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+
+        return result
+
+    @classmethod
+    def __checkMetadata(cls, element, requiredMetadata):
+        """
+        Return a list of problems about the required metadata not found in the frame.
+        """
+        # only the header is read (shared with the other readers through the image cache)
+        try:
+            attributeNames = [attribute.name for attribute in ImageReader.spec(element.var("fullPath")).extra_attribs]
+        except ImageReaderError as err:
+            return [(
+                CheckSequenceTaskRequiredMetadataError,
+                "Could not read the metadata from the frame:\n    {}\n    {}".format(
+                    element.var('fullPath'),
+                    err
+                )
+            )]
+
+        result = []
+        for metadataName in requiredMetadata:
+            if not any(fnmatch(attributeName, metadataName) for attributeName in attributeNames):
+                result.append((
+                    CheckSequenceTaskRequiredMetadataError,
+                    "Could not find the required metadata name '{}' in the frame:\n    {}".format(
+                        metadataName,
+                        element.var('fullPath')
+                    )
+                ))
+
+        return result
+
 
 # registering task
 Task.register(
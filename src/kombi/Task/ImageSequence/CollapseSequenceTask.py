@@ -0,0 +1,32 @@
+from ...Task import Task
+from ...Element.Fs.Sequence import SequenceElement
+
+class CollapseSequenceTask(Task):
+    """
+    Implements a task that collapses image sequence frame elements into sequence elements.
+
+    Each sequence results in a single element (SequenceElement) describing the
+    entire frame range. Elements that are not part of a sequence are passed
+    through (they are included in the result as they are).
+    """
+
+    def _perform(self):
+        """
+        Implement the execution of the task.
+        """
+        sequenceElements = []
+        result = []
+        for element in self.elements():
+            if 'group' in element.tagNames() and 'frame' in element.varNames():
+                sequenceElements.append(element)
+            else:
+                result.append(element)
+
+        return SequenceElement.createFromElements(sequenceElements) + result
+
+
+# registering task
+Task.register(
+    'collapseSequence',
+    CollapseSequenceTask
+)
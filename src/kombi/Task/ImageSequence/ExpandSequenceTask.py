@@ -0,0 +1,23 @@
+from ...Task import Task
+from ...Element.Fs.Sequence import SequenceElement
+
+class ExpandSequenceTask(Task):
+    """
+    Implements a task that expands sequence elements (SequenceElement) into their frame elements.
+
+    Useful for tasks that only operate on individual frames. Elements that are
+    not sequence elements are passed through.
+    """
+
+    def _perform(self):
+        """
+        Implement the execution of the task.
+        """
+        return SequenceElement.expandElements(self.elements())
+
+
+# registering task
+Task.register(
+    'expandSequence',
+    ExpandSequenceTask
+)
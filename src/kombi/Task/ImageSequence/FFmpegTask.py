@@ -1,18 +1,57 @@
 import os
+import math
+import shutil
+import threading
 import subprocess
-from collections import OrderedDict
-from ..Task import Task
+import multiprocessing
+from itertools import islice
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from ..Task import Task, TaskError
+from ..Image.OcioTask import OcioTask
+from ...Element.Fs.Sequence import SequenceElement
+
+class FFmpegTaskError(TaskError):
+    """FFmpeg task error."""
 
 class FFmpegTask(Task):
     """
     Abstracted ffmpeg task.
 
+    The input can be either the image sequence frame elements or a collapsed
+    sequence element (SequenceElement).
+
+    Segmented encoding:
+        When "segmented" is enabled, long sequences are split in GOP aligned
+        segments ("segmentFrames" rounded up to a multiple of "gopSize", by
+        default the frame rate) encoded in parallel (KOMBI_FFMPEG_SEGMENT_WORKERS)
+        and concatenated without re-encoding through the ffmpeg concat demuxer.
+        The cores are split between the segments encoded at the same time
+        (passed to each encoder through "-threads").
+        Sequences containing missing frames are encoded by a single process.
+
+    Piped frames:
+        When "pipeFrames" is enabled, the frames are decoded in memory by reader
+        threads (KOMBI_FFMPEG_PIPE_READERS), optionally transformed through OCIO
+        ("pipeOcioConfig", "pipeOcioSourceColorSpace", "pipeOcioTargetColorSpace"
+        and "pipeOcioLut") and streamed to ffmpeg as raw video (16 bits RGB), so
+        the converted frames are never written to disk. The frames decoded ahead
+        of the encoder are bounded by "pipeQueueSize". The piped frames are
+        encoded by a single process.
+
+    Progress:
+        A callback can be assigned through setProgressCallback, it's called with
+        the target file path, the total of encoded frames and the total of frames.
+
     Options:
-        - optional: scale (float), videoCoded, pixelFormat and bitRate
+        - optional: scale (float), videoCoded, pixelFormat, bitRate, segmented,
+          segmentFrames, gopSize, pipeFrames, pipeQueueSize and pipeOcio options
         - required: sourceColorSpace, targetColorSpace and frameRate (float)
     """
 
     __ffmpegExecutable = os.environ.get('KOMBI_FFMPEG_EXECUTABLE', 'ffmpeg')
+    __segmentWorkers = max(1, int(os.environ.get('KOMBI_FFMPEG_SEGMENT_WORKERS', 4)))
+    __pipeReaders = max(1, int(os.environ.get('KOMBI_FFMPEG_PIPE_READERS', 4)))
 
     def __init__(self, *args, **kwargs):
         """
@@ -29,6 +68,47 @@ class FFmpegTask(Task):
         self.setOption('targetColorSpace', "bt709")
         self.setOption('frameRate', 23.976)
 
+        # segmented encoding (gopSize 0 means the frame rate rounded)
+        self.setOption('segmented', False)
+        self.setOption('segmentFrames', 500)
+        self.setOption('gopSize', 0)
+
+        # frames decoded (and color transformed) in memory streamed to ffmpeg
+        self.setOption('pipeFrames', False)
+        self.setOption('pipeQueueSize', 8)
+        self.setOption('pipeOcioConfig', '')
+        self.setOption('pipeOcioSourceColorSpace', '')
+        self.setOption('pipeOcioTargetColorSpace', '')
+        self.setOption('pipeOcioLut', '')
+
+        self.__progressCallback = None
+
+    def setProgressCallback(self, callback):
+        """
+        Set a callback called during the encoding (targetFilePath, encodedFrames, totalFrames).
+        """
+        self.__progressCallback = callback
+
+    def progressCallback(self):
+        """
+        Return the callback called during the encoding (None when not defined).
+        """
+        return self.__progressCallback
+
+    @classmethod
+    def ffmpegExecutable(cls):
+        """
+        Return the ffmpeg executable.
+        """
+        return cls.__ffmpegExecutable
+
+    @classmethod
+    def setFFmpegExecutable(cls, ffmpegExecutable):
+        """
+        Change the ffmpeg executable.
+        """
+        cls.__ffmpegExecutable = ffmpegExecutable
+
     def _perform(self):
         """
         Perform the task.
@@ -45,102 +125,286 @@ class FFmpegTask(Task):
 
         # calling ffmpeg
         for movFile in movFiles.keys():
-            sequenceElements = movFiles[movFile]
-            element = sequenceElements[0]
-
-            # executing ffmpeg
-            self.__executeFFmpeg(
-                sequenceElements,
+            self.__encode(
+                movFiles[movFile],
                 movFile
             )
 
         # default result based on the target filePath
         return super(FFmpegTask, self)._perform()
 
-    def __executeFFmpeg(self, sequenceElements, outputFilePath):
+    def __encode(self, sequenceElements, outputFilePath):
         """
-        Execute ffmpeg.
+        Encode the sequence to the output file path (segmented when enabled).
         """
         element = sequenceElements[0]
-        startFrame = element.var('frame')
+        frameFilePaths = self.__frameFilePaths(sequenceElements)
+        frames = list(frameFilePaths.keys())
+
+        # trying to create the directory automatically in case
+        # it does not exist yet
+        os.makedirs(os.path.dirname(outputFilePath), exist_ok=True)
+
+        if int(self.option('pipeFrames')):
+            self.__executePipedFFmpeg(
+                element,
+                outputFilePath,
+                list(frameFilePaths.values()),
+                progress=self.__progress(outputFilePath, len(frames))
+            )
+            return
+
+        segmentFrames = int(self.option('segmentFrames'))
+        gopSize = int(self.option('gopSize')) or max(1, int(round(float(self.option('frameRate')))))
+        segmentFrames = int(math.ceil(segmentFrames / float(gopSize))) * gopSize
+
+        # the segments are only used when the sequence is longer than a segment
+        # and does not have missing frames (ffmpeg stops reading at the first missing frame)
+        isContiguous = frames == list(range(frames[0], frames[0] + len(frames)))
+        if not int(self.option('segmented')) or not isContiguous or len(frames) <= segmentFrames:
+            self.__executeFFmpeg(
+                element,
+                outputFilePath,
+                self.__sequenceInputArguments(element, frames[0]),
+                progress=self.__progress(outputFilePath, len(frames))
+            )
+            return
+
+        segmentsDirectory = os.path.join(
+            os.path.dirname(outputFilePath),
+            '.{}_segments'.format(os.path.basename(outputFilePath))
+        )
+        os.makedirs(segmentsDirectory, exist_ok=True)
+
+        # the segments are removed even when the encoding fails
+        try:
+            segments = []
+            for index, startIndex in enumerate(range(0, len(frames), segmentFrames)):
+                segments.append((
+                    os.path.join(
+                        segmentsDirectory,
+                        'segment_{:05d}{}'.format(index, os.path.splitext(outputFilePath)[1])
+                    ),
+                    frames[startIndex],
+                    min(segmentFrames, len(frames) - startIndex)
+                ))
+
+            progress = self.__progress(outputFilePath, len(frames))
+            segmentWorkers = min(self.__segmentWorkers, len(segments))
 
+            # splitting the cores between the segments, otherwise each encoder
+            # would use all of them
+            encoderThreads = max(1, multiprocessing.cpu_count() // segmentWorkers)
+            with ThreadPoolExecutor(max_workers=segmentWorkers) as executor:
+                futures = [
+                    executor.submit(
+                        self.__executeFFmpeg,
+                        element,
+                        segmentFilePath,
+                        self.__sequenceInputArguments(element, startFrame) + ['-frames:v', str(totalFrames)],
+                        gopSize,
+                        progress,
+                        encoderThreads=encoderThreads
+                    ) for segmentFilePath, startFrame, totalFrames in segments
+                ]
+
+                # propagating the errors
+                for future in futures:
+                    future.result()
+
+            # concatenating the segments without re-encoding them
+            concatFilePath = os.path.join(segmentsDirectory, 'concat.txt')
+            with open(concatFilePath, 'w') as f:
+                for segmentFilePath, _, _ in segments:
+                    f.write("file '{}'\n".format(segmentFilePath.replace("'", "'\\''")))
+
+            self.__run(
+                [
+                    '-loglevel', 'error',
+                    '-f', 'concat',
+                    '-safe', '0',
+                    '-i', concatFilePath,
+                    '-c', 'copy',
+                    '-y', outputFilePath
+                ]
+            )
+        finally:
+            shutil.rmtree(segmentsDirectory, ignore_errors=True)
+
+    def __sequenceInputArguments(self, element, startFrame):
+        """
+        Return the ffmpeg arguments used to read the image sequence starting at the start frame.
+        """
         # building an image sequence name that ffmpeg understands that is a file
         # sequence (aka foo.%04d.ext)
         inputSequence = os.path.join(
             os.path.dirname(element.var('filePath')),
-            '{name}.%0{padding}d.{ext}'.format(
-                name=element.var('name'),
-                padding=element.var('padding'),
-                ext=element.var('ext')
+            element.tag(
+                'groupSprintf',
+                '{name}.%0{padding}d.{ext}'.format(
+                    name=element.var('name'),
+                    padding=element.var('padding'),
+                    ext=element.var('ext')
+                )
             )
         )
 
-        # trying to create the directory automatically in case it
-        # does not exist yet
-        try:
-            os.makedirs(
-                os.path.dirname(
-                    outputFilePath
-                )
+        return [
+            # frame rate
+            '-framerate', str(self.option('frameRate')),
+            # start frame
+            '-start_number', str(startFrame),
+            # input sequence
+            '-i', inputSequence
+        ]
+
+    def __executePipedFFmpeg(self, element, outputFilePath, frameFilePaths, progress=None):
+        """
+        Execute ffmpeg streaming the frames decoded in memory as raw video.
+        """
+        import OpenImageIO as oiio
+        from ...ImageReader import ImageReader
+
+        spec = ImageReader.spec(frameFilePaths[0])
+        width = spec.width
+        height = spec.height
+
+        processor = None
+        if self.option('pipeOcioTargetColorSpace'):
+            processor = OcioTask.ocioProcessorFromFile(
+                self.option('pipeOcioConfig'),
+                self.option('pipeOcioSourceColorSpace'),
+                self.option('pipeOcioTargetColorSpace'),
+                self.option('pipeOcioLut')
             )
-        except OSError:
-            pass
 
+        def decodeFrame(frameFilePath):
+            import numpy
+
+            imageInput = oiio.ImageInput.open(frameFilePath)
+            if imageInput is None:
+                raise FFmpegTaskError(
+                    "Can't read the frame:\n{}\n{}".format(
+                        frameFilePath,
+                        oiio.geterror()
+                    )
+                )
+
+            try:
+                pixels = imageInput.read_image(oiio.FLOAT)
+            finally:
+                imageInput.close()
+
+            if pixels.shape[0] != height or pixels.shape[1] != width:
+                raise FFmpegTaskError(
+                    'Frame resolution {}x{} does not match the sequence resolution {}x{}:\n{}'.format(
+                        pixels.shape[1],
+                        pixels.shape[0],
+                        width,
+                        height,
+                        frameFilePath
+                    )
+                )
+
+            # raw video expects RGB (a single channel is used as luminance)
+            if pixels.shape[2] == 1:
+                pixels = numpy.repeat(pixels, 3, axis=2)
+            else:
+                pixels = numpy.ascontiguousarray(pixels[..., :3])
+
+            if processor is not None:
+                OcioTask.applyOcioProcessor(processor, pixels)
+
+            return (numpy.clip(pixels, 0.0, 1.0) * 65535.0 + 0.5).astype('<u2').tobytes()
+
+        def writeFrames(stdin):
+            # the frames are decoded ahead by the readers, bounded by the queue size
+            queueSize = max(1, int(self.option('pipeQueueSize')))
+            frameFilePathsIter = iter(frameFilePaths)
+            with ThreadPoolExecutor(max_workers=self.__pipeReaders) as executor:
+                pending = deque(executor.submit(decodeFrame, x) for x in islice(frameFilePathsIter, queueSize))
+                while pending:
+                    stdin.write(pending.popleft().result())
+                    for frameFilePath in islice(frameFilePathsIter, 1):
+                        pending.append(executor.submit(decodeFrame, frameFilePath))
+
+        self.__executeFFmpeg(
+            element,
+            outputFilePath,
+            [
+                '-f', 'rawvideo',
+                '-pix_fmt', 'rgb48le',
+                '-s', '{}x{}'.format(width, height),
+                '-framerate', str(self.option('frameRate')),
+                '-i', 'pipe:0'
+            ],
+            progress=progress,
+            stdinWriter=writeFrames
+        )
+
+    def __executeFFmpeg(
+        self,
+        element,
+        outputFilePath,
+        inputArguments,
+        gopSize=None,
+        progress=None,
+        stdinWriter=None,
+        encoderThreads=None
+    ):
+        """
+        Execute ffmpeg encoding the input to the output file path.
+        """
         # arguments passed to ffmpeg
         arguments = [
             # error level
-            '-loglevel error',
-            # frame rate
-            '-framerate {0}'.format(
-                self.option('frameRate')
-            ),
-            # start frame
-            '-start_number {0}'.format(
-                startFrame
-            ),
-            # input sequence
-            '-i "{0}"'.format(
-                inputSequence
-            ),
+            '-loglevel', 'error'
+        ] + inputArguments
+
+        # keyframe interval (the segments are aligned to it)
+        if gopSize is not None:
+            arguments += ['-g', str(gopSize)]
+
+        # amount of threads used by the encoder (by default ffmpeg picks it based on the cores)
+        if encoderThreads is not None:
+            arguments += ['-threads', str(encoderThreads)]
+
+        arguments += [
             # video codec
-            '-vcodec {0}'.format(
-                self.option('videoCodec')
-            ),
+            '-vcodec', str(self.option('videoCodec')),
             # bit rate
-            '-b {0}M -minrate {0}M -maxrate {0}M'.format(
-                self.option('bitRate')
-            ),
+            '-b', '{}M'.format(self.option('bitRate')),
+            '-minrate', '{}M'.format(self.option('bitRate')),
+            '-maxrate', '{}M'.format(self.option('bitRate')),
             # target color
-            '-color_primaries {0}'.format(
-                self.option('targetColorSpace')
-            ),
-            '-colorspace {0}'.format(
-                self.option('targetColorSpace')
-            ),
+            '-color_primaries', str(self.option('targetColorSpace')),
+            '-colorspace', str(self.option('targetColorSpace')),
             # source color
-            '-color_trc {0}'.format(
-                self.option('sourceColorSpace')
-            ),
+            '-color_trc', str(self.option('sourceColorSpace')),
             # pixel format
-            '-pix_fmt {0}'.format(
-                self.option('pixelFormat')
-            ),
+            '-pix_fmt', str(self.option('pixelFormat')),
             # resolution
-            '-vf scale={0}:{1}'.format(
+            '-vf', 'scale={0}:{1}'.format(
                 self.option('width', element),
                 self.option('height', element)
             ),
             # target mov file
-            '-y "{0}"'.format(
-                outputFilePath
-            )
+            '-y', outputFilePath
         ]
 
-        # ffmpeg command
-        ffmpegCommand = '{} {}'.format(
-            self.__ffmpegExecutable,
-            ' '.join(arguments),
-        )
+        self.__run(arguments, progress, stdinWriter)
+
+    def __run(self, arguments, progress=None, stdinWriter=None):
+        """
+        Run ffmpeg with the arguments raising FFmpegTaskError when it fails.
+
+        The progress is reported through "-progress pipe:1" (the total of encoded frames is passed to the progress callable).
+        The stdin writer (when specified) is called on a separated thread with the stdin of the process.
+        """
+        command = [self.__ffmpegExecutable]
+        if progress is not None:
+            command += ['-progress', 'pipe:1', '-nostats']
+        command += arguments
 
         # calling ffmpeg
         env = dict(os.environ)
@@ -151,19 +415,99 @@ class FFmpegTask(Task):
             del env['LD_LIBRARY_PATH']
 
         process = subprocess.Popen(
-            ffmpegCommand,
+            command,
+            stdin=subprocess.PIPE if stdinWriter else subprocess.DEVNULL,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
-            env=env,
-            shell=True
+            env=env
         )
 
-        # capturing the output
-        output, error = process.communicate()
+        # the errors are read in parallel, so ffmpeg does not block writing them
+        errorLines = []
+        errorThread = threading.Thread(
+            target=lambda: errorLines.extend(process.stderr.read().decode('utf-8', errors='ignore').splitlines())
+        )
+        errorThread.start()
+
+        stdinErrors = []
+        stdinThread = None
+        if stdinWriter:
+            def writeStdin():
+                try:
+                    stdinWriter(process.stdin)
+                except Exception as err:
+                    stdinErrors.append(err)
+
+                    # ffmpeg should not wait for more data
+                    process.kill()
+                finally:
+                    try:
+                        process.stdin.close()
+                    except OSError:
+                        pass
+
+            stdinThread = threading.Thread(target=writeStdin)
+            stdinThread.start()
+
+        encodedFrames = 0
+        for line in process.stdout:
+            key, _, value = line.decode('utf-8', errors='ignore').strip().partition('=')
+            if progress is not None and key == 'frame' and value.isdigit():
+                progress(int(value) - encodedFrames)
+                encodedFrames = int(value)
+
+        errorThread.join()
+        if stdinThread:
+            stdinThread.join()
+        process.wait()
+        process.stdout.close()
+        process.stderr.close()
+
+        # failing to provide the input (a broken pipe is a consequence of ffmpeg failing instead)
+        if stdinErrors and not isinstance(stdinErrors[0], BrokenPipeError):
+            raise stdinErrors[0]
 
         # in case of any errors
-        if error:
-            raise Exception(error)
+        if process.returncode != 0:
+            raise FFmpegTaskError(
+                'FFmpeg failed (exit code {}) running: {}\n{}'.format(
+                    process.returncode,
+                    ' '.join(command),
+                    '\n'.join(errorLines[-20:])
+                )
+            )
+
+    def __progress(self, outputFilePath, totalFrames):
+        """
+        Return a callable used to accumulate the encoded frames reported by the ffmpeg processes (None without a callback).
+        """
+        if self.__progressCallback is None:
+            return None
+
+        lock = threading.Lock()
+        encodedFrames = [0]
+
+        def progress(newFrames):
+            with lock:
+                encodedFrames[0] += newFrames
+                self.__progressCallback(outputFilePath, encodedFrames[0], totalFrames)
+
+        return progress
+
+    @classmethod
+    def __frameFilePaths(cls, sequenceElements):
+        """
+        Return an ordered dictionary containing the file path of each frame (sorted by frame).
+        """
+        frameFilePaths = {}
+        for element in sequenceElements:
+            if isinstance(element, SequenceElement):
+                for frame in element.frames():
+                    frameFilePaths[frame] = element.framePath(frame)
+            else:
+                frameFilePaths[element.var('frame')] = element.var('filePath')
+
+        return OrderedDict(sorted(frameFilePaths.items()))
 
 
 # registering task
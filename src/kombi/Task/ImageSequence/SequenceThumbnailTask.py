@@ -1,9 +1,14 @@
 from collections import OrderedDict
 from ..Task import Task
+from ...Element.Fs.Sequence import SequenceElement
 
 class SequenceThumbnailTask(Task):
     """
     Creates a thumbnail for the image sequence.
+
+    The input can be either the image sequence frame elements or a collapsed
+    sequence element (SequenceElement), in this case only the frame used
+    by the thumbnail is created.
     """
 
     __defaultWidth = 640
@@ -35,6 +40,9 @@ class SequenceThumbnailTask(Task):
         # generating a thumbnail for the sequence
         for targetThumbnail, thumbnailElements in targetThumbnails.items():
             thumbnailElement = thumbnailElements[int(len(thumbnailElements) / 2)]
+            if isinstance(thumbnailElement, SequenceElement):
+                frames = thumbnailElement.frames()
+                thumbnailElement = thumbnailElement.frameElement(frames[int(len(frames) / 2)])
 
             # creating a thumbnail for the image sequence
             imageThumbnailTask = Task.create('imageThumbnail')
@@ -1,4 +1,4 @@
-from .FFmpegTask import FFmpegTask
+from .FFmpegTask import FFmpegTask, FFmpegTaskError
 from .SequenceThumbnailTask import SequenceThumbnailTask
 from .GafferSceneTask import GafferSceneTask
 from .NukeTemplateTask import NukeTemplateTask
@@ -7,3 +7,5 @@ from .SliceSequenceTask import SliceSequenceTask
 from .SequenceInfoTask import SequenceInfoTask
 from .ModifyOutputTask import ModifyOutputTask
 from .CheckSequenceTask import CheckSequenceTask, CheckSequenceTaskError, CheckSequenceTaskTotalFramesError, CheckSequenceTaskMissingFrameError, CheckSequenceTaskMinimumFramesError, CheckSequenceTaskRequiredMetadataError, CheckSequenceTaskMinimumFileSizeError
+from .CollapseSequenceTask import CollapseSequenceTask
+from .ExpandSequenceTask import ExpandSequenceTask
@@ -1,3 +1,4 @@
+import os
 import sys
 from ..External.GafferTask import GafferTask
 from ...Element import Element
@@ -7,6 +8,8 @@ class GafferRenderTask(GafferTask):
     Render the task nodes in gaffer.
     """
 
+    __loadedScripts = {}
+
     def __init__(self, *args, **kwargs):
         """
         Create a gaffer render task.
@@ -77,49 +80,89 @@ class GafferRenderTask(GafferTask):
         import GafferDispatch
         elements = self.elements()
 
-        # loading gaffer scene
-        script = Gaffer.ScriptNode()
-        script['fileName'].setValue(self.option('scene'))
-        script.load()
-
-        # switching
-        for switchName, switchValue in self.option('switchBeforeRender').items():
-            sys.stdout.write('Switching {} to {}\n'.format(switchName, switchValue))
-            sys.stdout.flush()
-            script.getChild(str(switchName))['index'].setValue(int(switchValue))
-
-        nodes = script.children(GafferDispatch.TaskNode)
-        for elementGroup in Element.group(elements):
-            taskNodeName = elementGroup[0]['name']
-            startFrame = elementGroup[0]['startFrame']
-            endFrame = elementGroup[-1]['endFrame']
-
-            script['frameRange']['start'].setValue(startFrame)
-            script['frameRange']['end'].setValue(endFrame)
-
-            # adding context variables and executing task nodes
-            with Gaffer.Context(script.context()) as context:
-
-                for frame in range(startFrame, endFrame + 1):
-                    context.setFrame(frame)
-
-                    foundNode = False
-                    for node in nodes:
-                        if taskNodeName == node.getName():
-                            # disabling crop window
-                            for standardOptions in self.collectAncestors(node, GafferScene.StandardOptions):
-                                standardOptions['options']['renderCropWindow']['enabled'].setValue(False)
+        # loading gaffer scene (when running as a session the scene loaded
+        # by a previous task is reused as long as the file has not changed)
+        sceneKey = (self.option('scene'), os.path.getmtime(self.option('scene')))
+        script = self.__loadedScripts.get(sceneKey)
+        if script is None:
+            script = Gaffer.ScriptNode()
+            script['fileName'].setValue(self.option('scene'))
+            script.load()
+
+        # the plugs changed by the task (switches, frame range and crop window) are
+        # restored afterwards, so the next task reusing the script in a session
+        # starts from the values stored in the file
+        self.__loadedScripts.clear()
+        touchedPlugs = []
+        try:
+            # switching
+            for switchName, switchValue in self.option('switchBeforeRender').items():
+                sys.stdout.write('Switching {} to {}\n'.format(switchName, switchValue))
+                sys.stdout.flush()
+                self.__setPlugValue(script.getChild(str(switchName))['index'], int(switchValue), touchedPlugs)
+
+            nodes = script.children(GafferDispatch.TaskNode)
+            elementGroups = Element.group(elements)
+            totalFrames = sum((group[-1]['endFrame'] - group[0]['startFrame']) + 1 for group in elementGroups)
+            renderedFrames = 0
+            for elementGroup in elementGroups:
+                taskNodeName = elementGroup[0]['name']
+                startFrame = elementGroup[0]['startFrame']
+                endFrame = elementGroup[-1]['endFrame']
+
+                self.__setPlugValue(script['frameRange']['start'], startFrame, touchedPlugs)
+                self.__setPlugValue(script['frameRange']['end'], endFrame, touchedPlugs)
+
+                # adding context variables and executing task nodes
+                with Gaffer.Context(script.context()) as context:
+
+                    for frame in range(startFrame, endFrame + 1):
+                        context.setFrame(frame)
+
+                        foundNode = False
+                        for node in nodes:
+                            if taskNodeName == node.getName():
+                                # disabling crop window
+                                for standardOptions in self.collectAncestors(node, GafferScene.StandardOptions):
+                                    self.__setPlugValue(standardOptions['options']['renderCropWindow']['enabled'], False, touchedPlugs)
+
+                                # rendering
+                                node['task'].execute()
+                                foundNode = True
+                                break
+
+                        assert foundNode, "Could not find task node: {}".format(
+                            taskNodeName
+                        )
+
+                        renderedFrames += 1
+                        sys.stdout.write(
+                            "\nALF_PROGRESS {}%\n".format(
+                                int((renderedFrames / float(totalFrames)) * 100.0)
+                            )
+                        )
+                        sys.stdout.flush()
+        finally:
+            try:
+                for plug, originalValue in reversed(touchedPlugs):
+                    plug.setValue(originalValue)
+            except Exception:
+                # the script gets loaded again by the next task
+                pass
+            else:
+                self.__loadedScripts[sceneKey] = script
 
-                            # rendering
-                            node['task'].execute()
-                            foundNode = True
-                            break
+        return self.elements()
 
-                    assert foundNode, "Could not find task node: {}".format(
-                        taskNodeName
-                    )
+    @staticmethod
+    def __setPlugValue(plug, value, touchedPlugs):
+        """
+        Set the value of the plug recording its original value (only the first time it gets changed).
+        """
+        if not any(touchedPlug.fullName() == plug.fullName() for touchedPlug, _ in touchedPlugs):
+            touchedPlugs.append((plug, plug.getValue()))
 
-        return self.elements()
+        plug.setValue(value)
 
     @classmethod
     def __renderHashmapElement(cls, gafferTask, startFrame, endFrame):
@@ -7,6 +7,8 @@ class HoudiniRenderTask(HoudiniTask):
     Render the task nodes in houdini.
     """
 
+    __loadedSceneKey = None
+
     def __init__(self, *args, **kwargs):
         """
         Create a houdini render task.
@@ -104,7 +106,14 @@ class HoudiniRenderTask(HoudiniTask):
             houdiniRopName = elementGroup[0].var('rop')
             scenePath = elementGroup[0].var('fullPathScene')
 
-            hou.hipFile.load(scenePath, ignore_load_warnings=True)
+            # when running as a session the scene loaded by a previous task is reused
+            # as long as the file has not changed and the scene has not been modified
+            # in memory
+            sceneKey = (os.path.normpath(scenePath), os.path.getmtime(scenePath))
+            if sceneKey != HoudiniRenderTask.__loadedSceneKey or \
+                    os.path.normpath(hou.hipFile.path()) != sceneKey[0] or hou.hipFile.hasUnsavedChanges():
+                hou.hipFile.load(scenePath, suppress_save_prompt=True, ignore_load_warnings=True)
+                HoudiniRenderTask.__loadedSceneKey = sceneKey
             print("Rendering: ", scenePath, "Rop:", houdiniRopName)
             ropNode = hou.node(houdiniRopName)
 
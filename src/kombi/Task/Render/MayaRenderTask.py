@@ -188,6 +188,8 @@ class MayaRenderTask(MayaTask):
         seralizedTaskTempFile.write(self.toJson())
         seralizedTaskTempFile.close()
 
+        # the render executable is launched for every group (loading the scene
+        # again), even when the task is running as a session
         for elementGroup in Element.group(self.elements()):
             startFrame = elementGroup[0]['settings']['s']
             endFrame = elementGroup[-1]['settings']['e']
@@ -11,6 +11,8 @@ class NukeRenderTask(NukeTask):
     Render the write nodes in nuke.
     """
 
+    __loadedScriptKey = None
+
     def __init__(self, *args, **kwargs):
         """
         Create a nuke render task.
@@ -72,11 +74,29 @@ class NukeRenderTask(NukeTask):
         self.__totalFrames = 0
         self.__renderedFrames = 0
         nuke.addAfterFrameRender(self.__onAfterFrameRender)
+        try:
+            return self.__render(elements)
+        finally:
+            # nuke may be running as a session (the next tasks should not trigger this callback)
+            nuke.removeAfterFrameRender(self.__onAfterFrameRender)
+
+    def __render(self, elements):
+        """
+        Render the elements returning the created files.
+        """
+        import nuke
 
-        # loading nuke script
+        # loading nuke script (when running as a session the script loaded by a
+        # previous task is reused as long as the file has not changed and the
+        # script has not been modified in memory)
         script = self.option('script')
         if os.path.exists(script):
-            nuke.scriptOpen(script)
+            scriptKey = (os.path.normpath(script), os.path.getmtime(script))
+            if scriptKey != NukeRenderTask.__loadedScriptKey or \
+                    os.path.normpath(nuke.root().name()) != scriptKey[0] or nuke.root().modified():
+                nuke.scriptClear()
+                nuke.scriptOpen(script)
+                NukeRenderTask.__loadedScriptKey = scriptKey
 
         createdFiles = []
         for elementGroup in Element.group(elements):
@@ -2,6 +2,7 @@ import os
 import json
 import sys
 import copy
+import time
 from typing import List, Optional
 from collections import OrderedDict
 from ..ResourceLoader import ResourceLoader
@@ -9,6 +10,7 @@ from ..Element.Fs import FsElement
 from ..Element import Element
 from ..Template import Template
 from ..TaskReporter import TaskReporter
+from ..Tracer import Tracer
 from ..KombiError import KombiError
 
 # optional dependency
@@ -67,6 +69,7 @@ class Task(object):
         self.__taskType = taskType
         self.__options = OrderedDict()
         self.__currentElement = None
+        self.__reporter = None
 
     def type(self) -> str:
         """
@@ -307,30 +310,39 @@ class Task(object):
         self.validate(self.elements())
 
         # performing task
+        self.__reporter = reporter
         outputElements = []
+        try:
+            profiledExecution = False
+            if self.hasMetadata('output.profile') and self.metadata('output.profile'):
+                if not hasPyCallGraph:
+                    sys.stderr.write(
+                        'Error, unable to profile execution. The "pycallgraph" dependency is missing!\n'
+                    )
+                    sys.stderr.flush()
+                else:
+                    profiledExecution = True
+                    graphviz = pycallgraph.output.GraphvizOutput()
+                    graphviz.output_file = self.metadata('output.profile')
+                    graphviz.tool = self.__dotExecutable
+                    with pycallgraph.PyCallGraph(output=graphviz):
+                        outputElements.extend(self.__tracedPerform())
+
+                    sys.stdout.write(
+                        'Execution profile has been saved to: {}\n'.format(graphviz.output_file)
+                    )
+                    sys.stdout.flush()
 
-        profiledExecution = False
-        if self.hasMetadata('output.profile') and self.metadata('output.profile'):
-            if not hasPyCallGraph:
-                sys.stderr.write(
-                    'Error, unable to profile execution. The "pycallgraph" dependency is missing!\n'
-                )
-                sys.stderr.flush()
-            else:
-                profiledExecution = True
-                graphviz = pycallgraph.output.GraphvizOutput()
-                graphviz.output_file = self.metadata('output.profile')
-                graphviz.tool = self.__dotExecutable
-                with pycallgraph.PyCallGraph(output=graphviz):
-                    outputElements.extend(self._perform())
-
-                sys.stdout.write(
-                    'Execution profile has been saved to: {}\n'.format(graphviz.output_file)
-                )
-                sys.stdout.flush()
-
-        if not profiledExecution:
-            outputElements.extend(self._perform())
+            if not profiledExecution:
+                outputElements.extend(self.__tracedPerform())
+        except Exception:
+            # reporting the failed execution as well
+            if reporter:
+                reporter.setFailed(True)
+                reporter.displayFailure()
+            raise
+        finally:
+            self.__reporter = None
 
         # Copy all context variables to output elements
         for outputElement in outputElements:
@@ -353,19 +365,20 @@ class Task(object):
         """
         Clone the current task.
         """
-        clone = self.__class__(self.type())
+        with Tracer.span('task.clone', taskType=self.type(), elements=len(self.elements())):
+            clone = self.__class__(self.type())
 
-        # copying options
-        for optionName in self.optionNames():
-            clone.setOption(optionName, self.option(optionName))
+            # copying options
+            for optionName in self.optionNames():
+                clone.setOption(optionName, self.option(optionName))
 
-        # copying metadata
-        for metadataName in self.metadataNames():
-            clone.setMetadata(metadataName, self.metadata(metadataName))
+            # copying metadata
+            for metadataName in self.metadataNames():
+                clone.setMetadata(metadataName, self.metadata(metadataName))
 
-        # copying elements
-        for element in self.elements():
-            clone.add(element, self.target(element))
+            # copying elements
+            for element in self.elements():
+                clone.add(element, self.target(element))
 
         return clone
 
@@ -565,6 +578,25 @@ class Task(object):
             return FsElement.createFromPath(targetPath)
         return None
 
+    def _reportMetrics(self, bytesRead=0, bytesWritten=0, elementLatency=None):
+        """
+        Report metrics about the execution to the task reporter (does nothing when the task has no reporter).
+
+        Used by the tasks that know about the amount of bytes read/written and the time spent
+        processing each element (already reported by the default implementation of _perform).
+        """
+        if self.__reporter is None:
+            return
+
+        if bytesRead:
+            self.__reporter.addBytesRead(bytesRead)
+
+        if bytesWritten:
+            self.__reporter.addBytesWritten(bytesWritten)
+
+        if elementLatency is not None:
+            self.__reporter.addElementLatency(elementLatency)
+
     def _perform(self) -> List[Element]:
         """
         To be overridden: This method should implement the task computation and return a list of processed elements.
@@ -581,7 +613,9 @@ class Task(object):
         for element in self.elements():
             self.__currentElement = element
             targetPath = self.target(element)
+            startTime = time.perf_counter()
             resultElement = self._processElement(element)
+            self._reportMetrics(elementLatency=time.perf_counter() - startTime)
             # in case the target path is defined and it's the same, don't include the element
             # again to the result...
             if resultElement and targetPath not in alreadyAdded:
@@ -591,6 +625,16 @@ class Task(object):
 
         return result
 
+    def __tracedPerform(self):
+        """
+        Execute _perform recording a tracing span about it.
+        """
+        with Tracer.span('task.perform', taskType=self.type(), elements=len(self.elements())) as span:
+            result = self._perform()
+            span.setAttribute('outputElements', len(result))
+
+        return result
+
     def __optionElementLevels(self, data, currentPath):
         """
         Utility method recursively traverses through all levels of nested structures to find elements.
@@ -1,15 +1,27 @@
 import os
 import json
+import shutil
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from ..Task import Task
 from ...Template import Template
-from ...Element.Fs.FsElement import FsElement
 from .CreateVersionTask import CreateVersionTask
 
 class CreateIncrementalVersionTask(CreateVersionTask):
     """
     ABC for creating an incremental version.
+
+    The files from the incremental version (previous version by default) that
+    are not part of the current version are hardlinked in parallel
+    (KOMBI_INCREMENTAL_VERSION_THREADS). When the option "contentHashes" is
+    enabled the sha256 of each file is stored in "data.json", where the new files
+    with the same contents of a file from the incremental version are replaced
+    by a hardlink to it.
     """
 
+    __threads = max(1, int(os.environ.get('KOMBI_INCREMENTAL_VERSION_THREADS', 8)))
+    __hashChunkSize = 1024 * 1024
+
     def __init__(self, *args, **kwargs):
         """
         Create a version.
@@ -17,6 +29,7 @@ class CreateIncrementalVersionTask(CreateVersionTask):
         super(CreateIncrementalVersionTask, self).__init__(*args, **kwargs)
         self.setOption('incremental', True)
         self.setOption('incrementalSpecificVersion', 0)
+        self.setOption('contentHashes', False)
 
     def addFile(self, filePath, metadata=None):
         """
@@ -61,38 +74,53 @@ class CreateIncrementalVersionTask(CreateVersionTask):
         if not os.path.exists(incrementalVersionData):
             return
 
+        with open(incrementalVersionData) as f:
+            incrementalVersionContents = json.load(f)
+
+        # the new files with the same contents of a file from the incremental
+        # version are linked to it as well
+        if self.option('contentHashes'):
+            self.__linkSameContents(incrementalVersionPath, incrementalVersionContents)
+
         # getting all file paths from the current version
-        currentVersionRelativeFilePaths = list(map(
+        currentVersionRelativeFilePaths = set(map(
             lambda x: x[len(self.versionPath()) + 1:],
             self.files()
         ))
 
-        with open(incrementalVersionData) as f:
-            incrementalVersionContents = json.load(f)
-
+        incrementalFiles = []
         for fileEntry, fileMetadata in incrementalVersionContents.items():
 
             # file is part of the current version, skipping it
             if fileEntry in currentVersionRelativeFilePaths or fileMetadata['type'] in excludeTypes:
                 continue
 
-            sourceFile = os.path.join(incrementalVersionPath, fileEntry)
-            targetFile = os.path.join(self.versionPath(), fileEntry)
-
-            # making hardlink task
-            linkTask = Task.create('link')
-            linkTask.setOption(
-                'type',
-                'hardlink'
+            incrementalFiles.append(
+                (
+                    os.path.join(incrementalVersionPath, fileEntry),
+                    os.path.join(self.versionPath(), fileEntry),
+                    fileMetadata
+                )
             )
-            sourceElement = FsElement.createFromPath(sourceFile)
-            linkTask.add(sourceElement, targetFile)
-            # running task
-            linkTask.output()
 
-            # adding file to the version
+        self.__linkFiles([(sourceFile, targetFile) for sourceFile, targetFile, _ in incrementalFiles])
+
+        # adding files to the version
+        for _, targetFile, fileMetadata in incrementalFiles:
             self.addFile(targetFile, fileMetadata)
 
+    def addContentHashes(self):
+        """
+        Add the sha256 of the contents to the metadata of the files that don't have it yet.
+        """
+        filePaths = [filePath for filePath in self.files() if 'sha256' not in self.fileMetadata(filePath)]
+
+        with ThreadPoolExecutor(max_workers=self.__threads) as executor:
+            for filePath, contentHash in zip(filePaths, executor.map(self.__contentHash, filePaths)):
+                fileMetadata = self.fileMetadata(filePath)
+                fileMetadata['sha256'] = contentHash
+                self.addFile(filePath, fileMetadata)
+
     def _perform(self, incrementalExcludeTypes=[]):
         """
         Perform the task.
@@ -108,6 +136,9 @@ class CreateIncrementalVersionTask(CreateVersionTask):
 
             self.addIncrementalFiles(incrementalVersion, incrementalExcludeTypes)
 
+        if self.option('contentHashes'):
+            self.addContentHashes()
+
         # source version info
         sourceVersions = set()
         for metadata in list(map(self.fileMetadata, self.files())):
@@ -117,6 +148,86 @@ class CreateIncrementalVersionTask(CreateVersionTask):
         # calling super class
         return super(CreateIncrementalVersionTask, self)._perform()
 
+    def __linkSameContents(self, incrementalVersionPath, incrementalVersionContents):
+        """
+        Replace the new files by a hardlink to the file from the incremental version with the same contents.
+        """
+        incrementalContentHashes = {}
+        for fileEntry, fileMetadata in incrementalVersionContents.items():
+            if 'sha256' in fileMetadata:
+                incrementalContentHashes[(fileMetadata['sha256'], fileMetadata['size'])] = (fileEntry, fileMetadata)
+
+        if not incrementalContentHashes:
+            return
+
+        self.addContentHashes()
+        for filePath in self.files():
+            fileMetadata = self.fileMetadata(filePath)
+            contentKey = (fileMetadata['sha256'], fileMetadata['size'])
+            if fileMetadata['sourceVersion'] != self.version() or contentKey not in incrementalContentHashes:
+                continue
+
+            fileEntry, incrementalFileMetadata = incrementalContentHashes[contentKey]
+            sourceFile = os.path.join(incrementalVersionPath, fileEntry)
+
+            # linking to a temporary file first, so the published file
+            # is kept in case the link fails
+            temporaryFile = '{}.incremental'.format(filePath)
+            try:
+                os.link(sourceFile, temporaryFile)
+                os.replace(temporaryFile, filePath)
+            except OSError:
+                if os.path.exists(temporaryFile):
+                    os.remove(temporaryFile)
+                continue
+
+            fileMetadata['sourceVersion'] = incrementalFileMetadata.get('sourceVersion', self.version())
+            self.addFile(filePath, fileMetadata)
+
+    @classmethod
+    def __linkFiles(cls, links):
+        """
+        Hardlink the source files to the target files (source, target) in parallel.
+        """
+        # creating each target directory only once
+        for targetDirectory in sorted(set(os.path.dirname(targetFile) for _, targetFile in links)):
+            os.makedirs(targetDirectory, exist_ok=True)
+
+        with ThreadPoolExecutor(max_workers=cls.__threads) as executor:
+            list(executor.map(cls.__linkFile, links))
+
+    @staticmethod
+    def __linkFile(link):
+        """
+        Hardlink the source file to the target file (falling back to a copy when it fails).
+        """
+        sourceFile, targetFile = link
+        try:
+            os.link(sourceFile, targetFile)
+            return
+        except FileExistsError:
+            os.remove(targetFile)
+        except OSError:
+            shutil.copy2(sourceFile, targetFile)
+            return
+
+        try:
+            os.link(sourceFile, targetFile)
+        except OSError:
+            shutil.copy2(sourceFile, targetFile)
+
+    @classmethod
+    def __contentHash(cls, filePath):
+        """
+        Return the sha256 of the contents of the file.
+        """
+        contentHash = hashlib.sha256()
+        with open(filePath, 'rb') as f:
+            for chunk in iter(lambda: f.read(cls.__hashChunkSize), b''):
+                contentHash.update(chunk)
+
+        return contentHash.hexdigest()
+
 
 # registering task
 Task.register(
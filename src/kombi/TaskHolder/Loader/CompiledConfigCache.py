@@ -0,0 +1,230 @@
+import os
+import sys
+import pickle
+import hashlib
+import threading
+
+class CompiledConfigCache(object):
+    """
+    Cache about the parsed contents of the configuration files (root files and includes).
+
+    The parsed contents are stored in a binary form (pickle) keyed by the hash of
+    the file contents and the loader used to parse it. The cache is kept in memory
+    (validated by the modification time and size of the file) and on disk, so the
+    same configuration loaded by different processes (browser, cli, farm workers)
+    is only parsed once. Since each include is cached by its own contents, changes
+    in any file of a configuration tree are detected when it gets loaded.
+
+    The key also carries a cache format version, the installed kombi version and
+    a signature of the source code of the loader (and its base classes), so entries
+    written by a loader that has a different parse behaviour are not reused. Disk
+    entries that can't be unpickled (truncated or foreign files) are parsed again.
+
+    The disk cache location can be defined through KOMBI_CONFIG_CACHE_DIRECTORY
+    (an empty value disables it).
+    """
+
+    __directory = os.environ.get(
+        'KOMBI_CONFIG_CACHE_DIRECTORY',
+        os.path.join(os.path.expanduser('~'), '.cache', 'kombi', 'compiledConfigs')
+    )
+    __formatVersion = 1
+    __kombiVersion = None
+    __loaderSignatures = {}
+    __memoryCache = {}
+    __lock = threading.Lock()
+
+    @classmethod
+    def parse(cls, filePath, loaderClass):
+        """
+        Return the parsed contents of the file by using the parse method of the loader class.
+
+        The result is always a new copy of the contents, so it can be modified by the caller.
+        """
+        filePath = os.path.abspath(filePath)
+        stat = os.stat(filePath)
+
+        # memory cache (valid as long as the file has not been modified)
+        memoryKey = (filePath, loaderClass.__name__)
+        with cls.__lock:
+            entry = cls.__memoryCache.get(memoryKey)
+        if entry and entry['mtime'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            return pickle.loads(entry['data'])
+
+        with open(filePath) as f:
+            contents = f.read()
+
+        contentHash = cls.hash(contents, loaderClass)
+
+        # the file has been touched but the contents are still the same
+        result = None
+        data = None
+        if entry and entry['hash'] == contentHash:
+            data = entry['data']
+            result = pickle.loads(data)
+        else:
+            data = cls.__readDisk(contentHash)
+            if data is not None:
+                result = cls.__unpickle(data)
+                if result is None:
+                    data = None
+
+        # parsing the contents
+        if data is None:
+            result = loaderClass.parse(contents)
+            data = pickle.dumps(result, pickle.HIGHEST_PROTOCOL)
+            cls.__writeDisk(contentHash, data)
+
+            # the caller gets its own copy
+            result = pickle.loads(data)
+
+        with cls.__lock:
+            cls.__memoryCache[memoryKey] = {
+                'mtime': stat.st_mtime_ns,
+                'size': stat.st_size,
+                'hash': contentHash,
+                'data': data
+            }
+
+        return result
+
+    @classmethod
+    def hash(cls, contents, loaderClass):
+        """
+        Return the hash used to identify the parsed contents.
+        """
+        return hashlib.sha256(
+            '{}\n{}\n{}\n{}'.format(
+                cls.__formatVersion,
+                cls.__installedKombiVersion(),
+                cls.__loaderSignature(loaderClass),
+                contents
+            ).encode('utf-8')
+        ).hexdigest()
+
+    @classmethod
+    def clear(cls):
+        """
+        Clear the memory cache (the disk cache is kept).
+        """
+        with cls.__lock:
+            cls.__memoryCache.clear()
+
+    @classmethod
+    def directory(cls):
+        """
+        Return the directory used to store the cache on disk (empty string when disabled).
+        """
+        return cls.__directory
+
+    @classmethod
+    def setDirectory(cls, directory):
+        """
+        Change the directory used to store the cache on disk (empty string disables it).
+        """
+        cls.__directory = directory
+
+    @classmethod
+    def __cacheFilePath(cls, contentHash):
+        """
+        Return the location of the cache file for the content hash.
+        """
+        return os.path.join(
+            cls.__directory,
+            contentHash[:2],
+            '{}.pickle'.format(contentHash)
+        )
+
+    @classmethod
+    def __installedKombiVersion(cls):
+        """
+        Return the version of the installed kombi distribution (empty string when running from the source).
+        """
+        if cls.__kombiVersion is None:
+            try:
+                from importlib.metadata import version, PackageNotFoundError
+            except ImportError:
+                CompiledConfigCache.__kombiVersion = ''
+            else:
+                try:
+                    CompiledConfigCache.__kombiVersion = version('kombi')
+                except PackageNotFoundError:
+                    CompiledConfigCache.__kombiVersion = ''
+
+        return cls.__kombiVersion
+
+    @classmethod
+    def __loaderSignature(cls, loaderClass):
+        """
+        Return a signature about the source code of the loader class and its base classes.
+        """
+        with cls.__lock:
+            if loaderClass in cls.__loaderSignatures:
+                return cls.__loaderSignatures[loaderClass]
+
+        signature = hashlib.sha256()
+        for currentClass in loaderClass.__mro__:
+            signature.update('{}.{}\n'.format(currentClass.__module__, currentClass.__qualname__).encode('utf-8'))
+
+            module = sys.modules.get(currentClass.__module__)
+            moduleFilePath = getattr(module, '__file__', None)
+            if not moduleFilePath:
+                continue
+
+            try:
+                with open(moduleFilePath, 'rb') as f:
+                    signature.update(hashlib.sha256(f.read()).digest())
+            except OSError:
+                continue
+
+        with cls.__lock:
+            cls.__loaderSignatures[loaderClass] = signature.hexdigest()
+
+        return cls.__loaderSignatures[loaderClass]
+
+    @staticmethod
+    def __unpickle(data):
+        """
+        Return the unpickled data (None when the data is invalid).
+        """
+        try:
+            return pickle.loads(data)
+        except Exception:
+            return None
+
+    @classmethod
+    def __readDisk(cls, contentHash):
+        """
+        Return the cached data from the disk (None when not found).
+        """
+        if not cls.__directory:
+            return None
+
+        try:
+            with open(cls.__cacheFilePath(contentHash), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    @classmethod
+    def __writeDisk(cls, contentHash, data):
+        """
+        Write the cached data to the disk.
+        """
+        if not cls.__directory:
+            return
+
+        cacheFilePath = cls.__cacheFilePath(contentHash)
+        temporaryFilePath = '{}.{}_{}'.format(cacheFilePath, os.getpid(), threading.get_ident())
+        try:
+            os.makedirs(os.path.dirname(cacheFilePath), exist_ok=True)
+            with open(temporaryFilePath, 'wb') as f:
+                f.write(data)
+
+            # atomic rename, concurrent processes may be writing the same entry
+            os.replace(temporaryFilePath, cacheFilePath)
+        except OSError:
+            try:
+                os.remove(temporaryFilePath)
+            except OSError:
+                pass
@@ -2,6 +2,8 @@ import os
 import uuid
 import traceback
 from ..TaskHolder import TaskHolder
+from ...Tracer import Tracer
+from .CompiledConfigCache import CompiledConfigCache
 from ...KombiError import KombiError
 
 class LoaderError(KombiError):
@@ -64,26 +66,26 @@ class Loader(object):
                 "Cannot find a loader for: {}".format(filePath)
             )
 
-        # loading task holder
+        # loading task holder (the parsed contents are cached)
         fileTaskHolder = self.create(ext)
-        with open(filePath) as (f):
-            try:
+        try:
+            with Tracer.span('loader.loadFromFile', filePath=str(filePath)):
                 fileTaskHolder.load(
-                    fileTaskHolder.parse(f.read()),
+                    CompiledConfigCache.parse(filePath, fileTaskHolder.__class__),
                     {
                         'configDirectory': os.path.dirname(filePath),
                         'contextConfig': str(filePath),
                         'sessionId': str(uuid.uuid4())
                     }
                 )
-            except Exception as err:
-                raise LoaderInvalidConfigError(
-                    '{}\n ^--- {} while loading file: {}'.format(
-                        traceback.format_exc(),
-                        err.__class__.__name__,
-                        filePath
-                    )
+        except Exception as err:
+            raise LoaderInvalidConfigError(
+                '{}\n ^--- {} while loading file: {}'.format(
+                    traceback.format_exc(),
+                    err.__class__.__name__,
+                    filePath
                 )
+            )
 
         for loadedTaskHolder in fileTaskHolder.taskHolders():
             self.addTaskHolder(loadedTaskHolder)
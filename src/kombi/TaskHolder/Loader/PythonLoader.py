@@ -5,6 +5,7 @@ from ...Template import Template
 from ...TaskHolder import TaskHolder
 from ...ResourceLoader import ResourceLoader
 from .Loader import Loader, LoaderError, LoaderInvalidConfigError
+from .CompiledConfigCache import CompiledConfigCache
 
 class PythonLoaderContentError(LoaderError):
     """Python Loader Content Error."""
@@ -268,38 +269,35 @@ class PythonLoader(Loader):
             taskHolderLoader = cls.create(ext)
             if isinstance(taskHolderLoader, PythonLoader):
 
-                # loading include
-                with open(includePath) as f:
-
-                    # parsing include
-                    try:
-                        includeTaskHolderInfo = taskHolderLoader.parse(f.read())
-                    except Exception as err:
-                        raise LoaderInvalidConfigError(
-                            '{}\n ^--- {} while loading include file: {}'.format(
-                                str(err),
-                                err.__class__.__name__,
-                                includePath
-                            )
+                # parsing include (the parsed contents are cached)
+                try:
+                    includeTaskHolderInfo = CompiledConfigCache.parse(includePath, taskHolderLoader.__class__)
+                except Exception as err:
+                    raise LoaderInvalidConfigError(
+                        '{}\n ^--- {} while loading include file: {}'.format(
+                            str(err),
+                            err.__class__.__name__,
+                            includePath
                         )
-
-                    # making sure the parsed data contains the right structure
-                    if not isinstance(includeTaskHolderInfo, dict):
-                        raise PythonLoaderContentError('Expecting an object to describe the task holder!')
-
-                    # in case any information has been overridden in the include declaration
-                    # we want to preserve it and combine with all the other information
-                    # coming from the task holder
-                    for key in filter(lambda x: x not in taskHolderInfo, includeTaskHolderInfo.keys()):
-                        taskHolderInfo[key] = includeTaskHolderInfo[key]
-
-                    # adding config information
-                    if 'vars' not in taskHolderInfo:
-                        taskHolderInfo['vars'] = {}
-                    taskHolderInfo['vars'] = dict(list(contextVars.items()) + list(taskHolderInfo['vars'].items()))
-                    taskHolderInfo['vars']['configDirectory'] = os.path.dirname(includePath)
-                    taskHolderInfo['vars']['contextConfig'] = includePath
-                    loaded = True
+                    )
+
+                # making sure the parsed data contains the right structure
+                if not isinstance(includeTaskHolderInfo, dict):
+                    raise PythonLoaderContentError('Expecting an object to describe the task holder!')
+
+                # in case any information has been overridden in the include declaration
+                # we want to preserve it and combine with all the other information
+                # coming from the task holder
+                for key in filter(lambda x: x not in taskHolderInfo, includeTaskHolderInfo.keys()):
+                    taskHolderInfo[key] = includeTaskHolderInfo[key]
+
+                # adding config information
+                if 'vars' not in taskHolderInfo:
+                    taskHolderInfo['vars'] = {}
+                taskHolderInfo['vars'] = dict(list(contextVars.items()) + list(taskHolderInfo['vars'].items()))
+                taskHolderInfo['vars']['configDirectory'] = os.path.dirname(includePath)
+                taskHolderInfo['vars']['contextConfig'] = includePath
+                loaded = True
 
         if not loaded:
             raise PythonLoaderContentError(
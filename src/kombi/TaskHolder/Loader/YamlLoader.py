@@ -13,9 +13,10 @@ class YamlLoader(PythonLoader):
         # third-party dependency
         import yaml
 
+        # using the libyaml based loader when available (much faster)
         return yaml.load(
             contents,
-            yaml.Loader
+            getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
         )
 
 
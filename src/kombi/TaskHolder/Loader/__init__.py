@@ -1,4 +1,5 @@
 from .Loader import Loader, LoaderError, LoaderInvalidConfigError, LoaderNotRegisteredError
+from .CompiledConfigCache import CompiledConfigCache
 from .PythonLoader import PythonLoader, PythonLoaderContentError
 from .JsonLoader import JsonLoader
 from .YamlLoader import YamlLoader
@@ -5,7 +5,8 @@ from collections import OrderedDict
 from fnmatch import fnmatch
 from ..Task import Task
 from ..TaskWrapper import TaskWrapper
-from ..Template import Template
+from ..Template import Template, VersionResolver
+from ..Tracer import Tracer
 from ..Element import Element, Matcher
 from ..KombiError import KombiError
 
@@ -320,41 +321,42 @@ class TaskHolder(object):
         The elements are added to the task using "query" method to resolve
         the target template.
         """
-        for element, filePath in self.query(elements).items():
+        with Tracer.span('taskHolder.addElements', taskType=self.task().type(), elements=len(elements)):
+            for element, filePath in self.query(elements).items():
 
-            if addTaskHolderVars:
-                # cloning element so we can modify it safely
-                element = element.clone()
+                if addTaskHolderVars:
+                    # cloning element so we can modify it safely
+                    element = element.clone()
 
-                for tagName in self.tagNames():
+                    for tagName in self.tagNames():
 
-                    # in case the tag has already been
-                    # defined in the element we skip it
-                    if tagName in element.tagNames():
-                        continue
+                        # in case the tag has already been
+                        # defined in the element we skip it
+                        if tagName in element.tagNames():
+                            continue
 
-                    element.setTag(
-                        tagName,
-                        self.tag(tagName)
-                    )
+                        element.setTag(
+                            tagName,
+                            self.tag(tagName)
+                        )
 
-                for varName in self.varNames():
+                    for varName in self.varNames():
 
-                    # in case the variable has already been
-                    # defined in the element we skip it
-                    if varName in element.varNames():
-                        continue
+                        # in case the variable has already been
+                        # defined in the element we skip it
+                        if varName in element.varNames():
+                            continue
 
-                    element.setVar(
-                        varName,
-                        self.var(varName),
-                        varName in self.contextVarNames()
-                    )
+                        element.setVar(
+                            varName,
+                            self.var(varName),
+                            varName in self.contextVarNames()
+                        )
 
-            self.__task.add(
-                element,
-                filePath
-            )
+                self.__task.add(
+                    element,
+                    filePath
+                )
 
     def matcher(self):
         """
@@ -388,15 +390,18 @@ class TaskHolder(object):
         Return a dict containing the matched element as key and resolved template as value.
         """
         validElements = {}
-        for element in elements:
-            if self.matcher().match(element):
-                filterTemplateValue = self.filterTemplate().valueFromElement(element, self.__vars)
 
-                # if the value of the filter is 0 or false the element is ignored
-                if str(filterTemplateValue).lower() in ['false', '0']:
-                    continue
+        # the versions directories are listed once during the query (newver, latestver...)
+        with Tracer.span('taskHolder.query', taskType=self.task().type(), elements=len(elements)), VersionResolver.scope():
+            for element in elements:
+                if self.matcher().match(element):
+                    filterTemplateValue = self.filterTemplate().valueFromElement(element, self.__vars)
+
+                    # if the value of the filter is 0 or false the element is ignored
+                    if str(filterTemplateValue).lower() in ['false', '0']:
+                        continue
 
-                validElements[element] = self.targetTemplate().valueFromElement(element, self.__vars)
+                    validElements[element] = self.targetTemplate().valueFromElement(element, self.__vars)
 
         # sorting result
         result = OrderedDict()
@@ -419,7 +424,11 @@ class TaskHolder(object):
         """
         Return a cloned instance of the current task holder.
         """
-        return self.createFromJson(self.toJson(includeSubTaskHolders))
+        with Tracer.span('taskHolder.clone', taskType=self.task().type()) as span:
+            jsonContents = self.toJson(includeSubTaskHolders)
+            span.setAttribute('bytes', len(jsonContents))
+
+            return self.createFromJson(jsonContents)
 
     def run(self, elements=[], ignoreImports=False):
         """
@@ -675,7 +684,8 @@ class TaskHolder(object):
 
                 taskHolder.task().setMetadata('output.profile', profileOutput)
 
-            taskElements = taskHolder.taskWrapper().run(taskHolder.task())
+            with Tracer.span('taskHolder.run', taskType=taskHolder.task().type(), elements=len(taskHolder.task().elements())):
+                taskElements = taskHolder.taskWrapper().run(taskHolder.task())
             result += taskElements
 
         # exporting the result when export template is defined
@@ -0,0 +1,113 @@
+import os
+import sys
+import json
+import socket
+from .TaskReporter import TaskReporter
+
+class MetricsTaskReporter(TaskReporter):
+    """
+    Implements a metrics task reporter.
+
+    The metrics about the execution are written as a single JSON line per task
+    (JSON Lines), by default to the stdout or appended to the file defined by
+    the environment variable KOMBI_TASK_METRICS_FILE. Since each line is written
+    at once, the same file can be shared by the chunks executed in the renderfarm
+    and later combined through MetricsTaskReporter.aggregate. Failed executions
+    are written as well (flagged by the "failed" field).
+    """
+
+    __outputFilePath = os.environ.get('KOMBI_TASK_METRICS_FILE', '')
+
+    def display(self):
+        """
+        Implement the metrics display.
+        """
+        result = self.metrics()
+        result['host'] = socket.gethostname()
+        result['pid'] = os.getpid()
+        result['elementLatencies'] = self.elementLatencies()
+
+        line = '{}\n'.format(json.dumps(result, sort_keys=True))
+        if self.__outputFilePath:
+            outputDirectory = os.path.dirname(self.__outputFilePath)
+            if outputDirectory:
+                os.makedirs(outputDirectory, exist_ok=True)
+
+            with open(self.__outputFilePath, 'a') as f:
+                f.write(line)
+        else:
+            sys.stdout.write(line)
+
+    def displayFailure(self):
+        """
+        Implement the metrics display for failed executions.
+        """
+        self.display()
+
+    @classmethod
+    def outputFilePath(cls):
+        """
+        Return the file path used to write the metrics (empty string means stdout).
+        """
+        return cls.__outputFilePath
+
+    @classmethod
+    def setOutputFilePath(cls, filePath):
+        """
+        Set the file path used to write the metrics (empty string means stdout).
+        """
+        cls.__outputFilePath = filePath
+
+    @classmethod
+    def aggregate(cls, filePath):
+        """
+        Return a dictionary with the metrics combined per task from a JSON Lines metrics file.
+        """
+        result = {}
+        with open(filePath) as f:
+            for line in filter(None, map(str.strip, f)):
+                record = json.loads(line)
+                taskName = record['task']
+                if taskName not in result:
+                    result[taskName] = {
+                        'task': taskName,
+                        'records': 0,
+                        'failed': 0,
+                        'totalTime': 0.0,
+                        'elements': 0,
+                        'bytesRead': 0,
+                        'bytesWritten': 0,
+                        'cpuUser': 0.0,
+                        'cpuSystem': 0.0,
+                        'peakRss': None,
+                        'elementLatencies': []
+                    }
+
+                taskMetrics = result[taskName]
+                taskMetrics['records'] += 1
+                if record.get('failed'):
+                    taskMetrics['failed'] += 1
+                for name in ('totalTime', 'elements', 'bytesRead', 'bytesWritten', 'cpuUser', 'cpuSystem'):
+                    taskMetrics[name] += record[name]
+                taskMetrics['elementLatencies'] += record.get('elementLatencies', [])
+
+                if record['peakRss'] is not None:
+                    taskMetrics['peakRss'] = max(taskMetrics['peakRss'] or 0, record['peakRss'])
+
+        for taskMetrics in result.values():
+            latencies = taskMetrics.pop('elementLatencies')
+            taskMetrics['elementsPerSecond'] = (
+                taskMetrics['elements'] / taskMetrics['totalTime'] if taskMetrics['totalTime'] > 0 else 0.0
+            )
+            taskMetrics['elementLatency'] = {}
+            for percentile in (50, 90, 99, 100):
+                taskMetrics['elementLatency']['p{}'.format(percentile)] = cls.percentile(latencies, percentile)
+
+        return result
+
+
+# registering reporter
+TaskReporter.register(
+    'metrics',
+    MetricsTaskReporter
+)
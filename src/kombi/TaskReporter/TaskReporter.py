@@ -1,10 +1,21 @@
+import os
 import sys
 import time
 from ..Element import Element
 
+# resource is only available on unix
+try:
+    import resource
+except ImportError:
+    resource = None
+
 class TaskReporter(object):
     """
     Task report is used to handle the display of task output.
+
+    The reporter also collects the metrics about the execution: throughput,
+    bytes read and written (reported by the tasks that know about them),
+    cpu time, peak memory (RSS) and the latency about each element.
     """
 
     __registered = {}
@@ -16,7 +27,13 @@ class TaskReporter(object):
         self.__setTaskName(taskName)
         self.__startTime = time.time()
         self.__endTime = None
+        self.__startCpuTime = self.__cpuTime()
+        self.__endCpuTime = None
         self.__elements = []
+        self.__elementLatencies = []
+        self.__bytesRead = 0
+        self.__bytesWritten = 0
+        self.__failed = False
 
     def startTime(self):
         """
@@ -30,6 +47,7 @@ class TaskReporter(object):
         """
         if self.__endTime is None:
             self.__endTime = time.time()
+            self.__endCpuTime = self.__cpuTime()
 
         return self.__endTime
 
@@ -61,12 +79,148 @@ class TaskReporter(object):
         """
         return self.__elements
 
+    def addBytesRead(self, size):
+        """
+        Add the amount of bytes read by the task.
+        """
+        self.__bytesRead += size
+
+    def bytesRead(self):
+        """
+        Return the amount of bytes read by the task.
+        """
+        return self.__bytesRead
+
+    def addBytesWritten(self, size):
+        """
+        Add the amount of bytes written by the task.
+        """
+        self.__bytesWritten += size
+
+    def bytesWritten(self):
+        """
+        Return the amount of bytes written by the task.
+        """
+        return self.__bytesWritten
+
+    def addElementLatency(self, seconds):
+        """
+        Add the time spent processing an individual element.
+        """
+        self.__elementLatencies.append(seconds)
+
+    def elementLatencies(self):
+        """
+        Return a list with the time spent processing each element.
+        """
+        return self.__elementLatencies
+
+    def elementLatencyPercentile(self, percentile):
+        """
+        Return the element latency for the percentile (0-100) or None when no latencies are available.
+        """
+        return self.percentile(self.__elementLatencies, percentile)
+
+    def setFailed(self, failed):
+        """
+        Set if the execution of the task has failed.
+        """
+        self.__failed = failed
+
+    def failed(self):
+        """
+        Return a boolean telling if the execution of the task has failed.
+        """
+        return self.__failed
+
+    def elementsPerSecond(self):
+        """
+        Return the throughput of the task based on the output elements.
+        """
+        totalTime = self.totalTime()
+        if totalTime <= 0:
+            return 0.0
+
+        return len(self.elements()) / totalTime
+
+    def cpuTime(self):
+        """
+        Return a tuple (user, system) with the cpu time in seconds spent by the process during the execution.
+        """
+        self.endTime()
+        return (
+            self.__endCpuTime[0] - self.__startCpuTime[0],
+            self.__endCpuTime[1] - self.__startCpuTime[1]
+        )
+
+    def metrics(self):
+        """
+        Return a dictionary containing the metrics about the execution.
+        """
+        cpuUser, cpuSystem = self.cpuTime()
+        latencies = {}
+        for percentile in (50, 90, 99, 100):
+            latencies['p{}'.format(percentile)] = self.elementLatencyPercentile(percentile)
+
+        return {
+            'task': self.taskName(),
+            'startTime': self.startTime(),
+            'totalTime': self.totalTime(),
+            'elements': len(self.elements()),
+            'elementsPerSecond': self.elementsPerSecond(),
+            'bytesRead': self.bytesRead(),
+            'bytesWritten': self.bytesWritten(),
+            'cpuUser': cpuUser,
+            'cpuSystem': cpuSystem,
+            'peakRss': self.peakRss(),
+            'elementLatency': latencies,
+            'failed': self.failed()
+        }
+
     def display(self, stream=sys.stdout):
         """
         For reimplementation: compute the result (display) of the reporter.
         """
         raise NotImplementedError
 
+    def displayFailure(self, stream=sys.stdout):
+        """
+        For reimplementation: compute the result (display) of the reporter when the task has failed.
+
+        By default nothing is displayed for failed executions.
+        """
+        pass
+
+    @staticmethod
+    def peakRss():
+        """
+        Return the peak memory (resident set size) in bytes used by the process (None when not available).
+        """
+        if resource is None:
+            return None
+
+        maxRss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        # macos reports the value in bytes, linux in kilobytes
+        if sys.platform == 'darwin':
+            return maxRss
+        return maxRss * 1024
+
+    @staticmethod
+    def percentile(values, percentile):
+        """
+        Return the percentile (0-100) of the values using linear interpolation (None for empty values).
+        """
+        if not values:
+            return None
+
+        values = sorted(values)
+        position = (len(values) - 1) * percentile / 100.0
+        lowerIndex = int(position)
+        upperIndex = min(lowerIndex + 1, len(values) - 1)
+
+        return values[lowerIndex] + (values[upperIndex] - values[lowerIndex]) * (position - lowerIndex)
+
     @classmethod
     def register(cls, name, reporter):
         """
@@ -91,6 +245,18 @@ class TaskReporter(object):
         """
         return cls.__registered[reporterName](taskName)
 
+    @staticmethod
+    def __cpuTime():
+        """
+        Return a tuple (user, system) with the cpu time spent by the process.
+        """
+        if resource is not None:
+            usage = resource.getrusage(resource.RUSAGE_SELF)
+            return (usage.ru_utime, usage.ru_stime)
+
+        times = os.times()
+        return (times.user, times.system)
+
     def __setTaskName(self, name):
         """
         Set the name of the task to the reporter.
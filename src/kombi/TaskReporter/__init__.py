@@ -2,3 +2,4 @@ from .TaskReporter import TaskReporter
 from .DetailedTaskReporter import DetailedTaskReporter
 from .ColumnsTaskReporter import ColumnsTaskReporter
 from .JsonTaskReporter import JsonTaskReporter
+from .MetricsTaskReporter import MetricsTaskReporter
@@ -0,0 +1,409 @@
+import os
+import sys
+import json
+import time
+import socket
+import getpass
+import hashlib
+import secrets
+import tempfile
+import threading
+import traceback
+import subprocess
+from .TaskWrapper import TaskWrapperError
+from ..Task import Task
+
+# file locks are used to make sure each session is used by a single client at the time
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+class SubprocessSessionError(TaskWrapperError):
+    """Subprocess session error."""
+
+class _SessionOutputStream(object):
+    """
+    Stream used inside of the session process to send the output back to the client.
+    """
+
+    def __init__(self, sendMessage, originalStream):
+        """
+        Create a session output stream.
+        """
+        self.__sendMessage = sendMessage
+        self.__originalStream = originalStream
+
+    def write(self, text):
+        """
+        Send the text to the client (also writing it to the session log).
+        """
+        self.__originalStream.write(text)
+        self.__sendMessage({'output': text})
+
+        return len(text)
+
+    def flush(self):
+        """
+        Flush the session log.
+        """
+        self.__originalStream.flush()
+
+class SubprocessSession(object):
+    """
+    Long-running subprocess (usually a DCC) that performs the serialized tasks sent through a local socket.
+
+    Launching applications like nuke or maya can take a long time, a session keeps the
+    application running (along with anything loaded by the tasks, like scenes) so it can be
+    reused by the next task wrapper executions from any process on the same machine. The
+    sessions are identified by the command and the environment used to launch them and
+    each session serves only one client at the time (concurrent clients get their
+    own sessions, one per worker).
+
+    The session process quits when it has been idle for the idle timeout. The state about
+    the sessions is kept under KOMBI_TASKWRAPPER_SESSION_DIRECTORY (including the log
+    of each session process).
+
+    Usage:
+        with SubprocessSession.acquire(command, env) as session:
+            serializedElements = session.runTask(task.toJson(), sys.stdout)
+    """
+
+    __directory = os.environ.get(
+        'KOMBI_TASKWRAPPER_SESSION_DIRECTORY',
+        os.path.join(tempfile.gettempdir(), 'kombiSessions_{}'.format(getpass.getuser()))
+    )
+    __stateFileEnv = 'KOMBI_TASKWRAPPER_SESSION_FILE'
+    __tokenEnv = 'KOMBI_TASKWRAPPER_SESSION_TOKEN'
+    __idleTimeoutEnv = 'KOMBI_TASKWRAPPER_SESSION_IDLE_TIMEOUT'
+    __pollInterval = 0.1
+    __launchedProcesses = []
+
+    def __init__(self, lockFile, port, token):
+        """
+        Create a session object (use acquire instead).
+        """
+        self.__lockFile = lockFile
+        self.__port = port
+        self.__token = token
+
+    def runTask(self, taskJsonData, outputStream=None, timeout=None):
+        """
+        Run the serialized task in the session returning a list containing the serialized output elements.
+
+        The output written by the session process is forwarded to the output stream.
+        """
+        try:
+            connection = socket.create_connection(('127.0.0.1', self.__port))
+        except OSError as err:
+            raise SubprocessSessionError(
+                'Could not connect to the session: {}'.format(err)
+            )
+
+        connection.settimeout(timeout)
+        with connection, connection.makefile('rwb') as stream:
+            self.__sendMessage(stream, {'token': self.__token, 'task': taskJsonData})
+
+            try:
+                for line in stream:
+                    message = json.loads(line.decode('utf-8'))
+
+                    if 'output' in message:
+                        if outputStream is not None:
+                            outputStream.write(message['output'])
+                            outputStream.flush()
+
+                    elif 'error' in message:
+                        if outputStream is not None:
+                            outputStream.write(message['error'])
+                            outputStream.flush()
+
+                        raise SubprocessSessionError(
+                            'Error during the execution of the task in the session'
+                        )
+
+                    elif 'result' in message:
+                        return message['result']
+
+            except socket.timeout:
+                raise SubprocessSessionError(
+                    'Timeout during the execution of the task in the session'
+                )
+
+        raise SubprocessSessionError(
+            'Session has been terminated during the execution of the task'
+        )
+
+    def release(self):
+        """
+        Release the session so it can be used by other clients.
+        """
+        if self.__lockFile is not None:
+            self.__lockFile.close()
+            self.__lockFile = None
+
+    def __enter__(self):
+        """
+        Return the session itself.
+        """
+        return self
+
+    def __exit__(self, *args):
+        """
+        Release the session.
+        """
+        self.release()
+        return False
+
+    @classmethod
+    def directory(cls):
+        """
+        Return the directory containing the state about the sessions.
+        """
+        return cls.__directory
+
+    @classmethod
+    def setDirectory(cls, directory):
+        """
+        Change the directory containing the state about the sessions.
+        """
+        cls.__directory = directory
+
+    @classmethod
+    def isSessionProcess(cls):
+        """
+        Return a boolean telling if the current process has been launched as a session.
+        """
+        return cls.__stateFileEnv in os.environ
+
+    @classmethod
+    def acquire(cls, command, env, idleTimeout=600, startupTimeout=600, volatileEnvNames=()):
+        """
+        Return a session for exclusive usage (launching it when there is no idle session available).
+
+        The volatile env names are not taken into account to identify the session.
+        """
+        if fcntl is None:
+            raise SubprocessSessionError(
+                'Sessions are not supported on the current platform'
+            )
+
+        cls.__reapLaunchedProcesses()
+        os.makedirs(cls.__directory, exist_ok=True)
+
+        sessionEnv = {name: value for name, value in env.items() if name not in volatileEnvNames}
+        sessionKey = hashlib.sha256(
+            json.dumps([command, sorted(sessionEnv.items())]).encode('utf-8')
+        ).hexdigest()[:16]
+
+        # looking for the first session that is not in use
+        slot = 0
+        while True:
+            lockFile = open(os.path.join(cls.__directory, '{}_{}.lock'.format(sessionKey, slot)), 'a')
+            try:
+                fcntl.flock(lockFile, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                lockFile.close()
+                slot += 1
+            else:
+                break
+
+        try:
+            statePath = os.path.join(cls.__directory, '{}_{}.json'.format(sessionKey, slot))
+            state = cls.__readState(statePath)
+            if state is None or not cls.__isListening(state['port']):
+                state = cls.__launch(command, env, statePath, idleTimeout, startupTimeout)
+        except Exception:
+            lockFile.close()
+            raise
+
+        return SubprocessSession(lockFile, state['port'], state['token'])
+
+    @classmethod
+    def serve(cls):
+        """
+        Serve the tasks sent by the clients until the session has been idle for the idle timeout.
+
+        Executed inside of the session process.
+        """
+        statePath = os.environ.pop(cls.__stateFileEnv)
+        token = os.environ.pop(cls.__tokenEnv)
+        idleTimeout = float(os.environ.pop(cls.__idleTimeoutEnv))
+        lockPath = '{}.lock'.format(os.path.splitext(statePath)[0])
+
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.bind(('127.0.0.1', 0))
+        server.listen(1)
+        server.settimeout(idleTimeout)
+
+        # the state is written atomically (only readable by the user since
+        # it contains the token)
+        temporaryStatePath = '{}.{}'.format(statePath, os.getpid())
+        with open(os.open(temporaryStatePath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w') as f:
+            json.dump(
+                {
+                    'pid': os.getpid(),
+                    'port': server.getsockname()[1],
+                    'token': token
+                },
+                f
+            )
+        os.replace(temporaryStatePath, statePath)
+
+        with server:
+            while True:
+                try:
+                    connection, _ = server.accept()
+                except socket.timeout:
+                    # quitting only when there is no client holding the session
+                    with open(lockPath, 'a') as lockFile:
+                        try:
+                            fcntl.flock(lockFile, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                        except OSError:
+                            continue
+
+                        if os.path.exists(statePath):
+                            os.remove(statePath)
+                    return
+
+                connection.settimeout(None)
+                with connection, connection.makefile('rwb') as stream:
+                    cls.__serveConnection(stream, token)
+
+    @classmethod
+    def __serveConnection(cls, stream, token):
+        """
+        Run the task received through the connection stream sending back the result.
+        """
+        line = stream.readline()
+        if not line:
+            return
+
+        message = json.loads(line.decode('utf-8'))
+        if message.get('token') != token:
+            cls.__sendMessage(stream, {'error': 'Invalid session token\n'})
+            return
+
+        sendLock = threading.Lock()
+
+        def sendMessage(message):
+            with sendLock:
+                cls.__sendMessage(stream, message)
+
+        previousStdout = sys.stdout
+        previousStderr = sys.stderr
+        sys.stdout = _SessionOutputStream(sendMessage, previousStdout)
+        sys.stderr = _SessionOutputStream(sendMessage, previousStderr)
+        try:
+            task = Task.createFromJson(message['task'])
+            serializedElements = [element.toJson() for element in task.output()]
+        except Exception:
+            result = {'error': traceback.format_exc()}
+        else:
+            result = {'result': serializedElements}
+        finally:
+            sys.stdout = previousStdout
+            sys.stderr = previousStderr
+
+        try:
+            sendMessage(result)
+        except OSError:
+            # the client is gone
+            pass
+
+    @classmethod
+    def __launch(cls, command, env, statePath, idleTimeout, startupTimeout):
+        """
+        Launch a session process returning its state once it's ready to receive tasks.
+        """
+        if os.path.exists(statePath):
+            os.remove(statePath)
+
+        token = secrets.token_hex(16)
+        launchEnv = dict(env)
+        launchEnv[cls.__stateFileEnv] = statePath
+        launchEnv[cls.__tokenEnv] = token
+        launchEnv[cls.__idleTimeoutEnv] = str(idleTimeout)
+
+        # printing command in the stdout (for logging purposes)
+        sys.stdout.write("{}\n".format(command))
+        sys.stdout.flush()
+
+        # the session process is detached from the current process, so
+        # it can be used after the current process is terminated
+        logPath = '{}.log'.format(os.path.splitext(statePath)[0])
+        with open(logPath, 'ab') as logFile:
+            process = subprocess.Popen(
+                command,
+                stdin=subprocess.DEVNULL,
+                stdout=logFile,
+                stderr=subprocess.STDOUT,
+                env=launchEnv,
+                shell=True,
+                start_new_session=True
+            )
+        cls.__launchedProcesses.append(process)
+
+        startTime = time.time()
+        while True:
+            state = cls.__readState(statePath)
+            if state is not None and state['token'] == token:
+                return state
+
+            if process.poll() is not None:
+                raise SubprocessSessionError(
+                    'Session process has been terminated during the startup (return code {}), see: {}'.format(
+                        process.returncode,
+                        logPath
+                    )
+                )
+
+            if startupTimeout and time.time() - startTime > startupTimeout:
+                process.kill()
+                raise SubprocessSessionError(
+                    'Timeout during the startup of the session process, see: {}'.format(
+                        logPath
+                    )
+                )
+
+            time.sleep(cls.__pollInterval)
+
+    @classmethod
+    def __reapLaunchedProcesses(cls):
+        """
+        Collect the exit status of the session processes launched by the current process that have quit.
+        """
+        for process in list(cls.__launchedProcesses):
+            if process.poll() is not None:
+                cls.__launchedProcesses.remove(process)
+
+    @staticmethod
+    def __readState(statePath):
+        """
+        Return a dictionary containing the state of the session (None when it's not available).
+        """
+        try:
+            with open(statePath) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def __isListening(port):
+        """
+        Return a boolean telling if there is a session listening on the port.
+        """
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=5).close()
+        except OSError:
+            return False
+
+        return True
+
+    @staticmethod
+    def __sendMessage(stream, message):
+        """
+        Send a message through the connection stream.
+        """
+        stream.write(json.dumps(message).encode('utf-8') + b'\n')
+        stream.flush()
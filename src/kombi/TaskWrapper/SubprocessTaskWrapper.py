@@ -9,8 +9,11 @@ import base64
 import weakref
 import signal
 import atexit
+from concurrent.futures import ThreadPoolExecutor
 from ..EnvModifier import EnvModifier
+from ..Tracer import Tracer
 from .TaskWrapper import TaskWrapper, TaskWrapperError
+from .SubprocessSession import SubprocessSession, SubprocessSessionError
 from ..Task import Task
 from ..Element import Element
 
@@ -49,6 +52,8 @@ class SubprocessTaskWrapper(TaskWrapper):
 
     __serializedTaskEnv = "KOMBI_TASKWRAPPER_SUBPROCESS_FILE"
     __allSubprocessesWeakRef = []
+    __session = os.environ.get('KOMBI_TASKWRAPPER_SESSION', '').lower() in ['1', 'true']
+    __sessionIdleTimeout = float(os.environ.get('KOMBI_TASKWRAPPER_SESSION_IDLE_TIMEOUT', 600))
 
     def __init__(self, *args, **kwargs):
         """
@@ -92,6 +97,13 @@ class SubprocessTaskWrapper(TaskWrapper):
         # be careful with this flag)
         self.setOption('ignoreExitCode', False)
 
+        # runs the task in a long-running process that is reused by the next
+        # executions (see SubprocessSession). Avoiding to pay for the startup of
+        # the process (and for loading the same scenes) every time
+        self.setOption('session', self.__session)
+        self.setOption('sessionIdleTimeout', self.__sessionIdleTimeout)
+        self.setOption('sessionStartupTimeout', 600)
+
     def _command(self):
         """
         For re-implementation: should return a string which is executed as subprocess.
@@ -105,20 +117,12 @@ class SubprocessTaskWrapper(TaskWrapper):
         """
         Implement the execution of the subprocess wrapper.
         """
+        if self.option('session'):
+            return self.__performSession(task)
+
         processes = {}
-        executionInstances = self.option('executionInstances')
         clonedTask = task.clone()
-        originalElements = task.elements()
-
-        totalElementsPerPerform = int(round(len(originalElements) / float(executionInstances)))
-        for i in range(executionInstances):
-            currentIndex = i * totalElementsPerPerform
-            nextIndex = currentIndex + totalElementsPerPerform if i < executionInstances - 1 else None
-            taskElements = originalElements[currentIndex:nextIndex]
-
-            if not taskElements:
-                continue
-
+        for taskElements in self.__splitElements(task):
             # cleaning all elements in the task
             # we are going to add them back in groups
             clonedTask.clear()
@@ -134,9 +138,11 @@ class SubprocessTaskWrapper(TaskWrapper):
                 mode='w',
                 delete=False
             )
-            taskJsonData = clonedTask.toJson()
-            serializedTaskFile.write(taskJsonData)
-            serializedTaskFile.close()
+            with Tracer.span('taskWrapper.serialize', taskType=task.type(), elements=len(taskElements)) as span:
+                taskJsonData = clonedTask.toJson()
+                serializedTaskFile.write(taskJsonData)
+                serializedTaskFile.close()
+                span.setAttribute('bytes', len(taskJsonData))
 
             # we need to make this temporary file R&W for anyone, since it may be manipulated by
             # a subprocess that might use a different user/permissions.
@@ -208,7 +214,8 @@ class SubprocessTaskWrapper(TaskWrapper):
                 sys.stderr.write('Timeout is not supported in the execution of the subprocess for current python version, skipping it!\n')
 
             # waiting for execution
-            process.wait(**waitArgs)
+            with Tracer.span('taskWrapper.wait', pid=process.pid):
+                process.wait(**waitArgs)
 
             # checking if process has failed based on the return code
             if process.returncode and not self.option('ignoreExitCode'):
@@ -231,10 +238,11 @@ class SubprocessTaskWrapper(TaskWrapper):
                         'Failed to retrieve task result from subprocess!'
                     )
 
-                for serializedJsonElement in json.loads(taskResultDataJson):
-                    result.append(
-                        Element.createFromJson(serializedJsonElement)
-                    )
+                with Tracer.span('taskWrapper.deserialize', bytes=len(taskResultDataJson)):
+                    for serializedJsonElement in json.loads(taskResultDataJson):
+                        result.append(
+                            Element.createFromJson(serializedJsonElement)
+                        )
 
             # removing temporary file
             os.remove(serializedTaskFileName)
@@ -246,6 +254,11 @@ class SubprocessTaskWrapper(TaskWrapper):
         """
         Run a serialized task defined in the environment during SubprocessTaskWrapper._perform.
         """
+        # when launched as a session the tasks are received through a socket instead
+        if SubprocessSession.isSessionProcess():
+            SubprocessSession.serve()
+            return
+
         serializedTaskFilePath = os.environ[SubprocessTaskWrapper.__serializedTaskEnv]
         serializedJsonTaskContent = None
         with open(serializedTaskFilePath) as jsonFile:
@@ -292,6 +305,86 @@ class SubprocessTaskWrapper(TaskWrapper):
                 )
             sys.stderr.flush()
 
+    def __splitElements(self, task):
+        """
+        Return a list containing the elements of the task divided by the execution instances.
+        """
+        result = []
+        executionInstances = self.option('executionInstances')
+        originalElements = task.elements()
+
+        totalElementsPerPerform = int(round(len(originalElements) / float(executionInstances)))
+        for i in range(executionInstances):
+            currentIndex = i * totalElementsPerPerform
+            nextIndex = currentIndex + totalElementsPerPerform if i < executionInstances - 1 else None
+            taskElements = originalElements[currentIndex:nextIndex]
+
+            if taskElements:
+                result.append(taskElements)
+
+        return result
+
+    def __performSession(self, task):
+        """
+        Implement the execution of the subprocess wrapper through sessions (one per execution instance).
+        """
+        if self.option('user'):
+            raise SubprocessTaskWrapperFailedError(
+                'Session is not supported when running the process as a different user'
+            )
+
+        taskJsonDataList = []
+        clonedTask = task.clone()
+        for taskElements in self.__splitElements(task):
+            clonedTask.clear()
+            for taskElement in taskElements:
+                clonedTask.add(taskElement, task.target(taskElement))
+
+            with Tracer.span('taskWrapper.serialize', taskType=task.type(), elements=len(taskElements)) as span:
+                taskJsonData = clonedTask.toJson()
+                span.setAttribute('bytes', len(taskJsonData))
+            taskJsonDataList.append(taskJsonData)
+
+        command = self._command()
+        env = self.__envModifier().generate()
+
+        # variables that change for every execution should not launch new sessions
+        volatileEnvNames = [self.__serializedTaskEnv] + list(Tracer.env().keys())
+
+        def runSessionTask(taskJsonData):
+            try:
+                with SubprocessSession.acquire(
+                    command,
+                    env,
+                    idleTimeout=self.option('sessionIdleTimeout'),
+                    startupTimeout=self.option('sessionStartupTimeout'),
+                    volatileEnvNames=volatileEnvNames
+                ) as session:
+                    with Tracer.span('taskWrapper.session', taskType=task.type()):
+                        return session.runTask(
+                            taskJsonData,
+                            sys.stdout,
+                            timeout=self.option('timeout') or None
+                        )
+            except SubprocessSessionError as err:
+                raise SubprocessTaskWrapperFailedError(str(err))
+
+        if len(taskJsonDataList) > 1:
+            with ThreadPoolExecutor(max_workers=len(taskJsonDataList)) as executor:
+                serializedElementsList = list(executor.map(runSessionTask, taskJsonDataList))
+        else:
+            serializedElementsList = list(map(runSessionTask, taskJsonDataList))
+
+        result = []
+        for serializedElements in serializedElementsList:
+            with Tracer.span('taskWrapper.deserialize', elements=len(serializedElements)):
+                for serializedJsonElement in serializedElements:
+                    result.append(
+                        Element.createFromJson(serializedJsonElement)
+                    )
+
+        return result
+
     def __envModifier(self):
         """
         Return an Env Modifier instance.
@@ -327,6 +420,13 @@ class SubprocessTaskWrapper(TaskWrapper):
         for varName in self.option('envUnset'):
             envModifier.addUnsetVar(varName)
 
+        # propagating the tracing to the subprocess
+        for varName, varValue in Tracer.env().items():
+            envModifier.setOverrideVar(
+                varName,
+                varValue
+            )
+
         return envModifier
 
 
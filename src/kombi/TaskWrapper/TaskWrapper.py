@@ -1,4 +1,5 @@
 from ..Task import Task
+from ..Tracer import Tracer
 from ..KombiError import KombiError
 
 class TaskWrapperError(KombiError):
@@ -63,7 +64,8 @@ class TaskWrapper(object):
         """
         assert isinstance(task, Task), "Invalid task type!"
 
-        return self._perform(task)
+        with Tracer.span('taskWrapper.run', taskWrapperType=self.type(), taskType=task.type(), elements=len(task.elements())):
+            return self._perform(task)
 
     def _perform(self, task):
         """
@@ -1,4 +1,5 @@
 from .TaskWrapper import TaskWrapper, TaskWrapperError, TaskWrapperTypeNotFoundError, TaskWrapperInvalidOptionError
+from .SubprocessSession import SubprocessSession, SubprocessSessionError
 from .SubprocessTaskWrapper import SubprocessTaskWrapper, SubprocessTaskWrapperFailedError
 from .DCCTaskWrapper import DCCTaskWrapper
 from .MayaTaskWrapper import MayaTaskWrapper
@@ -1,6 +1,10 @@
 import re
 import os
+import ast
 import uuid
+import operator
+import threading
+from collections import OrderedDict
 from ..Element import ElementInvalidVarError
 from ..KombiError import KombiError
 
@@ -19,6 +23,9 @@ class TemplateRequiredPathNotFoundError(TemplateError):
 class TemplateProcedureNotFoundError(TemplateError):
     """Template procedure not found error."""
 
+class TemplateInvalidArithmeticError(TemplateError):
+    """Template invalid arithmetic operation error."""
+
 class Template(object):
     """
     Creates a template object based on a string defined using template syntax.
@@ -55,10 +62,25 @@ class Template(object):
         "!kt {prefix}/testing/(newver <parent> as <version>)/{name}_<version>.(pad {frame} 10).{ext}"
     """
 
-    __argsGroupRegex = r"'(?:''|[^']+)'|(?:[^' ]+)"
-    __arithmeticOperatorsRegex = r"^[0-9+\-*\/\.'(\)]*$"
+    __arithmeticOperatorsRegex = re.compile(r"^[0-9+\-*\/\.(\)]*$")
+    __arithmeticLeadingZerosRegex = re.compile(r"(?<![0-9.])0+(?=[0-9])")
+    __arithmeticBinaryOperators = {
+        ast.Add: operator.add,
+        ast.Sub: operator.sub,
+        ast.Mult: operator.mul,
+        ast.Div: operator.truediv,
+        ast.FloorDiv: operator.floordiv,
+        ast.Pow: operator.pow
+    }
+    __arithmeticUnaryOperators = {
+        ast.UAdd: operator.pos,
+        ast.USub: operator.neg
+    }
     __kombiTemplatePrefix = "!kt"
     __registeredProcedures = {}
+    __procedureCacheSize = int(os.environ.get('KOMBI_TEMPLATE_PROCEDURE_CACHE_SIZE', 10000))
+    __procedureCache = OrderedDict()
+    __procedureCacheLock = threading.Lock()
 
     def __init__(self, inputString=""):
         """
@@ -168,14 +190,28 @@ class Template(object):
         return rawTemplate.startswith(cls.__kombiTemplatePrefix + ' ')
 
     @classmethod
-    def registerProcedure(cls, name, procedureCallable):
+    def registerProcedure(cls, name, procedureCallable, pure=False, typed=False):
         """
         Register a callable as procedure.
+
+        Procedures flagged as pure (the result only depends on the arguments) are
+        memoized across the templates. By default the arguments are passed as
+        strings, procedures flagged as typed receive the native values returned
+        by nested procedures and arithmetic operations (for instance an int).
         """
         assert hasattr(procedureCallable, '__call__'), \
             "Invalid callable!"
 
-        cls.__registeredProcedures[name] = procedureCallable
+        cls.__registeredProcedures[name] = (
+            procedureCallable,
+            {
+                'pure': pure,
+                'typed': typed
+            }
+        )
+
+        # the previous results may have been computed by a different callable
+        cls.clearProcedureCache()
 
     @classmethod
     def registeredProcedureNames(cls):
@@ -184,22 +220,59 @@ class Template(object):
         """
         return cls.__registeredProcedures.keys()
 
+    @classmethod
+    def procedureMetadata(cls, procedureName):
+        """
+        Return a dictionary containing the metadata about the procedure (pure and typed).
+        """
+        return dict(cls.__registeredProcedure(procedureName)[1])
+
+    @classmethod
+    def clearProcedureCache(cls):
+        """
+        Clear the memoized results of the pure procedures.
+        """
+        with cls.__procedureCacheLock:
+            cls.__procedureCache.clear()
+
     @classmethod
     def runProcedure(cls, procedureName, *args):
         """
         Run the procedure and return a value base on the args.
         """
-        if procedureName not in cls.__registeredProcedures:
-            raise TemplateProcedureNotFoundError(
-                'Could not find procedure name: "{0}"'.format(
-                    procedureName
-                )
-            )
+        return str(cls.callProcedure(procedureName, *args))
+
+    @classmethod
+    def callProcedure(cls, procedureName, *args):
+        """
+        Run the procedure and return its native value (not converted to string).
 
-        # executing procedure
-        return str(cls.__registeredProcedures[procedureName](*args))
+        The results of the pure procedures are memoized.
+        """
+        procedureCallable, metadata = cls.__registeredProcedure(procedureName)
+        if not metadata['pure']:
+            return procedureCallable(*args)
 
-    @classmethod # noqa: C901
+        cacheKey = (procedureName, args)
+        try:
+            with cls.__procedureCacheLock:
+                if cacheKey in cls.__procedureCache:
+                    cls.__procedureCache.move_to_end(cacheKey)
+                    return cls.__procedureCache[cacheKey]
+
+        # not hashable arguments can't be memoized
+        except TypeError:
+            return procedureCallable(*args)
+
+        result = procedureCallable(*args)
+        with cls.__procedureCacheLock:
+            cls.__procedureCache[cacheKey] = result
+            if len(cls.__procedureCache) > cls.__procedureCacheSize:
+                cls.__procedureCache.popitem(last=False)
+
+        return result
+
+    @classmethod
     def evalProcedure(cls, procedure, tokens=None):
         """
         Parse and run a procedure.
@@ -215,96 +288,17 @@ class Template(object):
         Make sure the nested proceures are surrounded by parentheses.
             "(myProcedureA 'arg 1' (myProcedureB 'arg 2' (myProcedureC 'arg 3')))"
 
-        The arguments are always parsed as string, and they should be
-        handled per procedure callable bases.
+        The arguments are parsed as string, and they should be handled per
+        procedure callable bases (except for typed procedures, see registerProcedure).
+        The result is converted to string only at the end.
         """
-        assert isinstance(procedure, str), \
-            "Invalid procedure type!"
-
-        assert procedure.startswith("(") and procedure.endswith(")"), \
-            "Cannot parse procedure, it needs to be defined under: ()"
-
-        procedure = procedure[1:-1]
-
-        fullResolved = ''
-        if tokens is None:
-            tokens = {}
-
-        for tokenName, tokenValue in tokens.items():
-            procedure = procedure.replace(tokenName, tokenValue)
-
-        insideProcedure = []
-        insideQuote = False
-        previousChar = None
-        start = None
-        for i, char in enumerate(procedure):
-
-            if insideQuote and char == "'":
-                if not insideProcedure:
-                    fullResolved += char
-                if previousChar != "\\":
-                    insideQuote = False
-
-            elif not insideQuote and char == "'":
-                if not insideProcedure:
-                    fullResolved += char
-                insideQuote = True
-
-            elif not insideQuote and char == '(':
-                if char not in insideProcedure:
-                    start = i
-                insideProcedure.append(char)
-
-            elif not insideQuote and char == ')':
-                insideProcedure.pop()
-                if not insideProcedure:
-                    fullResolved += " '{}' ".format(
-                        cls.evalProcedure(
-                            procedure[start: i + 1],
-                            tokens
-                        ).replace("'", "\\'")
-                    )
-
-            elif len(insideProcedure) == 0:
-                fullResolved += char
-
-            previousChar = char
-
-        procedure = fullResolved
-
-        # executing arithmetic operations
-        if re.match(cls.__arithmeticOperatorsRegex, procedure.replace(' ', '')):
-            return str(int(eval(procedure.replace("'", ""))))
-
-        # converting all the escaped single quoted to a special token
-        singleQuoteId = cls.__generatePlaceHolderId()
-        procedure = procedure.replace("\\'", singleQuoteId).strip()
-        procedureName = procedure.split(' ')[0]
-        procedureArgs = ' '.join(procedure.split(' ')[1:])
-
-        assignResultToToken = None
-        tokenAssignmentRegex = re.search(r" as <.*>(\s*|)$", procedureArgs.lower())
-        if tokenAssignmentRegex:
-            assignResultToToken = procedureArgs[tokenAssignmentRegex.start() + 4:].rstrip()
-            procedureArgs = procedureArgs[:tokenAssignmentRegex.start()]
-
-        rawArgs = re.findall(cls.__argsGroupRegex, procedureArgs)
-
-        procedureArgs = list(map(lambda x: x[1:-1] if x.startswith("'") else x, rawArgs))
-
-        # restoring single quoted to the arguments
-        procedureArgs = list(map(lambda x: x.replace(singleQuoteId, "'"), procedureArgs))
-
-        result = cls.runProcedure(
-            procedureName,
-            *procedureArgs
+        return str(
+            cls.__evalProcedure(
+                procedure,
+                {} if tokens is None else tokens
+            )
         )
 
-        if assignResultToToken is not None:
-            tokens[assignResultToToken] = result
-
-        return result
-
     def __processTemplateRequiredLevels(self, finalResolvedTemplate):
         """
         Return a template string by processing the required levels.
@@ -450,8 +444,17 @@ class Template(object):
         Return a template by resolving all variables and tokens for the actual value.
         """
         placeHolders = {}
-        for tokenName, tokenValue in resultData:
-            tokenPlaceHolder = self.__generatePlaceHolderId()
+        placeHolderPrefix = None
+        for index, (tokenName, tokenValue) in enumerate(resultData):
+            if tokenName not in template:
+                continue
+
+            # a single unique id is generated per call, the place holders are
+            # identified by the index of the token
+            if placeHolderPrefix is None:
+                placeHolderPrefix = self.__generatePlaceHolderId()[:-1]
+
+            tokenPlaceHolder = '{}:{}>'.format(placeHolderPrefix, index)
             placeHolders[tokenPlaceHolder] = tokenValue.replace("'", "\\'") if procedure else tokenValue
 
             template = template.replace(
@@ -556,6 +559,147 @@ class Template(object):
 
         return parts
 
+    @classmethod # noqa: C901
+    def __evalProcedure(cls, procedure, tokens):
+        """
+        Parse and run a procedure returning its native value.
+
+        The nested procedures are evaluated while parsing the arguments, so their
+        values are passed directly to the parent procedure (without converting
+        them back to the procedure syntax).
+        """
+        assert isinstance(procedure, str), \
+            "Invalid procedure type!"
+
+        assert procedure.startswith("(") and procedure.endswith(")"), \
+            "Cannot parse procedure, it needs to be defined under: ()"
+
+        procedure = procedure[1:-1]
+        for tokenName, tokenValue in tokens.items():
+            procedure = procedure.replace(tokenName, tokenValue)
+
+        # list of tuples (value, isBareWord)
+        args = []
+        word = ''
+        quotedValue = ''
+        insideProcedure = 0
+        insideQuote = False
+        previousChar = None
+        start = None
+        for i, char in enumerate(procedure):
+
+            if insideQuote and char == "'" and previousChar != "\\":
+                insideQuote = False
+                if not insideProcedure:
+                    args.append((quotedValue.replace("\\'", "'"), False))
+
+            elif insideQuote:
+                if not insideProcedure:
+                    quotedValue += char
+
+            elif char == "'":
+                insideQuote = True
+                if not insideProcedure:
+                    quotedValue = ''
+                    if word:
+                        args.append((word, True))
+                    word = ''
+
+            elif char == '(':
+                if not insideProcedure:
+                    start = i
+                    if word:
+                        args.append((word, True))
+                    word = ''
+                insideProcedure += 1
+
+            elif char == ')':
+                insideProcedure -= 1
+                if not insideProcedure:
+                    args.append((cls.__evalProcedure(procedure[start: i + 1], tokens), False))
+
+            elif not insideProcedure:
+                if char == ' ':
+                    if word:
+                        args.append((word, True))
+                    word = ''
+                else:
+                    word += char
+
+            previousChar = char
+
+        if word:
+            args.append((word, True))
+
+        # empty values are not passed as arguments
+        args = list(filter(lambda x: not (isinstance(x[0], str) and x[0] == ''), args))
+
+        # executing arithmetic operations
+        expression = ' '.join(map(lambda x: str(x[0]), args))
+        if cls.__arithmeticOperatorsRegex.match(expression.replace(' ', '')):
+            return cls.__evalArithmetic(expression)
+
+        assignResultToToken = None
+        if len(args) > 2 and args[-1][1] and args[-2][1] and args[-2][0].lower() == 'as' and \
+                args[-1][0].startswith('<') and args[-1][0].endswith('>'):
+            assignResultToToken = args[-1][0]
+            args = args[:-2]
+
+        procedureName = str(args[0][0]) if args else ''
+        procedureArgs = [x[0] for x in args[1:]]
+        if not cls.__registeredProcedure(procedureName)[1]['typed']:
+            procedureArgs = [x if isinstance(x, str) else str(x) for x in procedureArgs]
+
+        result = cls.callProcedure(
+            procedureName,
+            *procedureArgs
+        )
+
+        if assignResultToToken is not None:
+            tokens[assignResultToToken] = str(result)
+
+        return result
+
+    @classmethod
+    def __evalArithmetic(cls, expression):
+        """
+        Return the integer result of an arithmetic operation (evaluated without using eval).
+        """
+        def evalNode(node):
+            if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+                return node.value
+            elif isinstance(node, ast.BinOp) and type(node.op) in cls.__arithmeticBinaryOperators:
+                return cls.__arithmeticBinaryOperators[type(node.op)](evalNode(node.left), evalNode(node.right))
+            elif isinstance(node, ast.UnaryOp) and type(node.op) in cls.__arithmeticUnaryOperators:
+                return cls.__arithmeticUnaryOperators[type(node.op)](evalNode(node.operand))
+
+            raise TemplateInvalidArithmeticError(
+                'Invalid arithmetic operation: "{}"'.format(expression)
+            )
+
+        try:
+            # numbers may contain leading zeros (frames for instance: 0010)
+            node = ast.parse(cls.__arithmeticLeadingZerosRegex.sub('', expression).strip(), mode='eval')
+            return int(evalNode(node.body))
+        except (SyntaxError, ZeroDivisionError) as err:
+            raise TemplateInvalidArithmeticError(
+                'Invalid arithmetic operation "{}": {}'.format(expression, err)
+            )
+
+    @classmethod
+    def __registeredProcedure(cls, procedureName):
+        """
+        Return a tuple (callable, metadata) about the registered procedure.
+        """
+        if procedureName not in cls.__registeredProcedures:
+            raise TemplateProcedureNotFoundError(
+                'Could not find procedure name: "{0}"'.format(
+                    procedureName
+                )
+            )
+
+        return cls.__registeredProcedures[procedureName]
+
     @classmethod
     def __generatePlaceHolderId(cls):
         """
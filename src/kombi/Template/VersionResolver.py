@@ -0,0 +1,220 @@
+import os
+import re
+import threading
+from ..KombiError import KombiError
+
+class VersionResolverError(KombiError):
+    """Version resolver error."""
+
+class VersionResolverReserveError(VersionResolverError):
+    """Version resolver reserve error."""
+
+class VersionResolver(object):
+    """
+    Resolves the versions (v0001, v0002...) described by a version pattern.
+
+    The parsing of the version patterns (prefix, padding and suffix) and their
+    regexes are cached. The listing of the versions directories is cached while
+    a scope is active, so templates resolved for many elements (for instance
+    "(newver <parent>)" during a task holder query) list each directory once:
+
+        with VersionResolver.scope():
+            ...
+
+    Since the cached listing does not see the versions created by other
+    processes, use VersionResolver.reserve (or the "reservever" procedure) when
+    the version must be unique, it creates the version directory atomically so
+    concurrent publishers never get the same version.
+    """
+
+    __patternCache = {}
+    __listingCache = {}
+    __activeScopes = 0
+    __reserveMaxAttempts = 1000
+    __lock = threading.RLock()
+
+    @classmethod
+    def defaultPattern(cls):
+        """
+        Return the default version pattern (KOMBI_VERSION_PATTERN).
+        """
+        return os.environ.get('KOMBI_VERSION_PATTERN', 'v####')
+
+    @classmethod
+    def splitPattern(cls, versionPattern=''):
+        """
+        Return a dictionary containing the parts of the version pattern (prefix, padding and suffix).
+        """
+        return dict(cls.__parsePattern(versionPattern or cls.defaultPattern())[0])
+
+    @classmethod
+    def split(cls, version, versionPattern=''):
+        """
+        Return a tuple (prefix, number, suffix) for a version matching the pattern or None otherwise.
+        """
+        patternParts, versionRegex = cls.__parsePattern(versionPattern or cls.defaultPattern())
+        versionMatch = versionRegex.match(str(version))
+        if not versionMatch:
+            return None
+
+        return (patternParts['prefix'], versionMatch.group(1), patternParts['suffix'])
+
+    @classmethod
+    def label(cls, versionNumber, versionPattern=''):
+        """
+        Return a version using the pattern.
+        """
+        patternParts = cls.__parsePattern(versionPattern or cls.defaultPattern())[0]
+
+        return patternParts['prefix'] + str(int(versionNumber)).zfill(len(patternParts['padding'])) + patternParts['suffix']
+
+    @classmethod
+    def latest(cls, versionsPath, versionPattern=''):
+        """
+        Return the latest version number found under the versions path (0 when none version is found).
+        """
+        versionPattern = versionPattern or cls.defaultPattern()
+        padding = len(cls.__parsePattern(versionPattern)[0]['padding'])
+
+        result = 0
+        for name in cls.listing(versionsPath):
+            versionParts = cls.split(name, versionPattern)
+            if versionParts and len(versionParts[1]) >= padding:
+                result = max(int(versionParts[1]), result)
+
+        return result
+
+    @classmethod
+    def reserve(cls, versionsPath, versionPattern=''):
+        """
+        Create the directory about the next version under the versions path returning its version.
+
+        The version directory is created through mkdir (atomic), in case another
+        process has created it first the next version is attempted.
+        """
+        versionPattern = versionPattern or cls.defaultPattern()
+        os.makedirs(versionsPath, exist_ok=True)
+
+        with cls.__lock:
+            # not using the cached listing here, since the versions may have been
+            # created by other processes
+            cls.__listingCache.pop(os.path.normpath(versionsPath), None)
+            versionNumber = cls.latest(versionsPath, versionPattern)
+
+            for _ in range(cls.__reserveMaxAttempts):
+                versionNumber += 1
+                version = cls.label(versionNumber, versionPattern)
+                try:
+                    os.mkdir(os.path.join(versionsPath, version))
+                except FileExistsError:
+                    continue
+
+                if cls.__activeScopes:
+                    cls.listing(versionsPath).append(version)
+                return version
+
+        raise VersionResolverReserveError(
+            'Could not reserve a new version under: {}'.format(versionsPath)
+        )
+
+    @classmethod
+    def listing(cls, versionsPath):
+        """
+        Return a list with the names found under the versions path (cached while a scope is active).
+        """
+        if not cls.__activeScopes:
+            return cls.__listDirectory(versionsPath)
+
+        versionsPath = os.path.normpath(versionsPath)
+        with cls.__lock:
+            if versionsPath not in cls.__listingCache:
+                cls.__listingCache[versionsPath] = cls.__listDirectory(versionsPath)
+
+            return cls.__listingCache[versionsPath]
+
+    @classmethod
+    def scope(cls):
+        """
+        Return a context manager where the listing of the versions directories is cached.
+        """
+        return _VersionResolverScope()
+
+    @classmethod
+    def _enterScope(cls):
+        """
+        Activate the caching of the listing.
+        """
+        with cls.__lock:
+            cls.__activeScopes += 1
+
+    @classmethod
+    def _exitScope(cls):
+        """
+        Deactivate the caching of the listing (the cache is cleared when leaving the last scope).
+        """
+        with cls.__lock:
+            cls.__activeScopes -= 1
+            if not cls.__activeScopes:
+                cls.__listingCache.clear()
+
+    @classmethod
+    def __parsePattern(cls, versionPattern):
+        """
+        Return a tuple containing the parts of the version pattern and the regex used to match the versions.
+        """
+        if versionPattern in cls.__patternCache:
+            return cls.__patternCache[versionPattern]
+
+        prefix = ''
+        padding = ''
+        suffix = ''
+        for char in versionPattern:
+            if char != '#' and not padding:
+                prefix += char
+            elif char != '#' and padding:
+                suffix += char
+            else:
+                padding += char
+
+        assert len(padding), 'Padding pattern representation (#) not found in version pattern: {}'.format(versionPattern)
+
+        result = (
+            {
+                'prefix': prefix,
+                'padding': padding,
+                'suffix': suffix
+            },
+            re.compile('^{}([0-9]+){}$'.format(re.escape(prefix), re.escape(suffix)))
+        )
+        cls.__patternCache[versionPattern] = result
+
+        return result
+
+    @staticmethod
+    def __listDirectory(versionsPath):
+        """
+        Return a list with the names found under the directory (empty list when it does not exist).
+        """
+        try:
+            return os.listdir(versionsPath)
+        except OSError:
+            return []
+
+class _VersionResolverScope(object):
+    """
+    Context manager used to cache the listing of the versions directories.
+    """
+
+    def __enter__(self):
+        """
+        Activate the cache.
+        """
+        VersionResolver._enterScope()
+        return self
+
+    def __exit__(self, *args):
+        """
+        Deactivate the cache.
+        """
+        VersionResolver._exitScope()
+        return False
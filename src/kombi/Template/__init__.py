@@ -1,2 +1,3 @@
-from .Template import Template, TemplateError, TemplateVarNotFoundError, TemplateRequiredPathNotFoundError, TemplateProcedureNotFoundError
+from .Template import Template, TemplateError, TemplateVarNotFoundError, TemplateRequiredPathNotFoundError, TemplateProcedureNotFoundError, TemplateInvalidArithmeticError
+from .VersionResolver import VersionResolver, VersionResolverError, VersionResolverReserveError
 from . import procedures
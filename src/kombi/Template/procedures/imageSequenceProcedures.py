@@ -20,11 +20,15 @@ def retimePadding(frame, retime, size):
 # frame padding
 Template.registerProcedure(
     'pad',
-    padding
+    padding,
+    pure=True,
+    typed=True
 )
 
 # re-time frame padding
 Template.registerProcedure(
     'retimepad',
-    retimePadding
+    retimePadding,
+    pure=True,
+    typed=True
 )
@@ -99,53 +99,71 @@ def __castToInt(*args):
 # sum
 Template.registerProcedure(
     'sum',
-    sumInt
+    sumInt,
+    pure=True,
+    typed=True
 )
 
 # subtraction
 Template.registerProcedure(
     'sub',
-    subtractInt
+    subtractInt,
+    pure=True,
+    typed=True
 )
 
 # multiply
 Template.registerProcedure(
     'mult',
-    multiplyInt
+    multiplyInt,
+    pure=True,
+    typed=True
 )
 
 # divide
 Template.registerProcedure(
     'div',
-    divideInt
+    divideInt,
+    pure=True,
+    typed=True
 )
 
 # minimum
 Template.registerProcedure(
     'min',
-    minimumInt
+    minimumInt,
+    pure=True,
+    typed=True
 )
 
 # maximum
 Template.registerProcedure(
     'max',
-    maximumInt
+    maximumInt,
+    pure=True,
+    typed=True
 )
 
 # round
 Template.registerProcedure(
     'round',
-    roundNumber
+    roundNumber,
+    pure=True,
+    typed=True
 )
 
 # even
 Template.registerProcedure(
     'even',
-    even
+    even,
+    pure=True,
+    typed=True
 )
 
 # odd
 Template.registerProcedure(
     'odd',
-    odd
+    odd,
+    pure=True,
+    typed=True
 )
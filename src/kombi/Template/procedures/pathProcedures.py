@@ -53,7 +53,8 @@ Template.registerProcedure(
 
 Template.registerProcedure(
     'dirname',
-    dirname
+    dirname,
+    pure=True
 )
 
 Template.registerProcedure(
@@ -63,20 +64,24 @@ Template.registerProcedure(
 
 Template.registerProcedure(
     'parentdirname',
-    parentdirname
+    parentdirname,
+    pure=True
 )
 
 Template.registerProcedure(
     'basename',
-    basename
+    basename,
+    pure=True
 )
 
 Template.registerProcedure(
     'basenamewithoutext',
-    basenamewithoutext
+    basenamewithoutext,
+    pure=True
 )
 
 Template.registerProcedure(
     'noext',
-    basenamewithoutext
+    basenamewithoutext,
+    pure=True
 )
@@ -129,106 +129,124 @@ def camelCaseToSpaced(text):
 # slice
 Template.registerProcedure(
     'slice',
-    sliceText
+    sliceText,
+    pure=True
 )
 
 # fallback
 Template.registerProcedure(
     'fallback',
-    fallback
+    fallback,
+    pure=True
 )
 
 # repeat
 Template.registerProcedure(
     'repeat',
-    repeat
+    repeat,
+    pure=True
 )
 
 # upper case
 Template.registerProcedure(
     'upper',
-    upper
+    upper,
+    pure=True
 )
 
 # concatenate
 Template.registerProcedure(
     'concat',
-    concat
+    concat,
+    pure=True
 )
 
 # lower case
 Template.registerProcedure(
     'lower',
-    lower
+    lower,
+    pure=True
 )
 
 # lower case
 Template.registerProcedure(
     'lower',
-    lower
+    lower,
+    pure=True
 )
 
 # capitalize
 Template.registerProcedure(
     'capitalize',
-    capitalize
+    capitalize,
+    pure=True
 )
 
 # replace
 Template.registerProcedure(
     'replace',
-    replace
+    replace,
+    pure=True
 )
 
 # remove
 Template.registerProcedure(
     'remove',
-    remove
+    remove,
+    pure=True
 )
 
 # match
 Template.registerProcedure(
     'match',
-    match
+    match,
+    pure=True
 )
 
 # length
 Template.registerProcedure(
     'len',
-    length
+    length,
+    pure=True
 )
 
 # undefined
 Template.registerProcedure(
     'undefined',
-    undefined
+    undefined,
+    pure=True
 )
 
 # defined
 Template.registerProcedure(
     'defined',
-    defined
+    defined,
+    pure=True
 )
 
 # equal
 Template.registerProcedure(
     'equal',
-    equal
+    equal,
+    pure=True
 )
 
 # different
 Template.registerProcedure(
     'different',
-    different
+    different,
+    pure=True
 )
 
 # split part
 Template.registerProcedure(
     'splitpart',
-    splitPart
+    splitPart,
+    pure=True
 )
 
 Template.registerProcedure(
     'camelcasetospaced',
-    camelCaseToSpaced
+    camelCaseToSpaced,
+    pure=True
 )
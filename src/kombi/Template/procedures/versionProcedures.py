@@ -27,94 +27,64 @@ Additionally, a custom version pattern can be provided directly through
     (labelver 1 v###)
     (new <parent> v#####)
     (latest <parent> v##)
+
+When the version needs to be unique across concurrent executions (for instance
+publishers running in the renderfarm), use 'reservever' that creates the
+version directory atomically:
+    (reservever <parent>)
+
+The resolution of the versions is implemented by the VersionResolver.
 """
 
-import os
-import re
 from ..Template import Template
+from ..VersionResolver import VersionResolver
 
 
 def defaultVersionPattern():
     """
     Return the default version pattern.
     """
-    return os.environ.get('KOMBI_VERSION_PATTERN', 'v####')
+    return VersionResolver.defaultPattern()
 
 def isVersion(version, versionPattern=''):
     """
     Return if the input is a version.
     """
-    if not versionPattern:
-        versionPattern = defaultVersionPattern()
-
-    patternParts = __splitVersionPattern(versionPattern)
-    version = str(version)
-    if patternParts['prefix'] and not version.startswith(patternParts['prefix']):
-        return 0
-
-    if patternParts['suffix'] and not version.endswith(patternParts['suffix']):
-        return 0
-
-    if patternParts['prefix']:
-        version = version[len(patternParts['prefix']):]
-
-    if patternParts['suffix']:
-        version = version[:-len(patternParts['suffix'])]
-
-    return int(version.isdigit())
+    return int(VersionResolver.split(version, versionPattern) is not None)
 
 def verPrefix(version, versionPattern=''):
     """
     Return the version prefix.
     """
-    if not versionPattern:
-        versionPattern = defaultVersionPattern()
-
-    patternParts = __splitVersionPattern(versionPattern)
+    patternParts = VersionResolver.splitPattern(versionPattern)
     return str(version)[:len(patternParts['prefix'])]
 
 def verNumber(version, versionPattern=''):
     """
     Return the version number.
     """
-    if not versionPattern:
-        versionPattern = defaultVersionPattern()
-
-    patternParts = __splitVersionPattern(versionPattern)
+    patternParts = VersionResolver.splitPattern(versionPattern)
     return str(version)[len(patternParts['prefix']): len(patternParts['prefix']) + len(patternParts['padding'])]
 
 def verSuffix(version, versionPattern=''):
     """
     Return the version suffix.
     """
-    if not versionPattern:
-        versionPattern = defaultVersionPattern()
-
-    patternParts = __splitVersionPattern(versionPattern)
+    patternParts = VersionResolver.splitPattern(versionPattern)
     return str(version)[len(patternParts['prefix']) + len(patternParts['padding']):]
 
 def label(versionNumber, versionPattern=''):
     """
     Return a version using the pattern.
     """
-    if not versionPattern:
-        versionPattern = defaultVersionPattern()
-
-    return __buildVersion(
-        int(versionNumber),
-        versionPattern
-    )
+    return VersionResolver.label(versionNumber, versionPattern)
 
 def new(versionsPath, versionPattern=''):
     """
     Return a new version.
     """
-    if not versionPattern:
-        versionPattern = defaultVersionPattern()
-
-    version = __queryLatest(versionsPath, versionPattern)
-    return label(
-        version + 1,
+    return VersionResolver.label(
+        VersionResolver.latest(versionsPath, versionPattern) + 1,
         versionPattern
     )
 
@@ -122,63 +92,16 @@ def latest(versionsPath, versionPattern=''):
     """
     Return a new version, in case none version is found it version 0, for instance v000.
     """
-    if not versionPattern:
-        versionPattern = defaultVersionPattern()
-
-    version = __queryLatest(versionsPath, versionPattern)
-    return label(
-        version,
+    return VersionResolver.label(
+        VersionResolver.latest(versionsPath, versionPattern),
         versionPattern
     )
 
-def __buildVersion(version, versionPattern):
-    """
-    Return a resolved version string using the version pattern.
-    """
-    patternParts = __splitVersionPattern(versionPattern)
-    return patternParts['prefix'] + str(version).zfill(len(patternParts['padding'])) + patternParts['suffix']
-
-def __splitVersionPattern(versionPattern):
+def reserve(versionsPath, versionPattern=''):
     """
-    Split the version pattern in parts.
+    Return a new version creating its directory under the versions path (unique across concurrent executions).
     """
-    prefix = ''
-    padding = ''
-    suffix = ''
-    for char in versionPattern:
-        if char != '#' and not padding:
-            prefix += char
-        elif char != '#' and padding:
-            suffix += char
-        else:
-            padding += char
-
-    assert len(padding), 'Padding pattern representation (#) not found in version pattern: {}'.format(versionPattern)
-    return {
-        'prefix': prefix,
-        'padding': padding,
-        'suffix': suffix
-    }
-
-def __queryLatest(versionsPath, versionPattern):
-    """
-    Return the latest version found under the versions path.
-
-    In case none version is found, it returns 0 by default.
-    """
-    version = 0
-    patternParts = __splitVersionPattern(versionPattern)
-    versionRegEx = "^" + patternParts['prefix'] + "[0-9]{" + str(len(patternParts['padding'])) + ",}" + patternParts['suffix'] + "$"
-
-    # finding the latest version
-    if os.path.exists(versionsPath):
-        for directory in os.listdir(versionsPath):
-            if re.match(versionRegEx, directory):
-                version = max(
-                    int(verNumber(directory, versionPattern)),
-                    version
-                )
-    return version
+    return VersionResolver.reserve(versionsPath, versionPattern)
 
 
 # version prefix procedure
@@ -217,6 +140,12 @@ Template.registerProcedure(
     latest
 )
 
+# reserve version procedure
+Template.registerProcedure(
+    'reservever',
+    reserve
+)
+
 # is version procedure
 Template.registerProcedure(
     'isver',
@@ -0,0 +1,311 @@
+import os
+import sys
+import json
+import time
+import uuid
+import atexit
+import socket
+import threading
+
+class _NullSpan(object):
+    """
+    Span used when the tracing is disabled (does nothing).
+    """
+
+    def setAttribute(self, name, value):
+        """
+        Ignore the attribute.
+        """
+
+    def __enter__(self):
+        """
+        Return the span itself.
+        """
+        return self
+
+    def __exit__(self, *args):
+        """
+        Nothing to be done.
+        """
+        return False
+
+class TracerSpan(object):
+    """
+    Timing span recorded by the tracer.
+
+    The spans are nested per thread, the attributes are written as the "args"
+    of the trace event.
+    """
+
+    def __init__(self, name, attributes):
+        """
+        Create a tracer span.
+        """
+        self.__name = name
+        self.__attributes = attributes
+        self.__spanId = uuid.uuid4().hex[:16]
+        self.__parentSpanId = None
+        self.__startTime = None
+
+    def spanId(self):
+        """
+        Return the id of the span.
+        """
+        return self.__spanId
+
+    def setAttribute(self, name, value):
+        """
+        Set an attribute to the span (for instance: number of elements, bytes).
+        """
+        self.__attributes[name] = value
+
+    def __enter__(self):
+        """
+        Start the span.
+        """
+        stack = Tracer._spanStack()
+        self.__parentSpanId = stack[-1].spanId() if stack else Tracer.parentSpanId()
+        stack.append(self)
+        self.__startTime = time.time_ns()
+
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        """
+        Finish the span recording it in the tracer.
+        """
+        endTime = time.time_ns()
+        stack = Tracer._spanStack()
+        if stack and stack[-1] is self:
+            stack.pop()
+
+        args = dict(self.__attributes)
+        args['spanId'] = self.__spanId
+        if self.__parentSpanId:
+            args['parentSpanId'] = self.__parentSpanId
+        if excType is not None:
+            args['error'] = excType.__name__
+
+        Tracer._addEvent({
+            'name': self.__name,
+            'cat': 'kombi',
+            'ph': 'X',
+            'ts': self.__startTime // 1000,
+            'dur': (endTime - self.__startTime) // 1000,
+            'pid': os.getpid(),
+            'tid': threading.get_ident(),
+            'args': args
+        })
+
+        return False
+
+class Tracer(object):
+    """
+    Low overhead execution tracing based on nested timing spans.
+
+    The tracing is enabled by defining the directory where the traces are written
+    through the environment variable KOMBI_TRACE_DIRECTORY. Each process writes
+    its own file using the Chrome trace event format (chrome://tracing, perfetto),
+    the trace information is propagated to the subprocesses and renderfarm jobs
+    (see Tracer.env), so all the files about a dispatched run share the same trace
+    id and can be combined through Tracer.merge. When disabled Tracer.span returns
+    a no-op span.
+
+    Usage:
+        with Tracer.span('myTask.render', elements=len(elements)) as span:
+            ...
+            span.setAttribute('bytes', totalBytes)
+    """
+
+    __directoryEnv = 'KOMBI_TRACE_DIRECTORY'
+    __traceIdEnv = 'KOMBI_TRACE_ID'
+    __parentSpanEnv = 'KOMBI_TRACE_PARENT_SPAN'
+    __flushSize = 1000
+
+    __directory = os.environ.get(__directoryEnv, '')
+    __traceId = os.environ.get(__traceIdEnv, '') or uuid.uuid4().hex
+    __parentSpanId = os.environ.get(__parentSpanEnv, '')
+    __nullSpan = _NullSpan()
+    __events = []
+    __local = threading.local()
+    __lock = threading.Lock()
+
+    @classmethod
+    def isEnabled(cls):
+        """
+        Return a boolean telling if the tracing is enabled.
+        """
+        return bool(cls.__directory)
+
+    @classmethod
+    def span(cls, name, **attributes):
+        """
+        Return a span (context manager) that records the execution time of the block.
+        """
+        if not cls.__directory:
+            return cls.__nullSpan
+
+        return TracerSpan(name, attributes)
+
+    @classmethod
+    def traceId(cls):
+        """
+        Return the id of the trace (shared by the processes that are part of the same run).
+        """
+        return cls.__traceId
+
+    @classmethod
+    def parentSpanId(cls):
+        """
+        Return the id of the span that launched the current process (empty string when not available).
+        """
+        return cls.__parentSpanId
+
+    @classmethod
+    def directory(cls):
+        """
+        Return the directory where the traces are written (empty string when disabled).
+        """
+        return cls.__directory
+
+    @classmethod
+    def setDirectory(cls, directory):
+        """
+        Set the directory used to write the traces (an empty string disables the tracing).
+        """
+        cls.flush()
+        cls.__directory = directory
+
+    @classmethod
+    def env(cls):
+        """
+        Return the environment variables used to propagate the tracing to a subprocess.
+        """
+        if not cls.__directory:
+            return {}
+
+        stack = cls._spanStack()
+        return {
+            cls.__directoryEnv: cls.__directory,
+            cls.__traceIdEnv: cls.__traceId,
+            cls.__parentSpanEnv: stack[-1].spanId() if stack else cls.__parentSpanId
+        }
+
+    @classmethod
+    def filePath(cls):
+        """
+        Return the trace file path written by the current process.
+        """
+        return os.path.join(
+            cls.__directory,
+            'kombiTrace_{}_{}_{}.json'.format(
+                cls.__traceId,
+                socket.gethostname(),
+                os.getpid()
+            )
+        )
+
+    @classmethod
+    def flush(cls):
+        """
+        Write the recorded events to the trace file of the process.
+
+        The file uses the JSON array format where the closing bracket is optional
+        (supported by the trace viewers), so the events can be appended to it.
+        """
+        with cls.__lock:
+            if not cls.__events or not cls.__directory:
+                return
+
+            events = cls.__events
+            cls.__events = []
+
+            filePath = cls.filePath()
+            contents = ',\n'.join(map(json.dumps, events))
+            if not os.path.exists(filePath):
+                processName = {
+                    'name': 'process_name',
+                    'ph': 'M',
+                    'pid': os.getpid(),
+                    'args': {
+                        'name': '{} ({})'.format(
+                            os.path.basename(sys.argv[0]) if sys.argv and sys.argv[0] else 'python',
+                            socket.gethostname()
+                        )
+                    }
+                }
+                contents = '[\n{},\n{}'.format(json.dumps(processName), contents)
+            else:
+                contents = ',\n' + contents
+
+            os.makedirs(cls.__directory, exist_ok=True)
+            with open(filePath, 'a') as f:
+                f.write(contents)
+
+    @classmethod
+    def events(cls, directory, traceId=None):
+        """
+        Return a list of the events found in the trace files under the directory.
+
+        When the trace id is specified only the events about it are returned.
+        """
+        result = []
+        for fileName in sorted(os.listdir(directory)):
+            if not (fileName.startswith('kombiTrace_') and fileName.endswith('.json')):
+                continue
+
+            if traceId is not None and not fileName.startswith('kombiTrace_{}_'.format(traceId)):
+                continue
+
+            with open(os.path.join(directory, fileName)) as f:
+                contents = f.read().strip()
+
+            if not contents:
+                continue
+
+            if not contents.endswith(']'):
+                contents += ']'
+            result += json.loads(contents)
+
+        return result
+
+    @classmethod
+    def merge(cls, directory, outputFilePath, traceId=None):
+        """
+        Combine the trace files found under the directory in a single Chrome trace file.
+        """
+        with open(outputFilePath, 'w') as f:
+            json.dump(
+                {
+                    'traceEvents': cls.events(directory, traceId),
+                    'displayTimeUnit': 'ms'
+                },
+                f
+            )
+
+    @classmethod
+    def _spanStack(cls):
+        """
+        Return the stack of active spans for the current thread.
+        """
+        try:
+            return cls.__local.stack
+        except AttributeError:
+            cls.__local.stack = []
+            return cls.__local.stack
+
+    @classmethod
+    def _addEvent(cls, event):
+        """
+        Add a trace event (flushing the events to the file when necessary).
+        """
+        with cls.__lock:
+            cls.__events.append(event)
+            shouldFlush = len(cls.__events) >= cls.__flushSize
+
+        if shouldFlush:
+            cls.flush()
+
+
+# making sure the events are written when the process exits
+atexit.register(Tracer.flush)
@@ -1,4 +1,7 @@
 import sys
+from .Tracer import Tracer, TracerSpan
+from .CacheFile import CacheFile
+from .ImageReader import ImageReader, ImageReaderError
 from .ProcessExecution import ProcessExecution
 from .EnvModifier import EnvModifier, EnvModifierError, EnvModifierInvalidVarError, EnvModifierInvalidVarValueError
 from .Config import Config, ConfigKeyError
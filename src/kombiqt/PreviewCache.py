@@ -0,0 +1,226 @@
+import os
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from Qt import QtCore, QtGui
+
+class PreviewCache(object):
+    """
+    Bounded cache for the preview images displayed by the interface.
+
+    The images are stored downscaled to a size bucket (the smallest power of two
+    that fits the requested size), in memory using a least recently used policy
+    bounded by the total amount of bytes (KOMBI_GUI_PREVIEW_CACHE_MEMORY_LIMIT) and
+    on disk (KOMBI_GUI_PREVIEW_CACHE_DIRECTORY, an empty value disables it). The
+    entries are keyed by the file path, modification time and size, therefore a
+    modified file results in a new entry.
+
+    The disk store is bounded by KOMBI_GUI_PREVIEW_CACHE_DISK_LIMIT (bytes), once
+    the limit is exceeded the least recently used images are removed from it.
+    """
+
+    __minimumBucketSize = 256
+    __memoryLimit = int(os.environ.get('KOMBI_GUI_PREVIEW_CACHE_MEMORY_LIMIT', 256 * 1024 * 1024))
+    __diskDirectory = os.environ.get(
+        'KOMBI_GUI_PREVIEW_CACHE_DIRECTORY',
+        os.path.join(tempfile.gettempdir(), 'kombiPreviewCache')
+    )
+    __diskLimit = int(os.environ.get('KOMBI_GUI_PREVIEW_CACHE_DISK_LIMIT', 1024 * 1024 * 1024))
+    __diskPruneInterval = 64
+
+    __entries = OrderedDict()
+    __totalBytes = 0
+    __diskWrites = 0
+    __lock = threading.Lock()
+    __diskLock = threading.Lock()
+
+    @classmethod
+    def get(cls, filePath, width, height):
+        """
+        Return the cached preview image for the file path (None when not cached).
+
+        The result can be bigger than the input size (size bucket), it's up to the
+        caller to scale it to the final size.
+        """
+        key = cls.__key(filePath, width, height)
+        if key is None:
+            return None
+
+        with cls.__lock:
+            if key in cls.__entries:
+                cls.__entries.move_to_end(key)
+                return cls.__entries[key]
+
+        # looking for the image in the disk store
+        diskFilePath = cls.__diskFilePath(key)
+        if diskFilePath and os.path.exists(diskFilePath):
+            image = QtGui.QImage(diskFilePath)
+            if not image.isNull():
+                cls.__addEntry(key, image)
+
+                # keeping track about the usage of the image in the disk store
+                try:
+                    os.utime(diskFilePath)
+                except OSError:
+                    pass
+
+                return image
+
+        return None
+
+    @classmethod
+    def contains(cls, filePath, width, height):
+        """
+        Return a boolean telling if there is a cached preview for the file path (without loading it).
+        """
+        key = cls.__key(filePath, width, height)
+        if key is None:
+            return False
+
+        with cls.__lock:
+            if key in cls.__entries:
+                return True
+
+        diskFilePath = cls.__diskFilePath(key)
+        return bool(diskFilePath) and os.path.exists(diskFilePath)
+
+    @classmethod
+    def set(cls, filePath, image, width, height):
+        """
+        Add the image to the cache returning the downscaled image that has been stored.
+        """
+        key = cls.__key(filePath, width, height)
+        if key is None or image.isNull():
+            return image
+
+        bucketSize = key[-1]
+        if image.width() > bucketSize or image.height() > bucketSize:
+            image = image.scaled(
+                bucketSize,
+                bucketSize,
+                QtCore.Qt.KeepAspectRatio,
+                QtCore.Qt.SmoothTransformation
+            )
+
+        cls.__addEntry(key, image)
+
+        diskFilePath = cls.__diskFilePath(key)
+        if diskFilePath:
+            try:
+                os.makedirs(os.path.dirname(diskFilePath), exist_ok=True)
+
+                # writing to a temporary file first so concurrent readers never
+                # see a partially written file
+                temporaryFilePath = '{}_{}.png'.format(diskFilePath[:-4], threading.get_ident())
+                if image.save(temporaryFilePath, 'PNG'):
+                    os.replace(temporaryFilePath, diskFilePath)
+            except OSError:
+                pass
+
+            # the disk store is checked against the limit from time to time
+            with cls.__lock:
+                pruneDisk = cls.__diskWrites % cls.__diskPruneInterval == 0
+                cls.__diskWrites += 1
+
+            if pruneDisk:
+                cls.pruneDisk()
+
+        return image
+
+    @classmethod
+    def pruneDisk(cls, limit=None):
+        """
+        Remove the least recently used images from the disk store until it fits in the limit.
+        """
+        if not cls.__diskDirectory:
+            return
+
+        if limit is None:
+            limit = cls.__diskLimit
+
+        with cls.__diskLock:
+            entries = []
+            totalBytes = 0
+            for directory, _, fileNames in os.walk(cls.__diskDirectory):
+                for fileName in fileNames:
+                    diskFilePath = os.path.join(directory, fileName)
+                    try:
+                        stat = os.stat(diskFilePath)
+                    except OSError:
+                        continue
+
+                    entries.append((stat.st_mtime_ns, stat.st_size, diskFilePath))
+                    totalBytes += stat.st_size
+
+            if totalBytes <= limit:
+                return
+
+            for _, size, diskFilePath in sorted(entries):
+                try:
+                    os.remove(diskFilePath)
+                except OSError:
+                    continue
+
+                totalBytes -= size
+                if totalBytes <= limit:
+                    break
+
+    @classmethod
+    def clear(cls):
+        """
+        Remove all the images from the memory cache (the disk store is kept).
+        """
+        with cls.__lock:
+            cls.__entries.clear()
+            cls.__totalBytes = 0
+
+    @classmethod
+    def totalBytes(cls):
+        """
+        Return the amount of bytes used by the images in memory.
+        """
+        return cls.__totalBytes
+
+    @classmethod
+    def __addEntry(cls, key, image):
+        """
+        Add the image to the memory cache evicting the least recently used images when necessary.
+        """
+        with cls.__lock:
+            if key in cls.__entries:
+                cls.__totalBytes -= cls.__entries.pop(key).sizeInBytes()
+
+            cls.__entries[key] = image
+            cls.__totalBytes += image.sizeInBytes()
+
+            while cls.__totalBytes > cls.__memoryLimit and len(cls.__entries) > 1:
+                _, evictedImage = cls.__entries.popitem(last=False)
+                cls.__totalBytes -= evictedImage.sizeInBytes()
+
+    @classmethod
+    def __key(cls, filePath, width, height):
+        """
+        Return the key (file path, modification time, size and size bucket) used by the cache.
+        """
+        try:
+            stat = os.stat(filePath)
+        except OSError:
+            return None
+
+        bucketSize = cls.__minimumBucketSize
+        while bucketSize < max(width or 0, height or 0):
+            bucketSize *= 2
+
+        return (os.path.abspath(filePath), stat.st_mtime_ns, stat.st_size, bucketSize)
+
+    @classmethod
+    def __diskFilePath(cls, key):
+        """
+        Return the location of the image in the disk store (None when the disk store is disabled).
+        """
+        if not cls.__diskDirectory:
+            return None
+
+        keyHash = hashlib.sha256('|'.join(map(str, key)).encode('utf-8')).hexdigest()
+        return os.path.join(cls.__diskDirectory, keyHash[:2], '{}.png'.format(keyHash))
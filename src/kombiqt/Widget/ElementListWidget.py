@@ -1,12 +1,19 @@
 import os
 import hashlib
+import collections
+import concurrent.futures
 import functools
 import traceback
 import weakref
+from kombi.ImageReader import ImageReaderError
 from kombi.Element import Element
 from kombi.Template import Template
 from kombi.Config import Config
 from kombi.Element import ElementContext
+from kombi.Element.Fs import FsElement, SequenceIndex, MediaProbe
+from kombi.Element.Fs.Image import OiioElement
+from kombi.Element.Fs.Video import VideoElement
+from kombi.Element.Fs.Sequence import SequenceElement
 from ..Menu.TasksMenu import TasksMenu
 from ..Resource import Resource
 from Qt import QtWidgets, QtGui, QtCore
@@ -20,6 +27,11 @@ class ElementListWidget(QtWidgets.QTreeWidget):
     modifed = QtCore.Signal()
     checkedStateChanged = QtCore.Signal()
     parentContextMenu = QtCore.Signal()
+    prefetched = QtCore.Signal(list)
+    __prefetchExecutor = None
+    __prefetchThreads = int(os.environ.get('KOMBI_GUI_PREFETCH_THREADS', 4))
+    __prefetchLookahead = int(os.environ.get('KOMBI_GUI_PREFETCH_LOOKAHEAD', 50))
+    __itemsBatchSize = int(os.environ.get('KOMBI_GUI_ITEMS_BATCH_SIZE', 1000))
 
     def __init__(
         self,
@@ -49,7 +61,24 @@ class ElementListWidget(QtWidgets.QTreeWidget):
         self.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
 
         self.itemChanged.connect(self.__onSourceTreeItemCheckedChanged)
+        self.itemExpanded.connect(self.__onSourceTreeItemExpanded)
         self.customContextMenuRequested.connect(self.__onSourceTreeContextMenu)
+        self.prefetched.connect(self.__onPrefetched)
+
+        # the column data of the items is only computed once they are displayed
+        self.__prefetchedElements = weakref.WeakSet()
+        self.__visibleItemsTimer = QtCore.QTimer(self)
+        self.__visibleItemsTimer.setSingleShot(True)
+        self.__visibleItemsTimer.setInterval(0)
+        self.__visibleItemsTimer.timeout.connect(self.__onUpdateVisibleItems)
+        self.verticalScrollBar().valueChanged.connect(lambda _: self.__visibleItemsTimer.start())
+
+        # the items of the flat mode are created by batches, so large lists
+        # don't block the interface
+        self.__pendingElements = collections.deque()
+        self.__pendingItemsTimer = QtCore.QTimer(self)
+        self.__pendingItemsTimer.setInterval(0)
+        self.__pendingItemsTimer.timeout.connect(self.__onCreatePendingItems)
 
         header = QtWidgets.QTreeWidgetItem([])
         self.header().setSectionResizeMode(QtWidgets.QHeaderView.ResizeToContents)
@@ -67,6 +96,7 @@ class ElementListWidget(QtWidgets.QTreeWidget):
         self.setIconSize(QtCore.QSize(defaultIconSize, defaultIconSize))
         self.__taskHolders = []
         self.__viewMode = viewMode
+        self.__groupItems = {}
         self.__visibleColumns = []
         self.__columns = elementVarColumnNames or []
         self.__updateColumns(self.__columns)
@@ -220,6 +250,10 @@ class ElementListWidget(QtWidgets.QTreeWidget):
             elif item.checkState(0) == QtCore.Qt.Checked and isinstance(item, ElementsTreeWidgetItem):
                 result.extend(item.elements())
 
+        # elements that don't have items yet are using the default state
+        if self.__checkableState:
+            result.extend(self.__pendingElements)
+
         result = list(map(lambda x: x.clone(), result))
         if applyOverrides:
             self.__applySourceOverrides(result)
@@ -267,62 +301,105 @@ class ElementListWidget(QtWidgets.QTreeWidget):
             elif isinstance(item, ElementsTreeWidgetItem):
                 result.extend(item.elements())
 
+        result.extend(self.__pendingElements)
+
         result = list(map(lambda x: x.clone(), result))
         if applyOverrides:
             self.__applySourceOverrides(result)
         return result
 
-    def setElements(self, elementList):
+    def resizeEvent(self, event):
         """
-        Update the elements displayed in the tree.
+        Compute the data of the items that became visible.
         """
-        self.clear()
+        super().resizeEvent(event)
+        self.__visibleItemsTimer.start()
+
+    def setElements(self, elementList, append=False):
+        """
+        Update the elements displayed in the tree.
+
+        When append is enabled the elements are added to the ones already displayed
+        rather than replacing them (used to render the elements incrementally as they
+        are found). In the group mode the elements are added to the existing groups.
+
+        The items are created without the column data, it gets computed once the
+        items are displayed (also the items under a group are only created when the
+        group is expanded). In the flat mode the items are created by batches
+        (KOMBI_GUI_ITEMS_BATCH_SIZE) where the remaining batches are created in
+        background by the event loop. The lazy variables about the displayed elements
+        are prefetched in background (KOMBI_GUI_PREFETCH_THREADS).
+        """
+        if not append:
+            self.clear()
+            self.__pendingElements.clear()
+            self.__pendingItemsTimer.stop()
+            self.__groupItems = {}
+            self.__visibleColumns = []
+            self.__prefetchedElements = weakref.WeakSet()
 
         elementTypes = set()
         elementTags = {}
 
-        # workaround necessary to improve the rendering speed
-        self.setVisible(False)
+        # workaround necessary to improve the rendering speed (hiding the widget
+        # during incremental updates would make it flicker)
+        if append:
+            self.setUpdatesEnabled(False)
+        else:
+            self.setVisible(False)
 
-        # update visible columns
-        self.__visibleColumns = []
+        # update visible columns (new columns found in incremental updates are added
+        # to the end, so the data of the existing items remains valid)
+        visibleColumns = list(self.__visibleColumns)
         for columnName in self.__columns:
+            if columnName in visibleColumns:
+                continue
+
             for element in elementList:
                 if columnName in element.varNames():
-                    self.__visibleColumns.append(columnName)
+                    visibleColumns.append(columnName)
                     break
 
+        if not append or visibleColumns != self.__visibleColumns:
+            self.__visibleColumns = visibleColumns
+            self.__updateColumns(self.__visibleColumns)
+
         # group
         if self.__viewMode == "group":
             groupedElements = self.__groupElements(elementList)
 
             for groupName in groupedElements.keys():
                 if groupName:
-                    parent = ElementsTreeWidgetItem(self)
-                    self.__updateIcon(parent, groupedElements[groupName][0])
-                    parent.setElements(list(groupedElements[groupName]))
+                    parent = self.__groupItems.get(groupName)
+                    if parent is None:
+                        parent = ElementsTreeWidgetItem(self)
+                        self.__groupItems[groupName] = parent
+                        self.__updateIcon(parent, groupedElements[groupName][0])
 
-                    # visible data
-                    visibleGroupName = groupName + '   '
-                    if visibleGroupName.startswith(os.sep):
-                        visibleGroupName = visibleGroupName[1:]
+                        # visible data (including the frame range of sequences)
+                        visibleGroupName = groupName + '   '
+                        groupFrames = self.__sequenceFrames(groupName, groupedElements[groupName][0])
+                        if groupFrames:
+                            visibleGroupName = '{} [{}]   '.format(groupName, SequenceElement.compactFrames(groupFrames))
 
-                    parent.setData(0, QtCore.Qt.EditRole, visibleGroupName)
+                        if visibleGroupName.startswith(os.sep):
+                            visibleGroupName = visibleGroupName[1:]
 
-                    # adding column information
-                    self.__addSourceTreeColumnData(groupedElements[groupName][0], parent, groupedElements[groupName])
+                        parent.setData(0, QtCore.Qt.EditRole, visibleGroupName)
 
-                    if self.__checkableState is not None:
-                        parent.setFlags(parent.flags() | QtCore.Qt.ItemIsUserCheckable)
-                        parent.setCheckState(0, QtCore.Qt.Checked if self.__checkableState else QtCore.Qt.Unchecked)
+                        if self.__checkableState is not None:
+                            parent.setFlags(parent.flags() | QtCore.Qt.ItemIsUserCheckable)
+                            parent.setCheckState(0, QtCore.Qt.Checked if self.__checkableState else QtCore.Qt.Unchecked)
 
-                    for element in groupedElements[groupName]:
-                        self.__createSourceTreeChildItem(
-                            element,
-                            parent,
-                            elementTypes,
-                            elementTags
-                        )
+                    parent.setElements(parent.elements() + list(groupedElements[groupName]))
+                    parent.setColumnDataPending(True)
+
+                    # the items about the elements of the group are created when
+                    # the group gets expanded
+                    parent.setPendingChildElements(parent.pendingChildElements() + list(groupedElements[groupName]))
+                    parent.setChildIndicatorPolicy(QtWidgets.QTreeWidgetItem.ShowIndicator)
+                    if parent.isExpanded():
+                        self.__onSourceTreeItemExpanded(parent)
 
                 else:
                     for element in groupedElements[groupName]:
@@ -337,8 +414,6 @@ class ElementListWidget(QtWidgets.QTreeWidget):
                             child.setFlags(child.flags() | QtCore.Qt.ItemIsUserCheckable)
                             child.setCheckState(0, QtCore.Qt.Checked if self.__checkableState else QtCore.Qt.Unchecked)
 
-                        self.__addSourceTreeColumnData(element, child)
-
         # flat
         else:
             for element in elementList:
@@ -347,21 +422,63 @@ class ElementListWidget(QtWidgets.QTreeWidget):
                 if isinstance(element, list):
                     element = element[0]
 
-                child = self.__createSourceTreeChildItem(element, self, elementTypes, elementTags)
-
-                if self.__checkableState is not None:
-                    child.setFlags(child.flags() | QtCore.Qt.ItemIsUserCheckable)
-                    child.setCheckState(0, QtCore.Qt.Checked if self.__checkableState else QtCore.Qt.Unchecked)
+                self.__pendingElements.append(element)
 
-                self.__addSourceTreeColumnData(element, child)
+            self.__createPendingItems(self.__itemsBatchSize)
 
         # workaround to improve the performance of the rendering:
         # restoring the visibility of the widget
-        self.setVisible(True)
-        self.__updateColumns(self.__visibleColumns)
+        if append:
+            self.setUpdatesEnabled(True)
+        else:
+            self.setVisible(True)
 
         self.__computeEmptyMessageVisibility()
         self.resizeColumnToContents(0)
+        self.__visibleItemsTimer.start()
+
+    def createPendingItems(self):
+        """
+        Create the items about the elements that are still waiting to be added to the tree (flat mode).
+        """
+        self.setUpdatesEnabled(False)
+        self.__createPendingItems()
+        self.setUpdatesEnabled(True)
+        self.__visibleItemsTimer.start()
+
+    def __createPendingItems(self, maxItems=None):
+        """
+        Create the items about the pending elements (scheduling the remaining ones to the next batch).
+        """
+        elementTypes = set()
+        elementTags = {}
+        totalItems = 0
+        while self.__pendingElements and (maxItems is None or totalItems < maxItems):
+            child = self.__createSourceTreeChildItem(
+                self.__pendingElements.popleft(),
+                self,
+                elementTypes,
+                elementTags
+            )
+            totalItems += 1
+
+            if self.__checkableState is not None:
+                child.setFlags(child.flags() | QtCore.Qt.ItemIsUserCheckable)
+                child.setCheckState(0, QtCore.Qt.Checked if self.__checkableState else QtCore.Qt.Unchecked)
+
+        if self.__pendingElements:
+            self.__pendingItemsTimer.start()
+        else:
+            self.__pendingItemsTimer.stop()
+
+    def __onCreatePendingItems(self):
+        """
+        Slot triggered by the event loop to create the next batch of pending items.
+        """
+        self.setUpdatesEnabled(False)
+        self.__createPendingItems(self.__itemsBatchSize)
+        self.setUpdatesEnabled(True)
+        self.__visibleItemsTimer.start()
 
     def __computeEmptyMessageVisibility(self):
         """
@@ -454,9 +571,9 @@ class ElementListWidget(QtWidgets.QTreeWidget):
         child.setElements([element])
         self.__updateIcon(child, element)
 
-        # visible data
+        # visible data (the column data is computed once the item is displayed)
         child.setData(0, QtCore.Qt.EditRole, element.tag('label') + '   ')
-        self.__addSourceTreeColumnData(element, child)
+        child.setColumnDataPending(True)
 
         elementTypes.add(element.var('type'))
 
@@ -513,27 +630,32 @@ class ElementListWidget(QtWidgets.QTreeWidget):
         if self.__overridesConfig and self.__overridesConfig.hasKey('overrides'):
             overrides = self.__overridesConfig.value('overrides')
 
-        # adding column information
+        # adding column information. Only the variables that are already loaded are
+        # used (running on the GUI thread), the lazy ones are loaded by the prefetch
+        # which updates the column data once they are available. Therefore, a group
+        # only reports mixed values among the elements that have been loaded
         for index, column in enumerate(self.__visibleColumns):
 
             hasOverride = False
             value = ''
             columnLabel = ''
             mixedValues = False
-            for elementIndex, checkElement in enumerate(groupedElements if groupedElements else [element]):
-                currentValue = ''
-
-                if checkElement.var('fullPath') in overrides and column in overrides[checkElement.var('fullPath')]:
-                    currentValue = overrides[checkElement.var('fullPath')][column]
+            hasValue = False
+            for checkElement in (groupedElements if groupedElements else [element]):
+                fullPath = checkElement.var('fullPath')
+                if fullPath in overrides and column in overrides[fullPath]:
+                    currentValue = overrides[fullPath][column]
                     hasOverride = True
-                if column in checkElement.varNames():
-                    if not hasOverride:
-                        currentValue = checkElement.var(column)
+                elif column in checkElement.varNames():
+                    currentValue = checkElement.var(column)
+                else:
+                    continue
 
-                if currentValue != value and elementIndex:
+                if hasValue and currentValue != value:
                     mixedValues = True
                     break
                 value = currentValue
+                hasValue = True
 
             columnLabel = ('...' if mixedValues else str(value)) + '   '
 
@@ -793,6 +915,132 @@ class ElementListWidget(QtWidgets.QTreeWidget):
         if value is not None:
             self.modifed.emit()
 
+    def __onSourceTreeItemExpanded(self, item):
+        """
+        Slot triggered when an item is expanded to create the items about the elements of the group.
+        """
+        if not isinstance(item, ElementsTreeWidgetItem) or not item.pendingChildElements():
+            return
+
+        elements = item.pendingChildElements()
+        item.setPendingChildElements([])
+
+        elementTypes = set()
+        elementTags = {}
+        for element in elements:
+            self.__createSourceTreeChildItem(
+                element,
+                item,
+                elementTypes,
+                elementTags
+            )
+
+        self.__visibleItemsTimer.start()
+
+    def __onUpdateVisibleItems(self):
+        """
+        Compute the column data about the items displayed in the viewport.
+
+        The elements about the displayed items (and the ones right below them) are
+        prefetched in background, so their lazy variables are available without
+        blocking the interface.
+        """
+        if not self.__visibleColumns:
+            return
+
+        viewportHeight = self.viewport().height()
+        prefetchItems = []
+        totalLookaheadItems = 0
+        item = self.itemAt(0, 0)
+        while item is not None and totalLookaheadItems < self.__prefetchLookahead:
+            isVisible = self.visualItemRect(item).top() <= viewportHeight
+            if not isVisible:
+                totalLookaheadItems += 1
+
+            if isinstance(item, ElementsTreeWidgetItem) and item.elements():
+                if isVisible and item.isColumnDataPending():
+                    item.setColumnDataPending(False)
+                    self.__addSourceTreeColumnData(item.elements()[0], item, item.elements())
+
+                # only the representative element of a group is prefetched (a group can
+                # contain thousands of elements), the other ones get prefetched once
+                # the group is expanded and their items are displayed
+                if item.elements()[0] not in self.__prefetchedElements:
+                    prefetchItems.append(item)
+
+            item = self.itemBelow(item)
+
+        if not prefetchItems:
+            return
+
+        prefetchElements = []
+        for prefetchItem in prefetchItems:
+            self.__prefetchedElements.add(prefetchItem.elements()[0])
+            prefetchElements.append(prefetchItem.elements()[0])
+
+        if ElementListWidget.__prefetchExecutor is None:
+            ElementListWidget.__prefetchExecutor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.__prefetchThreads
+            )
+
+        self.__prefetchExecutor.submit(
+            self.__prefetchElements,
+            prefetchElements,
+            list(self.__visibleColumns),
+            list(map(weakref.ref, prefetchItems))
+        )
+
+    def __prefetchElements(self, elements, columns, itemRefs):
+        """
+        Query the variables used by the columns (running on the prefetch thread pool).
+        """
+        # the resolution of the media is probed in batch rather than once per element
+        if 'width' in columns or 'height' in columns:
+            try:
+                MediaProbe.prefetchImages([element.var('filePath') for element in elements if isinstance(element, OiioElement)])
+                MediaProbe.prefetchVideos([element.var('filePath') for element in elements if isinstance(element, VideoElement)])
+
+            # the elements that could not be probed in batch are probed again
+            # when their column data is computed
+            except (OSError, ImageReaderError):
+                pass
+
+        for element in elements:
+            for column in columns:
+                try:
+                    element.var(column, None)
+
+                # errors are going to be reported when the value is queried by the interface
+                except Exception:
+                    pass
+
+        try:
+            self.prefetched.emit(itemRefs)
+
+        # the widget may have been deleted in the meantime
+        except RuntimeError:
+            pass
+
+    def __onPrefetched(self, itemRefs):
+        """
+        Slot triggered when the elements of the items have been prefetched to update the column data.
+        """
+        for itemRef in itemRefs:
+            item = itemRef()
+            if item is None or item.isColumnDataPending() or item.treeWidget() is not self:
+                continue
+
+            self.__addSourceTreeColumnData(item.elements()[0], item, item.elements())
+
+    def __sequenceFrames(self, groupName, element):
+        """
+        Return the frames for the group from the sequence index of the element directory.
+        """
+        if not isinstance(element, FsElement) or isinstance(element, SequenceElement):
+            return []
+
+        return SequenceIndex.get(element.path().parent).frames(groupName)
+
     def __groupElements(self, elements):
         """
         Return a dictionary containing the matched elements grouped.
@@ -897,6 +1145,8 @@ class ElementsTreeWidgetItem(QtWidgets.QTreeWidgetItem):
         super().__init__(*args, **kwargs)
         self.setFlags(self.flags() & ~QtCore.Qt.ItemIsUserCheckable)
         self.setElements([])
+        self.setPendingChildElements([])
+        self.setColumnDataPending(False)
 
     def setElements(self, elements):
         """
@@ -910,6 +1160,30 @@ class ElementsTreeWidgetItem(QtWidgets.QTreeWidgetItem):
         """
         return self.__elements
 
+    def setPendingChildElements(self, elements):
+        """
+        Set the elements that should be created as child items once the item is expanded.
+        """
+        self.__pendingChildElements = elements
+
+    def pendingChildElements(self):
+        """
+        Return the elements that have not been created as child items yet.
+        """
+        return self.__pendingChildElements
+
+    def setColumnDataPending(self, pending):
+        """
+        Set a boolean telling if the column data should be computed when the item is displayed.
+        """
+        self.__columnDataPending = pending
+
+    def isColumnDataPending(self):
+        """
+        Return a boolean telling if the column data has not been computed yet.
+        """
+        return self.__columnDataPending
+
 class _ComboBoxInputDialog(QtWidgets.QDialog):
     """
     Provides a generic combo box prompt dialog.
@@ -1,5 +1,6 @@
 import os
 import traceback
+import concurrent.futures
 import platform
 import subprocess
 from pathlib import Path
@@ -10,6 +11,7 @@ from kombi.Task.Desktop.LaunchWithDefaultApplicationTask import LaunchWithDefaul
 from kombi.Element import Element
 from kombi.Task import Task
 from ..Resource import Resource
+from ..PreviewCache import PreviewCache
 from Qt import QtCore, QtGui, QtWidgets
 
 class ElementViewerWidget(QtWidgets.QLabel):
@@ -21,6 +23,8 @@ class ElementViewerWidget(QtWidgets.QLabel):
     """
     __loadingSize = 80
     __controlsHeight = 30
+    __prefetchExecutor = None
+    __prefetchThreads = int(os.environ.get('KOMBI_GUI_PREVIEW_PREFETCH_THREADS', 2))
 
     def __init__(
         self,
@@ -40,6 +44,7 @@ class ElementViewerWidget(QtWidgets.QLabel):
         self.setAlignment(QtCore.Qt.AlignCenter if centerAlignment else QtCore.Qt.AlignHCenter)
 
         self.__loadMediaThread = LoadMediaThread()
+        self.__prefetchFutures = []
         self.__loading = False
         self.__currentElement = None
         self.__loadMediaThread.loadedSignal.connect(self.__finishedLoad)
@@ -238,6 +243,41 @@ class ElementViewerWidget(QtWidgets.QLabel):
         QtCore.QTimer.singleShot(250, self.__showLoadingIndicator)
 
         self.__loadMediaThread.start()
+        self.__prefetchNeighbours(value)
+
+    def __prefetchNeighbours(self, value):
+        """
+        Load the previous and next elements of the slider in background (populating the preview cache).
+
+        The prefetches that have not started yet for the previous slider value are cancelled.
+        """
+        if ElementViewerWidget.__prefetchExecutor is None:
+            ElementViewerWidget.__prefetchExecutor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.__prefetchThreads
+            )
+
+        for future in self.__prefetchFutures:
+            future.cancel()
+        self.__prefetchFutures = []
+
+        for index in (value + 1, value - 1):
+            if not 0 <= index < len(self.__elements):
+                continue
+
+            element = self.__elements[index]
+            filePath = LoadMediaThread.previewFilePath(element, self.previewTag())
+            if PreviewCache.contains(filePath, self.width(), self.height()):
+                continue
+
+            self.__prefetchFutures.append(
+                self.__prefetchExecutor.submit(
+                    LoadMediaThread.loadPreview,
+                    element,
+                    self.width(),
+                    self.height(),
+                    self.previewTag()
+                )
+            )
 
     def __setPreviewTag(self, tagName):
         """
@@ -254,9 +294,11 @@ class ElementViewerWidget(QtWidgets.QLabel):
 class LoadMediaThread(QtCore.QThread):
     """
     Thread to load the file in background.
+
+    The loaded images are stored through the PreviewCache (downscaled to the
+    requested size).
     """
     loadedSignal = QtCore.Signal(object, QtGui.QImage)
-    __elementCache = {}
     __ffmpegExecutable = os.environ.get('KOMBI_FFMPEG_EXECUTABLE', 'ffmpeg')
 
     def __init__(self, element=None, previewTag='previewFilePath'):
@@ -292,26 +334,7 @@ class LoadMediaThread(QtCore.QThread):
         """
         Implement the thread execution.
         """
-        resultImage = QtGui.QImage()
-
-        loadElement = self.__element
-        previewTagValue = self.__element.tag(self.previewTag(), None)
-        if previewTagValue and os.path.exists(previewTagValue):
-            try:
-                loadElement = Element.create(Path(previewTagValue))
-            except Exception:
-                traceback.print_exc()
-
-        if loadElement.var('filePath') in self.__elementCache:
-            resultImage = self.__elementCache[loadElement.var('filePath')]
-        else:
-            if isinstance(loadElement, ImageElement):
-                resultImage = QtGui.QImage(loadElement.var('filePath'))
-                if resultImage.isNull():
-                    resultImage = self.__ffmpegFetchImage(loadElement.var('filePath'))
-            elif isinstance(loadElement, (VideoElement, AudioElement)):
-                resultImage = self.__ffmpegFetchImage(loadElement.var('filePath'))
-            self.__elementCache[loadElement.var('filePath')] = resultImage
+        resultImage = self.loadPreview(self.__element, self.__width, self.__height, self.previewTag())
 
         if not resultImage.isNull() and self.__width is not None and self.__height is not None:
             resultImage = resultImage.scaled(
@@ -324,23 +347,69 @@ class LoadMediaThread(QtCore.QThread):
         if not self.__abort:
             self.loadedSignal.emit(self.__element, resultImage)
 
-    def __ffmpegFetchImage(self, filePath):
+    @classmethod
+    def loadPreview(cls, element, width=None, height=None, previewTag='previewFilePath'):
+        """
+        Return a QImage with the preview for the element (querying the preview cache first).
+
+        The result is not scaled to the exact input size, since the cache stores the
+        images using size buckets.
+        """
+        loadElement = cls.__previewElement(element, previewTag)
+        filePath = loadElement.var('filePath')
+        resultImage = PreviewCache.get(filePath, width, height)
+        if resultImage is not None:
+            return resultImage
+
+        resultImage = QtGui.QImage()
+        if isinstance(loadElement, ImageElement):
+            resultImage = QtGui.QImage(filePath)
+            if resultImage.isNull():
+                resultImage = cls.__ffmpegFetchImage(loadElement)
+        elif isinstance(loadElement, (VideoElement, AudioElement)):
+            resultImage = cls.__ffmpegFetchImage(loadElement)
+
+        return PreviewCache.set(filePath, resultImage, width, height)
+
+    @classmethod
+    def previewFilePath(cls, element, previewTag='previewFilePath'):
+        """
+        Return the file path used to load the preview for the element.
+        """
+        return cls.__previewElement(element, previewTag).var('filePath')
+
+    @classmethod
+    def __previewElement(cls, element, previewTag):
+        """
+        Return the element defined by the preview tag (or the element itself when the tag is not available).
+        """
+        previewTagValue = element.tag(previewTag, None)
+        if previewTagValue and os.path.exists(previewTagValue):
+            try:
+                return Element.create(Path(previewTagValue))
+            except Exception:
+                traceback.print_exc()
+
+        return element
+
+    @classmethod
+    def __ffmpegFetchImage(cls, element):
         """
         Load a frame from the video/image (raw formats) or generate a waveform from the input audio.
         """
         extraArgs = []
-        if isinstance(self.__element, AudioElement):
+        if isinstance(element, AudioElement):
             extraArgs += [
                 '-filter_complex',
                 'showwavespic=colors=green|yellow'
             ]
 
         ffmpegCommand = [
-            self.__ffmpegExecutable,
+            cls.__ffmpegExecutable,
             "-v",
             "quiet",
             "-i",
-            filePath,
+            element.var('filePath'),
             *extraArgs,
             "-vframes",
             "1",
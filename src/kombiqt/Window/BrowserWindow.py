@@ -1,4 +1,5 @@
 import os
+import time
 import functools
 import traceback
 from Qt import QtCore, QtWidgets, QtGui
@@ -22,7 +23,9 @@ class BrowserWindow(ScriptEditorWindow):
     A graphical user interface for interacting with Kombi configurations.
 
     Signals:
-    - preRenderElements: Emitted when the element list is about to be rendered.
+    - preRenderElements: Emitted when the element list is about to be rendered. The
+    elements are listed in background, therefore the signal is emitted for each batch
+    of elements found.
     """
 
     preRenderElements = QtCore.Signal(list)
@@ -43,6 +46,10 @@ class BrowserWindow(ScriptEditorWindow):
         self.__customHeader = customHeader
         self.__uiHintGlobRecursively = False
         self.__rootElements = []
+        self.__crawlerThread = None
+        self.__runningCrawlerThreads = []
+        self.__pendingLeafName = None
+        self.__skipSourceStep = False
         self.__buildWidgets()
 
         self.__elementListWidget.setViewMode(viewMode)
@@ -97,18 +104,11 @@ class BrowserWindow(ScriptEditorWindow):
         if selectLeaf:
             self.__elementsLevelNavigationWidget.gotoPath(os.path.dirname(fullPath))
 
+            # since the elements are listed in background the leaf gets
+            # selected as soon as it's found
             baseName = os.path.basename(fullPath)
-            for index in range(self.__elementListWidget.topLevelItemCount()):
-                item = self.__elementListWidget.topLevelItem(index)
-
-                if not isinstance(item, ElementsTreeWidgetItem):
-                    continue
-
-                for element in item.elements():
-                    if element.var('name') != baseName:
-                        continue
-                    self.__elementListWidget.setCurrentItem(item, 0)
-                    break
+            if not self.__selectLeaf(baseName) and self.__crawlerThread is not None:
+                self.__pendingLeafName = baseName
         else:
             self.__elementsLevelNavigationWidget.gotoPath(fullPath)
 
@@ -124,14 +124,10 @@ class BrowserWindow(ScriptEditorWindow):
         """
         Set the root element, updating elements.
         """
-        QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.WaitCursor)
-        try:
-            self.__updateElementList(rootElement)
+        self.__updateElementList(rootElement)
 
-            if self.__infoPanel and self.__infoPanel.isVisible():
-                self.__elementViewer.setElements([rootElement])
-        finally:
-            QtWidgets.QApplication.restoreOverrideCursor()
+        if self.__infoPanel and self.__infoPanel.isVisible():
+            self.__elementViewer.setElements([rootElement])
 
     def refreshTaskHolderList(self, elements=None):
         """
@@ -320,25 +316,30 @@ class BrowserWindow(ScriptEditorWindow):
         self.__nextButton.setVisible(self.__elementListWidget.checkableState() is not None)
         self.__selectedDispatcher.setVisible(self.__elementListWidget.checkableState() is not None)
 
-        with ElementContext():
-            elementList = []
-            # filtering the result of the glob, but now using the element matcher
-            # this will match the variable types.
-            for elementFound in rootElement.glob(filterTypes, recursive=self.__uiHintGlobRecursively):
-                for taskHolder in self.__taskHolders:
-                    if elementFound.var('type') not in filterDefaultTypes and not taskHolder.matcher().match(elementFound):
-                        continue
-                    # since we may have several task holders we need to only
-                    # include the element once
-                    if elementFound not in elementList:
-                        elementList.append(elementFound)
-
-            self.preRenderElements.emit(elementList)
-            self.__elementListWidget.setElements(elementList)
-
         # forcing kombi to start at the execution settings (next) interface
-        if skipSourceStep:
-            self.refreshTaskHolderList()
+        # once all the elements have been listed
+        self.__skipSourceStep = skipSourceStep
+
+        # listing the elements in background
+        self.__onCancelCrawler()
+        self.__pendingLeafName = None
+        self.__elementListWidget.setElements([])
+
+        self.__crawlerThread = ElementCrawlerThread(
+            rootElement,
+            self.__taskHolders,
+            filterTypes,
+            filterDefaultTypes,
+            self.__uiHintGlobRecursively
+        )
+        self.__crawlerThread.foundSignal.connect(self.__onCrawlerFound)
+        self.__crawlerThread.progressSignal.connect(self.__onCrawlerProgress)
+        self.__crawlerThread.finished.connect(self.__onCrawlerFinished)
+        self.__runningCrawlerThreads.append(self.__crawlerThread)
+
+        self.__crawlerProgressLabel.setText('Listing elements...')
+        self.__crawlerProgressWidget.setVisible(True)
+        self.__crawlerThread.start()
 
     def __buildWidgets(self):
         """
@@ -381,6 +382,30 @@ class BrowserWindow(ScriptEditorWindow):
         sourceBarLayout.addWidget(self.__elementsLevelNavigationWidget)
         sourceBarLayout.addWidget(self.__sourceRefreshButton)
 
+        # crawler progress (displayed while the elements are listed)
+        self.__crawlerProgressWidget = QtWidgets.QWidget()
+        crawlerProgressLayout = QtWidgets.QHBoxLayout(self.__crawlerProgressWidget)
+        crawlerProgressLayout.setContentsMargins(0, 0, 0, 0)
+
+        self.__crawlerProgressLabel = QtWidgets.QLabel()
+        crawlerProgressBar = QtWidgets.QProgressBar()
+        crawlerProgressBar.setRange(0, 0)
+        crawlerProgressBar.setTextVisible(False)
+        crawlerProgressBar.setFixedWidth(80)
+
+        self.__crawlerCancelButton = QtWidgets.QPushButton()
+        self.__crawlerCancelButton.setToolTip('Cancel the listing')
+        self.__crawlerCancelButton.setIcon(
+            Resource.icon("icons/remove.png")
+        )
+        self.__crawlerCancelButton.clicked.connect(self.__onCancelCrawler)
+
+        crawlerProgressLayout.addWidget(self.__crawlerProgressLabel)
+        crawlerProgressLayout.addWidget(crawlerProgressBar)
+        crawlerProgressLayout.addWidget(self.__crawlerCancelButton)
+        self.__crawlerProgressWidget.setVisible(False)
+        sourceBarLayout.addWidget(self.__crawlerProgressWidget)
+
         # info panel
         self.__infoPanel = QtWidgets.QDockWidget("Info")
         self.__infoPanel.setMinimumWidth(300)
@@ -503,6 +528,91 @@ class BrowserWindow(ScriptEditorWindow):
         buttonLayout.addWidget(self.__nextButton)
         buttonLayout.addWidget(self.__executeButton)
 
+    def closeEvent(self, event):
+        """
+        Cancel the listing of the elements when the window is closed.
+        """
+        self.__onCancelCrawler()
+        super().closeEvent(event)
+
+    def __selectLeaf(self, name):
+        """
+        Select the item about the element with the input name returning a boolean telling if it was found.
+        """
+        # the element may not have an item yet (flat mode)
+        self.__elementListWidget.createPendingItems()
+
+        for index in range(self.__elementListWidget.topLevelItemCount()):
+            item = self.__elementListWidget.topLevelItem(index)
+
+            if not isinstance(item, ElementsTreeWidgetItem):
+                continue
+
+            for element in item.elements():
+                if element.var('name') != name:
+                    continue
+                self.__elementListWidget.setCurrentItem(item, 0)
+                return True
+
+        return False
+
+    def __onCrawlerFound(self, elements):
+        """
+        Slot triggered when the crawler thread finds a batch of elements.
+        """
+        # ignoring batches from a listing that has been cancelled
+        if self.sender() is not self.__crawlerThread:
+            return
+
+        self.preRenderElements.emit(elements)
+        self.__elementListWidget.setElements(elements, append=True)
+
+        if self.__pendingLeafName is not None and self.__selectLeaf(self.__pendingLeafName):
+            self.__pendingLeafName = None
+
+    def __onCrawlerProgress(self, totalFound, totalVisited):
+        """
+        Slot triggered to report the progress of the crawler thread.
+        """
+        if self.sender() is not self.__crawlerThread:
+            return
+
+        self.__crawlerProgressLabel.setText(
+            'Listing elements: {} found ({} visited)'.format(totalFound, totalVisited)
+        )
+
+    def __onCrawlerFinished(self):
+        """
+        Slot triggered when the crawler thread is finished.
+        """
+        crawlerThread = self.sender()
+        if crawlerThread in self.__runningCrawlerThreads:
+            self.__runningCrawlerThreads.remove(crawlerThread)
+
+        if crawlerThread is not self.__crawlerThread:
+            return
+
+        self.__crawlerThread = None
+        self.__pendingLeafName = None
+        self.__crawlerProgressWidget.setVisible(False)
+
+        if self.__skipSourceStep:
+            self.refreshTaskHolderList()
+
+    def __onCancelCrawler(self):
+        """
+        Slot triggered to cancel the listing of the elements in progress.
+
+        The elements found so far are kept in the element list.
+        """
+        if self.__crawlerThread is None:
+            return
+
+        self.__crawlerThread.cancel()
+        self.__crawlerThread = None
+        self.__pendingLeafName = None
+        self.__crawlerProgressWidget.setVisible(False)
+
     def __onShowMoreMenu(self):
         """
         Display the more menu.
@@ -664,3 +774,121 @@ class BrowserWindow(ScriptEditorWindow):
         Slot triggered when info show tags is triggered.
         """
         self.__elementListWidget.setShowTags(checked)
+
+
+class ElementCrawlerThread(QtCore.QThread):
+    """
+    Thread to list (glob and match) the elements in background.
+
+    The elements are emitted in batches as they are found, so the interface can
+    render them incrementally. The crawling can be interrupted at any time
+    through ElementCrawlerThread.cancel.
+    """
+    foundSignal = QtCore.Signal(list)
+    progressSignal = QtCore.Signal(int, int)
+    __batchSize = int(os.environ.get('KOMBI_GUI_CRAWLER_BATCH_SIZE', 250))
+    __batchInterval = float(os.environ.get('KOMBI_GUI_CRAWLER_BATCH_INTERVAL', 0.25))
+
+    def __init__(self, rootElement, taskHolders, filterTypes=None, filterDefaultTypes=None, recursive=False):
+        """
+        Create an ElementCrawlerThread object.
+        """
+        super(ElementCrawlerThread, self).__init__()
+
+        self.__rootElement = rootElement
+        self.__taskHolders = list(taskHolders)
+        self.__filterTypes = list(filterTypes or [])
+        self.__filterDefaultTypes = list(filterDefaultTypes or [])
+        self.__recursive = recursive
+        self.__cancelled = False
+
+    def cancel(self):
+        """
+        Request the crawling to stop (no more elements are emitted after that).
+        """
+        self.__cancelled = True
+
+    def isCancelled(self):
+        """
+        Return a boolean telling if the crawling has been cancelled.
+        """
+        return self.__cancelled
+
+    def run(self):
+        """
+        Implement the thread execution.
+        """
+        subClasses = tuple()
+        for filterType in self.__filterTypes:
+            subClasses += tuple(Element.registeredSubclasses(filterType))
+
+        foundPaths = set()
+        batch = []
+        totalVisited = 0
+        lastEmitTime = time.time()
+
+        with ElementContext():
+            for elementFound in self.__iterElements(self.__rootElement):
+                if self.__cancelled:
+                    return
+
+                totalVisited += 1
+                fullPath = elementFound.var('fullPath')
+
+                # filtering the result of the glob, but now using the element matcher
+                # this will match the variable types. Since we may have several task
+                # holders we need to only include the element once
+                if (not subClasses or isinstance(elementFound, subClasses)) and fullPath not in foundPaths:
+                    for taskHolder in self.__taskHolders:
+                        if elementFound.var('type') not in self.__filterDefaultTypes and not taskHolder.matcher().match(elementFound):
+                            continue
+
+                        foundPaths.add(fullPath)
+                        batch.append(elementFound)
+                        break
+
+                if len(batch) >= self.__batchSize or time.time() - lastEmitTime >= self.__batchInterval:
+                    self.__emitBatch(batch, len(foundPaths), totalVisited)
+                    batch = []
+                    lastEmitTime = time.time()
+
+        if not self.__cancelled:
+            self.__emitBatch(batch, len(foundPaths), totalVisited)
+
+    def __emitBatch(self, batch, totalFound, totalVisited):
+        """
+        Emit the batch of elements found and the progress.
+        """
+        if batch:
+            self.foundSignal.emit(batch)
+        self.progressSignal.emit(totalFound, totalVisited)
+
+    def __iterElements(self, element):
+        """
+        Yield the elements under the input element (same order used by Element.glob).
+        """
+        if element.isLeaf():
+            return
+
+        for childElement in element.children():
+            if self.__cancelled:
+                return
+
+            yield childElement
+            if self.__recursive:
+                yield from self.__iterElements(childElement)
+
+    def __del__(self):
+        """
+        We need to wait for the thread to be finished before destroying it.
+        """
+        self.__cancelled = True
+        try:
+            if self.isRunning():
+                self.quit()
+                self.wait()
+
+        # We intentionally ignore any runtime errors that may occur at this point, as
+        # they could be caused by the internal C++ object already being deleted.
+        except RuntimeError:
+            pass
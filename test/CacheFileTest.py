@@ -0,0 +1,44 @@
+import os
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from .BaseTestCase import BaseTestCase
+from kombi.CacheFile import CacheFile
+
+class CacheFileTest(BaseTestCase):
+    """Test for the cache file helpers."""
+
+    __directory = os.path.join(BaseTestCase.tempDirectory(), 'cacheFile')
+
+    def testStat(self):
+        """
+        Test that the stat changes when the file gets modified.
+        """
+        filePath = os.path.join(self.__directory, 'stat', 'file.txt')
+        if os.path.exists(filePath):
+            os.remove(filePath)
+        self.assertIsNone(CacheFile.stat(filePath))
+
+        CacheFile.atomicWrite(filePath, 'a')
+        fileStat = CacheFile.stat(filePath)
+        self.assertEqual(fileStat[1], 1)
+
+        CacheFile.atomicWrite(filePath, 'ab')
+        self.assertNotEqual(CacheFile.stat(filePath), fileStat)
+
+    def testAtomicWrite(self):
+        """
+        Test that concurrent writes don't leave partial or temporary files.
+        """
+        directory = os.path.join(self.__directory, 'atomicWrite')
+        filePath = os.path.join(directory, 'file.txt')
+        contents = ['{}'.format(index) * 100000 for index in range(8)]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda x: CacheFile.atomicWrite(filePath, x), contents))
+
+        with open(filePath) as f:
+            self.assertIn(f.read(), contents)
+        self.assertEqual(os.listdir(directory), ['file.txt'])
+
+
+if __name__ == "__main__":
+    unittest.main()
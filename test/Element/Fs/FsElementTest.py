@@ -1,5 +1,6 @@
 import os
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from ...BaseTestCase import BaseTestCase
 from kombi.Element import Element
 from kombi.Element.Fs import FsElement
@@ -122,6 +123,31 @@ class FsElementTest(BaseTestCase):
         element = FsElement.createFromPath(self.__turntableFile, "exr")
         self.assertIsInstance(element, ExrElement)
 
+    def testCachedPathComputeThreads(self):
+        """
+        Test that the path cache can be used from multiple threads.
+        """
+        paths = [Path(self.__dir, 'cachedPathCompute', str(index)) for index in range(50)]
+
+        def compute(threadIndex):
+            result = []
+            for path in paths:
+                result.append(FsElement.cachedPathCompute(path, 'threadIndex', lambda: threadIndex))
+                if threadIndex == 0:
+                    FsElement.clearCache()
+            return result
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(compute, range(1, 9)))
+
+        # the first value added to the cache is returned by all the threads
+        for index, path in enumerate(paths):
+            self.assertEqual(set(result[index] for result in results), {FsElement.cachedPathCompute(path, 'threadIndex', None)})
+
+        FsElement.clearCache()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(compute, range(0, 8)))
+
 
 if __name__ == "__main__":
     unittest.main()
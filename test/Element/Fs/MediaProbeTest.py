@@ -0,0 +1,116 @@
+import os
+import sys
+import shutil
+import unittest
+from ...BaseTestCase import BaseTestCase
+from kombi.Element.Fs import FsElement, MediaProbe
+
+class MediaProbeTest(BaseTestCase):
+    """Test for the media probe."""
+
+    __mockFfprobe = '''
+import os
+import sys
+import json
+
+with open(os.environ['KOMBI_MOCK_FFPROBE_LOG'], 'a') as f:
+    f.write(sys.argv[-1] + '\\n')
+
+sys.stdout.write(json.dumps({'streams': [{'codec_type': 'audio'}, {'width': 1280, 'height': 720}]}))
+'''
+
+    def setUp(self):
+        """
+        Configure the media probe to use a temporary cache and a mocked ffprobe.
+        """
+        self.__probeDirectory = os.path.join(self.tempDirectory(), 'mediaProbe')
+        if os.path.exists(self.__probeDirectory):
+            shutil.rmtree(self.__probeDirectory)
+        os.makedirs(self.__probeDirectory)
+
+        ffprobeFilePath = os.path.join(self.__probeDirectory, 'ffprobe')
+        with open(ffprobeFilePath, 'w') as f:
+            f.write('#!{}\n{}'.format(sys.executable, self.__mockFfprobe))
+        os.chmod(ffprobeFilePath, 0o755)
+
+        self.__logFilePath = os.path.join(self.__probeDirectory, 'ffprobe.log')
+        os.environ['KOMBI_MOCK_FFPROBE_LOG'] = self.__logFilePath
+
+        self.__previousFfprobeExecutable = MediaProbe.ffprobeExecutable()
+        self.__previousCacheDirectory = MediaProbe.cacheDirectory()
+        MediaProbe.setFfprobeExecutable(ffprobeFilePath)
+        MediaProbe.setCacheDirectory(os.path.join(self.__probeDirectory, 'cache'))
+        MediaProbe.clear()
+
+    def tearDown(self):
+        """
+        Restore the media probe configuration.
+        """
+        MediaProbe.setFfprobeExecutable(self.__previousFfprobeExecutable)
+        MediaProbe.setCacheDirectory(self.__previousCacheDirectory)
+        MediaProbe.clear()
+        del os.environ['KOMBI_MOCK_FFPROBE_LOG']
+
+    def testImages(self):
+        """
+        Test that the images are probed in batch.
+        """
+        filePaths = [
+            os.path.join(self.dataTestsDirectory(), 'testSeq.000{}.exr'.format(frame)) for frame in range(1, 4)
+        ]
+        filePaths.append(os.path.join(self.dataTestsDirectory(), 'missing.exr'))
+
+        result = MediaProbe.prefetchImages(filePaths)
+        self.assertEqual(list(result.keys()), filePaths)
+        self.assertEqual(result[filePaths[0]], {'width': 1920, 'height': 1080})
+        self.assertIsNone(result[filePaths[-1]])
+
+        element = FsElement.createFromPath(filePaths[1])
+        self.assertEqual(element.var('width'), 1920)
+        self.assertEqual(element.var('height'), 1080)
+
+    def testVideos(self):
+        """
+        Test that the videos are probed once and cached on disk.
+        """
+        filePaths = []
+        for index in range(3):
+            filePath = os.path.join(self.__probeDirectory, 'video{}.mov'.format(index))
+            with open(filePath, 'w') as f:
+                f.write('video')
+            filePaths.append(filePath)
+
+        result = MediaProbe.prefetchVideos(filePaths)
+        self.assertEqual(result[filePaths[0]], {'width': 1280, 'height': 720})
+        self.assertEqual(len(self.__probedFilePaths()), 3)
+
+        # the lazy variables use the probed information
+        element = FsElement.createFromPath(filePaths[0])
+        self.assertEqual(element.var('width'), 1280)
+        self.assertEqual(element.var('height'), 720)
+        self.assertEqual(len(self.__probedFilePaths()), 3)
+
+        # the information is read from the disk cache
+        MediaProbe.clear()
+        MediaProbe.prefetchVideos(filePaths)
+        self.assertEqual(len(self.__probedFilePaths()), 3)
+
+        # only the modified file is probed again
+        with open(filePaths[1], 'a') as f:
+            f.write('modified')
+        MediaProbe.prefetchVideos(filePaths)
+        self.assertEqual(self.__probedFilePaths()[3:], [filePaths[1]])
+
+    def __probedFilePaths(self):
+        """
+        Return a list with the file paths probed by the mocked ffprobe.
+        """
+        if not os.path.exists(self.__logFilePath):
+            return []
+
+        with open(self.__logFilePath) as f:
+            return f.read().split('\n')[:-1]
+
+
+if __name__ == "__main__":
+    unittest.main()
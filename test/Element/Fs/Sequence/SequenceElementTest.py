@@ -0,0 +1,87 @@
+import os
+import glob
+import unittest
+from ....BaseTestCase import BaseTestCase
+from kombi.Element import Element
+from kombi.Element.Fs import FsElement
+from kombi.Element.Fs.Image import ExrElement
+from kombi.Element.Fs.Sequence import SequenceElement
+
+class SequenceElementTest(BaseTestCase):
+    """Test Sequence element."""
+
+    __sequencePattern = os.path.join(BaseTestCase.dataTestsDirectory(), "testSeq.####.exr")
+
+    def testSequenceElement(self):
+        """
+        Test that the sequence element is created from a sequence pattern.
+        """
+        element = FsElement.createFromPath(self.__sequencePattern)
+        self.assertIsInstance(element, SequenceElement)
+        self.assertEqual(element.var('type'), 'sequence')
+        self.assertEqual(element.frames(), list(range(1, 13)))
+        self.assertEqual(element.missingFrames(), [])
+        self.assertEqual(element.tag('group'), "testSeq.####.exr")
+        self.assertEqual(element.tag('groupSprintf'), "testSeq.%04d.exr")
+
+    def testSequenceVariables(self):
+        """
+        Test that variables about the sequence are set.
+        """
+        element = FsElement.createFromPath(self.__sequencePattern)
+        self.assertEqual(element.var('name'), 'testSeq')
+        self.assertEqual(element.var('ext'), 'exr')
+        self.assertEqual(element.var('padding'), 4)
+        self.assertEqual(element.var('frame'), 1)
+        self.assertEqual(element.var('firstFrame'), 1)
+        self.assertEqual(element.var('lastFrame'), 12)
+        self.assertEqual(element.var('totalFrames'), 12)
+        self.assertEqual(element.var('width'), 1920)
+        self.assertEqual(element.var('height'), 1080)
+
+    def testFrameElements(self):
+        """
+        Test that the sequence gets expanded to frame elements.
+        """
+        element = FsElement.createFromPath(self.__sequencePattern)
+        frameElements = element.children()
+        self.assertEqual(len(frameElements), 12)
+        for index, frameElement in enumerate(frameElements):
+            self.assertIsInstance(frameElement, ExrElement)
+            self.assertEqual(frameElement.var('frame'), index + 1)
+
+    def testCreateFromElements(self):
+        """
+        Test that frame elements get collapsed to a sequence element.
+        """
+        frameFiles = sorted(glob.glob(self.__sequencePattern.replace('####', '*')))
+        frameElements = list(map(FsElement.createFromPath, frameFiles))
+        del frameElements[4]
+        sequenceElements = SequenceElement.createFromElements(frameElements)
+        self.assertEqual(len(sequenceElements), 1)
+        self.assertEqual(sequenceElements[0].missingFrames(), [5])
+        self.assertEqual(sequenceElements[0].var('totalFrames'), 11)
+
+    def testFrames(self):
+        """
+        Test the compact frame notation.
+        """
+        self.assertEqual(SequenceElement.compactFrames([1, 2, 3, 4, 6, 8, 9]), "1-4,6,8-9")
+        self.assertEqual(SequenceElement.expandFrames("1-4,6,8-9"), [1, 2, 3, 4, 6, 8, 9])
+        self.assertEqual(SequenceElement.resolvePattern("/tmp/a.####.exr", 12), "/tmp/a.0012.exr")
+
+    def testSerialization(self):
+        """
+        Test that the sequence element is serialized without the frame elements.
+        """
+        element = FsElement.createFromPath(self.__sequencePattern)
+        element.setVar('customVar', 'test', True)
+        clonedElement = Element.createFromJson(element.toJson())
+        self.assertIsInstance(clonedElement, SequenceElement)
+        self.assertEqual(clonedElement.frames(), element.frames())
+        self.assertEqual(clonedElement.var('customVar'), 'test')
+        self.assertEqual(clonedElement.children()[0].var('customVar'), 'test')
+
+
+if __name__ == "__main__":
+    unittest.main()
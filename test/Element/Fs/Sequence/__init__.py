@@ -0,0 +1 @@
+from .SequenceElementTest import SequenceElementTest
@@ -0,0 +1,71 @@
+import os
+import shutil
+import unittest
+from ...BaseTestCase import BaseTestCase
+from kombi.Element.Fs import FsElement, SequenceIndex
+
+class SequenceIndexTest(BaseTestCase):
+    """Test SequenceIndex."""
+
+    def testParseName(self):
+        """
+        Test parsing the sequence information from file names.
+        """
+        self.assertEqual(SequenceIndex.parseName("testSeq.0001.exr"), ("testSeq", ".", "0001", "exr"))
+        self.assertEqual(SequenceIndex.parseName("test_0001.exr"), ("test", "_", "0001", "exr"))
+        self.assertIsNone(SequenceIndex.parseName("test_001.exr"))
+        self.assertIsNone(SequenceIndex.parseName("test.exr"))
+
+    def testIndex(self):
+        """
+        Test that the files get grouped by the sequence pattern.
+        """
+        sequenceIndex = SequenceIndex([
+            "a.0003.exr",
+            "a.0001.exr",
+            "a.0002.exr",
+            "b_0010.dpx",
+            "single.exr"
+        ])
+        self.assertEqual(sequenceIndex.groups(), ["a.####.exr", "b_####.dpx"])
+        self.assertEqual(sequenceIndex.frames("a.####.exr"), [1, 2, 3])
+        self.assertEqual(sequenceIndex.fileNames("a.####.exr"), ["a.0001.exr", "a.0002.exr", "a.0003.exr"])
+        self.assertEqual(sequenceIndex.frames("missing.####.exr"), [])
+
+    def testUnpaddedSequence(self):
+        """
+        Test that the frames of an unpadded sequence are found regardless of the padding.
+        """
+        sequenceIndex = SequenceIndex(["a.8.exr", "a.10.exr", "a.9.exr", "a.11.exr"])
+        self.assertEqual(sequenceIndex.groups(), ["a.##.exr", "a.#.exr"])
+        self.assertEqual(sequenceIndex.frames("a.#.exr"), [8, 9, 10, 11])
+        self.assertEqual(sequenceIndex.fileNames("a.##.exr"), ["a.8.exr", "a.9.exr", "a.10.exr", "a.11.exr"])
+
+        # sequence elements
+        sequenceDirectory = os.path.join(self.tempDirectory(), 'unpaddedSequence')
+        if os.path.exists(sequenceDirectory):
+            shutil.rmtree(sequenceDirectory)
+        os.makedirs(sequenceDirectory)
+        for frame in range(8, 12):
+            shutil.copy(
+                os.path.join(self.dataTestsDirectory(), 'test.exr'),
+                os.path.join(sequenceDirectory, 'a.{}.exr'.format(frame))
+            )
+
+        element = FsElement.createFromPath(os.path.join(sequenceDirectory, 'a.9.exr'))
+        self.assertEqual(
+            [x.var('baseName') for x in element.sequenceElements()],
+            ["a.8.exr", "a.9.exr", "a.10.exr", "a.11.exr"]
+        )
+
+    def testDirectoryIndex(self):
+        """
+        Test the index computed from a directory.
+        """
+        sequenceIndex = SequenceIndex.get(self.dataTestsDirectory())
+        self.assertEqual(sequenceIndex.frames("testSeq.####.exr"), list(range(1, 13)))
+        self.assertIs(SequenceIndex.get(self.dataTestsDirectory()), sequenceIndex)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,5 +5,8 @@ from . import Render
 from . import Scene
 from . import Texture
 from . import Video
+from . import Sequence
 from .DirectoryElementTest import DirectoryElementTest
 from .FsElementTest import FsElementTest
+from .SequenceIndexTest import SequenceIndexTest
+from .MediaProbeTest import MediaProbeTest
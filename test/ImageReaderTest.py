@@ -0,0 +1,79 @@
+import os
+import unittest
+from .BaseTestCase import BaseTestCase
+from kombi.ImageReader import ImageReader, ImageReaderError
+from kombi.Element.Fs import FsElement
+
+class ImageReaderTest(BaseTestCase):
+    """Test for the image reader."""
+
+    __sourcePath = os.path.join(BaseTestCase.dataTestsDirectory(), "testSeq.0001.exr")
+
+    def setUp(self):
+        """
+        Create the images used by the tests.
+        """
+        self.__imageDirectory = os.path.join(self.tempDirectory(), 'imageReader')
+        os.makedirs(self.__imageDirectory, exist_ok=True)
+        ImageReader.clear()
+
+    def testSpec(self):
+        """
+        Test that the spec is read from the header.
+        """
+        spec = ImageReader.spec(self.__sourcePath)
+        self.assertEqual(spec.full_width, 1920)
+        self.assertEqual(spec.full_height, 1080)
+
+        element = FsElement.createFromPath(self.__sourcePath)
+        self.assertEqual(element.var('width'), 1920)
+        self.assertEqual(element.var('height'), 1080)
+
+    def testModifiedFile(self):
+        """
+        Test that a modified file is not read from the cache.
+        """
+        filePath = os.path.join(self.__imageDirectory, 'modified.exr')
+        self.__writeImage(filePath, 8, 4)
+        self.assertEqual(ImageReader.spec(filePath).width, 8)
+        self.assertEqual(ImageReader.imageBuf(filePath).spec().width, 8)
+
+        self.__writeImage(filePath, 16, 2)
+        os.utime(filePath, ns=(0, 0))
+        self.assertEqual(ImageReader.spec(filePath).width, 16)
+        self.assertEqual(ImageReader.imageBuf(filePath).spec().height, 2)
+
+    def testOverlayImageBuf(self):
+        """
+        Test that the overlay image buf is loaded once.
+        """
+        filePath = os.path.join(self.__imageDirectory, 'overlay.exr')
+        self.__writeImage(filePath, 4, 4)
+        overlayImageBuf = ImageReader.overlayImageBuf(filePath)
+        self.assertIs(ImageReader.overlayImageBuf(filePath), overlayImageBuf)
+
+        ImageReader.invalidate(filePath)
+        self.assertIsNot(ImageReader.overlayImageBuf(filePath), overlayImageBuf)
+
+    def testMissingFile(self):
+        """
+        Test that reading a missing file fails.
+        """
+        filePath = os.path.join(self.__imageDirectory, 'missing.exr')
+        self.assertRaises(ImageReaderError, ImageReader.spec, filePath)
+        self.assertRaises(ImageReaderError, ImageReader.overlayImageBuf, filePath)
+
+    @classmethod
+    def __writeImage(cls, filePath, width, height):
+        """
+        Write an image with the specified resolution.
+        """
+        import OpenImageIO as oiio
+
+        imageBuf = oiio.ImageBuf(oiio.ImageSpec(width, height, 3, oiio.FLOAT))
+        oiio.ImageBufAlgo.fill(imageBuf, (0.5, 0.5, 0.5))
+        imageBuf.write(filePath)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,12 @@
 import os
+import gzip
 import unittest
 import tarfile
 from zipfile import ZipFile
 from ...BaseTestCase import BaseTestCase
 from kombi.Task import Task
 from kombi.Element.Fs import FsElement
+from kombi.Task.Archive import Packer, PackerMissingDependencyError
 from kombi.Task.Archive.PackTask import PackTaskUnsupportedTypeError
 
 class PackTaskTest(BaseTestCase):
@@ -17,6 +19,9 @@ class PackTaskTest(BaseTestCase):
     __targetTarArchivePath = os.path.join(BaseTestCase.tempDirectory(), "testTarArchive.tar")
     __targetTarGzArchivePath = os.path.join(BaseTestCase.tempDirectory(), "testTarGzArchive.tar.gz")
     __targetTgzArchivePath = os.path.join(BaseTestCase.tempDirectory(), "testTgzArchive.tgz")
+    __targetBlocksArchivePath = os.path.join(BaseTestCase.tempDirectory(), "testBlocksArchive.tar.gz")
+    __targetDeflatedArchivePath = os.path.join(BaseTestCase.tempDirectory(), "testDeflatedArchive.zip")
+    __targetZstdArchivePath = os.path.join(BaseTestCase.tempDirectory(), "testZstdArchive.tar.zst")
 
     def testArchiveDirectory(self):
         """
@@ -174,6 +179,78 @@ class PackTaskTest(BaseTestCase):
                 sorted(['test.exr'])
             )
 
+    def testArchiveTarGzBlocks(self):
+        """
+        Test that a tar.gz archive compressed by blocks in parallel contains the original data.
+        """
+        sourceDirectory = os.path.join(BaseTestCase.dataTestsDirectory(), "glob")
+        previousBlockSize = Packer.blockSize()
+        Packer.setBlockSize(64 * 1024)
+        try:
+            packTask = Task.create('pack')
+            packTask.add(FsElement.createFromPath(sourceDirectory), self.__targetBlocksArchivePath)
+            result = packTask.output()
+        finally:
+            Packer.setBlockSize(previousBlockSize)
+
+        # each block is written as an individual gzip member
+        with open(result[0].var('fullPath'), 'rb') as f:
+            self.assertGreater(f.read().count(gzip.compress(b'', mtime=0)[:4]), 1)
+
+        with tarfile.open(result[0].var('fullPath')) as f:
+            self.assertEqual(len(f.getnames()), len(set(f.getnames())))
+            self.assertIn('glob/images', f.getnames())
+            for name in ('glob/test.txt', 'glob/images/RND-TST-SHT_lighting_beauty_sr.1001.exr'):
+                with open(os.path.join(os.path.dirname(sourceDirectory), name), 'rb') as sourceFile:
+                    self.assertEqual(f.extractfile(name).read(), sourceFile.read())
+
+    def testArchiveZipDeflated(self):
+        """
+        Test that the members of a compressed zip archive contain the original data.
+        """
+        sourceDirectory = os.path.join(BaseTestCase.dataTestsDirectory(), "glob")
+        packTask = Task.create('pack')
+        packTask.setOption('compress', True)
+        packTask.add(FsElement.createFromPath(sourceDirectory), self.__targetDeflatedArchivePath)
+        packTask.add(
+            FsElement.createFromPath(os.path.join(BaseTestCase.dataTestsDirectory(), "test.exr")),
+            "{}[a|b|c|d.exr]".format(self.__targetDeflatedArchivePath)
+        )
+        result = packTask.output()
+
+        with ZipFile(result[0].var('fullPath')) as f:
+            self.assertIsNone(f.testzip())
+            self.assertIn('glob/images/', f.namelist())
+            self.assertLess(f.getinfo('glob/test.json').compress_size, f.getinfo('glob/test.json').file_size)
+            for name in ('glob/test.json', 'glob/images/RND_ass_lookdev_default_beauty_tt.1001.exr'):
+                with open(os.path.join(os.path.dirname(sourceDirectory), name), 'rb') as sourceFile:
+                    self.assertEqual(f.read(name), sourceFile.read())
+
+            with open(os.path.join(BaseTestCase.dataTestsDirectory(), "test.exr"), 'rb') as sourceFile:
+                self.assertEqual(f.read('a/b/c/d.exr'), sourceFile.read())
+
+    def testArchiveTarZstd(self):
+        """
+        Test that a tar.zst archive can be created (requires the zstandard module).
+        """
+        packTask = Task.create('pack')
+        packTask.add(
+            FsElement.createFromPath(os.path.join(BaseTestCase.dataTestsDirectory(), "test.exr")),
+            self.__targetZstdArchivePath
+        )
+
+        try:
+            import zstandard
+        except ImportError:
+            self.assertRaises(PackerMissingDependencyError, packTask.output)
+            return
+
+        result = packTask.output()
+        with open(result[0].var('fullPath'), 'rb') as f:
+            with zstandard.ZstdDecompressor().stream_reader(f) as reader:
+                with tarfile.open(fileobj=reader, mode='r|') as archiveFile:
+                    self.assertListEqual(archiveFile.getnames(), ['test.exr'])
+
     def testUnsupportedArchiveType(self):
         """
         Test the exception unsupported archive type.
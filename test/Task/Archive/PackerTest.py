@@ -0,0 +1,76 @@
+import os
+import zlib
+import unittest
+import tempfile
+from zipfile import ZipFile, ZipInfo
+from ...BaseTestCase import BaseTestCase
+from kombi.Task.Archive import Packer, DeflatedZipFile
+
+class PackerTest(BaseTestCase):
+    """Test Packer."""
+
+    __directory = os.path.join(BaseTestCase.tempDirectory(), "packer")
+    __targetDeflatedZipPath = os.path.join(__directory, "testDeflatedZipFile.zip")
+    __targetPendingZipPath = os.path.join(__directory, "testPendingZip.zip")
+
+    def setUp(self):
+        """
+        Create the source files.
+        """
+        os.makedirs(self.__directory, exist_ok=True)
+
+        self.__sourceFilePaths = []
+        for index in range(6):
+            sourceFilePath = os.path.join(self.__directory, 'source_{}.txt'.format(index))
+            with open(sourceFilePath, 'wb') as f:
+                f.write(os.urandom(1024) * (index + 1))
+            self.__sourceFilePaths.append(sourceFilePath)
+
+    def testDeflatedZipFile(self):
+        """
+        Test writing members that have been deflated in advance.
+        """
+        with open(self.__sourceFilePaths[0], 'rb') as f:
+            data = f.read()
+
+        compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+        with DeflatedZipFile(self.__targetDeflatedZipPath, 'w', allowZip64=True) as zipFile:
+            zipFile.write(self.__sourceFilePaths[1], 'regular.txt')
+
+            with tempfile.TemporaryFile() as deflatedData:
+                deflatedData.write(compressor.compress(data) + compressor.flush())
+                zipFile.writeDeflated(
+                    ZipInfo.from_file(self.__sourceFilePaths[0], 'deflated.txt'),
+                    deflatedData,
+                    zlib.crc32(data),
+                    len(data)
+                )
+
+        with ZipFile(self.__targetDeflatedZipPath) as zipFile:
+            self.assertIsNone(zipFile.testzip())
+            self.assertEqual(zipFile.namelist(), ['regular.txt', 'deflated.txt'])
+            self.assertEqual(zipFile.read('deflated.txt'), data)
+
+            with open(self.__sourceFilePaths[1], 'rb') as f:
+                self.assertEqual(zipFile.read('regular.txt'), f.read())
+
+    def testMaxPendingBytes(self):
+        """
+        Test that the zip archive is written in order when the pending members go over the maximum size.
+        """
+        previousMaxPendingBytes = Packer.maxPendingBytes()
+        Packer.setMaxPendingBytes(2048)
+        try:
+            items = [(sourceFilePath, os.path.basename(sourceFilePath)) for sourceFilePath in self.__sourceFilePaths]
+            stats = Packer.writeZip(self.__targetPendingZipPath, iter(items))
+        finally:
+            Packer.setMaxPendingBytes(previousMaxPendingBytes)
+
+        self.assertEqual(stats['bytesRead'], sum(map(os.path.getsize, self.__sourceFilePaths)))
+        with ZipFile(self.__targetPendingZipPath) as zipFile:
+            self.assertIsNone(zipFile.testzip())
+            self.assertEqual(zipFile.namelist(), [x[1] for x in items])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1 +1,2 @@
 from .PackTaskTest import PackTaskTest
+from .PackerTest import PackerTest
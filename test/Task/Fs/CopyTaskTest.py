@@ -4,6 +4,7 @@ from ...BaseTestCase import BaseTestCase
 from kombi.Task import Task
 from kombi.Element.Fs import FsElement
 from kombi.Element.Fs.Image import ExrElement
+from kombi.Element.Fs.Sequence import SequenceElement
 
 class CopyTaskTest(BaseTestCase):
     """Test Copy task."""
@@ -27,6 +28,21 @@ class CopyTaskTest(BaseTestCase):
         self.assertEqual(element.var("width"), element.var("width"))
         self.assertEqual(element.var("height"), element.var("height"))
 
+    def testCopySequence(self):
+        """
+        Test that the copy task works properly with sequence elements.
+        """
+        element = FsElement.createFromPath(os.path.join(BaseTestCase.dataTestsDirectory(), "testSeq.####.exr"))
+        targetPath = os.path.join(BaseTestCase.tempDirectory(), "copySequenceTest", "copyTest.####.exr")
+        copyTask = Task.create('copy')
+        copyTask.add(element, targetPath)
+        result = copyTask.output()
+        self.assertEqual(len(result), 1)
+        self.assertIsInstance(result[0], SequenceElement)
+        self.assertEqual(result[0].frames(), element.frames())
+        for frame in element.frames():
+            self.assertTrue(os.path.isfile(result[0].framePath(frame)))
+
 
 if __name__ == "__main__":
     unittest.main()
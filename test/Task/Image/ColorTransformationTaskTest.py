@@ -0,0 +1,70 @@
+import unittest
+import os
+from ...BaseTestCase import BaseTestCase
+from kombi.Task import Task
+from kombi.Task.Image import OcioTask
+from kombi.Element.Fs import FsElement
+
+class ColorTransformationTaskTest(BaseTestCase):
+    """Test ColorTransformation task."""
+
+    __ocioConfig = 'ocio://cg-config-latest'
+    __sourceColorSpace = 'ACEScg'
+    __targetColorSpace = 'Linear Rec.709 (sRGB)'
+
+    def testColorTransformation(self):
+        """
+        Test that the ColorTransformation task works properly.
+        """
+        import numpy
+        import OpenImageIO as oiio
+        import PyOpenColorIO as ocio
+
+        config = ocio.Config.CreateFromFile(self.__ocioConfig)
+        processor = config.getProcessor(self.__sourceColorSpace, self.__targetColorSpace).getDefaultCPUProcessor()
+
+        # images spread over multiple strips with rgb, rgba and extra channels
+        for channels in (3, 4, 6):
+            sourcePath = os.path.join(self.tempDirectory(), 'colorTransformationSource_{}.exr'.format(channels))
+            targetPath = os.path.join(self.tempDirectory(), 'colorTransformationTarget_{}.exr'.format(channels))
+            sourcePixels = numpy.random.RandomState(channels).rand(150, 40, channels).astype(numpy.float32)
+            sourceImage = oiio.ImageOutput.create(sourcePath)
+            sourceImage.open(sourcePath, oiio.ImageSpec(40, 150, channels, oiio.FLOAT))
+            sourceImage.write_image(sourcePixels)
+            sourceImage.close()
+
+            colorTask = Task.create('colorTransformation')
+            colorTask.setOption('ocioConfig', self.__ocioConfig)
+            colorTask.setOption('sourceColorSpace', self.__sourceColorSpace)
+            colorTask.setOption('targetColorSpace', self.__targetColorSpace)
+            colorTask.add(FsElement.createFromPath(sourcePath), targetPath)
+            result = colorTask.output()
+            self.assertEqual(len(result), 1)
+
+            expectedPixels = numpy.ascontiguousarray(sourcePixels[..., :3])
+            processor.applyRGB(expectedPixels)
+
+            targetPixels = oiio.ImageInput.open(targetPath).read_image(oiio.FLOAT)
+            self.assertEqual(targetPixels.shape, sourcePixels.shape)
+            self.assertTrue(numpy.allclose(targetPixels[..., :3], expectedPixels, atol=1e-5))
+            self.assertTrue(numpy.array_equal(targetPixels[..., 3:], sourcePixels[..., 3:]))
+
+    def testProcessorCache(self):
+        """
+        Test that the processor is built once per color space transformation.
+        """
+        colorTask = Task.create('colorTransformation')
+        colorTask.setOption('ocioConfig', self.__ocioConfig)
+        processor = colorTask.ocioProcessor(self.__sourceColorSpace, self.__targetColorSpace)
+
+        otherColorTask = Task.create('colorTransformation')
+        otherColorTask.setOption('ocioConfig', self.__ocioConfig)
+        self.assertIs(otherColorTask.ocioProcessor(self.__sourceColorSpace, self.__targetColorSpace), processor)
+        self.assertIsNot(otherColorTask.ocioProcessor(self.__targetColorSpace, self.__sourceColorSpace), processor)
+
+        # the processor can be queried without a task
+        self.assertIs(OcioTask.ocioProcessorFromFile(self.__ocioConfig, self.__sourceColorSpace, self.__targetColorSpace), processor)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import os
+import unittest
+from ...BaseTestCase import BaseTestCase
+from kombi.Task import Task
+from kombi.Task.Image import ImagePipelineTaskInvalidOperationError
+from kombi.Element.Fs import FsElement
+
+class ImagePipelineTaskTest(BaseTestCase):
+    """Test ImagePipeline task."""
+
+    __sourcePaths = [
+        os.path.join(BaseTestCase.dataTestsDirectory(), "testSeq.000{}.exr".format(frame)) for frame in (1, 2)
+    ]
+    __targetDirectory = os.path.join(BaseTestCase.tempDirectory(), "imagePipeline")
+
+    def testMultipleOutputs(self):
+        """
+        Test that the ImagePipeline task writes all the outputs of each frame.
+        """
+        imagePipelineTask = Task.create('imagePipeline')
+        imagePipelineTask.setOption(
+            'operations',
+            [
+                {'run': 'metadata', 'data': {'kombi:pipeline': '!kt {name}'}}
+            ]
+        )
+        imagePipelineTask.setOption(
+            'outputs',
+            [
+                {
+                    'target': '!kt {}/proxy/{{name}}.(pad {{frame}} 4).jpg'.format(self.__targetDirectory),
+                    'operations': [
+                        {'run': 'resize', 'width': 960, 'height': 540}
+                    ],
+                    'dataFormat': 'uint8'
+                },
+                {
+                    'target': '!kt {}/thumbnail/{{name}}.(pad {{frame}} 4).png'.format(self.__targetDirectory),
+                    'operations': [
+                        {'run': 'resize', 'width': 320, 'height': 320, 'keepAspectRatio': True},
+                        {'run': 'channels', 'channels': ['R', 'G', 'B', 'A']}
+                    ]
+                }
+            ]
+        )
+
+        for sourcePath in self.__sourcePaths:
+            element = FsElement.createFromPath(sourcePath)
+            imagePipelineTask.add(
+                element,
+                os.path.join(self.__targetDirectory, 'full', os.path.basename(sourcePath))
+            )
+
+        result = imagePipelineTask.output()
+        self.assertEqual(len(result), 6)
+        self.assertEqual(
+            list(map(lambda x: os.path.basename(os.path.dirname(x.var('filePath'))), result)),
+            ['full', 'proxy', 'thumbnail'] * 2
+        )
+
+        resolutions = list(map(lambda x: (x.var('width'), x.var('height')), result[:3]))
+        self.assertEqual(resolutions, [(1920, 1080), (960, 540), (320, 180)])
+
+        import OpenImageIO as oiio
+        fullSpec = oiio.ImageInput.open(result[0].var('filePath')).spec()
+        self.assertEqual(fullSpec.getattribute('kombi:pipeline'), 'testSeq')
+
+        thumbnailSpec = oiio.ImageInput.open(result[2].var('filePath')).spec()
+        self.assertEqual(thumbnailSpec.nchannels, 3)
+
+    def testInvalidOperation(self):
+        """
+        Test that an invalid operation fails.
+        """
+        imagePipelineTask = Task.create('imagePipeline')
+        imagePipelineTask.setOption('operations', [{'run': 'invalid'}])
+        imagePipelineTask.add(
+            FsElement.createFromPath(self.__sourcePaths[0]),
+            os.path.join(self.__targetDirectory, 'invalid.exr')
+        )
+        self.assertRaises(ImagePipelineTaskInvalidOperationError, imagePipelineTask.output)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,3 +3,5 @@ from .ConvertTextureTaskTest import ConvertTextureTaskTest
 from .ImageThumbnailTaskTest import ImageThumbnailTaskTest
 from .ResizeImageTaskTest import ResizeImageTaskTest
 from .UpdateImageMetadataTaskTest import UpdateImageMetadataTaskTest
+from .ColorTransformationTaskTest import ColorTransformationTaskTest
+from .ImagePipelineTaskTest import ImagePipelineTaskTest
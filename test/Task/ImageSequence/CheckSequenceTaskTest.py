@@ -0,0 +1,83 @@
+import os
+import glob
+import shutil
+import unittest
+from ...BaseTestCase import BaseTestCase
+from kombi.Task import Task
+from kombi.Task.ImageSequence import CheckSequenceTaskError, CheckSequenceTaskMissingFrameError
+from kombi.Element.Fs import FsElement
+
+class CheckSequenceTaskTest(BaseTestCase):
+    """Test CheckSequence task."""
+
+    __sourcePath = os.path.join(BaseTestCase.dataTestsDirectory(), "testSeq.*.exr")
+
+    def setUp(self):
+        """
+        Create a copy of the test sequence.
+        """
+        self.__sequenceDirectory = os.path.join(self.tempDirectory(), 'checkSequence')
+        if os.path.exists(self.__sequenceDirectory):
+            shutil.rmtree(self.__sequenceDirectory)
+        os.makedirs(self.__sequenceDirectory)
+
+        for sourceFilePath in sorted(glob.glob(self.__sourcePath))[:6]:
+            shutil.copy(sourceFilePath, self.__sequenceDirectory)
+
+    def testValidSequence(self):
+        """
+        Test that a valid sequence passes the checks.
+        """
+        checkSequenceTask = self.__createTask()
+        checkSequenceTask.setOption('totalFrames', 6)
+        self.assertEqual(len(checkSequenceTask.output()), 6)
+
+    def testMissingFrames(self):
+        """
+        Test that all the holes of the sequence are reported.
+        """
+        for frame in (2, 4):
+            os.remove(os.path.join(self.__sequenceDirectory, 'testSeq.000{}.exr'.format(frame)))
+
+        checkSequenceTask = self.__createTask()
+        with self.assertRaises(CheckSequenceTaskMissingFrameError) as context:
+            checkSequenceTask.output()
+
+        self.assertIn('Found 2 problem(s)', str(context.exception))
+
+    def testReport(self):
+        """
+        Test that the problems found by the different checks are reported at once.
+        """
+        os.remove(os.path.join(self.__sequenceDirectory, 'testSeq.0003.exr'))
+        open(os.path.join(self.__sequenceDirectory, 'testSeq.0005.exr'), 'w').close()
+
+        checkSequenceTask = self.__createTask()
+        checkSequenceTask.setOption('totalFrames', 6)
+        checkSequenceTask.setOption('requiredMetadata', ['compression', 'kombi:*'])
+
+        with self.assertRaises(CheckSequenceTaskError) as context:
+            checkSequenceTask.output()
+
+        # total frames, missing frame, file size, metadata could not be
+        # read (frame 5) and metadata not found (4 frames)
+        report = str(context.exception)
+        self.assertIn('Found 8 problem(s)', report)
+        self.assertIn('total number of frames', report)
+        self.assertIn('missing frame', report)
+        self.assertIn('minimum required size', report)
+        self.assertEqual(report.count("required metadata name 'kombi:*'"), 4)
+
+    def __createTask(self):
+        """
+        Return a check sequence task containing the frames of the sequence.
+        """
+        checkSequenceTask = Task.create('checkSequence')
+        for filePath in sorted(glob.glob(os.path.join(self.__sequenceDirectory, '*.exr'))):
+            checkSequenceTask.add(FsElement.createFromPath(filePath))
+
+        return checkSequenceTask
+
+
+if __name__ == "__main__":
+    unittest.main()
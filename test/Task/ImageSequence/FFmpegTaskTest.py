@@ -0,0 +1,222 @@
+import os
+import sys
+import json
+import glob
+import shutil
+import unittest
+import multiprocessing
+from ...BaseTestCase import BaseTestCase
+from kombi.Task import Task
+from kombi.Task.ImageSequence import FFmpegTask, FFmpegTaskError
+from kombi.Element.Fs import FsElement
+
+class FFmpegTaskTest(BaseTestCase):
+    """Test FFmpeg task."""
+
+    __sourcePath = os.path.join(BaseTestCase.dataTestsDirectory(), "testSeq.*.exr")
+    __mockFFmpeg = '''
+import os
+import sys
+import json
+import hashlib
+
+args = sys.argv[1:]
+with open(os.environ['KOMBI_MOCK_FFMPEG_LOG'], 'a') as f:
+    f.write(json.dumps(args) + '\\n')
+
+# warnings should not be considered as failures
+sys.stderr.write('warning\\n')
+if os.environ.get('KOMBI_MOCK_FFMPEG_FAIL'):
+    sys.stderr.write('failed\\n')
+    sys.exit(1)
+
+outputFilePath = args[args.index('-y') + 1]
+if 'concat' in args:
+    with open(args[args.index('-i') + 1]) as f:
+        segmentFilePaths = [x[6:-1] for x in f.read().split('\\n') if x]
+
+    with open(outputFilePath, 'w') as f:
+        for segmentFilePath in segmentFilePaths:
+            with open(segmentFilePath) as segmentFile:
+                f.write(segmentFile.read())
+    sys.exit(0)
+
+if 'pipe:0' in args:
+    data = sys.stdin.buffer.read()
+    width, height = map(int, args[args.index('-s') + 1].split('x'))
+    totalFrames = len(data) // (width * height * 6)
+    for frame in range(1, totalFrames + 1):
+        sys.stdout.write('frame={}\\nprogress=continue\\n'.format(frame))
+
+    with open(outputFilePath, 'w') as f:
+        f.write('{}x{},{},{}\\n'.format(width, height, totalFrames, hashlib.sha256(data).hexdigest()))
+    sys.exit(0)
+
+startFrame = int(args[args.index('-start_number') + 1])
+if '-frames:v' in args:
+    totalFrames = int(args[args.index('-frames:v') + 1])
+else:
+    totalFrames = 0
+    while os.path.exists(args[args.index('-i') + 1] % (startFrame + totalFrames)):
+        totalFrames += 1
+
+if '-progress' in args:
+    for frame in range(1, totalFrames + 1):
+        sys.stdout.write('frame={}\\nprogress=continue\\n'.format(frame))
+    sys.stdout.write('progress=end\\n')
+
+with open(outputFilePath, 'w') as f:
+    f.write('{},{}\\n'.format(startFrame, totalFrames))
+'''
+
+    def setUp(self):
+        """
+        Configure the task to use a mocked ffmpeg.
+        """
+        self.__ffmpegDirectory = os.path.join(self.tempDirectory(), 'ffmpeg')
+        if os.path.exists(self.__ffmpegDirectory):
+            shutil.rmtree(self.__ffmpegDirectory)
+        os.makedirs(self.__ffmpegDirectory)
+
+        ffmpegFilePath = os.path.join(self.__ffmpegDirectory, 'ffmpeg')
+        with open(ffmpegFilePath, 'w') as f:
+            f.write('#!{}\n{}'.format(sys.executable, self.__mockFFmpeg))
+        os.chmod(ffmpegFilePath, 0o755)
+
+        self.__logFilePath = os.path.join(self.__ffmpegDirectory, 'ffmpeg.log')
+        self.__previousEnv = dict(os.environ)
+        os.environ['KOMBI_MOCK_FFMPEG_LOG'] = self.__logFilePath
+        self.__previousFFmpegExecutable = FFmpegTask.ffmpegExecutable()
+        FFmpegTask.setFFmpegExecutable(ffmpegFilePath)
+
+    def tearDown(self):
+        """
+        Restore the ffmpeg executable.
+        """
+        FFmpegTask.setFFmpegExecutable(self.__previousFFmpegExecutable)
+        os.environ.clear()
+        os.environ.update(self.__previousEnv)
+
+    def testSegmented(self):
+        """
+        Test that the sequence is encoded in segments that are concatenated.
+        """
+        targetFilePath = os.path.join(self.__ffmpegDirectory, 'segmented.mov')
+        ffmpegTask = self.__createTask(targetFilePath)
+        ffmpegTask.setOption('segmented', True)
+        ffmpegTask.setOption('segmentFrames', 4)
+        ffmpegTask.setOption('gopSize', 3)
+
+        progress = []
+        ffmpegTask.setProgressCallback(lambda *args: progress.append(args))
+        result = ffmpegTask.output()
+
+        self.assertEqual(len(result), 1)
+        with open(targetFilePath) as f:
+            self.assertEqual(f.read(), '1,6\n7,6\n')
+
+        calls = self.__calls()
+        self.assertEqual(len(calls), 3)
+        for call in calls[:2]:
+            self.assertEqual(call[call.index('-g') + 1], '3')
+            self.assertEqual(call[call.index('-threads') + 1], str(max(1, multiprocessing.cpu_count() // 2)))
+        self.assertIn('concat', calls[2])
+        self.assertEqual(progress[-1], (targetFilePath, 12, 12))
+        self.assertEqual(sorted(os.listdir(self.__ffmpegDirectory)), ['ffmpeg', 'ffmpeg.log', 'segmented.mov'])
+
+    def testSegmentedFailure(self):
+        """
+        Test that the segments are removed when the encoding fails.
+        """
+        targetFilePath = os.path.join(self.__ffmpegDirectory, 'segmented.mov')
+        ffmpegTask = self.__createTask(targetFilePath)
+        ffmpegTask.setOption('segmented', True)
+        ffmpegTask.setOption('segmentFrames', 4)
+        ffmpegTask.setOption('gopSize', 3)
+
+        os.environ['KOMBI_MOCK_FFMPEG_FAIL'] = '1'
+        self.assertRaises(FFmpegTaskError, ffmpegTask.output)
+        self.assertEqual(sorted(os.listdir(self.__ffmpegDirectory)), ['ffmpeg', 'ffmpeg.log'])
+
+    def testSingleProcess(self):
+        """
+        Test that the sequence is encoded by a single process when it is not segmented.
+        """
+        targetFilePath = os.path.join(self.__ffmpegDirectory, 'single.mov')
+        ffmpegTask = self.__createTask(targetFilePath)
+
+        progress = []
+        ffmpegTask.setProgressCallback(lambda *args: progress.append(args))
+        ffmpegTask.output()
+
+        with open(targetFilePath) as f:
+            self.assertEqual(f.read(), '1,12\n')
+
+        self.assertEqual(len(self.__calls()), 1)
+        self.assertEqual(progress[-1], (targetFilePath, 12, 12))
+
+    def testFailure(self):
+        """
+        Test that a failure is detected by the exit code.
+        """
+        os.environ['KOMBI_MOCK_FFMPEG_FAIL'] = '1'
+        ffmpegTask = self.__createTask(os.path.join(self.__ffmpegDirectory, 'failure.mov'))
+        self.assertRaises(FFmpegTaskError, ffmpegTask.output)
+
+    def testPipeFrames(self):
+        """
+        Test that the decoded frames are streamed to ffmpeg.
+        """
+        targetFilePath = os.path.join(self.__ffmpegDirectory, 'pipe.mov')
+        ffmpegTask = self.__createTask(targetFilePath, totalFrames=3)
+        ffmpegTask.setOption('pipeFrames', True)
+        ffmpegTask.setOption('pipeQueueSize', 2)
+
+        progress = []
+        ffmpegTask.setProgressCallback(lambda *args: progress.append(args))
+        ffmpegTask.output()
+
+        with open(targetFilePath) as f:
+            resolution, totalFrames, checksum = f.read().strip().split(',')
+        self.assertEqual(resolution, '1920x1080')
+        self.assertEqual(totalFrames, '3')
+        self.assertEqual(progress[-1], (targetFilePath, 3, 3))
+
+        # the frames are transformed through ocio
+        ocioTargetFilePath = os.path.join(self.__ffmpegDirectory, 'pipeOcio.mov')
+        ffmpegTask = self.__createTask(ocioTargetFilePath, totalFrames=3)
+        ffmpegTask.setOption('pipeFrames', True)
+        ffmpegTask.setOption('pipeOcioConfig', 'ocio://cg-config-latest')
+        ffmpegTask.setOption('pipeOcioSourceColorSpace', 'ACEScg')
+        ffmpegTask.setOption('pipeOcioTargetColorSpace', 'sRGB - Display')
+        ffmpegTask.output()
+
+        with open(ocioTargetFilePath) as f:
+            ocioResolution, ocioTotalFrames, ocioChecksum = f.read().strip().split(',')
+        self.assertEqual(ocioTotalFrames, '3')
+        self.assertNotEqual(ocioChecksum, checksum)
+
+        calls = self.__calls()
+        self.assertEqual(len(calls), 2)
+        self.assertIn('rawvideo', calls[0])
+
+    def __createTask(self, targetFilePath, totalFrames=None):
+        """
+        Return a ffmpeg task containing the test sequence.
+        """
+        ffmpegTask = Task.create('ffmpeg')
+        for sourceFilePath in sorted(glob.glob(self.__sourcePath))[:totalFrames]:
+            ffmpegTask.add(FsElement.createFromPath(sourceFilePath), targetFilePath)
+
+        return ffmpegTask
+
+    def __calls(self):
+        """
+        Return a list containing the arguments of each ffmpeg call.
+        """
+        with open(self.__logFilePath) as f:
+            return list(map(json.loads, f.read().split('\n')[:-1]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1 +1,3 @@
 from .SequenceThumbnailTaskTest import SequenceThumbnailTaskTest
+from .FFmpegTaskTest import FFmpegTaskTest
+from .CheckSequenceTaskTest import CheckSequenceTaskTest
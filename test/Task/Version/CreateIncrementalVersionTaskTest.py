@@ -0,0 +1,131 @@
+import os
+import json
+import shutil
+import unittest
+from ...BaseTestCase import BaseTestCase
+from kombi.Task import Task
+from kombi.Task.Version.CreateIncrementalVersionTask import CreateIncrementalVersionTask
+from kombi.Element.Fs import FsElement
+
+class _PublishTestVersionTask(CreateIncrementalVersionTask):
+    """
+    Publish the files defined by the option "files" (relative path under data: contents).
+    """
+
+    def __init__(self, *args, **kwargs):
+        """
+        Create a publish test version task.
+        """
+        super(_PublishTestVersionTask, self).__init__(*args, **kwargs)
+        self.setOption('files', {})
+        self.setOption('excludeTypes', [])
+
+    def _perform(self):
+        """
+        Perform the task.
+        """
+        for relativePath, contents in self.option('files').items():
+            filePath = os.path.join(self.dataPath(), relativePath)
+            self.makeDirs(os.path.dirname(filePath))
+            with open(filePath, 'w') as f:
+                f.write(contents)
+            self.addFile(filePath)
+
+        return super(_PublishTestVersionTask, self)._perform(self.option('excludeTypes'))
+
+
+Task.register(
+    'publishTestVersion',
+    _PublishTestVersionTask
+)
+
+class CreateIncrementalVersionTaskTest(BaseTestCase):
+    """Test create incremental version task."""
+
+    def setUp(self):
+        """
+        Create the directory used by the versions.
+        """
+        self.__versionsDirectory = os.path.join(self.tempDirectory(), 'incrementalVersions')
+        if os.path.exists(self.__versionsDirectory):
+            shutil.rmtree(self.__versionsDirectory)
+
+        self.__configDirectory = os.path.join(self.__versionsDirectory, 'config')
+        os.makedirs(self.__configDirectory)
+        with open(os.path.join(self.__configDirectory, 'config.json'), 'w') as f:
+            f.write('{}')
+
+    def testIncrementalFiles(self):
+        """
+        Test that the files from the previous version are hardlinked.
+        """
+        self.__publish(
+            'v0001',
+            {
+                'a.txt': 'a',
+                'sub/b.txt': 'b',
+                'sub/deep/c.txt': 'c',
+                'sub/deep/d.tx': 'd'
+            }
+        )
+        data = self.__publish('v0002', {'a.txt': 'new a'}, excludeTypes=['tx'])
+
+        self.assertEqual(sorted(data.keys()), ['data/a.txt', 'data/sub/b.txt', 'data/sub/deep/c.txt'])
+        self.assertEqual(data['data/a.txt']['sourceVersion'], 2)
+        self.assertEqual(data['data/sub/deep/c.txt']['sourceVersion'], 1)
+        self.assertFalse(self.__sameFile('v0001', 'v0002', 'data/a.txt'))
+        self.assertTrue(self.__sameFile('v0001', 'v0002', 'data/sub/b.txt'))
+        self.assertTrue(self.__sameFile('v0001', 'v0002', 'data/sub/deep/c.txt'))
+        self.assertNotIn('sha256', data['data/a.txt'])
+
+        with open(os.path.join(self.__versionsDirectory, 'v0002', 'info.json')) as f:
+            self.assertEqual(sorted(json.load(f)['sourceVersions']), [1, 2])
+
+    def testContentHashes(self):
+        """
+        Test that the new files with the same contents of a previous file are hardlinked to it.
+        """
+        self.__publish('v0001', {'a.txt': 'a', 'b.txt': 'b'}, contentHashes=True)
+        data = self.__publish('v0002', {'renamed.txt': 'a', 'b.txt': 'new b'}, contentHashes=True)
+
+        self.assertEqual(sorted(data.keys()), ['data/a.txt', 'data/b.txt', 'data/renamed.txt'])
+        self.assertEqual(data['data/renamed.txt']['sha256'], data['data/a.txt']['sha256'])
+        self.assertEqual(data['data/renamed.txt']['sourceVersion'], 1)
+        self.assertEqual(data['data/b.txt']['sourceVersion'], 2)
+        self.assertTrue(
+            os.path.samefile(
+                os.path.join(self.__versionsDirectory, 'v0001', 'data', 'a.txt'),
+                os.path.join(self.__versionsDirectory, 'v0002', 'data', 'renamed.txt')
+            )
+        )
+        self.assertFalse(self.__sameFile('v0001', 'v0002', 'data/b.txt'))
+
+    def __publish(self, versionName, files, excludeTypes=[], contentHashes=False):
+        """
+        Publish a version returning the contents of its data.json.
+        """
+        element = FsElement.createFromPath(self.__configDirectory)
+        element.setVar('configDirectory', self.__configDirectory)
+
+        task = Task.create('publishTestVersion')
+        task.setOption('files', files)
+        task.setOption('excludeTypes', excludeTypes)
+        task.setOption('contentHashes', contentHashes)
+        task.add(element, os.path.join(self.__versionsDirectory, versionName))
+        task.output()
+
+        with open(os.path.join(self.__versionsDirectory, versionName, 'data.json')) as f:
+            return json.load(f)
+
+    def __sameFile(self, versionName, otherVersionName, relativePath):
+        """
+        Return a boolean telling if the file is the same (hardlink) in both versions.
+        """
+        return os.path.samefile(
+            os.path.join(self.__versionsDirectory, versionName, relativePath),
+            os.path.join(self.__versionsDirectory, otherVersionName, relativePath)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1 @@
+from .CreateIncrementalVersionTaskTest import CreateIncrementalVersionTaskTest
@@ -3,4 +3,5 @@ from . import Image
 from . import ImageSequence
 from . import Video
 from . import Archive
+from . import Version
 from .TaskTest import TaskTest
@@ -0,0 +1,375 @@
+import os
+import sys
+import json
+import shutil
+import subprocess
+import unittest
+from ....BaseTestCase import BaseTestCase
+from kombi.Task import Task
+from kombi.Template import Template
+from kombi.TaskHolder import TaskHolder
+from kombi.Element.Fs import FsElement
+from kombi.Dispatcher import Dispatcher
+from kombi.Dispatcher.Renderfarm import DeadlineDispatcher, DeadlineDispatcherCommandError, SplitPolicy, SharedJobData
+
+class DeadlineDispatcherTest(BaseTestCase):
+    """Test for the deadline dispatcher."""
+
+    __mockDeadlineCommand = '''
+import os
+import sys
+import json
+import shutil
+import subprocess
+
+args = sys.argv[1:]
+if len(args) == 1 and os.path.isfile(args[0]):
+    with open(args[0]) as f:
+        args = f.read().split('\\n')
+
+jobs = []
+if args[0] == '-SubmitMultipleJobs':
+    for index, arg in enumerate(args):
+        if arg == '-job':
+            with open(args[index + 1]) as f:
+                jobInfo = dict(x.split('=', 1) for x in f.read().split('\\n'))
+            with open(args[index + 2]) as f:
+                pluginInfo = dict(x.split('=', 1) for x in f.read().split('\\n'))
+            jobs.append({'jobInfo': jobInfo, 'pluginInfo': pluginInfo})
+
+logFilePath = os.environ['KOMBI_MOCK_DEADLINECOMMAND_LOG']
+with open(logFilePath, 'a') as f:
+    f.write(json.dumps({'command': args[0], 'args': args[1:], 'jobs': jobs}) + '\\n')
+
+if os.environ.get('KOMBI_MOCK_DEADLINECOMMAND_SKIP_ID'):
+    jobs = jobs[1:]
+
+with open(logFilePath) as f:
+    jobIdOffset = sum(len(json.loads(x)['jobs']) for x in f)
+
+for index in range(len(jobs)):
+    sys.stdout.write('Result=Success\\nJobID=job{}\\n'.format(jobIdOffset - len(jobs) + index))
+
+if args[0] == 'GetJobSetting':
+    sys.stdout.write('75\\n')
+'''
+
+    def setUp(self):
+        """
+        Configure the dispatcher to use a mocked deadlinecommand.
+        """
+        self.__previousExecutable = DeadlineDispatcher.deadlineCommandExecutable()
+        self.__directory = os.path.join(self.tempDirectory(), 'deadline')
+        os.makedirs(self.__directory, exist_ok=True)
+
+        mockFilePath = os.path.join(self.__directory, 'deadlinecommand.py')
+        with open(mockFilePath, 'w') as f:
+            f.write(self.__mockDeadlineCommand)
+
+        self.__jobTempDir = os.path.join(self.__directory, 'jobs')
+        shutil.rmtree(self.__jobTempDir, ignore_errors=True)
+        shutil.rmtree(os.path.join(self.__directory, 'target'), ignore_errors=True)
+
+        self.__logFilePath = os.path.join(self.__directory, 'deadlinecommand.log')
+        if os.path.exists(self.__logFilePath):
+            os.remove(self.__logFilePath)
+
+        DeadlineDispatcher.setDeadlineCommandExecutable(
+            '"{}" "{}"'.format(sys.executable, mockFilePath)
+        )
+
+        self.__sourceDirectory = os.path.join(self.__directory, 'source')
+        os.makedirs(self.__sourceDirectory, exist_ok=True)
+        for index in range(5):
+            open(os.path.join(self.__sourceDirectory, 'file_{}.txt'.format(index)), 'w').close()
+
+    def tearDown(self):
+        """
+        Restore the deadlinecommand executable.
+        """
+        DeadlineDispatcher.setDeadlineCommandExecutable(self.__previousExecutable)
+
+    def testBatchSubmission(self):
+        """
+        Test that the jobs that don't depend on each other are submitted at once.
+        """
+        dispatcher = self.__createDispatcher()
+        jobIds = dispatcher.dispatch(self.__createTaskHolder(), self.__elements())
+
+        invocations = self.__invocations()
+
+        # chunks, parallel sub task holders and one call for each await sub task holder
+        self.assertEqual(len(invocations), 3)
+        self.assertTrue(all(x['command'] == '-SubmitMultipleJobs' for x in invocations))
+        self.assertEqual(list(map(lambda x: len(x['jobs']), invocations)), [3, 2, 1])
+        self.assertEqual(jobIds, ['job{}'.format(x) for x in range(6)])
+
+        chunkJobs, parallelJobs, awaitJobs = map(lambda x: x['jobs'], invocations)
+        self.assertEqual(
+            list(map(lambda x: x['jobInfo']['Name'].split(':')[0], chunkJobs)),
+            ['copy (001/003)', 'copy (002/003)', 'copy (003/003)']
+        )
+        self.assertEqual(
+            list(map(lambda x: x['jobInfo']['Name'].split(' ')[-1], chunkJobs)),
+            ['file_0.txt', 'file_2.txt', 'file_4.txt']
+        )
+
+        for chunkJob in chunkJobs:
+            self.assertEqual(chunkJob['jobInfo']['Plugin'], 'CommandLine')
+            self.assertEqual(chunkJob['jobInfo']['Priority'], '50')
+            self.assertNotIn('JobDependencies', chunkJob['jobInfo'])
+            self.assertTrue(chunkJob['pluginInfo']['Arguments'].endswith('.json'))
+
+        for parallelJob in parallelJobs:
+            self.assertEqual(parallelJob['jobInfo']['JobDependencies'], 'job0,job1,job2')
+            self.assertEqual(parallelJob['jobInfo']['OnJobComplete'], 'Delete')
+
+        self.assertEqual(awaitJobs[0]['jobInfo']['JobDependencies'], 'job3,job4')
+
+        # the job ids are mapped back to the collapsed jobs
+        jobIdFilePath = awaitJobs[0]['pluginInfo']['Arguments'].split(' ')[-1][:-len('.json')] + '_jobId.json'
+        with open(jobIdFilePath) as f:
+            self.assertEqual(json.load(f)['id'], 'job5')
+
+    def testAdaptiveSplit(self):
+        """
+        Test that the chunks are computed from the timings recorded by the previous executions.
+        """
+        dispatcher = self.__createDispatcher()
+        dispatcher.setOption('adaptiveSplit', True)
+        dispatcher.setOption('splitSize', 2)
+        dispatcher.setOption('chunkDuration', 3)
+        SplitPolicy.record(SplitPolicy.historyFilePath(self.__jobTempDir, 'copy'), 10, 0, 10.0)
+
+        # the split size defined by the task is used as it is
+        taskHolder = self.__createTaskHolder()
+        taskHolder.cleanSubTaskHolders()
+        dispatcher.dispatch(taskHolder, self.__elements())
+        self.assertEqual(len(self.__invocations()[0]['jobs']), 3)
+        os.remove(self.__logFilePath)
+
+        taskHolder.task().unsetMetadata('dispatch.splitSize')
+        dispatcher.dispatch(taskHolder, self.__elements())
+
+        invocations = self.__invocations()
+        self.assertEqual(len(invocations), 1)
+        self.assertEqual(len(invocations[0]['jobs']), 2)
+
+        # the expanded jobs record their timings in the history
+        with open(invocations[0]['jobs'][0]['pluginInfo']['Arguments'].split(' ')[-1]) as f:
+            self.assertEqual(
+                json.load(f)['splitHistoryFilePath'],
+                SplitPolicy.historyFilePath(self.__jobTempDir, 'copy')
+            )
+
+    def testStaticSplitWithoutHistory(self):
+        """
+        Test that the maximum number of jobs is only applied when there is history about the task type.
+        """
+        dispatcher = self.__createDispatcher()
+        dispatcher.setOption('adaptiveSplit', True)
+        dispatcher.setOption('maxJobs', 1)
+
+        taskHolder = self.__createTaskHolder()
+        taskHolder.cleanSubTaskHolders()
+        dispatcher.dispatch(taskHolder, self.__elements())
+
+        invocations = self.__invocations()
+        self.assertEqual(len(invocations), 1)
+        self.assertEqual(len(invocations[0]['jobs']), 3)
+
+    def testSharedJobData(self):
+        """
+        Test that the chunks share the data about the dispatcher and task holder.
+        """
+        dispatcher = self.__createDispatcher()
+        taskHolder = self.__createTaskHolder()
+        taskHolder.cleanSubTaskHolders()
+        dispatcher.dispatch(taskHolder, self.__elements())
+
+        jobDataFilePaths = list(map(
+            lambda x: x['pluginInfo']['Arguments'].split(' ')[-1],
+            self.__invocations()[0]['jobs']
+        ))
+        sharedJobDataFilePaths = set()
+        totalElements = 0
+        for jobDataFilePath in jobDataFilePaths:
+            with open(jobDataFilePath) as f:
+                data = json.load(f)
+            self.assertNotIn('taskHolder', data)
+            self.assertNotIn('dispatcher', data)
+            sharedJobDataFilePaths.add(data['sharedJobDataFilePath'])
+            totalElements += len(data['elementData'])
+
+        self.assertEqual(len(sharedJobDataFilePaths), 1)
+        self.assertEqual(totalElements, 5)
+
+        sharedJobData = SharedJobData.load(sharedJobDataFilePaths.pop())
+        self.assertEqual(set(sharedJobData.keys()), {'dispatcher', 'taskHolder'})
+
+        # executing a chunk as the farm would do
+        self.__executeOnTheFarm(jobDataFilePaths[1])
+        self.assertEqual(
+            sorted(os.listdir(os.path.join(self.__directory, 'target'))),
+            ['file_2.txt', 'file_3.txt']
+        )
+
+    def testCollapsedJobRegroup(self):
+        """
+        Test that a collapsed job dispatches the groups found among the results of the chunks.
+        """
+        targetTemplate = Template('!kt ' + os.path.join(self.__directory, 'target', '{baseName}'))
+        task = Task.create('copy')
+        task.setMetadata('dispatch.splitSize', 2)
+        taskHolder = TaskHolder(task, targetTemplate)
+        subTaskHolder = TaskHolder(Task.create('copy'), targetTemplate)
+        subTaskHolder.setRegroupTag('group')
+        taskHolder.addSubTaskHolder(subTaskHolder)
+
+        dispatcher = self.__createDispatcher()
+        dispatcher.dispatch(taskHolder, self.__elements())
+        invocations = self.__invocations()
+        collapsedJobDataFilePath = invocations[1]['jobs'][0]['pluginInfo']['Arguments'].split(' ')[-1]
+        with open(collapsedJobDataFilePath) as f:
+            taskInputFilePaths = json.load(f)['taskInputFilePaths']
+
+        # writing the results of the chunks (a group is spread among them)
+        groups = [['a', None], ['b', 'a'], ['b']]
+        index = 0
+        for taskInputFilePath, chunkGroups in zip(taskInputFilePaths, groups):
+            serializedElements = []
+            for group in chunkGroups:
+                element = FsElement.createFromPath(os.path.join(self.__sourceDirectory, 'file_{}.txt'.format(index)))
+                if group:
+                    element.setTag('group', group)
+                serializedElements.append(element.toJson())
+                index += 1
+
+            with open(taskInputFilePath, 'w') as f:
+                json.dump(serializedElements, f)
+
+        self.__executeOnTheFarm(collapsedJobDataFilePath)
+
+        dispatchedElements = []
+        for invocation in self.__invocations()[len(invocations):]:
+            if invocation['command'] != '-SubmitMultipleJobs':
+                continue
+
+            baseNames = []
+            for job in invocation['jobs']:
+                with open(job['pluginInfo']['Arguments'].split(' ')[-1]) as f:
+                    baseNames += map(lambda x: json.loads(x['serializedElement'])['vars']['baseName'], json.load(f)['elementData'])
+            dispatchedElements.append(baseNames)
+
+        self.assertEqual(
+            dispatchedElements,
+            [
+                ['file_1.txt'],
+                ['file_0.txt', 'file_3.txt'],
+                ['file_2.txt', 'file_4.txt']
+            ]
+        )
+
+    def testMissingJobId(self):
+        """
+        Test that an error is raised when deadline does not return an id for each job.
+        """
+        dispatcher = self.__createDispatcher()
+        dispatcher.setOption(
+            'env',
+            dict(dispatcher.option('env'), KOMBI_MOCK_DEADLINECOMMAND_SKIP_ID='1')
+        )
+
+        self.assertRaises(
+            DeadlineDispatcherCommandError,
+            dispatcher.dispatch,
+            self.__createTaskHolder(),
+            self.__elements()
+        )
+
+    def testExtendDependencyIds(self):
+        """
+        Test the commands used to extend the dependencies of a job.
+        """
+        dispatcher = self.__createDispatcher()
+        dispatcher.extendDependencyIds('job0', ['job1', 'job2'])
+
+        invocations = self.__invocations()
+        self.assertEqual(
+            list(map(lambda x: [x['command']] + x['args'], invocations)),
+            [
+                ['SetJobSetting', 'job0', 'JobDependencies', 'job1,job2'],
+                ['PendJob', 'job0'],
+                ['GetJobSetting', 'job0', 'Priority'],
+                ['SetJobSetting', 'job1', 'Priority', '75'],
+                ['SetJobSetting', 'job2', 'Priority', '75']
+            ]
+        )
+
+    def __createDispatcher(self):
+        """
+        Return a deadline dispatcher that submits the jobs locally (without expanding them on the farm).
+        """
+        dispatcher = Dispatcher.create('renderFarm')
+        dispatcher.setOption('jobTempDir', self.__jobTempDir)
+        dispatcher.setOption('expandOnTheFarm', False)
+        dispatcher.setOption('chunkifyOnTheFarm', False)
+        dispatcher.setOption(
+            'env',
+            dict(dispatcher.option('env'), KOMBI_MOCK_DEADLINECOMMAND_LOG=self.__logFilePath)
+        )
+
+        return dispatcher
+
+    def __createTaskHolder(self):
+        """
+        Return a task holder containing parallel and await sub task holders.
+        """
+        targetTemplate = Template('!kt ' + os.path.join(self.__directory, 'target', '{baseName}'))
+        task = Task.create('copy')
+        task.setMetadata('dispatch.splitSize', 2)
+        taskHolder = TaskHolder(task, targetTemplate)
+
+        for _ in range(2):
+            taskHolder.addSubTaskHolder(TaskHolder(Task.create('copy'), targetTemplate))
+
+        awaitTask = Task.create('copy')
+        awaitTask.setMetadata('dispatch.await', True)
+        taskHolder.addSubTaskHolder(TaskHolder(awaitTask, targetTemplate))
+
+        return taskHolder
+
+    def __executeOnTheFarm(self, jobDataFilePath):
+        """
+        Execute a job as the farm would do.
+        """
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join([os.path.join(self.rootPath(), 'src'), env.get('PYTHONPATH', '')])
+        env['KOMBI_DEADLINECOMMAND_EXECUTABLE'] = DeadlineDispatcher.deadlineCommandExecutable()
+        env['KOMBI_MOCK_DEADLINECOMMAND_LOG'] = self.__logFilePath
+        subprocess.check_call(
+            [
+                sys.executable,
+                os.path.join(self.rootPath(), 'src', 'kombi', 'Dispatcher', 'Renderfarm', 'auxiliary', 'execute-renderfarm.py'),
+                jobDataFilePath
+            ],
+            env=env,
+            stdout=subprocess.DEVNULL
+        )
+
+    def __elements(self):
+        """
+        Return the elements used by the tests.
+        """
+        return FsElement.createFromPath(self.__sourceDirectory).children()
+
+    def __invocations(self):
+        """
+        Return a list with the calls received by the mocked deadlinecommand.
+        """
+        with open(self.__logFilePath) as f:
+            return list(map(json.loads, f))
+
+
+if __name__ == "__main__":
+    unittest.main()
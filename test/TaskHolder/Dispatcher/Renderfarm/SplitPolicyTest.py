@@ -0,0 +1,105 @@
+import os
+import unittest
+from ....BaseTestCase import BaseTestCase
+from kombi.Element.Fs import FsElement
+from kombi.Dispatcher.Renderfarm import SplitPolicy
+
+class SplitPolicyTest(BaseTestCase):
+    """Test for the split policy used by the renderfarm dispatcher."""
+
+    def setUp(self):
+        """
+        Create files with different sizes.
+        """
+        self.__directory = os.path.join(self.tempDirectory(), 'splitPolicy')
+        os.makedirs(self.__directory, exist_ok=True)
+
+        self.__historyFilePath = SplitPolicy.historyFilePath(self.__directory, 'copy')
+        if os.path.exists(self.__historyFilePath):
+            os.remove(self.__historyFilePath)
+
+        self.__elements = []
+        for index, size in enumerate([100, 100, 100, 100, 400, 400, 100, 100]):
+            filePath = os.path.join(self.__directory, 'file_{}.txt'.format(index))
+            with open(filePath, 'w') as f:
+                f.write('x' * size)
+            self.__elements.append(FsElement.createFromPath(filePath))
+
+    def testCost(self):
+        """
+        Test the cost computed from the recorded history.
+        """
+        self.assertIsNone(SplitPolicy.cost(self.__historyFilePath))
+
+        SplitPolicy.record(self.__historyFilePath, 10, 0, 5.0)
+        self.assertEqual(SplitPolicy.cost(self.__historyFilePath), {'perElement': 0.5, 'perByte': None})
+
+        SplitPolicy.record(self.__historyFilePath, 10, 1000, 15.0)
+        cost = SplitPolicy.cost(self.__historyFilePath)
+        self.assertAlmostEqual(cost['perElement'], 1.0)
+        self.assertAlmostEqual(cost['perByte'], 0.015)
+
+    def testHistoryCompaction(self):
+        """
+        Test that the history file is compacted to the latest records.
+        """
+        for index in range(10000):
+            SplitPolicy.record(self.__historyFilePath, 10, 0, float(index))
+
+        self.assertLess(os.path.getsize(self.__historyFilePath), 65536 * 4)
+        with open(self.__historyFilePath) as f:
+            self.assertEqual(f.read().split('\n')[-2], '{"elements": 10, "bytes": 0, "duration": 9999.0}')
+
+        # the cost only takes into account the latest 50 records
+        self.assertAlmostEqual(SplitPolicy.cost(self.__historyFilePath)['perElement'], 997.45)
+
+    def testHistoryFilePath(self):
+        """
+        Test that the history is kept per task type and config.
+        """
+        historyFilePaths = {
+            SplitPolicy.historyFilePath(self.__directory, 'copy'),
+            SplitPolicy.historyFilePath(self.__directory, 'copy', '/configs/a.yaml'),
+            SplitPolicy.historyFilePath(self.__directory, 'copy', '/configs/b.yaml'),
+            SplitPolicy.historyFilePath(self.__directory, 'nukeRender', '/configs/a.yaml')
+        }
+        self.assertEqual(len(historyFilePaths), 4)
+
+    def testStaticSplit(self):
+        """
+        Test that the static split size is used when there is no history.
+        """
+        chunks = SplitPolicy.chunkify(self.__elements, 3)
+        self.assertEqual(list(map(len, chunks)), [3, 3, 2])
+
+        chunks = SplitPolicy.chunkify(self.__elements, 1, maxJobs=2)
+        self.assertEqual(list(map(len, chunks)), [4, 4])
+
+    def testWeightedSplit(self):
+        """
+        Test that the elements are weighted by their file size.
+        """
+        cost = {'perElement': 1.0, 'perByte': 0.01}
+        chunks = SplitPolicy.chunkify(self.__elements, 10, cost, targetDuration=4.0)
+        self.assertEqual(list(map(len, chunks)), [4, 1, 1, 2])
+
+        # the maximum number of jobs increases the duration of the chunks
+        chunks = SplitPolicy.chunkify(self.__elements, 10, cost, targetDuration=4.0, maxJobs=2)
+        self.assertEqual(list(map(len, chunks)), [5, 3])
+
+        # without the size it falls back to the cost per element
+        cost = {'perElement': 1.0, 'perByte': None}
+        chunks = SplitPolicy.chunkify(self.__elements, 10, cost, targetDuration=3.0)
+        self.assertEqual(list(map(len, chunks)), [3, 3, 2])
+
+    def testChunkSize(self):
+        """
+        Test the chunk size used when the chunks are computed by the farm.
+        """
+        self.assertEqual(SplitPolicy.chunkSize(self.__elements, 3), 3)
+        self.assertEqual(SplitPolicy.chunkSize(self.__elements, 3, {'perElement': 0.5, 'perByte': None}, 2.0), 4)
+        self.assertEqual(SplitPolicy.chunkSize(self.__elements, 1, maxJobs=4), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,2 @@
+from .DeadlineDispatcherTest import DeadlineDispatcherTest
+from .SplitPolicyTest import SplitPolicyTest
@@ -1 +1,2 @@
 from . import Local
+from . import Renderfarm
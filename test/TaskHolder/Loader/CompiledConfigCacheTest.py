@@ -0,0 +1,123 @@
+import os
+import json
+import unittest
+from ...BaseTestCase import BaseTestCase
+from kombi.TaskHolder.Loader import Loader, JsonLoader, CompiledConfigCache
+
+class CompiledConfigCacheTest(BaseTestCase):
+    """Test CompiledConfigCache."""
+
+    __configData = {
+        "vars": {
+            "prefix": "/tmp"
+        },
+        "tasks": [
+            {
+                "include": "include.json"
+            }
+        ]
+    }
+
+    __includeData = {
+        "run": "copy",
+        "target": "{prefix}/{baseName}"
+    }
+
+    def setUp(self):
+        """
+        Create the configuration files used by the tests.
+        """
+        self.__previousDirectory = CompiledConfigCache.directory()
+        self.__configDirectory = os.path.join(self.tempDirectory(), 'compiledConfigCache', 'config')
+        self.__cacheDirectory = os.path.join(self.tempDirectory(), 'compiledConfigCache', 'cache')
+        os.makedirs(self.__configDirectory, exist_ok=True)
+
+        CompiledConfigCache.setDirectory(self.__cacheDirectory)
+        CompiledConfigCache.clear()
+
+        self.__configFile = os.path.join(self.__configDirectory, 'config.json')
+        with open(self.__configFile, 'w') as f:
+            json.dump(self.__configData, f)
+
+        self.__includeFile = os.path.join(self.__configDirectory, 'include.json')
+        with open(self.__includeFile, 'w') as f:
+            json.dump(self.__includeData, f)
+
+    def tearDown(self):
+        """
+        Restore the cache directory.
+        """
+        CompiledConfigCache.setDirectory(self.__previousDirectory)
+        CompiledConfigCache.clear()
+
+    def testParse(self):
+        """
+        Test that the parsed contents are cached in memory and on disk.
+        """
+        result = CompiledConfigCache.parse(self.__configFile, JsonLoader)
+        self.assertEqual(result, self.__configData)
+
+        # modifying the result should not affect the cache
+        result['tasks'].clear()
+        self.assertEqual(CompiledConfigCache.parse(self.__configFile, JsonLoader), self.__configData)
+
+        # disk cache
+        with open(self.__configFile) as f:
+            contentHash = CompiledConfigCache.hash(f.read(), JsonLoader)
+        self.assertTrue(os.path.exists(os.path.join(self.__cacheDirectory, contentHash[:2], '{}.pickle'.format(contentHash))))
+
+        CompiledConfigCache.clear()
+        self.assertEqual(CompiledConfigCache.parse(self.__configFile, JsonLoader), self.__configData)
+
+    def testInvalidation(self):
+        """
+        Test that modifying an include invalidates the cached contents.
+        """
+        loader = Loader()
+        loader.loadFromFile(self.__configFile)
+        self.assertEqual(loader.taskHolders()[0].targetTemplate().inputString(), "{prefix}/{baseName}")
+
+        includeData = dict(self.__includeData)
+        includeData['target'] = "{prefix}/modified/{baseName}"
+        with open(self.__includeFile, 'w') as f:
+            json.dump(includeData, f)
+
+        # making sure the modification time is different
+        stat = os.stat(self.__includeFile)
+        os.utime(self.__includeFile, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+
+        loader = Loader()
+        loader.loadFromFile(self.__configFile)
+        self.assertEqual(loader.taskHolders()[0].targetTemplate().inputString(), "{prefix}/modified/{baseName}")
+
+    def testInvalidDiskEntry(self):
+        """
+        Test that a disk entry that can't be unpickled gets parsed again.
+        """
+        with open(self.__configFile) as f:
+            contentHash = CompiledConfigCache.hash(f.read(), JsonLoader)
+        cacheFilePath = os.path.join(self.__cacheDirectory, contentHash[:2], '{}.pickle'.format(contentHash))
+        os.makedirs(os.path.dirname(cacheFilePath), exist_ok=True)
+        with open(cacheFilePath, 'wb') as f:
+            f.write(b'\x80\x05truncated')
+
+        self.assertEqual(CompiledConfigCache.parse(self.__configFile, JsonLoader), self.__configData)
+
+        # the invalid entry should have been replaced
+        CompiledConfigCache.clear()
+        with open(cacheFilePath, 'rb') as f:
+            self.assertNotEqual(f.read(), b'\x80\x05truncated')
+        self.assertEqual(CompiledConfigCache.parse(self.__configFile, JsonLoader), self.__configData)
+
+    def testHashLoader(self):
+        """
+        Test that the hash depends on the loader.
+        """
+        contents = json.dumps(self.__configData)
+        self.assertEqual(CompiledConfigCache.hash(contents, JsonLoader), CompiledConfigCache.hash(contents, JsonLoader))
+        self.assertNotEqual(CompiledConfigCache.hash(contents, JsonLoader), CompiledConfigCache.hash(contents, Loader))
+        self.assertNotEqual(CompiledConfigCache.hash(contents, JsonLoader), CompiledConfigCache.hash(contents + ' ', JsonLoader))
+
+
+if __name__ == "__main__":
+    unittest.main()
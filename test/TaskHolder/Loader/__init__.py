@@ -0,0 +1 @@
+from .CompiledConfigCacheTest import CompiledConfigCacheTest
@@ -1 +1,2 @@
 from . import Dispatcher
+from . import Loader
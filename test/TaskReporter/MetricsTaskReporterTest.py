@@ -0,0 +1,118 @@
+import os
+import json
+import unittest
+from ..BaseTestCase import BaseTestCase
+from kombi.Task import Task
+from kombi.Element.Fs import FsElement
+from kombi.TaskReporter import TaskReporter, MetricsTaskReporter
+
+class MetricsTaskReporterTest(BaseTestCase):
+    """Test for metrics task reporter."""
+
+    def setUp(self):
+        """
+        Create the source files used by the test.
+        """
+        self.__sourceDirectory = os.path.join(self.tempDirectory(), 'metricsSource')
+        self.__targetDirectory = os.path.join(self.tempDirectory(), 'metricsTarget')
+        self.__metricsFile = os.path.join(self.tempDirectory(), 'metrics', 'metrics.jsonl')
+        os.makedirs(self.__sourceDirectory, exist_ok=True)
+        for index in range(4):
+            with open(os.path.join(self.__sourceDirectory, 'file{}.txt'.format(index)), 'wb') as f:
+                f.write(b'x' * 100)
+
+        self.__previousOutputFilePath = MetricsTaskReporter.outputFilePath()
+        MetricsTaskReporter.setOutputFilePath(self.__metricsFile)
+
+    def tearDown(self):
+        """
+        Restore the metrics output.
+        """
+        MetricsTaskReporter.setOutputFilePath(self.__previousOutputFilePath)
+        if os.path.exists(self.__metricsFile):
+            os.remove(self.__metricsFile)
+
+    def testReport(self):
+        """
+        Test the metrics written by the reporter.
+        """
+        for _ in range(2):
+            self.__runCopy()
+
+        with open(self.__metricsFile) as f:
+            records = list(map(json.loads, f))
+
+        self.assertEqual(len(records), 2)
+        for record in records:
+            self.assertEqual(record['task'], 'byteCopy')
+            self.assertEqual(record['elements'], 4)
+            self.assertEqual(record['bytesRead'], 400)
+            self.assertEqual(record['bytesWritten'], 400)
+            self.assertEqual(len(record['elementLatencies']), 4)
+            self.assertGreaterEqual(record['cpuUser'] + record['cpuSystem'], 0.0)
+            self.assertGreater(record['elementsPerSecond'], 0.0)
+            self.assertIsNotNone(record['elementLatency']['p90'])
+
+    def testAggregate(self):
+        """
+        Test the aggregation of the metrics written by multiple executions (chunks).
+        """
+        for _ in range(3):
+            self.__runCopy()
+
+        aggregated = MetricsTaskReporter.aggregate(self.__metricsFile)['byteCopy']
+        self.assertEqual(aggregated['records'], 3)
+        self.assertEqual(aggregated['elements'], 12)
+        self.assertEqual(aggregated['bytesRead'], 1200)
+        self.assertEqual(aggregated['bytesWritten'], 1200)
+        self.assertLessEqual(aggregated['elementLatency']['p50'], aggregated['elementLatency']['p100'])
+
+    def testFailure(self):
+        """
+        Test that the metrics are written for failed executions.
+        """
+        self.__runCopy()
+
+        # removing a source file after the element has been created
+        missingFile = os.path.join(self.__sourceDirectory, 'missing.txt')
+        with open(missingFile, 'wb') as f:
+            f.write(b'x')
+        task = Task.create('byteCopy')
+        task.setMetadata('output.reporter', 'metrics')
+        task.add(FsElement.createFromPath(missingFile), os.path.join(self.__targetDirectory, 'missing.txt'))
+        os.remove(missingFile)
+        self.assertRaises(Exception, task.output)
+
+        with open(self.__metricsFile) as f:
+            records = list(map(json.loads, f))
+
+        self.assertEqual(len(records), 2)
+        self.assertFalse(records[0]['failed'])
+        self.assertTrue(records[1]['failed'])
+        self.assertEqual(MetricsTaskReporter.aggregate(self.__metricsFile)['byteCopy']['failed'], 1)
+
+    def testPercentile(self):
+        """
+        Test the percentile computation.
+        """
+        self.assertIsNone(TaskReporter.percentile([], 50))
+        self.assertEqual(TaskReporter.percentile([3, 1, 2], 50), 2)
+        self.assertEqual(TaskReporter.percentile([1, 2, 3, 4], 100), 4)
+        self.assertEqual(TaskReporter.percentile([0, 10], 90), 9)
+
+    def __runCopy(self):
+        """
+        Run a byte copy task reporting the metrics.
+        """
+        task = Task.create('byteCopy')
+        task.setMetadata('output.reporter', 'metrics')
+        for fileName in sorted(os.listdir(self.__sourceDirectory)):
+            task.add(
+                FsElement.createFromPath(os.path.join(self.__sourceDirectory, fileName)),
+                os.path.join(self.__targetDirectory, fileName)
+            )
+        task.output()
+
+
+if __name__ == "__main__":
+    unittest.main()
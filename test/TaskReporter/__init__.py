@@ -1,3 +1,4 @@
 from .ColumnsTaskReporterTest import ColumnsTaskReporterTest
 from .DetailedTaskReporterTest import DetailedTaskReporterTest
 from .JsonTaskReporterTest import JsonTaskReporterTest
+from .MetricsTaskReporterTest import MetricsTaskReporterTest
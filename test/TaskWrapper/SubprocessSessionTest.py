@@ -0,0 +1,107 @@
+import io
+import os
+import time
+import shutil
+import unittest
+import contextlib
+from ..BaseTestCase import BaseTestCase
+from kombi.Task import Task
+from kombi.TaskWrapper import TaskWrapper, SubprocessSession, SubprocessTaskWrapperFailedError
+from kombi.Element.Fs import FsElement
+from kombi.ResourceLoader import ResourceLoader
+
+class SubprocessSessionTest(BaseTestCase):
+    """Test subprocess sessions."""
+
+    __sourcePath = os.path.join(BaseTestCase.dataTestsDirectory(), 'test.exr')
+    __taskPath = os.path.join(BaseTestCase.dataTestsDirectory(), 'tasks', 'SessionTestTask.py')
+
+    def setUp(self):
+        """
+        Use a temporary directory for the state of the sessions.
+        """
+        self.__sessionDirectory = os.path.join(self.tempDirectory(), 'sessions')
+        if os.path.exists(self.__sessionDirectory):
+            shutil.rmtree(self.__sessionDirectory)
+
+        self.__previousSessionDirectory = SubprocessSession.directory()
+        SubprocessSession.setDirectory(self.__sessionDirectory)
+        ResourceLoader.get().load(self.__taskPath)
+
+    def tearDown(self):
+        """
+        Restore the session directory.
+        """
+        SubprocessSession.setDirectory(self.__previousSessionDirectory)
+
+    def testReuse(self):
+        """
+        Test that the session process is reused by the next executions.
+        """
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            firstResult = self.__run(totalElements=2)
+            secondResult = self.__run()
+
+        self.assertEqual(len(firstResult), 2)
+        self.assertNotEqual(firstResult[0].var('sessionPid'), os.getpid())
+        self.assertEqual(firstResult[0].var('sessionPid'), secondResult[0].var('sessionPid'))
+
+        # the output of the session process is forwarded
+        self.assertIn('ALF_PROGRESS 50%', output.getvalue())
+        self.assertEqual(output.getvalue().count('ALF_PROGRESS 100%'), 2)
+
+    def testExecutionInstances(self):
+        """
+        Test that concurrent executions use different sessions.
+        """
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = self.__run(totalElements=2, executionInstances=2)
+
+        self.assertEqual(len(result), 2)
+        self.assertNotEqual(result[0].var('sessionPid'), result[1].var('sessionPid'))
+
+    def testIdleTimeout(self):
+        """
+        Test that the session process quits once it has been idle for the timeout.
+        """
+        with contextlib.redirect_stdout(io.StringIO()):
+            firstResult = self.__run(idleTimeout=0.5)
+            time.sleep(1.5)
+            secondResult = self.__run(idleTimeout=0.5)
+
+        self.assertNotEqual(firstResult[0].var('sessionPid'), secondResult[0].var('sessionPid'))
+
+    def testFailure(self):
+        """
+        Test that a failure in the session is raised without terminating the session.
+        """
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertRaises(SubprocessTaskWrapperFailedError, self.__run, fail=True)
+            firstResult = self.__run()
+            secondResult = self.__run()
+
+        self.assertIn('Session test task failure', output.getvalue())
+        self.assertEqual(firstResult[0].var('sessionPid'), secondResult[0].var('sessionPid'))
+
+    def __run(self, totalElements=1, executionInstances=1, idleTimeout=5, fail=False):
+        """
+        Run the session test task through the python task wrapper using sessions.
+        """
+        task = Task.create('sessionTestTask')
+        task.setOption('fail', fail)
+        for _ in range(totalElements):
+            task.add(FsElement.createFromPath(self.__sourcePath))
+
+        wrapper = TaskWrapper.create('python')
+        wrapper.setOption('session', True)
+        wrapper.setOption('sessionIdleTimeout', idleTimeout)
+        wrapper.setOption('executionInstances', executionInstances)
+        wrapper.setOption('envPrepend', {'PYTHONPATH': os.path.join(self.rootPath(), 'src')})
+
+        return wrapper.run(task)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,2 +1,3 @@
 from .PythonTaskWrapperTest import PythonTaskWrapperTest
 from .Python3TaskWrapperTest import Python3TaskWrapperTest
+from .SubprocessSessionTest import SubprocessSessionTest
@@ -2,7 +2,7 @@ import os
 import unittest
 from ..BaseTestCase import BaseTestCase
 from kombi.Template import Template
-from kombi.Template import TemplateRequiredPathNotFoundError, TemplateVarNotFoundError
+from kombi.Template import TemplateRequiredPathNotFoundError, TemplateVarNotFoundError, TemplateInvalidArithmeticError
 from kombi.Element.Fs import FsElement
 
 class TemplateTest(BaseTestCase):
@@ -116,6 +116,44 @@ class TemplateTest(BaseTestCase):
             "/15/5/2"
         )
 
+    def testArithmeticLeadingZeros(self):
+        """
+        Test arithmetic operations using numbers with leading zeros and invalid operations.
+        """
+        self.assertEqual(Template("!kt (pad ({frame} + 1) 4)").value({'frame': '0010'}), '0011')
+        self.assertEqual(Template("!kt ((2 + 3) * 1.5)").value(), '7')
+        self.assertRaises(TemplateInvalidArithmeticError, Template("!kt (1 +)").value)
+        self.assertRaises(TemplateInvalidArithmeticError, Template("!kt (1 / 0)").value)
+
+    def testTypedProcedure(self):
+        """
+        Test that typed procedures receive the native values from nested procedures.
+        """
+        def __argTypes(*args):
+            return ','.join(map(lambda x: type(x).__name__, args))
+        Template.registerProcedure('testtypedargs', __argTypes, typed=True)
+        Template.registerProcedure('testuntypedargs', __argTypes)
+
+        self.assertEqual(Template("!kt (testtypedargs (1 + 2) (upper a) b)").value(), 'int,str,str')
+        self.assertEqual(Template("!kt (testuntypedargs (1 + 2) (upper a) b)").value(), 'str,str,str')
+
+    def testPureProcedure(self):
+        """
+        Test that the results of the pure procedures are memoized across templates.
+        """
+        calls = []
+
+        def __countCalls(value):
+            calls.append(value)
+            return value
+        Template.registerProcedure('testpurecalls', __countCalls, pure=True)
+        self.assertEqual(Template.procedureMetadata('testpurecalls'), {'pure': True, 'typed': False})
+
+        for _ in range(3):
+            self.assertEqual(Template("!kt /(testpurecalls {name})").value({'name': 'a'}), '/a')
+        self.assertEqual(Template("!kt /(testpurecalls {name})").value({'name': 'b'}), '/b')
+        self.assertEqual(calls, ['a', 'b'])
+
     def testSingleQuote(self):
         """
         Test that the template can return a value with single quote.
@@ -1,7 +1,9 @@
 import unittest
 import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from ...BaseTestCase import BaseTestCase
-from kombi.Template import Template
+from kombi.Template import Template, VersionResolver
 
 class VersionProceduresTest(BaseTestCase):
     """Test Version template procedures."""
@@ -125,6 +127,40 @@ class VersionProceduresTest(BaseTestCase):
         result = Template.runProcedure('latestver', BaseTestCase.dataTestsDirectory(), customPattern)
         self.assertEqual(result, 'v00004b')
 
+    def testReserveVersion(self):
+        """
+        Test that the reserve procedure creates unique versions.
+        """
+        versionsPath = os.path.join(self.tempDirectory(), 'reserveVersions')
+        shutil.rmtree(versionsPath, ignore_errors=True)
+
+        self.assertEqual(Template.runProcedure('reservever', versionsPath), 'v0001')
+        self.assertEqual(Template.runProcedure('reservever', versionsPath, 'v###b'), 'v001b')
+        self.assertTrue(os.path.isdir(os.path.join(versionsPath, 'v0001')))
+
+        # concurrent reservations should never result the same version
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            versions = list(executor.map(lambda x: Template.runProcedure('reservever', versionsPath), range(20)))
+        self.assertEqual(sorted(versions), ['v{:04d}'.format(x) for x in range(2, 22)])
+
+    def testVersionScope(self):
+        """
+        Test that the listing of the versions is cached inside of the scope.
+        """
+        versionsPath = os.path.join(self.tempDirectory(), 'scopeVersions')
+        shutil.rmtree(versionsPath, ignore_errors=True)
+        os.makedirs(os.path.join(versionsPath, 'v0001'))
+
+        with VersionResolver.scope():
+            self.assertEqual(Template.runProcedure('newver', versionsPath), 'v0002')
+            os.mkdir(os.path.join(versionsPath, 'v0002'))
+            self.assertEqual(Template.runProcedure('newver', versionsPath), 'v0002')
+
+            # the reserved versions are taken into account by the cache
+            self.assertEqual(Template.runProcedure('reservever', versionsPath), 'v0003')
+            self.assertEqual(Template.runProcedure('latestver', versionsPath), 'v0003')
+        self.assertEqual(Template.runProcedure('newver', versionsPath), 'v0004')
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,116 @@
+import os
+import sys
+import json
+import subprocess
+import unittest
+from .BaseTestCase import BaseTestCase
+from kombi.Tracer import Tracer
+from kombi.Task import Task
+from kombi.Dispatcher import Dispatcher
+from kombi.Element.Fs import FsElement
+
+class TracerTest(BaseTestCase):
+    """Test for the tracer."""
+
+    def setUp(self):
+        """
+        Enable the tracing.
+        """
+        self.__previousDirectory = Tracer.directory()
+        self.__traceDirectory = os.path.join(self.tempDirectory(), 'trace')
+        Tracer.setDirectory(self.__traceDirectory)
+
+    def tearDown(self):
+        """
+        Restore the tracing directory.
+        """
+        Tracer.setDirectory(self.__previousDirectory)
+
+    def testDisabled(self):
+        """
+        Test that no events are recorded when the tracing is disabled.
+        """
+        Tracer.setDirectory('')
+        self.assertFalse(Tracer.isEnabled())
+        self.assertEqual(Tracer.env(), {})
+        with Tracer.span('disabled') as span:
+            span.setAttribute('bytes', 10)
+        Tracer.flush()
+        self.assertFalse(os.path.exists(self.__traceDirectory))
+
+    def testNestedSpans(self):
+        """
+        Test the nested spans written by the tracer.
+        """
+        with Tracer.span('parent', elements=2) as parentSpan:
+            with Tracer.span('child') as childSpan:
+                childSpan.setAttribute('bytes', 1024)
+                self.assertEqual(Tracer.env()['KOMBI_TRACE_PARENT_SPAN'], childSpan.spanId())
+        Tracer.flush()
+
+        events = {x['name']: x for x in Tracer.events(self.__traceDirectory, Tracer.traceId()) if x['ph'] == 'X'}
+        self.assertEqual(events['parent']['args']['elements'], 2)
+        self.assertEqual(events['child']['args']['bytes'], 1024)
+        self.assertEqual(events['child']['args']['parentSpanId'], parentSpan.spanId())
+        self.assertGreaterEqual(events['parent']['dur'], events['child']['dur'])
+
+    def testTaskSpans(self):
+        """
+        Test the spans recorded during the execution of a task.
+        """
+        task = Task.create('glob')
+        task.add(FsElement.createFromPath(self.tempDirectory()))
+        task.setOption('skipDuplicated', True)
+        task.output()
+        Tracer.flush()
+
+        events = [x for x in Tracer.events(self.__traceDirectory, Tracer.traceId()) if x['name'] == 'task.perform']
+        self.assertEqual(events[-1]['args']['taskType'], 'glob')
+        self.assertEqual(events[-1]['args']['elements'], 1)
+
+    def testSubprocessPropagation(self):
+        """
+        Test that the trace is propagated to a subprocess.
+        """
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join([os.path.join(self.rootPath(), 'src'), env.get('PYTHONPATH', '')])
+        with Tracer.span('launcher') as launcherSpan:
+            env.update(Tracer.env())
+            subprocess.check_call(
+                [
+                    sys.executable,
+                    '-c',
+                    'from kombi.Tracer import Tracer\nwith Tracer.span("subprocess"): pass'
+                ],
+                env=env
+            )
+
+        Tracer.flush()
+        outputFile = os.path.join(self.tempDirectory(), 'mergedTrace.json')
+        Tracer.merge(self.__traceDirectory, outputFile, Tracer.traceId())
+        with open(outputFile) as f:
+            events = json.load(f)['traceEvents']
+
+        subprocessEvent = [x for x in events if x['name'] == 'subprocess'][0]
+        self.assertEqual(subprocessEvent['args']['parentSpanId'], launcherSpan.spanId())
+        self.assertNotEqual(subprocessEvent['pid'], os.getpid())
+
+    def testDispatcherEnv(self):
+        """
+        Test that the tracing env is only used during the dispatch.
+        """
+        class _TraceDispatcher(Dispatcher):
+            def _perform(self, taskHolder):
+                return [dict(self.option('env'))]
+
+        dispatcher = _TraceDispatcher('trace')
+        task = Task.create('glob')
+        with Tracer.span('dispatch'):
+            env = dispatcher.dispatch(task, [FsElement.createFromPath(self.tempDirectory())])[0]
+
+        self.assertEqual(env['KOMBI_TRACE_DIRECTORY'], self.__traceDirectory)
+        self.assertNotIn('KOMBI_TRACE_DIRECTORY', dispatcher.option('env'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,8 @@
 from .BaseTestCase import BaseTestCase
 from .CliTest import CliTest
+from .TracerTest import TracerTest
+from .ImageReaderTest import ImageReaderTest
+from .CacheFileTest import CacheFileTest
 from . import Element
 from . import Template
 from . import Task